@@ -2,10 +2,11 @@
 Agente de extração usando LangChain para extrair informações de vagas.
 Implementa validação multi-camada e confidence scoring.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import hashlib
 import json
+import time
 import structlog
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
 from langsmith import traceable
@@ -17,13 +18,40 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from agents.base_agent import BaseAgent
-from agents.prompts import PromptTemplates
+from agents.llm_registry import extraction_llm_config, get_llm_registry
+from agents.prompts import PromptTemplates, prompt_fingerprint
 from config import settings
+from services.cache import create_cache
+from services.circuit_breaker import NegativeCache
+from services.html_parsers import parse_job_page
+from services.job_monitor import STATUS_CLOSED, JobChange
+from services.strategy_stats import StrategyLearner, get_strategy_learner
+from services.url_canonicalizer import canonicalize_url
 from services.web_scraper import WebScraper
+from services.worker_pool import get_worker_pool
 from utils.validation import ValidationResult, validate_and_score_job_content, validate_and_score_job_details
 
 logger = structlog.get_logger()
 
+# Fontes de conteúdo enviadas pelo cliente (sem fetch da URL)
+PROVIDED_CONTENT_SOURCES = ("provided_html", "provided_text")
+
+
+class ContentUnavailableError(ValueError):
+    """A página não rendeu conteúdo de vaga (inacessível, vazia ou encerrada)."""
+
+
+def provided_scraped_data(content_result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Dados parseados a repassar para extract_job_title_and_company quando a
+    página não deve ser buscada de novo: conteúdo enviado pelo cliente, ou
+    conteúdo obtido pela IA porque o scraping falhou ou foi pulado (título e
+    empresa vazios levam direto à IA).
+    """
+    if content_result.get("source") in PROVIDED_CONTENT_SOURCES + ("llm_fallback",):
+        return content_result
+    return None
+
 
 class ExtractionAgent(BaseAgent):
     """
@@ -46,34 +74,65 @@ class ExtractionAgent(BaseAgent):
         super().__init__(model_name=model_name)
         self.use_web_scraping = use_web_scraping
         self.web_scraper = WebScraper() if use_web_scraping else None
-        self._chain = None
+        self.strategy_learner = get_strategy_learner() if settings.strategy_learning_enabled else None
+        # URLs cuja extração falhou por completo recentemente falham rápido
+        self.negative_cache = (
+            NegativeCache(
+                base_seconds=settings.negative_cache_base_seconds,
+                max_seconds=settings.negative_cache_max_seconds
+            )
+            if settings.negative_cache_enabled
+            else None
+        )
+        # Clientes LLM e cadeias compartilhados pelo processo
+        self.llm_registry = get_llm_registry()
+        self.llm_config = extraction_llm_config(self.model_name)
+        # Resultado da IA para título/empresa: mesmo conteúdo, mesmo modelo e mesmo prompt
+        self.details_cache = (
+            create_cache(
+                namespace="llm-details",
+                ttl_seconds=settings.details_cache_ttl_seconds,
+                memory_max_entries=settings.details_cache_memory_max_entries,
+                disk_max_entries=settings.details_cache_disk_max_entries
+            )
+            if settings.details_cache_enabled
+            else None
+        )
+        self.details_prompt_fingerprint = prompt_fingerprint(
+            PromptTemplates.get_job_details_extraction_prompt()
+        )
+    
+    def _details_cache_key(self, job_content: str) -> str:
+        """Chave do cache de título/empresa: conteúdo normalizado, modelo e versão do prompt."""
+        content_hash = hashlib.sha256(" ".join(job_content.split()).encode("utf-8")).hexdigest()
+        return f"{self.model_name}:{self.details_prompt_fingerprint}:{content_hash}"
     
     def _create_chain(self):
-        """Cria a cadeia LangChain para extração."""
-        if self._chain is None:
-            llm = ChatGoogleGenerativeAI(
-                model=self.model_name,
-                google_api_key=settings.google_api_key,
-                temperature=0.1,  # Baixa temperatura para extração precisa
-            )
-            
-            prompt = PromptTemplates.get_job_content_extraction_prompt()
-            parser = StrOutputParser()
-            
-            self._chain = prompt | llm | parser
-        
-        return self._chain
+        """Retorna a cadeia LangChain compartilhada para extração."""
+        return self.llm_registry.get_chain(
+            self.llm_config,
+            "job_content",
+            lambda llm: PromptTemplates.get_job_content_extraction_prompt() | llm | StrOutputParser()
+        )
     
     @traceable(name="extract_job_content")
     async def extract_job_content_from_url(
         self,
-        job_url: str
+        job_url: str,
+        job_html: Optional[str] = None,
+        job_text: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Extrai conteúdo de uma vaga a partir de uma URL.
         
+        Se o cliente enviar o HTML da página ou o texto da vaga, o conteúdo
+        é parseado e validado sem nenhum fetch; a URL só é acessada se o
+        conteúdo enviado não passar na validação.
+        
         Args:
             job_url: URL da vaga de emprego
+            job_html: HTML da página já obtido pelo cliente (opcional)
+            job_text: Texto da vaga colado pelo usuário (opcional)
             
         Returns:
             Dicionário com conteúdo extraído e metadados de validação
@@ -92,61 +151,154 @@ class ExtractionAgent(BaseAgent):
         except Exception as e:
             raise ValueError(f"URL inválida: {job_url}") from e
         
-        # Tentativa 1: Web scraping direto (mais rápido e confiável)
-        if self.use_web_scraping and self.web_scraper:
+        # Conteúdo enviado pelo cliente dispensa o fetch (e o cache negativo)
+        provided = await self._extract_provided_content(job_url, job_html, job_text)
+        if provided:
+            return provided
+        
+        url_key = canonicalize_url(job_url)
+        if self.negative_cache:
+            recent_failure = self.negative_cache.get(url_key)
+            if recent_failure:
+                retry_in = self.negative_cache.retry_in_seconds(recent_failure)
+                self.logger.info(
+                    "URL com falha recente - recusando sem nova tentativa",
+                    url=job_url,
+                    failures=recent_failure.failures,
+                    retry_in_seconds=round(retry_in)
+                )
+                raise ValueError(
+                    f"A extração desta URL falhou recentemente ({recent_failure.failures}x) "
+                    f"e só será tentada de novo em {retry_in:.0f}s: {job_url}\n"
+                    f"Último erro: {recent_failure.reason}\n\n"
+                    f"Ações sugeridas:\n"
+                    f"• Cole o conteúdo da vaga manualmente\n"
+                    f"• Tente novamente mais tarde"
+                )
+        
+        # Scraping (fetch + parse) e IA na ordem aprendida para o domínio:
+        # domínios em que o scraping falha de forma consistente vão direto
+        # para a IA, sem o fetch
+        domain = StrategyLearner.domain_of(url_key)
+        strategies = ["scraping", "llm_content"] if self.use_web_scraping and self.web_scraper else ["llm_content"]
+        order = self._strategy_order(domain, strategies)
+        
+        last_error: Optional[Exception] = None
+        for strategy in order:
+            started = time.monotonic()
+            error: Optional[Exception] = None
             try:
-                scraped_data = await self.web_scraper.scrape_job_posting(job_url)
-                
-                # Validação com scoring
-                validation = validate_and_score_job_content(scraped_data["fullText"])
-                
-                if validation.is_valid:
-                    self.logger.info(
-                        "Extração via web scraping bem-sucedida",
-                        score=validation.score,
-                        url=job_url
-                    )
-                    return {
-                        "content": scraped_data["fullText"],
-                        "title": scraped_data.get("title", ""),
-                        "company": scraped_data.get("company", ""),
-                        "validation": {
-                            "is_valid": True,
-                            "score": validation.score,
-                            "reasons": validation.reasons
-                        },
-                        "source": "web_scraping"
-                    }
+                if strategy == "scraping":
+                    result = await self._extract_content_by_scraping(job_url)
                 else:
-                    self.logger.warning(
-                        "Web scraping retornou conteúdo de baixa qualidade - acionando fallback de IA",
-                        score=validation.score,
-                        reasons=validation.reasons
-                    )
-                    # Continua para tentar com LLM como fallback
-                    
+                    result = await self._extract_content_with_llm(job_url)
             except Exception as e:
-                self.logger.warning(
-                    "Web scraping falhou - acionando fallback de IA para extração de conteúdo",
-                    error=str(e),
-                    error_type=type(e).__name__
-                )
+                error = last_error = e
+                result = None
+            # Erro da API do LLM não diz nada sobre o domínio
+            if error is None or isinstance(error, ContentUnavailableError):
+                self._record_strategy(domain, strategy, result is not None, started)
+            if result is not None:
+                self._clear_negative(url_key)
+                return result
         
-        # Tentativa 2 (Fallback): LLM tenta acessar e extrair conteúdo da URL
+        attempts = "\n".join(
+            f"{i}. ✗ {'Web scraping direto' if name == 'scraping' else 'Extração via IA'}"
+            for i, name in enumerate(order, 1)
+        )
+        error_msg = (
+            f"Falha completa ao extrair conteúdo da URL: {job_url}\n\n"
+            f"Tentativas realizadas:\n"
+            f"{attempts}\n\n"
+            f"Erro: {str(last_error) if last_error else 'conteúdo de baixa qualidade'}\n\n"
+            f"Ações sugeridas:\n"
+            f"• Cole o conteúdo da vaga manualmente\n"
+            f"• Verifique se a URL está correta e acessível\n"
+            f"• Tente novamente em alguns minutos"
+        )
+        self.logger.error(
+            "Extração de conteúdo falhou completamente",
+            error=error_msg,
+            error_type=type(last_error).__name__ if last_error else None
+        )
+        # Só conteúdo indisponível (página inacessível, vazia ou encerrada) entra
+        # no cache negativo; erros da API do LLM (quota, indisponibilidade) não
+        # dizem nada sobre a URL
+        if self.negative_cache and isinstance(last_error, ContentUnavailableError):
+            first_line = str(last_error).strip().split("\n")[0][:200]
+            self.negative_cache.record_failure(url_key, first_line)
+        raise ValueError(error_msg) from last_error
+    
+    def _strategy_order(self, domain: str, strategies: List[str]) -> List[str]:
+        """Ordem das estratégias de conteúdo para o domínio (padrão sem aprendizado)."""
+        if not self.strategy_learner:
+            return strategies
+        
+        ordered = self.strategy_learner.order(domain, strategies)
+        if ordered != strategies:
+            self.logger.info("Ordem de extração ajustada pelo histórico", domain=domain, order=ordered)
+        return ordered
+    
+    async def _extract_content_by_scraping(self, job_url: str) -> Optional[Dict[str, Any]]:
+        """Web scraping (mais rápido e confiável); None se falhar ou o conteúdo for fraco."""
         try:
-            self.logger.info(
-                "Iniciando extração de conteúdo via IA (fallback)",
-                url=job_url
+            scraped_data = await self.web_scraper.scrape_job_posting(job_url)
+        except Exception as e:
+            self.logger.warning(
+                "Web scraping falhou - acionando fallback de IA para extração de conteúdo",
+                error=str(e),
+                error_type=type(e).__name__
             )
-            
-            llm = ChatGoogleGenerativeAI(
-                model=self.model_name,
-                google_api_key=settings.google_api_key,
-                temperature=0.1,
+            return None
+        
+        # Validação com scoring (fora do event loop para páginas grandes)
+        full_text = scraped_data["fullText"]
+        validation = await get_worker_pool().run(
+            validate_and_score_job_content, full_text, size_hint=len(full_text)
+        )
+        
+        if not validation.is_valid:
+            self.logger.warning(
+                "Web scraping retornou conteúdo de baixa qualidade - acionando fallback de IA",
+                score=validation.score,
+                reasons=validation.reasons
             )
-            
-            # Prompt para o LLM extrair conteúdo da URL
-            fallback_prompt = f"""Você precisa extrair o conteúdo completo de uma vaga de emprego da seguinte URL:
+            return None
+        
+        self.logger.info(
+            "Extração via web scraping bem-sucedida",
+            score=validation.score,
+            url=job_url
+        )
+        return {
+            "content": scraped_data["fullText"],
+            "title": scraped_data.get("title", ""),
+            "company": scraped_data.get("company", ""),
+            "validation": {
+                "is_valid": True,
+                "score": validation.score,
+                "reasons": validation.reasons
+            },
+            "source": "web_scraping"
+        }
+    
+    async def _extract_content_with_llm(self, job_url: str) -> Dict[str, Any]:
+        """
+        LLM tenta acessar e extrair o conteúdo da URL (fallback).
+        
+        Raises:
+            ContentUnavailableError: Se a IA não obtiver conteúdo de vaga válido
+            Exception: Erros da API do LLM (quota, indisponibilidade)
+        """
+        self.logger.info(
+            "Iniciando extração de conteúdo via IA (fallback)",
+            url=job_url
+        )
+        
+        llm = self.llm_registry.get_llm(self.llm_config)
+        
+        # Prompt para o LLM extrair conteúdo da URL
+        fallback_prompt = f"""Você precisa extrair o conteúdo completo de uma vaga de emprego da seguinte URL:
 
 URL: {job_url}
 
@@ -162,72 +314,160 @@ Se não conseguir acessar a URL diretamente, explique o que impede o acesso.
 
 Retorne o conteúdo extraído em formato de texto estruturado."""
 
-            response = await llm.ainvoke(fallback_prompt)
-            content = response.content if hasattr(response, 'content') else str(response)
+        response = await llm.ainvoke(fallback_prompt)
+        content = response.content if hasattr(response, 'content') else str(response)
+        
+        # Valida o conteúdo extraído pela IA
+        validation = await get_worker_pool().run(
+            validate_and_score_job_content, content, size_hint=len(content)
+        )
+        
+        if not validation.is_valid:
+            error_msg = (
+                f"IA não conseguiu extrair conteúdo válido da URL: {job_url}\n"
+                f"Score: {validation.score}/100 (mínimo: 70)\n"
+                f"Motivos: {', '.join(validation.reasons)}\n\n"
+                f"A URL pode estar protegida ou o conteúdo pode não estar acessível.\n"
+                f"Sugestões:\n"
+                f"1. Abra a URL no navegador e copie o conteúdo manualmente\n"
+                f"2. Tente uma URL diferente da mesma vaga\n"
+                f"3. Verifique se a vaga ainda está disponível"
+            )
+            self.logger.error(
+                "Fallback de IA falhou - conteúdo inválido",
+                score=validation.score,
+                reasons=validation.reasons
+            )
+            raise ContentUnavailableError(error_msg)
+        
+        self.logger.info(
+            "Conteúdo extraído via IA com sucesso (fallback)",
+            score=validation.score,
+            source="llm_fallback"
+        )
+        
+        return {
+            "content": content,
+            "title": "",  # Será extraído em outra etapa
+            "company": "",  # Será extraído em outra etapa
+            "validation": {
+                "is_valid": True,
+                "score": validation.score,
+                "reasons": validation.reasons
+            },
+            "source": "llm_fallback"
+        }
+    
+    async def _extract_provided_content(
+        self,
+        job_url: str,
+        job_html: Optional[str],
+        job_text: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Parseia e valida o HTML ou texto enviado pelo cliente, sem fetch.
+        
+        O HTML passa pelo mesmo parse do scraping (JSON-LD, extrator do site,
+        conteúdo principal) e tem prioridade sobre o texto. O resultado não
+        entra nos caches de scraping, que guardam só o que o servidor buscou.
+        
+        Args:
+            job_url: URL da vaga (seleciona o extrator específico do site)
+            job_html: HTML da página (opcional)
+            job_text: Texto da vaga (opcional)
             
-            # Valida o conteúdo extraído pela IA
-            validation = validate_and_score_job_content(content)
+        Returns:
+            Resultado no formato de extract_job_content_from_url, ou None se
+            nada foi enviado ou nenhum conteúdo passou na validação
             
-            if not validation.is_valid:
-                error_msg = (
-                    f"IA não conseguiu extrair conteúdo válido da URL: {job_url}\n"
-                    f"Score: {validation.score}/100 (mínimo: 70)\n"
-                    f"Motivos: {', '.join(validation.reasons)}\n\n"
-                    f"A URL pode estar protegida ou o conteúdo pode não estar acessível.\n"
-                    f"Sugestões:\n"
-                    f"1. Abra a URL no navegador e copie o conteúdo manualmente\n"
-                    f"2. Tente uma URL diferente da mesma vaga\n"
-                    f"3. Verifique se a vaga ainda está disponível"
+        Raises:
+            ValueError: Se o HTML enviado exceder o tamanho máximo de página
+        """
+        candidates = []
+        if job_html and job_html.strip():
+            if len(job_html.encode("utf-8")) > settings.scraping_max_body_bytes:
+                raise ValueError(
+                    f"HTML enviado excede o limite de {settings.scraping_max_body_bytes} bytes"
+                )
+            parsed = await get_worker_pool().run(
+                parse_job_page, job_html, settings.scraping_parser_backend, job_url,
+                settings.scraping_main_content_enabled,
+                size_hint=len(job_html)
+            )
+            candidates.append(("provided_html", parsed))
+        if job_text and job_text.strip():
+            candidates.append(("provided_text", {"fullText": job_text.strip()}))
+        
+        for source, data in candidates:
+            content = data.get("fullText", "")
+            # Mesmo mínimo de texto exigido de uma página obtida pelo scraping
+            if len(content) <= 200:
+                self.logger.warning(
+                    "Conteúdo enviado pelo cliente muito curto", source=source, chars=len(content)
                 )
-                self.logger.error(
-                    "Fallback de IA falhou - conteúdo inválido",
+                continue
+            validation = await get_worker_pool().run(
+                validate_and_score_job_content, content, size_hint=len(content)
+            )
+            if not validation.is_valid:
+                self.logger.warning(
+                    "Conteúdo enviado pelo cliente reprovado na validação",
+                    source=source,
                     score=validation.score,
                     reasons=validation.reasons
                 )
-                raise ValueError(error_msg)
+                continue
             
             self.logger.info(
-                "Conteúdo extraído via IA com sucesso (fallback)",
+                "Conteúdo enviado pelo cliente aceito - sem fetch da URL",
+                source=source,
                 score=validation.score,
-                source="llm_fallback"
+                url=job_url
             )
-            
             return {
                 "content": content,
-                "title": "",  # Será extraído em outra etapa
-                "company": "",  # Será extraído em outra etapa
+                "title": data.get("title", ""),
+                "company": data.get("company", ""),
                 "validation": {
                     "is_valid": True,
                     "score": validation.score,
                     "reasons": validation.reasons
                 },
-                "source": "llm_fallback"
+                "source": source
             }
-            
-        except Exception as e:
-            error_msg = (
-                f"Falha completa ao extrair conteúdo da URL: {job_url}\n\n"
-                f"Tentativas realizadas:\n"
-                f"1. ✗ Web scraping direto\n"
-                f"2. ✗ Extração via IA\n\n"
-                f"Erro: {str(e)}\n\n"
-                f"Ações sugeridas:\n"
-                f"• Cole o conteúdo da vaga manualmente\n"
-                f"• Verifique se a URL está correta e acessível\n"
-                f"• Tente novamente em alguns minutos"
-            )
-            self.logger.error(
-                "Extração de conteúdo falhou completamente",
-                error=error_msg,
-                error_type=type(e).__name__
-            )
-            raise ValueError(error_msg) from e
+        
+        return None
+    
+    def _clear_negative(self, url_key: str):
+        """Remove a URL do cache negativo após uma extração bem-sucedida."""
+        if self.negative_cache:
+            self.negative_cache.clear(url_key)
+    
+    def handle_job_change(self, change: JobChange):
+        """
+        Ouvinte do monitor de vagas: ajusta o cache negativo da URL.
+
+        Vaga encerrada passa a ser recusada sem novo fetch; vaga alterada
+        está no ar, então falhas anteriores deixam de valer.
+        """
+        if not self.negative_cache:
+            return
+        if change.status == STATUS_CLOSED:
+            self.negative_cache.record_failure(change.url, "Vaga encerrada (detectada pelo monitor)")
+        else:
+            self.negative_cache.clear(change.url)
+    
+    def _record_strategy(self, domain: str, strategy: str, success: bool, started: float):
+        """Registra o resultado de uma estratégia de extração para o domínio."""
+        if self.strategy_learner and domain:
+            self.strategy_learner.record(domain, strategy, success, time.monotonic() - started)
     
     @traceable(name="extract_job_details")
     async def extract_job_title_and_company(
         self,
         job_content: str,
-        job_url: Optional[str] = None
+        job_url: Optional[str] = None,
+        scraped_data: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Extrai título e empresa da vaga a partir do conteúdo.
@@ -235,6 +475,8 @@ Retorne o conteúdo extraído em formato de texto estruturado."""
         Args:
             job_content: Conteúdo da vaga já extraído
             job_url: URL da vaga (opcional, usado para web scraping)
+            scraped_data: Dados já obtidos na extração de conteúdo (ver
+                provided_scraped_data); substituem o web scraping, sem fetch da URL
             
         Returns:
             Dicionário com título, empresa e metadados de validação
@@ -247,11 +489,15 @@ Retorne o conteúdo extraído em formato de texto estruturado."""
         if not job_content or len(job_content.strip()) < 100:
             raise ValueError("Conteúdo da vaga muito curto ou vazio")
         
-        # Tentativa 1: Web scraping se URL disponível
+        # Tentativa 1: Web scraping se URL disponível (ou dados já parseados)
         parsing_succeeded = False
-        if job_url and self.use_web_scraping and self.web_scraper:
+        provided = scraped_data is not None
+        if provided or (job_url and self.use_web_scraping and self.web_scraper):
             try:
-                scraped_data = await self.web_scraper.scrape_job_posting(job_url)
+                # Reutiliza o scraping feito em extract_job_content_from_url
+                # (memorizado no WebScraper), sem novo fetch da URL
+                if not provided:
+                    scraped_data = await self.web_scraper.scrape_job_posting(job_url)
                 
                 if scraped_data.get("title") and scraped_data.get("company"):
                     title = scraped_data["title"].strip()
@@ -276,7 +522,7 @@ Retorne o conteúdo extraído em formato de texto estruturado."""
                                 "score": validation.score,
                                 "reasons": validation.reasons
                             },
-                            "source": "web_scraping"
+                            "source": scraped_data.get("source", "web_scraping") if provided else "web_scraping"
                         }
                     else:
                         # Parsing encontrou dados mas validação falhou
@@ -304,23 +550,35 @@ Retorne o conteúdo extraído em formato de texto estruturado."""
             self.logger.info("Web scraping desabilitado ou URL não fornecida - usando IA diretamente")
         
         # Tentativa 2 (ou Fallback): LLM com parsing estruturado
+        source = "llm_fallback" if job_url and self.use_web_scraping else "llm"
+        cache_key = self._details_cache_key(job_content) if self.details_cache else None
+        if cache_key:
+            entry = await self.details_cache.aget(cache_key)
+            if entry is not None and self.details_cache.is_fresh(entry):
+                self.logger.info(
+                    "Título e empresa reaproveitados do cache da IA",
+                    title=entry.value["job_title"],
+                    company=entry.value["company"]
+                )
+                return {**entry.value, "source": source, "cached": True}
+        
         try:
             self.logger.info(
                 "Iniciando extração via IA",
                 fallback_mode=job_url is not None and self.use_web_scraping
             )
             
-            llm = ChatGoogleGenerativeAI(
-                model=self.model_name,
-                google_api_key=settings.google_api_key,
-                temperature=0.1,
+            chain = self.llm_registry.get_chain(
+                self.llm_config,
+                "job_details",
+                # JsonOutputParser sem schema aceita qualquer JSON válido
+                lambda llm: (
+                    PromptTemplates.get_job_details_extraction_prompt()
+                    | llm
+                    | JsonOutputParser(pydantic_object=None)
+                )
             )
             
-            prompt = PromptTemplates.get_job_details_extraction_prompt()
-            parser = JsonOutputParser(pydantic_object=None)  # Aceita qualquer JSON válido
-            
-            chain = prompt | llm | parser
-            
             result = await chain.ainvoke({"content": job_content})
             
             # Extrai valores do resultado (aceita camelCase e snake_case)
@@ -352,8 +610,6 @@ Retorne o conteúdo extraído em formato de texto estruturado."""
                 })
                 raise ValueError(error_msg)
             
-            source = "llm_fallback" if job_url and self.use_web_scraping else "llm"
-            
             self.logger.info(
                 "Título e empresa extraídos via IA com sucesso",
                 title=title,
@@ -363,16 +619,18 @@ Retorne o conteúdo extraído em formato de texto estruturado."""
             )
             
             # BUG FIX: Sempre retorna snake_case para consistência Python
-            return {
+            details = {
                 "job_title": title,  # snake_case correto
                 "company": company,
                 "validation": {
                     "is_valid": True,
                     "score": validation.score,
                     "reasons": validation.reasons
-                },
-                "source": source
+                }
             }
+            if cache_key:
+                await self.details_cache.aset(cache_key, details, {"model": self.model_name})
+            return {**details, "source": source}
             
         except json.JSONDecodeError as e:
             error_msg = f"IA retornou JSON inválido: {str(e)}"
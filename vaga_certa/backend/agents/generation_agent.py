@@ -2,10 +2,14 @@
 Agente de geração usando LangChain para criar materiais de carreira personalizados.
 Implementa geração estruturada com validação de qualidade.
 """
-from typing import Dict, Any
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+import asyncio
+import copy
+import hashlib
+import json
 import re
+import time
 import structlog
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
 from langsmith import traceable
@@ -17,8 +21,12 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from agents.base_agent import BaseAgent
-from agents.prompts import PromptTemplates, get_prompt_variables
+from agents.llm_registry import generation_llm_config, get_llm_registry
+from agents.prompts import PromptTemplates, build_generation_context, get_prompt_variables, prompt_fingerprint
+from agents.section_stream import SECTION_MARKERS, SectionStreamParser, parse_sections, strip_section_marker
 from config import settings
+from services.cache import create_cache
+from services.worker_pool import get_worker_pool
 from utils.compatibility import calculate_compatibility
 
 logger = structlog.get_logger()
@@ -48,34 +56,42 @@ class GenerationAgent(BaseAgent):
         
         super().__init__(model_name=model_name)
         self.use_thinking_mode = use_thinking_mode
-        self._chain = None
+        # Cliente com Google Search (e modo de raciocínio, se pedido) compartilhado pelo processo
+        self.llm_registry = get_llm_registry()
+        self.llm_config = generation_llm_config(model_name, use_thinking_mode)
+        # Resultados completos por entradas normalizadas; chamadas idênticas simultâneas
+        # (duplo clique, retry) aguardam a mesma geração
+        self.result_cache = (
+            create_cache(
+                namespace="generation",
+                ttl_seconds=settings.generation_cache_ttl_seconds,
+                memory_max_entries=settings.generation_cache_memory_max_entries,
+                disk_max_entries=settings.generation_cache_disk_max_entries
+            )
+            if settings.generation_cache_enabled
+            else None
+        )
+        self.prompt_version = hashlib.sha256(":".join(
+            [prompt_fingerprint(PromptTemplates.get_career_materials_generation_prompt())]
+            + [prompt_fingerprint(PromptTemplates.get_section_generation_prompt(key)) for key in SECTION_MARKERS]
+        ).encode("utf-8")).hexdigest()[:16]
+        self._inflight: Dict[str, asyncio.Task] = {}
     
     def _create_chain(self):
-        """Cria a cadeia LangChain para geração."""
-        if self._chain is None:
-            # Configuração do modelo com ferramentas
-            config = {}
-            
-            if self.use_thinking_mode:
-                # Modo de raciocínio para maior precisão
-                config["thinking_config"] = {"thinking_budget": 32768}
-            
-            # Habilita Google Search para contexto adicional
-            config["tools"] = [{"googleSearch": {}}]
-            
-            llm = ChatGoogleGenerativeAI(
-                model=self.model_name,
-                google_api_key=settings.google_api_key,
-                temperature=0.7,  # Temperatura média para criatividade controlada
-                **config
-            )
-            
-            prompt = PromptTemplates.get_career_materials_generation_prompt()
-            parser = StrOutputParser()
-            
-            self._chain = prompt | llm | parser
-        
-        return self._chain
+        """Retorna a cadeia LangChain compartilhada para geração."""
+        return self.llm_registry.get_chain(
+            self.llm_config,
+            "career_materials",
+            lambda llm: PromptTemplates.get_career_materials_generation_prompt() | llm | StrOutputParser()
+        )
+    
+    def _create_section_chain(self, section: str):
+        """Retorna a cadeia compartilhada que gera uma única seção."""
+        return self.llm_registry.get_chain(
+            self.llm_config,
+            f"section:{section}",
+            lambda llm: PromptTemplates.get_section_generation_prompt(section) | llm | StrOutputParser()
+        )
     
     @traceable(name="generate_career_materials")
     async def generate_career_materials(
@@ -86,7 +102,9 @@ class GenerationAgent(BaseAgent):
         job_description: str,
         tone: str = "Profissional mas entusiasmado",
         language: str = "Português Brasileiro",
-        custom_context: str = ""
+        custom_context: str = "",
+        parallel_sections: Optional[bool] = None,
+        force_regenerate: bool = False
     ) -> Dict[str, Any]:
         """
         Gera materiais de carreira personalizados.
@@ -99,9 +117,13 @@ class GenerationAgent(BaseAgent):
             tone: Tom desejado
             language: Idioma alvo
             custom_context: Contexto adicional do usuário
+            parallel_sections: Gera cada seção em uma chamada paralela ao LLM
+                (None usa settings.generation_parallel_sections)
+            force_regenerate: Ignora o cache de resultados e gera de novo
             
         Returns:
-            Dicionário com materiais gerados e metadados
+            Dicionário com materiais gerados e metadados (metadata.cached indica
+            se veio do cache)
         """
         self.logger.info(
             "Gerando materiais de carreira",
@@ -110,6 +132,273 @@ class GenerationAgent(BaseAgent):
             model=self.model_name
         )
         
+        prompt_vars = self._prepare_generation(
+            cv, job_title, company, job_description, tone, language, custom_context
+        )
+        
+        if parallel_sections is None:
+            parallel_sections = settings.generation_parallel_sections
+        cache_key = self._result_cache_key(prompt_vars, parallel_sections)
+        if not force_regenerate:
+            cached = await self._cached_result(cache_key)
+            if cached is not None:
+                return cached
+        
+        async def generate() -> Dict[str, Any]:
+            compatibility = await self._calculate_compatibility(cv, job_description)
+            if parallel_sections:
+                result = await self._generate_sections_parallel(prompt_vars, compatibility, tone, language)
+            else:
+                result = await self._generate_single_prompt(prompt_vars, compatibility, tone, language)
+            await self._store_result(cache_key, result)
+            return result
+        
+        return await self._single_flight(cache_key, generate, join=not force_regenerate)
+    
+    async def _generate_single_prompt(
+        self,
+        prompt_vars: Dict[str, Any],
+        compatibility,
+        tone: str,
+        language: str
+    ) -> Dict[str, Any]:
+        """Gera as quatro seções com o prompt único."""
+        try:
+            # Executa a cadeia
+            chain = self._create_chain()
+            raw_response = await chain.ainvoke(prompt_vars)
+            
+            # Parseia a resposta estruturada
+            parsed_content = self._parse_generated_content(raw_response)
+            
+            self.logger.info(
+                "Materiais gerados com sucesso",
+                sections=list(parsed_content.keys())
+            )
+            
+            return self._build_result(parsed_content, raw_response, compatibility, tone, language)
+            
+        except Exception as e:
+            self.logger.error("Erro na geração de materiais", error=str(e))
+            raise ValueError(f"Falha ao gerar materiais: {e}") from e
+    
+    async def stream_career_materials(
+        self,
+        cv: str,
+        job_title: str,
+        company: str,
+        job_description: str,
+        tone: str = "Profissional mas entusiasmado",
+        language: str = "Português Brasileiro",
+        custom_context: str = "",
+        force_regenerate: bool = False
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Gera os materiais em streaming, emitindo eventos por seção.
+        
+        Eventos (dicionários com a chave "event"): `compatibility` antes da
+        chamada ao LLM; `section_start`, `section_delta` e `section_end`
+        conforme cada seção começa, cresce e termina; `done` com o mesmo
+        resultado de generate_career_materials. Resultado em cache é emitido
+        de uma vez (uma seção completa por evento).
+        
+        Args:
+            Os mesmos de generate_career_materials (sempre com o prompt único)
+            
+        Raises:
+            ValueError: Se a entrada for inválida ou a geração falhar
+        """
+        self.logger.info(
+            "Gerando materiais de carreira (streaming)",
+            job_title=job_title,
+            company=company,
+            model=self.model_name
+        )
+        
+        prompt_vars = self._prepare_generation(
+            cv, job_title, company, job_description, tone, language, custom_context
+        )
+        cache_key = self._result_cache_key(prompt_vars, False)
+        cached = None if force_regenerate else await self._cached_result(cache_key)
+        if cached is not None:
+            yield {"event": "compatibility", **cached["compatibility"]}
+            for section in SECTION_MARKERS:
+                yield {"event": "section_start", "section": section}
+                yield {"event": "section_delta", "section": section, "text": cached[section]}
+                yield {"event": "section_end", "section": section, "text": cached[section]}
+            yield {"event": "done", **cached}
+            return
+        
+        compatibility = await self._calculate_compatibility(cv, job_description)
+        yield {"event": "compatibility", **self._compatibility_payload(compatibility)}
+        
+        parser = SectionStreamParser()
+        try:
+            chain = self._create_chain()
+            async for chunk in chain.astream(prompt_vars):
+                for event in parser.feed(chunk):
+                    yield event
+        except Exception as e:
+            self.logger.error("Erro na geração de materiais (streaming)", error=str(e))
+            raise ValueError(f"Falha ao gerar materiais: {e}") from e
+        
+        for event in parser.close():
+            yield event
+        
+        parsed_content = parser.result()
+        self.logger.info(
+            "Materiais gerados com sucesso (streaming)",
+            sections=list(parsed_content.keys())
+        )
+        result = self._build_result(parsed_content, parser.text, compatibility, tone, language)
+        await self._store_result(cache_key, result)
+        yield {"event": "done", **result}
+    
+    async def _generate_section(self, section: str, prompt_vars: Dict[str, Any], feedback: str = "") -> str:
+        """
+        Gera uma única seção com o prompt específico dela.
+        
+        Args:
+            section: Chave da seção
+            prompt_vars: Variáveis do prompt, incluindo o contexto já renderizado
+            feedback: Observações sobre a versão anterior (regeneração)
+        """
+        chain = self._create_section_chain(section)
+        text = await chain.ainvoke({
+            **prompt_vars,
+            "feedback": feedback.strip() or "Nenhuma (primeira versão).",
+        })
+        return strip_section_marker(section, text)
+    
+    async def _generate_sections_parallel(
+        self,
+        prompt_vars: Dict[str, Any],
+        compatibility,
+        tone: str,
+        language: str
+    ) -> Dict[str, Any]:
+        """
+        Gera as quatro seções em chamadas concorrentes ao LLM.
+        
+        O tempo total fica próximo ao da seção mais lenta. Seção que falha
+        recebe um texto de erro (pode ser regenerada isoladamente); se todas
+        falharem, levanta ValueError.
+        """
+        section_vars = {**prompt_vars, "context": build_generation_context(prompt_vars)}
+        durations: Dict[str, float] = {}
+        
+        async def timed(section: str) -> str:
+            started = time.monotonic()
+            try:
+                return await self._generate_section(section, section_vars)
+            finally:
+                durations[section] = round(time.monotonic() - started, 3)
+        
+        sections = list(SECTION_MARKERS.keys())
+        results = await asyncio.gather(*(timed(section) for section in sections), return_exceptions=True)
+        
+        parsed_content: Dict[str, str] = {}
+        failed = []
+        for section, result in zip(sections, results):
+            if isinstance(result, Exception):
+                self.logger.warning("Falha ao gerar seção", section=section, error=str(result))
+                parsed_content[section] = f"Erro: falha ao gerar a seção ({result})"
+                failed.append(section)
+            else:
+                parsed_content[section] = result
+        
+        if len(failed) == len(sections):
+            raise ValueError(f"Falha ao gerar materiais: {results[0]}")
+        
+        self.logger.info(
+            "Materiais gerados com sucesso (seções em paralelo)",
+            failed_sections=failed,
+            section_seconds=durations
+        )
+        result = self._build_result(
+            parsed_content, "\n\n".join(parsed_content.values()), compatibility, tone, language
+        )
+        result["metadata"].update({
+            "parallel_sections": True,
+            "section_seconds": durations,
+            "failed_sections": failed,
+        })
+        return result
+    
+    @traceable(name="regenerate_section")
+    async def regenerate_section(
+        self,
+        section: str,
+        cv: str,
+        job_title: str,
+        company: str,
+        job_description: str,
+        tone: str = "Profissional mas entusiasmado",
+        language: str = "Português Brasileiro",
+        custom_context: str = "",
+        feedback: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Regenera uma única seção dos materiais, sem refazer as demais.
+        
+        Args:
+            section: Chave da seção (optimizedCv, coverLetter, networkingMessage, interviewTips)
+            feedback: O que mudar em relação à versão anterior
+            Demais: os mesmos de generate_career_materials
+            
+        Returns:
+            Dicionário com a seção, o texto gerado e metadados
+            
+        Raises:
+            ValueError: Se a seção não existir, a entrada for inválida ou a geração falhar
+        """
+        if section not in SECTION_MARKERS:
+            raise ValueError(f"Seção desconhecida: {section}")
+        
+        self.logger.info("Regenerando seção", section=section, job_title=job_title, company=company)
+        prompt_vars = self._prepare_generation(
+            cv, job_title, company, job_description, tone, language, custom_context
+        )
+        
+        started = time.monotonic()
+        try:
+            text = await self._generate_section(
+                section,
+                {**prompt_vars, "context": build_generation_context(prompt_vars)},
+                feedback
+            )
+        except Exception as e:
+            self.logger.error("Erro na regeneração da seção", section=section, error=str(e))
+            raise ValueError(f"Falha ao regenerar a seção {section}: {e}") from e
+        
+        return {
+            "section": section,
+            "content": text,
+            "metadata": {
+                "model": self.model_name,
+                "use_thinking_mode": self.use_thinking_mode,
+                "tone": tone,
+                "language": language,
+                "seconds": round(time.monotonic() - started, 3),
+            }
+        }
+    
+    def _prepare_generation(
+        self,
+        cv: str,
+        job_title: str,
+        company: str,
+        job_description: str,
+        tone: str,
+        language: str,
+        custom_context: str
+    ) -> Dict[str, Any]:
+        """
+        Valida a entrada e prepara as variáveis do prompt.
+        
+        Raises:
+            ValueError: Se a entrada for inválida
+        """
         # Validação de entrada
         if not cv or len(cv.strip()) < 50:
             raise ValueError("CV muito curto ou vazio")
@@ -121,7 +410,7 @@ class GenerationAgent(BaseAgent):
             raise ValueError("Descrição da vaga muito curta ou vazia")
         
         # Prepara variáveis do prompt
-        prompt_vars = get_prompt_variables(
+        return get_prompt_variables(
             cv=cv,
             job_title=job_title,
             company=company,
@@ -130,46 +419,111 @@ class GenerationAgent(BaseAgent):
             language=language,
             custom_context=custom_context
         )
+    
+    async def _calculate_compatibility(self, cv: str, job_description: str):
+        """Compatibilidade heurística candidato-vaga, fora do event loop."""
+        return await get_worker_pool().run(
+            calculate_compatibility, cv, job_description,
+            size_hint=len(cv) + len(job_description)
+        )
+    
+    def _result_cache_key(self, prompt_vars: Dict[str, Any], parallel_sections: bool) -> str:
+        """
+        Chave do cache de resultados: entradas normalizadas (espaços colapsados),
+        modelo, modo de raciocínio, modo de geração e versão dos prompts.
+        """
+        payload = {
+            "vars": {name: " ".join(str(value).split()) for name, value in prompt_vars.items()},
+            "model": self.model_name,
+            "thinking": self.use_thinking_mode,
+            "mode": "sections" if parallel_sections else "single",
+            "prompt": self.prompt_version,
+        }
+        serialized = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+    
+    async def _cached_result(self, key: str) -> Optional[Dict[str, Any]]:
+        """Resultado fresco do cache (marcado como cached) ou None."""
+        if self.result_cache is None:
+            return None
+        entry = await self.result_cache.aget(key)
+        if entry is None or not self.result_cache.is_fresh(entry):
+            return None
         
-        compatibility = calculate_compatibility(cv, job_description)
-
-        try:
-            # Executa a cadeia
-            chain = self._create_chain()
-            raw_response = await chain.ainvoke(prompt_vars)
-            
-            # Parseia a resposta estruturada
-            parsed_content = self._parse_generated_content(raw_response)
-            
+        result = copy.deepcopy(entry.value)
+        result["metadata"].update({
+            "cached": True,
+            "cache_age_seconds": round(entry.age_seconds(), 1),
+        })
+        self.logger.info("Materiais servidos pelo cache", cache_age_seconds=result["metadata"]["cache_age_seconds"])
+        return result
+    
+    async def _store_result(self, key: str, result: Dict[str, Any]):
+        """Guarda o resultado se todas as seções foram geradas."""
+        result["metadata"]["cached"] = False
+        if self.result_cache is None:
+            return
+        if any(result[section].startswith("Erro:") for section in SECTION_MARKERS):
+            self.result_cache.count("skipped_incomplete")
+            return
+        await self.result_cache.aset(key, result, {"model": self.model_name})
+    
+    async def _single_flight(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Dict[str, Any]]],
+        join: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Executa a geração uma vez por chave: chamadas idênticas simultâneas
+        aguardam a mesma tarefa (join=False sempre inicia uma nova).
+        """
+        task = self._inflight.get(key) if join else None
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight.pop(key, None) if self._inflight.get(key) is done else None)
+        else:
+            self.logger.info("Aguardando geração idêntica em andamento")
+            if self.result_cache is not None:
+                self.result_cache.count("joined_inflight")
+        
+        # shield: o cancelamento de um chamador não derruba a geração compartilhada
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+    
+    @staticmethod
+    def _compatibility_payload(compatibility) -> Dict[str, Any]:
+        """Compatibilidade no formato da resposta da API."""
+        return {
+            "score": compatibility.score,
+            "label": compatibility.label,
+            "strengths": compatibility.strengths,
+            "gaps": compatibility.gaps,
+            "coverage_ratio": compatibility.coverage_ratio,
+        }
+    
+    def _build_result(
+        self,
+        parsed_content: Dict[str, str],
+        raw_response: str,
+        compatibility,
+        tone: str,
+        language: str
+    ) -> Dict[str, Any]:
+        """Monta o resultado da geração a partir das seções parseadas."""
+        return {
+            **parsed_content,
             # Extrai fontes (grounding metadata) se disponível
-            sources = self._extract_sources(raw_response)
-            
-            self.logger.info(
-                "Materiais gerados com sucesso",
-                sections=list(parsed_content.keys())
-            )
-            
-            return {
-                **parsed_content,
-                "sources": sources,
-                "compatibility": {
-                    "score": compatibility.score,
-                    "label": compatibility.label,
-                    "strengths": compatibility.strengths,
-                    "gaps": compatibility.gaps,
-                    "coverage_ratio": compatibility.coverage_ratio,
-                },
-                "metadata": {
-                    "model": self.model_name,
-                    "use_thinking_mode": self.use_thinking_mode,
-                    "tone": tone,
-                    "language": language
-                }
+            "sources": self._extract_sources(raw_response),
+            "compatibility": self._compatibility_payload(compatibility),
+            "metadata": {
+                "model": self.model_name,
+                "use_thinking_mode": self.use_thinking_mode,
+                "tone": tone,
+                "language": language
             }
-            
-        except Exception as e:
-            self.logger.error("Erro na geração de materiais", error=str(e))
-            raise ValueError(f"Falha ao gerar materiais: {e}") from e
+        }
     
     def _parse_generated_content(self, response_text: str) -> Dict[str, str]:
         """
@@ -181,43 +535,7 @@ class GenerationAgent(BaseAgent):
         Returns:
             Dicionário com seções parseadas
         """
-        sections = {
-            "optimizedCv": "### OPTIMIZED CV ###",
-            "coverLetter": "### COVER LETTER ###",
-            "networkingMessage": "### NETWORKING MESSAGE ###",
-            "interviewTips": "### INTERVIEW TIPS ###",
-        }
-        
-        parsed_content = {}
-        remaining_text = response_text
-        
-        keys = list(sections.keys())
-        for i, key in enumerate(keys):
-            start_marker = sections[key]
-            next_key = keys[i + 1] if i + 1 < len(keys) else None
-            end_marker = sections[next_key] if next_key else None
-            
-            start_index = remaining_text.find(start_marker)
-            if start_index == -1:
-                parsed_content[key] = f"Erro: Seção {start_marker} não encontrada"
-                continue
-            
-            end_index = (
-                remaining_text.find(end_marker, start_index)
-                if end_marker
-                else len(remaining_text)
-            )
-            
-            if end_index == -1:
-                end_index = len(remaining_text)
-            
-            section_text = remaining_text[
-                start_index + len(start_marker):end_index
-            ].strip()
-            
-            parsed_content[key] = section_text
-        
-        return parsed_content
+        return parse_sections(response_text)
     
     def _extract_sources(self, response_text: str) -> list:
         """
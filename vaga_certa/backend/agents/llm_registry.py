@@ -0,0 +1,233 @@
+"""
+Registro de clientes LLM compartilhados pelo processo.
+Um ChatGoogleGenerativeAI (e seus canais gRPC/HTTP) por configuração
+(modelo, temperatura, ferramentas, modo de raciocínio), reaproveitado por
+todas as requisições, junto com as cadeias LangChain montadas sobre ele.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+import asyncio
+import json
+import threading
+import structlog
+from langchain_core.runnables import Runnable
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+import sys
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para imports absolutos
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+
+logger = structlog.get_logger()
+
+
+@dataclass(frozen=True)
+class LLMConfig:
+    """Configuração que identifica um cliente LLM compartilhado."""
+    model: str
+    temperature: float
+    tools: Tuple[str, ...] = ()  # Ferramentas serializadas em JSON (hashable)
+    thinking_budget: Optional[int] = None
+
+    @classmethod
+    def build(
+        cls,
+        model: str,
+        temperature: float,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        thinking_budget: Optional[int] = None
+    ) -> "LLMConfig":
+        """Cria a chave a partir das ferramentas no formato da API."""
+        return cls(
+            model=model,
+            temperature=temperature,
+            tools=tuple(json.dumps(tool, sort_keys=True) for tool in tools or ()),
+            thinking_budget=thinking_budget
+        )
+
+    def client_kwargs(self) -> Dict[str, Any]:
+        """Argumentos extras do construtor do cliente."""
+        kwargs: Dict[str, Any] = {}
+        if self.thinking_budget is not None:
+            kwargs["thinking_config"] = {"thinking_budget": self.thinking_budget}
+        if self.tools:
+            kwargs["tools"] = [json.loads(tool) for tool in self.tools]
+        return kwargs
+
+
+@dataclass
+class _Entry:
+    """Cliente compartilhado e as cadeias montadas sobre ele."""
+    llm: Any
+    chains: Dict[str, Runnable] = field(default_factory=dict)
+    requests: int = 0
+
+
+class LLMRegistry:
+    """
+    Clientes LLM e cadeias reutilizáveis, criados sob demanda uma única vez.
+
+    Os clientes do LangChain são seguros para chamadas concorrentes; o lock
+    só protege a criação, para que duas requisições simultâneas não montem
+    dois clientes para a mesma configuração.
+    """
+
+    def __init__(self, factory: Optional[Callable[..., Any]] = None, api_key: Optional[str] = None):
+        """
+        Inicializa o registro.
+
+        Args:
+            factory: Construtor dos clientes (padrão: ChatGoogleGenerativeAI)
+            api_key: Chave da API (padrão: settings.google_api_key na criação do cliente)
+        """
+        self.factory = factory or ChatGoogleGenerativeAI
+        self.api_key = api_key
+        self._entries: Dict[LLMConfig, _Entry] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _entry(self, config: LLMConfig) -> _Entry:
+        entry = self._entries.get(config)
+        if entry is not None:
+            return entry
+        with self._lock:
+            entry = self._entries.get(config)
+            if entry is None:
+                llm = self.factory(
+                    model=config.model,
+                    google_api_key=self.api_key or settings.google_api_key,
+                    temperature=config.temperature,
+                    **config.client_kwargs()
+                )
+                entry = self._entries[config] = _Entry(llm=llm)
+                logger.info(
+                    "Cliente LLM criado",
+                    model=config.model,
+                    temperature=config.temperature,
+                    tools=len(config.tools),
+                    thinking_budget=config.thinking_budget
+                )
+        return entry
+
+    def get_llm(self, config: LLMConfig) -> Any:
+        """Cliente compartilhado para a configuração."""
+        entry = self._entry(config)
+        entry.requests += 1
+        return entry.llm
+
+    def get_chain(self, config: LLMConfig, name: str, build: Callable[[Any], Runnable]) -> Runnable:
+        """
+        Cadeia compartilhada montada sobre o cliente da configuração.
+
+        Args:
+            config: Configuração do cliente
+            name: Nome da cadeia (único por configuração)
+            build: Recebe o cliente e monta a cadeia (chamado uma única vez)
+        """
+        entry = self._entry(config)
+        entry.requests += 1
+        chain = entry.chains.get(name)
+        if chain is None:
+            with self._lock:
+                chain = entry.chains.get(name)
+                if chain is None:
+                    chain = entry.chains[name] = build(entry.llm)
+        return chain
+
+    def warm_up(self, configs: List[LLMConfig]):
+        """
+        Cria os clientes das configurações informadas antes da primeira requisição.
+
+        Chamado dentro do event loop da aplicação, também abre o cliente
+        assíncrono (preso ao loop em que é criado).
+        """
+        for config in configs:
+            llm = self._entry(config).llm
+            getattr(llm, "async_client", None)
+        logger.info("Clientes LLM pré-aquecidos", clients=len(configs))
+
+    async def close(self):
+        """Fecha os transportes dos clientes e esvazia o registro."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            for attr in ("async_client_running", "client"):
+                transport = getattr(getattr(entry.llm, attr, None), "transport", None)
+                if transport is None:
+                    continue
+                try:
+                    closed = transport.close()
+                    if asyncio.iscoroutine(closed):
+                        await closed
+                except Exception as e:
+                    logger.warning("Falha ao fechar cliente LLM", error=str(e))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Clientes ativos e uso de cada um."""
+        return {
+            "clients": [
+                {
+                    "model": config.model,
+                    "temperature": config.temperature,
+                    "tools": len(config.tools),
+                    "thinking_budget": config.thinking_budget,
+                    "chains": sorted(entry.chains),
+                    "requests": entry.requests,
+                }
+                for config, entry in list(self._entries.items())
+            ]
+        }
+
+
+# Configurações usadas pelos agentes
+GENERATION_TOOLS = [{"googleSearch": {}}]  # Google Search para contexto adicional
+GENERATION_THINKING_BUDGET = 32768
+
+
+def extraction_llm_config(model_name: str) -> LLMConfig:
+    """Configuração do cliente de extração (baixa temperatura para extração precisa)."""
+    return LLMConfig.build(model_name, 0.1)
+
+
+def generation_llm_config(model_name: str, use_thinking_mode: bool) -> LLMConfig:
+    """Configuração do cliente de geração (temperatura média, criatividade controlada)."""
+    return LLMConfig.build(
+        model_name,
+        0.7,
+        tools=GENERATION_TOOLS,
+        thinking_budget=GENERATION_THINKING_BUDGET if use_thinking_mode else None
+    )
+
+
+_llm_registry: Optional[LLMRegistry] = None
+
+
+def get_llm_registry() -> LLMRegistry:
+    """Retorna o registro global do processo."""
+    global _llm_registry
+    if _llm_registry is None:
+        _llm_registry = LLMRegistry()
+    return _llm_registry
+
+
+def warm_up_llm_registry():
+    """Pré-cria os clientes usados pelos agentes (chamado no startup da aplicação)."""
+    get_llm_registry().warm_up([
+        extraction_llm_config("gemini-2.5-flash"),
+        generation_llm_config("gemini-2.5-flash", False),
+        generation_llm_config("gemini-2.5-pro", True),
+    ])
+
+
+async def shutdown_llm_registry():
+    """Fecha o registro global (chamado no shutdown da aplicação)."""
+    global _llm_registry
+    if _llm_registry is not None:
+        await _llm_registry.close()
+        _llm_registry = None
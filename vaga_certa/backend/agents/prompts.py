@@ -4,100 +4,17 @@ Prompts são estruturados, testáveis e versionados.
 """
 from langchain_core.prompts import ChatPromptTemplate, SystemMessagePromptTemplate, HumanMessagePromptTemplate
 from typing import Dict
+import hashlib
+import json
 
 
-class PromptTemplates:
-    """
-    Templates de prompts profissionais seguindo Prompt Engineering best practices:
-    - Clareza e especificidade
-    - Estruturação clara
-    - Exemplos quando necessário
-    - Instruções de formatação explícitas
-    """
-    
-    # ============================================================================
-    # EXTRACTION PROMPTS
-    # ============================================================================
-    
-    @staticmethod
-    def get_job_content_extraction_prompt() -> ChatPromptTemplate:
-        """
-        Prompt para extração de conteúdo de vaga de emprego.
-        Focado em extrair informações estruturadas e validadas.
-        """
-        return ChatPromptTemplate.from_messages([
-            SystemMessagePromptTemplate.from_template(
-                """Você é um especialista em extração de informações de vagas de emprego.
-                
-Sua tarefa é analisar o conteúdo HTML/texto fornecido e extrair APENAS informações relevantes sobre a vaga de emprego.
-
-REGRAS CRÍTICAS:
-1. Extraia APENAS informações relacionadas à vaga de emprego
-2. Ignore navegação, menus, rodapés e outros elementos não relacionados
-3. Mantenha a estrutura original quando possível (listas, parágrafos)
-4. Se o conteúdo não parecer ser uma vaga válida, indique claramente
-
-FORMATO DE SAÍDA:
-Retorne APENAS o texto da descrição da vaga, sem comentários ou metadados adicionais."""
-            ),
-            HumanMessagePromptTemplate.from_template(
-                """Analise o seguinte conteúdo e extraia a descrição da vaga de emprego:
-
-{content}
-
-Extraia APENAS a descrição da vaga, removendo elementos de navegação, menus e outros elementos não relacionados."""
-            )
-        ])
-    
-    @staticmethod
-    def get_job_details_extraction_prompt() -> ChatPromptTemplate:
-        """
-        Prompt para extração de título e empresa da vaga.
-        Usa formatação estruturada (JSON) para garantir precisão.
-        """
-        return ChatPromptTemplate.from_messages([
-            SystemMessagePromptTemplate.from_template(
-                """Você é um especialista em extração de dados estruturados de vagas de emprego.
-
-Sua tarefa é extrair o TÍTULO DA VAGA e o NOME DA EMPRESA do conteúdo fornecido.
-
-REGRAS CRÍTICAS:
-1. O título deve ser específico e não genérico (evite "Software Engineer" sem contexto)
-2. O nome da empresa deve ser completo e oficial
-3. Se não conseguir identificar claramente, retorne valores vazios
-4. NUNCA invente informações - se não estiver claro, indique
-
-FORMATO DE SAÍDA (JSON):
-{{
-    "jobTitle": "título exato da vaga",
-    "company": "nome completo da empresa"
-}}"""
-            ),
-            HumanMessagePromptTemplate.from_template(
-                """Extraia o título da vaga e o nome da empresa do seguinte conteúdo:
-
-{content}
+# ============================================================================
+# BLOCOS DO PROMPT DE GERAÇÃO
+# ============================================================================
+# O prompt completo e os prompts por seção compartilham as regras, as
+# instruções de cada seção e o bloco de contexto (CV, vaga e preferências).
 
-Retorne APENAS um JSON válido com as chaves "jobTitle" e "company"."""
-            )
-        ])
-    
-    # ============================================================================
-    # GENERATION PROMPTS
-    # ============================================================================
-    
-    @staticmethod
-    def get_career_materials_generation_prompt() -> ChatPromptTemplate:
-        """
-        Prompt principal para geração de materiais de carreira.
-        Segue princípios de Prompt Engineering:
-        - Instruções claras e hierárquicas
-        - Exemplos de formato esperado
-        - Validações e salvaguardas
-        """
-        return ChatPromptTemplate.from_messages([
-            SystemMessagePromptTemplate.from_template(
-                """Você é um especialista em Engenharia de Carreira e Recrutamento, altamente treinado em Prompt Engineering e sistemas ATS (Applicant Tracking Systems).
+_GENERATION_RULES = """Você é um especialista em Engenharia de Carreira e Recrutamento, altamente treinado em Prompt Engineering e sistemas ATS (Applicant Tracking Systems).
 
 Sua missão é ajudar um usuário a personalizar seus materiais de carreira para uma candidatura específica usando as informações exatas fornecidas.
 
@@ -119,9 +36,9 @@ REGRAS CRÍTICAS (PRIORIDADE MÁXIMA)
 3. PESQUISA E CONTEXTO:
    - Use suas capacidades de pesquisa web para investigar a empresa e o cargo
    - Obtenha informações sobre cultura organizacional, valores e processos
-   - Use este contexto para personalizar os materiais
+   - Use este contexto para personalizar os materiais"""
 
-═══════════════════════════════════════════════════════════════
+_GENERATION_FORMAT = """═══════════════════════════════════════════════════════════════
 INSTRUÇÕES DE FORMATAÇÃO
 ═══════════════════════════════════════════════════════════════
 
@@ -131,9 +48,11 @@ NÃO adicione nenhum outro texto antes do primeiro cabeçalho.
 ### OPTIMIZED CV ###
 ### COVER LETTER ###
 ### NETWORKING MESSAGE ###
-### INTERVIEW TIPS ###
+### INTERVIEW TIPS ###"""
 
-═══════════════════════════════════════════════════════════════
+# Instruções por seção, com as chaves da resposta da API
+GENERATION_SECTION_INSTRUCTIONS: Dict[str, str] = {
+    "optimizedCv": """═══════════════════════════════════════════════════════════════
 DETALHES DO CV OTIMIZADO
 ═══════════════════════════════════════════════════════════════
 
@@ -176,9 +95,8 @@ OTIMIZAÇÕES ATS:
 - Use palavras-chave da descrição da vaga
 - Mantenha formatação simples e compatível com ATS
 - Destaque experiências mais relevantes primeiro
-- Quantifique resultados quando possível
-
-═══════════════════════════════════════════════════════════════
+- Quantifique resultados quando possível""",
+    "coverLetter": """═══════════════════════════════════════════════════════════════
 DETALHES DA CARTA DE APRESENTAÇÃO
 ═══════════════════════════════════════════════════════════════
 
@@ -187,9 +105,8 @@ Escreva uma carta de apresentação convincente, clara e direta para o cargo de
 - Personalize baseado no contexto do usuário, CV e descrição da vaga
 - Dirija-se ao gerente de contratação na {company} se possível
 - Demonstre conhecimento sobre a empresa e o cargo
-- Conecte experiências do usuário com requisitos da vaga
-
-═══════════════════════════════════════════════════════════════
+- Conecte experiências do usuário com requisitos da vaga""",
+    "networkingMessage": """═══════════════════════════════════════════════════════════════
 DETALHES DA MENSAGEM DE NETWORKING
 ═══════════════════════════════════════════════════════════════
 
@@ -198,9 +115,8 @@ Crie uma mensagem concisa e profissional para LinkedIn ou email para um recrutad
 - Seja profissional mas acessível
 - Mencione interesse específico no cargo
 - Destaque uma ou duas qualificações principais
-- Inclua call-to-action claro
-
-═══════════════════════════════════════════════════════════════
+- Inclua call-to-action claro""",
+    "interviewTips": """═══════════════════════════════════════════════════════════════
 DETALHES DAS DICAS DE ENTREVISTA
 ═══════════════════════════════════════════════════════════════
 
@@ -210,10 +126,10 @@ Forneça dicas objetivas e acionáveis de preparação para entrevista específi
 - Use suas habilidades de pesquisa para encontrar informações sobre cultura da empresa e processo de entrevista
 - Sugira como o usuário pode se preparar para falar sobre sua experiência em relação ao cargo e à empresa
 - Inclua perguntas prováveis baseadas nos requisitos
-- Forneça insights sobre a cultura organizacional"""
-            ),
-            HumanMessagePromptTemplate.from_template(
-                """CV Padrão do Usuário:
+- Forneça insights sobre a cultura organizacional""",
+}
+
+_GENERATION_CONTEXT = """CV Padrão do Usuário:
 ---
 {cv}
 ---
@@ -230,9 +146,147 @@ Contexto e Instruções Adicionais do Usuário:
 - Tom Desejado: {tone}
 - Idioma Alvo: {language}
 - Outras Instruções: {customContext}
----
+---"""
+
+_SECTION_OUTPUT_FORMAT = """═══════════════════════════════════════════════════════════════
+FORMATO DA RESPOSTA
+═══════════════════════════════════════════════════════════════
+
+Responda APENAS com o conteúdo desta seção, sem o cabeçalho ### e sem nenhum texto antes ou depois."""
 
-Gere os quatro materiais solicitados seguindo EXATAMENTE o formato especificado."""
+
+class PromptTemplates:
+    """
+    Templates de prompts profissionais seguindo Prompt Engineering best practices:
+    - Clareza e especificidade
+    - Estruturação clara
+    - Exemplos quando necessário
+    - Instruções de formatação explícitas
+    """
+    
+    # ============================================================================
+    # EXTRACTION PROMPTS
+    # ============================================================================
+    
+    @staticmethod
+    def get_job_content_extraction_prompt() -> ChatPromptTemplate:
+        """
+        Prompt para extração de conteúdo de vaga de emprego.
+        Focado em extrair informações estruturadas e validadas.
+        """
+        return ChatPromptTemplate.from_messages([
+            SystemMessagePromptTemplate.from_template(
+                """Você é um especialista em extração de informações de vagas de emprego.
+                
+Sua tarefa é analisar o conteúdo HTML/texto fornecido e extrair APENAS informações relevantes sobre a vaga de emprego.
+
+REGRAS CRÍTICAS:
+1. Extraia APENAS informações relacionadas à vaga de emprego
+2. Ignore navegação, menus, rodapés e outros elementos não relacionados
+3. Mantenha a estrutura original quando possível (listas, parágrafos)
+4. Se o conteúdo não parecer ser uma vaga válida, indique claramente
+
+FORMATO DE SAÍDA:
+Retorne APENAS o texto da descrição da vaga, sem comentários ou metadados adicionais."""
+            ),
+            HumanMessagePromptTemplate.from_template(
+                """Analise o seguinte conteúdo e extraia a descrição da vaga de emprego:
+
+{content}
+
+Extraia APENAS a descrição da vaga, removendo elementos de navegação, menus e outros elementos não relacionados."""
+            )
+        ])
+    
+    @staticmethod
+    def get_job_details_extraction_prompt() -> ChatPromptTemplate:
+        """
+        Prompt para extração de título e empresa da vaga.
+        Usa formatação estruturada (JSON) para garantir precisão.
+        """
+        return ChatPromptTemplate.from_messages([
+            SystemMessagePromptTemplate.from_template(
+                """Você é um especialista em extração de dados estruturados de vagas de emprego.
+
+Sua tarefa é extrair o TÍTULO DA VAGA e o NOME DA EMPRESA do conteúdo fornecido.
+
+REGRAS CRÍTICAS:
+1. O título deve ser específico e não genérico (evite "Software Engineer" sem contexto)
+2. O nome da empresa deve ser completo e oficial
+3. Se não conseguir identificar claramente, retorne valores vazios
+4. NUNCA invente informações - se não estiver claro, indique
+
+FORMATO DE SAÍDA (JSON):
+{{
+    "jobTitle": "título exato da vaga",
+    "company": "nome completo da empresa"
+}}"""
+            ),
+            HumanMessagePromptTemplate.from_template(
+                """Extraia o título da vaga e o nome da empresa do seguinte conteúdo:
+
+{content}
+
+Retorne APENAS um JSON válido com as chaves "jobTitle" e "company"."""
+            )
+        ])
+    
+    # ============================================================================
+    # GENERATION PROMPTS
+    # ============================================================================
+    
+    @staticmethod
+    def get_career_materials_generation_prompt() -> ChatPromptTemplate:
+        """
+        Prompt principal para geração de materiais de carreira.
+        Segue princípios de Prompt Engineering:
+        - Instruções claras e hierárquicas
+        - Exemplos de formato esperado
+        - Validações e salvaguardas
+        """
+        return ChatPromptTemplate.from_messages([
+            SystemMessagePromptTemplate.from_template(
+                "\n\n".join([
+                    _GENERATION_RULES,
+                    _GENERATION_FORMAT,
+                    *GENERATION_SECTION_INSTRUCTIONS.values(),
+                ])
+            ),
+            HumanMessagePromptTemplate.from_template(
+                _GENERATION_CONTEXT
+                + "\n\nGere os quatro materiais solicitados seguindo EXATAMENTE o formato especificado."
+            )
+        ])
+    
+    @staticmethod
+    def get_section_generation_prompt(section: str) -> ChatPromptTemplate:
+        """
+        Prompt para gerar (ou regenerar) uma única seção dos materiais.
+        Usa as mesmas regras e instruções do prompt completo, com o contexto
+        já renderizado na variável context (ver build_generation_context).
+        
+        Args:
+            section: Chave da seção (optimizedCv, coverLetter, networkingMessage, interviewTips)
+            
+        Raises:
+            ValueError: Se a seção não existir
+        """
+        if section not in GENERATION_SECTION_INSTRUCTIONS:
+            raise ValueError(f"Seção desconhecida: {section}")
+        return ChatPromptTemplate.from_messages([
+            SystemMessagePromptTemplate.from_template(
+                "\n\n".join([
+                    _GENERATION_RULES,
+                    GENERATION_SECTION_INSTRUCTIONS[section],
+                    _SECTION_OUTPUT_FORMAT,
+                ])
+            ),
+            HumanMessagePromptTemplate.from_template(
+                """{context}
+
+Observações sobre a versão anterior desta seção: {feedback}
+
+Gere APENAS esta seção seguindo EXATAMENTE o formato especificado."""
             )
         ])
     
@@ -268,6 +322,31 @@ Retorne APENAS um JSON com:
         ])
 
 
+def prompt_fingerprint(prompt: ChatPromptTemplate) -> str:
+    """
+    Hash curto dos templates das mensagens do prompt.
+    
+    Entra nas chaves de cache de resultados do LLM para que qualquer
+    alteração no prompt invalide as entradas geradas com a versão anterior.
+    """
+    templates = [
+        [type(message).__name__, getattr(getattr(message, "prompt", None), "template", "")]
+        for message in prompt.messages
+    ]
+    return hashlib.sha256(json.dumps(templates, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def build_generation_context(prompt_vars: Dict[str, str]) -> str:
+    """
+    Renderiza uma única vez o bloco de contexto (CV, vaga e preferências)
+    compartilhado pelos prompts por seção.
+    
+    Args:
+        prompt_vars: Variáveis de get_prompt_variables
+    """
+    return _GENERATION_CONTEXT.format(**prompt_vars)
+
+
 def get_prompt_variables(
     cv: str,
     job_title: str,
@@ -0,0 +1,170 @@
+"""
+Seções da resposta de geração de materiais, delimitadas por marcadores
+como `### OPTIMIZED CV ###`.
+Inclui o parser completo e um parser incremental para a resposta em streaming.
+"""
+from typing import Any, Dict, List, Optional
+
+# Chave da seção na resposta da API -> marcador na saída do LLM (na ordem do prompt)
+SECTION_MARKERS: Dict[str, str] = {
+    "optimizedCv": "### OPTIMIZED CV ###",
+    "coverLetter": "### COVER LETTER ###",
+    "networkingMessage": "### NETWORKING MESSAGE ###",
+    "interviewTips": "### INTERVIEW TIPS ###",
+}
+
+
+def missing_section_text(key: str) -> str:
+    """Texto usado quando a seção não aparece na resposta."""
+    return f"Erro: Seção {SECTION_MARKERS[key]} não encontrada"
+
+
+def strip_section_marker(key: str, text: str) -> str:
+    """Texto de uma seção gerada isoladamente, sem o marcador que o LLM às vezes repete."""
+    text = text.strip()
+    marker = SECTION_MARKERS[key]
+    if text.startswith(marker):
+        text = text[len(marker):].strip()
+    return text
+
+
+def parse_sections(response_text: str) -> Dict[str, str]:
+    """
+    Parseia a resposta completa do LLM em seções.
+
+    Args:
+        response_text: Texto completo da resposta
+
+    Returns:
+        Dicionário com o texto de cada seção
+    """
+    parsed_content = {}
+    keys = list(SECTION_MARKERS.keys())
+    for i, key in enumerate(keys):
+        start_marker = SECTION_MARKERS[key]
+        end_marker = SECTION_MARKERS[keys[i + 1]] if i + 1 < len(keys) else None
+
+        start_index = response_text.find(start_marker)
+        if start_index == -1:
+            parsed_content[key] = missing_section_text(key)
+            continue
+
+        end_index = (
+            response_text.find(end_marker, start_index)
+            if end_marker
+            else len(response_text)
+        )
+        if end_index == -1:
+            end_index = len(response_text)
+
+        parsed_content[key] = response_text[start_index + len(start_marker):end_index].strip()
+
+    return parsed_content
+
+
+class SectionStreamParser:
+    """
+    Divide em seções uma resposta que chega em pedaços.
+
+    Cada `feed` devolve os eventos que o pedaço tornou possíveis:
+    `section_start` quando o marcador da seção aparece, `section_delta` com o
+    texto novo da seção e `section_end` (com o texto completo) quando começa
+    a seção seguinte ou a resposta termina. O fim do buffer que ainda pode
+    ser o começo de um marcador fica retido até o próximo pedaço, então um
+    marcador partido entre pedaços nunca vaza como texto.
+    """
+
+    def __init__(self):
+        self._keys = list(SECTION_MARKERS.keys())
+        self._buffer = ""
+        self._current: Optional[int] = None  # Índice da seção aberta
+        self._parts: List[str] = []  # Texto da seção aberta
+        self._text: List[str] = []  # Resposta inteira, para o parse final
+        self.sections: Dict[str, str] = {}  # Seções concluídas
+
+    def _pending_markers(self) -> List[int]:
+        start = 0 if self._current is None else self._current + 1
+        return list(range(start, len(self._keys)))
+
+    def _delta(self, text: str, events: List[Dict[str, Any]]):
+        if self._current is None or not text:
+            return
+        if not self._parts:
+            text = text.lstrip()  # Espaço logo após o marcador não é conteúdo
+            if not text:
+                return
+        self._parts.append(text)
+        events.append({"event": "section_delta", "section": self._keys[self._current], "text": text})
+
+    def _close_current(self, events: List[Dict[str, Any]]):
+        if self._current is None:
+            return
+        key = self._keys[self._current]
+        self.sections[key] = "".join(self._parts).strip()
+        events.append({"event": "section_end", "section": key, "text": self.sections[key]})
+        self._parts = []
+
+    def _holdback(self, pending: List[int]) -> int:
+        """Tamanho do sufixo do buffer que pode ser o começo de um marcador."""
+        longest = 0
+        for index in pending:
+            marker = SECTION_MARKERS[self._keys[index]]
+            for size in range(min(len(marker) - 1, len(self._buffer)), longest, -1):
+                if self._buffer.endswith(marker[:size]):
+                    longest = size
+                    break
+        return longest
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Processa mais um pedaço da resposta.
+
+        Args:
+            chunk: Texto recebido do LLM
+
+        Returns:
+            Eventos gerados pelo pedaço
+        """
+        events: List[Dict[str, Any]] = []
+        self._text.append(chunk)
+        self._buffer += chunk
+
+        while True:
+            pending = self._pending_markers()
+            found = None
+            for index in pending:
+                position = self._buffer.find(SECTION_MARKERS[self._keys[index]])
+                if position != -1 and (found is None or position < found[1]):
+                    found = (index, position)
+
+            if found is None:
+                keep = self._holdback(pending)
+                cut = len(self._buffer) - keep
+                self._delta(self._buffer[:cut], events)
+                self._buffer = self._buffer[cut:]
+                return events
+
+            index, position = found
+            self._delta(self._buffer[:position], events)
+            self._close_current(events)
+            self._current = index
+            self._buffer = self._buffer[position + len(SECTION_MARKERS[self._keys[index]]):]
+            events.append({"event": "section_start", "section": self._keys[index]})
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Encerra a resposta: despeja o buffer e fecha a seção aberta."""
+        events: List[Dict[str, Any]] = []
+        self._delta(self._buffer, events)
+        self._buffer = ""
+        self._close_current(events)
+        self._current = len(self._keys)
+        return events
+
+    @property
+    def text(self) -> str:
+        """Resposta recebida até agora."""
+        return "".join(self._text)
+
+    def result(self) -> Dict[str, str]:
+        """Seções da resposta inteira, idênticas às do parse completo."""
+        return parse_sections(self.text)
@@ -2,11 +2,15 @@
 API REST principal usando FastAPI.
 Implementa endpoints para extração e geração de materiais de carreira.
 """
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 import structlog
 from contextlib import asynccontextmanager
+from typing import Optional
+import asyncio
+import hmac
+import json
 import os
 
 import sys
@@ -31,12 +35,21 @@ except Exception as e:
     raise
 
 from agents import ExtractionAgent, GenerationAgent
+from agents.extraction_agent import provided_scraped_data
+from agents.llm_registry import get_llm_registry, shutdown_llm_registry, warm_up_llm_registry
+from services.job_monitor import JobMonitor
+from services.strategy_stats import get_strategy_learner, shutdown_strategy_learner
+from services.worker_pool import get_worker_pool, shutdown_worker_pool
 from api.models import (
     JobExtractionRequest,
     UserInputRequest,
     JobDetailsResponse,
     GenerateMaterialsRequest,
     GeneratedContentResponse,
+    MonitorJobRequest,
+    MonitoredJobResponse,
+    RegenerateSectionRequest,
+    SectionResponse,
     ErrorResponse
 )
 
@@ -54,12 +67,14 @@ logger = structlog.get_logger()
 # Instâncias globais dos agentes (singleton)
 extraction_agent: ExtractionAgent = None
 generation_agent: GenerationAgent = None
+thinking_generation_agent: GenerationAgent = None
+job_monitor: JobMonitor = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Gerencia ciclo de vida da aplicação."""
-    global extraction_agent, generation_agent
+    global extraction_agent, generation_agent, thinking_generation_agent, job_monitor
     
     # Startup
     logger.info("Inicializando aplicação Vaga Certa")
@@ -81,18 +96,37 @@ async def lifespan(app: FastAPI):
         # Não falha para permitir health check, mas agentes não serão inicializados
         extraction_agent = None
         generation_agent = None
+        thinking_generation_agent = None
     else:
         logger.info("Inicializando agentes de IA")
         extraction_agent = ExtractionAgent()
         generation_agent = GenerationAgent()
+        thinking_generation_agent = GenerationAgent(use_thinking_mode=True)
+        warm_up_llm_registry()
         logger.info("Agentes inicializados com sucesso")
+        
+        if settings.job_monitor_enabled:
+            job_monitor = JobMonitor(extraction_agent.web_scraper)
+            job_monitor.add_listener(extraction_agent.handle_job_change)
+            job_monitor.start()
     
     yield
     
     # Shutdown
     logger.info("Encerrando aplicação")
+    if job_monitor:
+        await job_monitor.stop()
+        job_monitor = None
     if extraction_agent and extraction_agent.web_scraper:
         await extraction_agent.web_scraper.close()
+    if extraction_agent and extraction_agent.details_cache:
+        extraction_agent.details_cache.close()
+    for agent in (generation_agent, thinking_generation_agent):
+        if agent and agent.result_cache:
+            agent.result_cache.close()
+    await shutdown_llm_registry()
+    shutdown_worker_pool()
+    shutdown_strategy_learner()
 
 
 # Cria aplicação FastAPI
@@ -222,7 +256,13 @@ async def root():
             "health": "/health",
             "extract_job": "/extract-job-details",
             "generate_materials": "/generate-materials",
-            "generate_complete": "/generate-complete"
+            "generate_materials_stream": "/generate-materials/stream",
+            "regenerate_section": "/generate-materials/section",
+            "generate_complete": "/generate-complete",
+            "metrics": "/metrics",
+            "scraping_strategies": "/admin/scraping-strategies",
+            "proxies": "/admin/proxies",
+            "monitored_jobs": "/monitor/jobs"
         }
     }
 
@@ -258,6 +298,143 @@ async def health_check():
     return response
 
 
+def require_admin(x_admin_key: Optional[str] = Header(default=None)):
+    """Exige a chave de administração (header X-Admin-Key) ou HTTP 401/503."""
+    if not settings.admin_api_key:
+        raise HTTPException(
+            status_code=503,
+            detail="Rotas administrativas desabilitadas (ADMIN_API_KEY não configurada)"
+        )
+    if not x_admin_key or not hmac.compare_digest(x_admin_key, settings.admin_api_key):
+        raise HTTPException(status_code=401, detail="Chave de administração inválida")
+
+
+@app.get("/metrics", dependencies=[Depends(require_admin)])
+async def metrics():
+    """
+    Métricas internas de desempenho (caches, pool HTTP do scraping, clientes LLM e worker pool).
+    
+    Retorna contadores acumulados desde o início do processo. Exige a chave
+    de administração: os mapas por host revelam os sites consultados.
+    """
+    scraper = extraction_agent.web_scraper if extraction_agent else None
+    return {
+        "scrape_cache": scraper.get_cache_stats() if scraper else {"enabled": False},
+        "scraper_pool": scraper.get_pool_stats() if scraper else None,
+        "near_duplicates": (
+            scraper.near_duplicates.get_stats() if scraper and scraper.near_duplicates else None
+        ),
+        "circuit_breakers": scraper.breakers.get_stats() if scraper and scraper.breakers else {},
+        "details_cache": (
+            extraction_agent.details_cache.get_stats()
+            if extraction_agent and extraction_agent.details_cache
+            else {"enabled": False}
+        ),
+        "generation_cache": {
+            label: agent.result_cache.get_stats() if agent and agent.result_cache else {"enabled": False}
+            for label, agent in (("default", generation_agent), ("thinking", thinking_generation_agent))
+        },
+        "negative_cache": (
+            extraction_agent.negative_cache.get_stats()
+            if extraction_agent and extraction_agent.negative_cache
+            else None
+        ),
+        "job_monitor": await asyncio.to_thread(job_monitor.get_stats) if job_monitor else None,
+        "llm_clients": get_llm_registry().get_stats(),
+        "worker_pool": get_worker_pool().get_stats()
+    }
+
+
+@app.get("/admin/scraping-strategies", dependencies=[Depends(require_admin)])
+async def scraping_strategies():
+    """
+    Tabela aprendida de estratégias de extração por domínio.
+    
+    Para cada domínio, mostra tentativas, taxa de sucesso e latência (médias
+    móveis) das estratégias de fetch (direct, proxy) e de extração do
+    conteúdo (scraping, llm_content).
+    """
+    learner = get_strategy_learner()
+    return {
+        "enabled": settings.strategy_learning_enabled,
+        "min_samples": learner.min_samples,
+        "skip_success_rate": learner.skip_below,
+        "retry_after_seconds": learner.retry_after_seconds,
+        "domains": learner.snapshot()
+    }
+
+
+@app.get("/admin/proxies", dependencies=[Depends(require_admin)])
+async def proxy_health():
+    """
+    Saúde do pool de proxies CORS usados como fallback do scraping.
+    
+    Lista os proxies na ordem em que seriam tentados, com taxa de sucesso e
+    latência (médias móveis), score e afastamentos por falhas seguidas.
+    """
+    scraper = extraction_agent.web_scraper if extraction_agent else None
+    if not scraper:
+        return {"enabled": False, "proxies": []}
+    pool = scraper.proxy_pool
+    return {
+        "enabled": True,
+        "eject_after_failures": pool.eject_after_failures,
+        "eject_seconds": pool.eject_seconds,
+        "proxies": pool.snapshot()
+    }
+
+
+def _require_job_monitor() -> JobMonitor:
+    """Monitor de vagas ativo ou HTTP 503."""
+    if job_monitor is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Monitor de vagas indisponível (desabilitado ou GOOGLE_API_KEY ausente)"
+        )
+    return job_monitor
+
+
+@app.post("/monitor/jobs", response_model=MonitoredJobResponse, dependencies=[Depends(require_admin)])
+async def watch_job(request: MonitorJobRequest):
+    """
+    Passa a acompanhar uma vaga salva.
+    
+    A vaga é re-verificada periodicamente (GET condicional) e marcada como
+    alterada (`changed`) ou encerrada (`closed`). Acompanhar de novo uma vaga
+    já acompanhada reinicia a base de comparação com o conteúdo atual.
+    """
+    monitor = _require_job_monitor()
+    return MonitoredJobResponse(**(await monitor.watch(request.job_url)).to_dict())
+
+
+@app.get("/monitor/jobs", dependencies=[Depends(require_admin)])
+async def list_monitored_jobs(status: str = None):
+    """Lista as vagas acompanhadas (filtro opcional por estado)."""
+    monitor = _require_job_monitor()
+    return {
+        "jobs": [
+            MonitoredJobResponse(**job.to_dict())
+            for job in await monitor.list_jobs(status)
+        ]
+    }
+
+
+@app.post("/monitor/jobs/check", response_model=MonitoredJobResponse, dependencies=[Depends(require_admin)])
+async def check_monitored_job(request: MonitorJobRequest):
+    """Verifica agora uma vaga acompanhada, sem esperar o próximo intervalo."""
+    monitor = _require_job_monitor()
+    return MonitoredJobResponse(**(await monitor.check(request.job_url)).to_dict())
+
+
+@app.delete("/monitor/jobs", dependencies=[Depends(require_admin)])
+async def unwatch_job(job_url: str):
+    """Deixa de acompanhar uma vaga."""
+    monitor = _require_job_monitor()
+    if not await monitor.unwatch(job_url):
+        raise HTTPException(status_code=404, detail=f"Vaga não acompanhada: {job_url}")
+    return {"removed": True}
+
+
 @app.get("/debug")
 async def debug_info(request: Request):
     """
@@ -301,7 +478,8 @@ async def extract_job_details(request: JobExtractionRequest):
     BUG FIX: Agora usa JobExtractionRequest que não requer CV, resolvendo HTTP 422.
     
     Args:
-        request: Requisição com URL da vaga (apenas job_url necessário)
+        request: Requisição com URL da vaga (apenas job_url necessário; job_html
+            ou job_text opcionais dispensam o fetch da URL)
         
     Returns:
         Detalhes da vaga extraídos e validados
@@ -330,13 +508,16 @@ async def extract_job_details(request: JobExtractionRequest):
         
         # Extrai conteúdo da vaga
         content_result = await extraction_agent.extract_job_content_from_url(
-            request.job_url
+            request.job_url,
+            job_html=request.job_html,
+            job_text=request.job_text
         )
         
-        # Extrai título e empresa
+        # Extrai título e empresa (conteúdo enviado pelo cliente não é buscado de novo)
         details_result = await extraction_agent.extract_job_title_and_company(
             content_result["content"],
-            request.job_url
+            request.job_url,
+            scraped_data=provided_scraped_data(content_result)
         )
         
         # BUG FIX: Os agentes retornam snake_case, não camelCase
@@ -366,20 +547,8 @@ async def extract_job_details(request: JobExtractionRequest):
         )
 
 
-@app.post("/generate-materials", response_model=GeneratedContentResponse)
-async def generate_materials(request: GenerateMaterialsRequest):
-    """
-    Gera materiais de carreira personalizados.
-    
-    Args:
-        request: Requisição com dados para geração
-        
-    Returns:
-        Materiais gerados (CV otimizado, carta, networking, dicas)
-        
-    Raises:
-        HTTPException: Se geração falhar
-    """
+def _require_generation_agent(use_thinking_mode: bool) -> GenerationAgent:
+    """Agente de geração compartilhado para o modo pedido ou HTTP 503."""
     # Verifica se a aplicação está configurada
     if not settings.is_configured() or generation_agent is None:
         logger.error("Tentativa de usar API sem GOOGLE_API_KEY configurada")
@@ -395,6 +564,50 @@ async def generate_materials(request: GenerateMaterialsRequest):
                 ]
             }
         )
+    return thinking_generation_agent if use_thinking_mode else generation_agent
+
+
+def _sse(event: str, data: dict) -> str:
+    """Formata um evento Server-Sent Events com payload JSON."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _materials_response(result: dict) -> GeneratedContentResponse:
+    """Converte o resultado do GenerationAgent no corpo de /generate-materials."""
+    compatibility = result.get("compatibility") or {
+        "score": 0,
+        "label": "Compatibilidade indisponível",
+        "strengths": [],
+        "gaps": [],
+        "coverage_ratio": 0.0,
+    }
+    
+    return GeneratedContentResponse(
+        optimized_cv=result["optimizedCv"],
+        cover_letter=result["coverLetter"],
+        networking_message=result["networkingMessage"],
+        interview_tips=result["interviewTips"],
+        sources=result.get("sources", []),
+        compatibility=compatibility,
+        metadata=result.get("metadata", {})
+    )
+
+
+@app.post("/generate-materials", response_model=GeneratedContentResponse)
+async def generate_materials(request: GenerateMaterialsRequest):
+    """
+    Gera materiais de carreira personalizados.
+    
+    Args:
+        request: Requisição com dados para geração
+        
+    Returns:
+        Materiais gerados (CV otimizado, carta, networking, dicas)
+        
+    Raises:
+        HTTPException: Se geração falhar
+    """
+    agent = _require_generation_agent(request.use_thinking_mode)
     
     try:
         logger.info(
@@ -404,9 +617,6 @@ async def generate_materials(request: GenerateMaterialsRequest):
             use_thinking_mode=request.use_thinking_mode
         )
         
-        # Cria agente de geração com configuração apropriada
-        agent = GenerationAgent(use_thinking_mode=request.use_thinking_mode)
-        
         result = await agent.generate_career_materials(
             cv=request.cv,
             job_title=request.job_title,
@@ -414,26 +624,12 @@ async def generate_materials(request: GenerateMaterialsRequest):
             job_description=request.job_description,
             tone=request.tone,
             language=request.language,
-            custom_context=request.custom_context
+            custom_context=request.custom_context,
+            parallel_sections=request.parallel_sections,
+            force_regenerate=request.force_regenerate
         )
 
-        compatibility = result.get("compatibility") or {
-            "score": 0,
-            "label": "Compatibilidade indisponível",
-            "strengths": [],
-            "gaps": [],
-            "coverage_ratio": 0.0,
-        }
-        
-        return GeneratedContentResponse(
-            optimized_cv=result["optimizedCv"],
-            cover_letter=result["coverLetter"],
-            networking_message=result["networkingMessage"],
-            interview_tips=result["interviewTips"],
-            sources=result.get("sources", []),
-            compatibility=compatibility,
-            metadata=result.get("metadata", {})
-        )
+        return _materials_response(result)
         
     except ValueError as e:
         logger.warning("Erro na geração", error=str(e))
@@ -446,6 +642,109 @@ async def generate_materials(request: GenerateMaterialsRequest):
         )
 
 
+@app.post("/generate-materials/stream")
+async def generate_materials_stream(request: GenerateMaterialsRequest):
+    """
+    Gera materiais de carreira em streaming (Server-Sent Events).
+    
+    Eventos: `compatibility`; `section_start`, `section_delta` e
+    `section_end` para cada seção (optimizedCv, coverLetter,
+    networkingMessage, interviewTips) conforme o LLM a escreve; `done` com
+    o mesmo corpo de /generate-materials; `error` se a geração falhar
+    depois de iniciado o stream.
+    
+    Raises:
+        HTTPException: Se a entrada for inválida (400) ou o serviço não estiver configurado (503)
+    """
+    agent = _require_generation_agent(request.use_thinking_mode)
+    
+    logger.info(
+        "Gerando materiais (streaming)",
+        job_title=request.job_title,
+        company=request.company,
+        use_thinking_mode=request.use_thinking_mode
+    )
+    events = agent.stream_career_materials(
+        cv=request.cv,
+        job_title=request.job_title,
+        company=request.company,
+        job_description=request.job_description,
+        tone=request.tone,
+        language=request.language,
+        custom_context=request.custom_context,
+        force_regenerate=request.force_regenerate
+    )
+    
+    # A validação roda até o primeiro evento: erro de entrada ainda vira HTTP 400
+    try:
+        first_event = await events.__anext__()
+    except ValueError as e:
+        logger.warning("Erro na geração", error=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    def to_sse(event: dict) -> str:
+        event = dict(event)
+        name = event.pop("event")
+        if name == "done":
+            event = _materials_response(event).model_dump()
+        return _sse(name, event)
+    
+    async def event_stream():
+        yield to_sse(first_event)
+        try:
+            async for event in events:
+                yield to_sse(event)
+        except Exception as e:
+            logger.error("Erro na geração em streaming", error=str(e))
+            yield _sse("error", {"detail": str(e)})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Sem cache nem buffering de proxy para cada evento chegar assim que é gerado
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/generate-materials/section", response_model=SectionResponse)
+async def regenerate_section(request: RegenerateSectionRequest):
+    """
+    Regenera uma única seção dos materiais (ex.: só a carta de apresentação).
+    
+    Usa o prompt específico da seção com o mesmo contexto da geração
+    completa; `feedback` orienta o que mudar em relação à versão anterior.
+    
+    Raises:
+        HTTPException: Se a entrada for inválida (400), o serviço não estiver configurado (503)
+            ou a geração falhar (500)
+    """
+    agent = _require_generation_agent(request.use_thinking_mode)
+    
+    try:
+        result = await agent.regenerate_section(
+            section=request.section,
+            cv=request.cv,
+            job_title=request.job_title,
+            company=request.company,
+            job_description=request.job_description,
+            tone=request.tone,
+            language=request.language,
+            custom_context=request.custom_context,
+            feedback=request.feedback
+        )
+        return SectionResponse(**result)
+        
+    except ValueError as e:
+        logger.warning("Erro na regeneração da seção", section=request.section, error=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Erro inesperado na regeneração da seção", section=request.section, error=str(e))
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao regenerar seção: {str(e)}"
+        )
+
+
 @app.post("/generate-complete")
 async def generate_complete(request: UserInputRequest):
     """
@@ -463,12 +762,15 @@ async def generate_complete(request: UserInputRequest):
         
         # Passo 1: Extrair detalhes da vaga
         content_result = await extraction_agent.extract_job_content_from_url(
-            request.job_url
+            request.job_url,
+            job_html=request.job_html,
+            job_text=request.job_text
         )
         
         details_result = await extraction_agent.extract_job_title_and_company(
             content_result["content"],
-            request.job_url
+            request.job_url,
+            scraped_data=provided_scraped_data(content_result)
         )
         job_title = details_result.get("job_title") or details_result.get("jobTitle")
         company = details_result.get("company")
@@ -477,15 +779,15 @@ async def generate_complete(request: UserInputRequest):
             raise ValueError("Falha ao extrair título ou empresa da vaga")
         
         # Passo 2: Gerar materiais
-        agent = GenerationAgent()
-        materials_result = await agent.generate_career_materials(
+        materials_result = await generation_agent.generate_career_materials(
             cv=request.cv,
             job_title=job_title,
             company=company,
             job_description=content_result["content"],
             tone=request.tone,
             language=request.language,
-            custom_context=request.custom_context
+            custom_context=request.custom_context,
+            force_regenerate=request.force_regenerate
         )
 
         compatibility = materials_result.get("compatibility") or {
@@ -1,9 +1,12 @@
 """
 Modelos Pydantic para validação de requisições e respostas da API.
 """
-from typing import Optional, List
+from typing import Literal, Optional, List
 from pydantic import BaseModel, Field
 
+# Texto colado pelo usuário vai direto para o prompt do LLM
+MAX_JOB_TEXT_CHARS = 100_000
+
 
 class GroundingSource(BaseModel):
     """Fonte de informação usada na geração."""
@@ -24,15 +27,53 @@ class CompatibilityInsightsResponse(BaseModel):
 class JobExtractionRequest(BaseModel):
     """Requisição para extrair detalhes de uma vaga (não requer CV)."""
     job_url: str = Field(..., description="URL da vaga de emprego")
+    job_html: Optional[str] = Field(
+        default=None,
+        description="HTML da página da vaga já obtido pelo cliente (evita o fetch da URL)"
+    )
+    job_text: Optional[str] = Field(
+        default=None,
+        max_length=MAX_JOB_TEXT_CHARS,
+        description="Texto da vaga colado pelo usuário (evita o fetch da URL)"
+    )
 
 
 class UserInputRequest(BaseModel):
     """Requisição de entrada do usuário (inclui CV para geração completa)."""
     cv: str = Field(..., min_length=50, description="Currículo do usuário")
     job_url: str = Field(..., description="URL da vaga de emprego")
+    job_html: Optional[str] = Field(
+        default=None,
+        description="HTML da página da vaga já obtido pelo cliente (evita o fetch da URL)"
+    )
+    job_text: Optional[str] = Field(
+        default=None,
+        max_length=MAX_JOB_TEXT_CHARS,
+        description="Texto da vaga colado pelo usuário (evita o fetch da URL)"
+    )
     tone: str = Field(default="Profissional mas entusiasmado", description="Tom desejado")
     language: str = Field(default="Português Brasileiro", description="Idioma alvo")
     custom_context: str = Field(default="", description="Contexto adicional do usuário")
+    force_regenerate: bool = Field(default=False, description="Ignorar materiais em cache e gerar de novo")
+
+
+class MonitorJobRequest(BaseModel):
+    """Requisição para acompanhar (ou verificar) uma vaga salva."""
+    job_url: str = Field(..., description="URL da vaga de emprego")
+
+
+class MonitoredJobResponse(BaseModel):
+    """Estado de uma vaga acompanhada pelo monitor."""
+    url: str
+    status: str = Field(..., description="active | changed | closed")
+    added_at: float
+    last_checked_at: float
+    last_changed_at: float
+    checks: int
+    changes: int
+    last_change_distance: int = Field(..., description="Bits diferentes no SimHash do texto (0-64)")
+    closed_signals: int = Field(..., description="Sinais seguidos de vaga encerrada ainda não confirmados")
+    last_error: str
 
 
 class JobDetailsResponse(BaseModel):
@@ -66,6 +107,24 @@ class GenerateMaterialsRequest(BaseModel):
     language: str = Field(default="Português Brasileiro")
     custom_context: str = Field(default="")
     use_thinking_mode: bool = Field(default=False, description="Usar modo de raciocínio (mais lento, mais preciso)")
+    parallel_sections: Optional[bool] = Field(
+        default=None,
+        description="Gerar cada seção em uma chamada paralela ao LLM (padrão do servidor se ausente)"
+    )
+    force_regenerate: bool = Field(default=False, description="Ignorar materiais em cache e gerar de novo")
+
+
+class RegenerateSectionRequest(GenerateMaterialsRequest):
+    """Requisição para regenerar uma única seção dos materiais."""
+    section: Literal["optimizedCv", "coverLetter", "networkingMessage", "interviewTips"]
+    feedback: str = Field(default="", description="O que mudar em relação à versão anterior")
+
+
+class SectionResponse(BaseModel):
+    """Seção regenerada."""
+    section: str
+    content: str
+    metadata: dict
 
 
 class ErrorResponse(BaseModel):
@@ -0,0 +1,4 @@
+"""
+Benchmarks de desempenho do backend (scraping, parsing e afins).
+Executar a partir de backend/: python -m benchmarks.<nome>
+"""
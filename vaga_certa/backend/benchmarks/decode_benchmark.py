@@ -0,0 +1,112 @@
+"""
+Benchmark da decodificação: parse a partir de str (response.text) vs bytes.
+
+Gera páginas sintéticas de vários MB (sem JSON-LD, forçando o parse completo)
+e compara, por backend, o caminho antigo (decodificar o corpo em str e
+parsear) com o atual (bytes + charset declarado direto ao parser). Reporta
+tempo médio e pico de memória alocada pelo Python (tracemalloc); a árvore do
+libxml2 fica fora da medição nos dois caminhos.
+
+Uso (a partir de backend/):
+    python -m benchmarks.decode_benchmark
+    python -m benchmarks.decode_benchmark --sizes 1 4 8 --repeat 5 --encoding cp1252
+"""
+from pathlib import Path
+from statistics import mean
+from typing import Callable, List, Tuple
+import argparse
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.html_parsers import PARSER_BACKENDS, parse_job_page
+
+PARAGRAPH = (
+    "<p>Responsabilidades: desenvolver e manter serviços de alta disponibilidade, "
+    "revisar código, participar das decisões de arquitetura e acompanhar métricas "
+    "de produção junto ao time de operações.</p>\n"
+)
+
+
+def synthetic_page(size_mb: float) -> str:
+    """Página de vaga com ~size_mb MB de descrição e listas de vagas relacionadas."""
+    target = int(size_mb * 1024 * 1024)
+    block = (
+        '<div class="job-description">' + PARAGRAPH * 20 + "</div>\n"
+        '<ul class="related-jobs">' + '<li><a href="/vagas/1">Vaga semelhante</a></li>' * 10 + "</ul>\n"
+    )
+    repeats = max(1, target // len(block.encode("utf-8")))
+    return (
+        "<html><head><title>Engenheiro de Software Sênior | Acme</title></head><body>"
+        "<h1>Engenheiro de Software Sênior</h1>"
+        '<div data-company-name="Acme">Acme</div>'
+        + block * repeats
+        + "</body></html>"
+    )
+
+
+def measure(func: Callable[[], object], repeat: int) -> Tuple[float, int]:
+    """Tempo médio (ms) e pico de memória Python (bytes) de uma função de parse."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return mean(timings), peak
+
+
+def run(sizes: List[float], repeat: int, encoding: str) -> List[dict]:
+    """Executa o benchmark para cada tamanho de página e backend."""
+    rows = []
+    for size_mb in sizes:
+        body = synthetic_page(size_mb).encode(encoding)
+        for backend_name in PARSER_BACKENDS:
+            str_ms, str_peak = measure(
+                lambda: parse_job_page(body.decode(encoding), backend_name), repeat
+            )
+            bytes_ms, bytes_peak = measure(
+                lambda: parse_job_page(body, backend_name, encoding=encoding), repeat
+            )
+            rows.append({
+                "size_mb": len(body) / (1024 * 1024),
+                "backend": backend_name,
+                "str_ms": str_ms,
+                "bytes_ms": bytes_ms,
+                "str_peak_mb": str_peak / (1024 * 1024),
+                "bytes_peak_mb": bytes_peak / (1024 * 1024),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1.0, 4.0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--encoding", default="utf-8")
+    args = parser.parse_args()
+
+    rows = run(args.sizes, args.repeat, args.encoding)
+
+    header = (
+        f"{'MB':>6}  {'backend':<14}{'str ms':>10}{'bytes ms':>10}"
+        f"{'str pico MB':>13}{'bytes pico MB':>15}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['size_mb']:>6.1f}  {row['backend']:<14}{row['str_ms']:>10.1f}{row['bytes_ms']:>10.1f}"
+            f"{row['str_peak_mb']:>13.1f}{row['bytes_peak_mb']:>15.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark da extração de conteúdo principal: tokens do texto completo por página.
+
+Compara o fullText do parse completo (página inteira menos script/style/nav)
+com o fullText reduzido ao conteúdo principal, sobre um corpus de páginas
+salvas. Tokens estimados em ~4 caracteres por token (ordem de grandeza do
+tokenizador do Gemini para texto em português).
+
+Uso (a partir de backend/):
+    python -m benchmarks.main_content_benchmark
+    python -m benchmarks.main_content_benchmark --pages ../tests/fixtures/pages --backend lxml
+"""
+from pathlib import Path
+from statistics import mean
+from typing import List
+import argparse
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+from services.html_parsers import get_parser_backend
+
+DEFAULT_PAGES_DIR = Path(__file__).parent.parent.parent / "tests" / "fixtures" / "pages"
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimativa de tokens do texto (~4 caracteres por token)."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def run(pages_dir: Path, parser_backend: str, repeat: int) -> List[dict]:
+    """Executa o benchmark sobre todas as páginas .html do diretório."""
+    backend = get_parser_backend(parser_backend)
+    rows = []
+
+    for page in sorted(pages_dir.glob("*.html")):
+        html = page.read_text(encoding="utf-8")
+        full_text = backend.parse(html)["fullText"]
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            main_text = backend.parse(html, main_content=True)["fullText"]
+        main_ms = (time.perf_counter() - start) * 1000 / repeat
+
+        full_tokens = estimate_tokens(full_text)
+        main_tokens = estimate_tokens(main_text)
+        rows.append({
+            "page": page.name,
+            "full_tokens": full_tokens,
+            "main_tokens": main_tokens,
+            "reduction": 1 - main_tokens / full_tokens if full_tokens else 0.0,
+            "main_ms": main_ms,
+        })
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=Path, default=DEFAULT_PAGES_DIR)
+    parser.add_argument("--backend", default=settings.scraping_parser_backend)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    rows = run(args.pages, args.backend, args.repeat)
+    if not rows:
+        print(f"Nenhuma página .html encontrada em {args.pages}")
+        return
+
+    header = f"{'página':<24}{'tokens página':>15}{'tokens principal':>18}{'redução':>10}{'parse ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['page']:<24}{row['full_tokens']:>15}{row['main_tokens']:>18}"
+            f"{row['reduction']:>10.1%}{row['main_ms']:>10.3f}"
+        )
+
+    total_full = sum(row["full_tokens"] for row in rows)
+    total_main = sum(row["main_tokens"] for row in rows)
+    print(
+        f"\nRedução média por página: {mean(row['reduction'] for row in rows):.1%} "
+        f"(total {total_full} -> {total_main} tokens estimados)"
+    )
+
+
+if __name__ == "__main__":
+    main()
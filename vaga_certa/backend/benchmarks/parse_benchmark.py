@@ -0,0 +1,113 @@
+"""
+Benchmark do parse de páginas de vagas: caminho rápido JSON-LD vs parse completo.
+
+Mede tempo médio por página e pico de memória (tracemalloc) sobre um
+corpus de páginas salvas.
+
+Uso (a partir de backend/):
+    python -m benchmarks.parse_benchmark
+    python -m benchmarks.parse_benchmark --pages ../tests/fixtures/pages --repeat 50
+    python -m benchmarks.parse_benchmark --backend lxml
+"""
+from pathlib import Path
+from statistics import mean
+from typing import Callable, List, Tuple
+import argparse
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import settings
+from services.html_parsers import get_parser_backend
+from services.jsonld import extract_job_posting_fast
+from services.web_scraper import WebScraper
+
+DEFAULT_PAGES_DIR = Path(__file__).parent.parent.parent / "tests" / "fixtures" / "pages"
+
+
+def measure(func: Callable[[str], object], html: str, repeat: int) -> Tuple[float, int]:
+    """
+    Mede tempo médio (ms) e pico de memória (bytes) de uma função de parse.
+
+    Args:
+        func: Função que recebe o HTML
+        html: HTML da página
+        repeat: Número de repetições para o tempo médio
+
+    Returns:
+        Tupla (tempo médio em ms, pico de memória em bytes)
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(html)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    func(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return mean(timings), peak
+
+
+def run(pages_dir: Path, repeat: int, parser_backend: str) -> List[dict]:
+    """Executa o benchmark sobre todas as páginas .html do diretório."""
+    scraper = WebScraper.__new__(WebScraper)  # Sem cliente HTTP/cache: só parse
+    scraper.parser_backend = get_parser_backend(parser_backend)
+    rows = []
+
+    for page in sorted(pages_dir.glob("*.html")):
+        html = page.read_text(encoding="utf-8")
+        fast_hit = extract_job_posting_fast(html) is not None
+        full_ms, full_peak = measure(scraper._parse_html_full, html, repeat)
+        pipeline_ms, pipeline_peak = measure(scraper._parse_html, html, repeat)
+        rows.append({
+            "page": page.name,
+            "size_kb": len(html.encode("utf-8")) / 1024,
+            "fast_path": fast_hit,
+            "full_ms": full_ms,
+            "pipeline_ms": pipeline_ms,
+            "full_peak_kb": full_peak / 1024,
+            "pipeline_peak_kb": pipeline_peak / 1024,
+        })
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=Path, default=DEFAULT_PAGES_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--backend", default=settings.scraping_parser_backend)
+    args = parser.parse_args()
+
+    rows = run(args.pages, args.repeat, args.backend)
+    if not rows:
+        print(f"Nenhuma página .html encontrada em {args.pages}")
+        return
+
+    header = (
+        f"{'página':<24}{'KB':>8}{'JSON-LD':>9}"
+        f"{'completo ms':>13}{'pipeline ms':>13}{'completo KB':>13}{'pipeline KB':>13}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(
+            f"{row['page']:<24}{row['size_kb']:>8.1f}{'sim' if row['fast_path'] else 'não':>9}"
+            f"{row['full_ms']:>13.3f}{row['pipeline_ms']:>13.3f}"
+            f"{row['full_peak_kb']:>13.1f}{row['pipeline_peak_kb']:>13.1f}"
+        )
+
+    fast_rows = [row for row in rows if row["fast_path"]]
+    if fast_rows:
+        speedup = mean(row["full_ms"] / row["pipeline_ms"] for row in fast_rows)
+        print(f"\nPáginas com JSON-LD completo: {len(fast_rows)}/{len(rows)} "
+              f"(speedup médio {speedup:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Grava um corpus HTTP (.json.gz) para reproduzir o scraping sem rede.
+
+URLs passadas na linha de comando são buscadas pelo WebScraper real (com
+todas as estratégias: fetch direto, proxies, redirects), gravando cada
+resposta. Páginas já salvas em disco podem ser importadas com --page.
+
+Uso (a partir de backend/):
+    python -m benchmarks.record_corpus --corpus corpus.json.gz https://boards.greenhouse.io/acme/jobs/42
+    python -m benchmarks.record_corpus --corpus ../tests/fixtures/corpus/job_pages.json.gz \\
+        --page ../tests/fixtures/pages/gupy_job.html=https://varejobrasil.gupy.io/jobs/55
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.http_corpus import HttpCorpus, RecordingTransport
+from services.strategy_stats import StrategyLearner
+from services.web_scraper import WebScraper
+
+
+async def record_urls(corpus: HttpCorpus, urls: list):
+    """Busca as URLs com o WebScraper real, gravando as respostas no corpus."""
+    scraper = WebScraper(
+        transport=RecordingTransport(corpus),
+        strategy_learner=StrategyLearner(path=None)
+    )
+    scraper.cache = None
+    try:
+        for url in urls:
+            try:
+                result = await scraper.scrape_job_posting(url)
+                print(f"ok    {url} ({len(result.get('fullText', ''))} caracteres)")
+            except Exception as e:
+                print(f"falha {url}: {str(e).splitlines()[0]}")
+    finally:
+        await scraper.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("urls", nargs="*", help="URLs de vagas a buscar e gravar")
+    parser.add_argument("--corpus", type=Path, required=True, help="Arquivo .json.gz do corpus")
+    parser.add_argument(
+        "--page", action="append", default=[], metavar="ARQUIVO=URL",
+        help="Importa uma página HTML salva como resposta da URL (repetível)"
+    )
+    args = parser.parse_args()
+
+    corpus = HttpCorpus(str(args.corpus))
+    for item in args.page:
+        file_name, separator, url = item.partition("=")
+        if not separator or not url:
+            parser.error(f"--page espera ARQUIVO=URL: {item}")
+        corpus.add_page(url, Path(file_name).read_text(encoding="utf-8"))
+
+    if args.urls:
+        asyncio.run(record_urls(corpus, args.urls))
+
+    corpus.save()
+    print(f"\n{len(corpus)} respostas em {args.corpus}")
+
+
+if __name__ == "__main__":
+    main()
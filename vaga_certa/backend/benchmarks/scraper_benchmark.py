@@ -0,0 +1,226 @@
+"""
+Benchmark de throughput do WebScraper sobre um corpus HTTP gravado (sem rede).
+
+Reporta páginas/s, latência p50/p95 de `_parse_html` e pico de RSS do
+processo, além de um digest da extração de cada página. Com --compare, falha
+(código de saída 1) se a latência p95 piorar além de --max-slowdown ou se a
+extração de alguma página mudar, para detectar regressões de parsers e
+heurísticas em CI.
+
+Uso (a partir de backend/):
+    python -m benchmarks.scraper_benchmark
+    python -m benchmarks.scraper_benchmark --corpus corpus.json.gz --repeat 50 --scrape
+    python -m benchmarks.scraper_benchmark --json atual.json --compare base.json
+"""
+from pathlib import Path
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+import structlog
+
+from config import settings
+from services.html_parsers import get_parser_backend
+from services.http_corpus import HttpCorpus, ReplayTransport
+from services.strategy_stats import StrategyLearner
+from services.web_scraper import WebScraper
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_CORPUS = (
+    Path(__file__).parent.parent.parent / "tests" / "fixtures" / "corpus" / "job_pages.json.gz"
+)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentil por posição mais próxima (valores não precisam estar ordenados)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Pico de memória residente do processo em MB (None se indisponível)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa KB; macOS informa bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def extraction_digest(result: Dict[str, str]) -> str:
+    """Digest curto dos campos extraídos (muda quando a extração muda)."""
+    payload = json.dumps(result, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()[:12]
+
+
+def html_pages(corpus: HttpCorpus) -> List[Dict]:
+    """Respostas 200 com HTML do corpus: corpo em bytes e charset declarado, como no fetch."""
+    pages = []
+    for recorded in corpus:
+        if recorded.method != "GET" or recorded.status_code != 200:
+            continue
+        if "html" not in recorded.content_type.lower():
+            continue
+        response = httpx.Response(200, headers=recorded.headers, content=recorded.body)
+        pages.append({
+            "url": recorded.url,
+            "html": recorded.body,
+            "encoding": response.charset_encoding,
+        })
+    return sorted(pages, key=lambda page: page["url"])
+
+
+def run_parse(pages: List[Dict], repeat: int, parser_backend: str) -> Dict:
+    """Mede `_parse_html` em todas as páginas, `repeat` passadas sobre o corpus."""
+    scraper = WebScraper.__new__(WebScraper)  # Sem cliente HTTP/cache: só parse
+    scraper.parser_backend = get_parser_backend(parser_backend)
+    scraper.main_content = settings.scraping_main_content_enabled
+
+    digests = {
+        page["url"]: extraction_digest(
+            scraper._parse_html(page["html"], page["url"], page["encoding"])
+        )
+        for page in pages
+    }
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            start = time.perf_counter()
+            scraper._parse_html(page["html"], page["url"], page["encoding"])
+            latencies.append((time.perf_counter() - start) * 1000)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "pages": len(pages),
+        "parses": len(latencies),
+        "pages_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "digests": digests,
+    }
+
+
+async def run_scrape(corpus: HttpCorpus, urls: List[str], repeat: int) -> Dict:
+    """Mede o scrape_job_posting completo (fetch + parse) servido pelo corpus."""
+    transport = ReplayTransport(corpus)
+    scraper = WebScraper(transport=transport, strategy_learner=StrategyLearner(path=None))
+    scraper.cache = None
+    scraper.memo_ttl_seconds = 0
+    scraper.rate_limiter = None  # Replay local: a fila do host só mediria o limite configurado
+
+    latencies = []
+    failures = 0
+    started = time.perf_counter()
+    try:
+        for _ in range(repeat):
+            for url in urls:
+                start = time.perf_counter()
+                try:
+                    await scraper.scrape_job_posting(url)
+                except ValueError:
+                    failures += 1
+                latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        await scraper.close()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "failures": failures,
+        "pages_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "corpus_misses": transport.misses,
+    }
+
+
+def compare(current: Dict, baseline: Dict, max_slowdown: float) -> List[str]:
+    """Lista as regressões do resultado atual em relação à linha de base."""
+    problems = []
+    base_p95 = baseline["parse"]["p95_ms"]
+    if base_p95 and current["parse"]["p95_ms"] > base_p95 * max_slowdown:
+        problems.append(
+            f"p95 de parse {current['parse']['p95_ms']:.3f} ms > "
+            f"{max_slowdown:.2f}x a base ({base_p95:.3f} ms)"
+        )
+
+    base_digests = baseline["parse"].get("digests", {})
+    for url, digest in sorted(current["parse"]["digests"].items()):
+        if url in base_digests and base_digests[url] != digest:
+            problems.append(f"extração mudou: {url}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--backend", default=settings.scraping_parser_backend)
+    parser.add_argument("--scrape", action="store_true", help="Mede também o scrape completo via replay")
+    parser.add_argument("--json", type=Path, help="Grava o resultado em JSON")
+    parser.add_argument("--compare", type=Path, help="Resultado JSON de referência")
+    parser.add_argument("--max-slowdown", type=float, default=1.5)
+    args = parser.parse_args()
+    # Logs por requisição distorcem as medições
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    corpus = HttpCorpus(str(args.corpus))
+    pages = html_pages(corpus)
+    if not pages:
+        print(f"Nenhuma página HTML no corpus {args.corpus}")
+        sys.exit(1)
+
+    result = {"backend": args.backend, "parse": run_parse(pages, args.repeat, args.backend)}
+    if args.scrape:
+        urls = [page["url"] for page in pages]
+        result["scrape"] = asyncio.run(run_scrape(corpus, urls, args.repeat))
+    result["peak_rss_mb"] = peak_rss_mb()
+
+    parse = result["parse"]
+    print(f"Corpus: {args.corpus} ({parse['pages']} páginas HTML, backend {args.backend})")
+    print(
+        f"_parse_html: {parse['pages_per_sec']:.1f} páginas/s | "
+        f"p50 {parse['p50_ms']:.3f} ms | p95 {parse['p95_ms']:.3f} ms"
+    )
+    if "scrape" in result:
+        scrape = result["scrape"]
+        print(
+            f"scrape (replay): {scrape['pages_per_sec']:.1f} páginas/s | "
+            f"p50 {scrape['p50_ms']:.3f} ms | p95 {scrape['p95_ms']:.3f} ms | "
+            f"falhas {scrape['failures']}"
+        )
+    if result["peak_rss_mb"] is not None:
+        print(f"Pico de RSS: {result['peak_rss_mb']:.1f} MB")
+
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    if args.compare:
+        problems = compare(result, json.loads(args.compare.read_text(encoding="utf-8")), args.max_slowdown)
+        if problems:
+            print("\nRegressões em relação a", args.compare)
+            for problem in problems:
+                print(f"- {problem}")
+            sys.exit(1)
+        print(f"\nSem regressões em relação a {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,7 @@ from pydantic_settings import BaseSettings
 from pydantic import field_validator, Field
 from typing import Optional, Any
 import os
+import tempfile
 import warnings
 import json
 
@@ -40,6 +41,9 @@ class Settings(BaseSettings):
     langchain_project: str = "vaga_certa_production"
     langchain_endpoint: str = "https://api.smith.langchain.com"
     
+    # Chave das rotas administrativas (/admin, /monitor, /metrics) no header X-Admin-Key; vazia desabilita as rotas
+    admin_api_key: Optional[str] = None
+    
     # Application Settings
     environment: str = "production"
     log_level: str = "INFO"
@@ -54,6 +58,92 @@ class Settings(BaseSettings):
     request_timeout_seconds: int = 300
     scraping_timeout_seconds: int = 30
     
+    # Web Scraping
+    scraping_memo_ttl_seconds: int = 120  # Reuso do mesmo scraping entre etapas do pipeline
+    scraping_memo_max_entries: int = 256
+    scraping_hedge_enabled: bool = True  # Corrida entre fetch direto e proxies CORS
+    scraping_hedge_delay_seconds: float = 2.0  # Espera antes de disparar a próxima tentativa
+    scraping_max_parallel_attempts: int = 3
+    scraping_parser_backend: str = "beautifulsoup"  # beautifulsoup | lxml
+    scraping_main_content_enabled: bool = True  # Texto completo só com o corpo da vaga (menos tokens no LLM)
+    scraping_max_body_bytes: int = 5 * 1024 * 1024  # Aborta downloads maiores
+    scraping_early_stop_enabled: bool = True  # Encerra o download ao achar o JSON-LD da vaga
+    scraping_max_connections: int = 50  # Conexões simultâneas no pool do cliente HTTP
+    scraping_max_keepalive_connections: int = 20
+    scraping_keepalive_expiry_seconds: float = 30.0
+    scraping_http2_enabled: bool = False  # Requer o pacote h2 (httpx[http2])
+    scraping_max_concurrency_per_host: int = 4  # 0 desabilita o limite por host
+    scraping_rate_limit_enabled: bool = True  # Token bucket por host (sites e proxies CORS)
+    scraping_rate_per_host: float = 2.0  # Requisições/s por host (0 = sem limite)
+    scraping_rate_burst: int = 4  # Requisições imediatas antes de enfileirar
+    scraping_host_rates: str = "api.allorigins.win=1,corsproxy.io=1"  # host=req/s (vale para subdomínios)
+    scraping_rate_max_wait_seconds: float = 10.0  # Espera máxima na fila; acima disso a requisição é descartada
+    scraping_retry_after_max_seconds: float = 300.0  # Teto para o Retry-After de respostas 429/503
+    scraping_max_tracked_hosts: int = 1024  # Hosts mantidos em memória nos limitadores e circuit breakers
+    
+    # Pool de proxies CORS (fallback do fetch direto)
+    proxy_pool_urls: str = "https://api.allorigins.win/raw?url={url},https://corsproxy.io/?{url}"  # Templates com {url}, separados por vírgula
+    proxy_pool_alpha: float = 0.3  # Peso da tentativa mais recente nas médias de sucesso e latência
+    proxy_eject_after_failures: int = 3  # Falhas seguidas para afastar o proxy
+    proxy_eject_seconds: float = 60.0  # Primeiro afastamento; dobra a cada novo afastamento
+    proxy_eject_max_seconds: float = 900.0
+    near_duplicate_enabled: bool = False  # Reaproveita extração de vagas quase idênticas (mesmo título e empresa)
+    near_duplicate_max_distance: int = 2  # Bits diferentes aceitos no SimHash de 64 bits
+    near_duplicate_max_entries: int = 10000
+    
+    # Aprendizado de estratégias por domínio (direto x proxy, scraping x IA)
+    strategy_learning_enabled: bool = True
+    strategy_stats_alpha: float = 0.3  # Peso da tentativa mais recente nas médias
+    strategy_min_samples: int = 5  # Tentativas antes de reordenar/pular estratégias
+    strategy_skip_success_rate: float = 0.1  # Abaixo disso a estratégia é pulada
+    strategy_retry_after_seconds: int = 3600  # Nova tentativa de estratégia pulada
+    strategy_save_interval_seconds: float = 30.0
+    
+    # Circuit breaker por host (sites e proxies) e cache negativo de URLs
+    circuit_breaker_enabled: bool = True
+    circuit_failure_threshold: int = 5  # Falhas consecutivas (403/429/5xx/rede) para abrir
+    circuit_recovery_seconds: float = 60.0  # Tempo aberto antes da chamada de teste
+    negative_cache_enabled: bool = True
+    negative_cache_base_seconds: float = 30.0  # Dobra a cada falha consecutiva da URL
+    negative_cache_max_seconds: float = 3600.0
+    
+    # Monitor de vagas acompanhadas (re-verificação periódica com GET condicional)
+    job_monitor_enabled: bool = True
+    job_monitor_interval_seconds: float = 6 * 3600  # Intervalo entre verificações da mesma vaga
+    job_monitor_poll_seconds: float = 60.0  # Frequência com que o monitor procura vagas vencidas
+    job_monitor_batch_size: int = 20  # Vagas verificadas por rodada
+    job_monitor_concurrency: int = 4
+    job_monitor_max_jobs: int = 5000
+    job_monitor_lease_seconds: float = 300.0  # Posse do agendador no SQLite: só um worker do gunicorn verifica vagas
+    job_monitor_closed_confirmations: int = 2  # Sinais seguidos de vaga encerrada (404/410 ou aviso) para encerrá-la
+    job_monitor_closed_interval_seconds: float = 7 * 24 * 3600  # Re-verificação das encerradas (voltam se a página voltar)
+    
+    # Geração de materiais: uma chamada ao LLM por seção, em paralelo, em vez do prompt único
+    generation_parallel_sections: bool = False
+    
+    # Worker pool para parsing/validação fora do event loop
+    cpu_pool_mode: str = "thread"  # thread | process | inline
+    cpu_pool_max_workers: int = 4
+    cpu_pool_max_queue_size: int = 64
+    cpu_pool_min_offload_chars: int = 20000  # Entradas menores rodam inline
+    
+    # Cache (memória + SQLite). CACHE_DIR vazio desabilita a camada em disco
+    cache_dir: str = os.path.join(tempfile.gettempdir(), "vaga_certa_cache")
+    scrape_cache_enabled: bool = True
+    scrape_cache_ttl_seconds: int = 6 * 3600
+    scrape_cache_memory_max_entries: int = 512
+    scrape_cache_disk_max_entries: int = 5000
+    # Título/empresa extraídos pela IA, por hash do conteúdo + modelo + prompt
+    details_cache_enabled: bool = True
+    details_cache_ttl_seconds: int = 7 * 24 * 3600
+    details_cache_memory_max_entries: int = 1024
+    details_cache_disk_max_entries: int = 20000
+    # Materiais gerados, por hash das entradas normalizadas + modelo + versão do prompt
+    generation_cache_enabled: bool = True
+    generation_cache_ttl_seconds: int = 24 * 3600
+    generation_cache_memory_max_entries: int = 256
+    generation_cache_disk_max_entries: int = 2000
+    
     # CORS - Armazenado como string para evitar parse JSON automático
     cors_origins_str: Optional[str] = Field(default=None, alias="CORS_ORIGINS")
     
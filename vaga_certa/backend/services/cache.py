@@ -0,0 +1,363 @@
+"""
+Cache em duas camadas (memória + SQLite) com TTL, limite LRU e métricas.
+Usado para reaproveitar resultados caros (scraping, chamadas de LLM) entre requisições.
+"""
+from typing import Any, Dict, Optional
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import structlog
+
+from config import settings
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class CacheEntry:
+    """Entrada de cache com valor, metadados e instante de armazenamento."""
+    value: Any
+    stored_at: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def age_seconds(self) -> float:
+        """Idade da entrada em segundos."""
+        return time.time() - self.stored_at
+
+
+class TieredCache:
+    """
+    Cache com camada em memória (LRU) e camada em disco (SQLite, LRU).
+
+    Entradas expiradas continuam disponíveis via `get` (marcadas como stale)
+    para permitir revalidação condicional pelo chamador.
+
+    Código assíncrono deve usar `aget`/`apeek`/`aset`/`atouch`/`adelete`, que levam o
+    acesso ao SQLite para uma thread e não bloqueiam o event loop. Os instantes
+    de acesso das leituras em disco são gravados em lote, não a cada leitura.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: int,
+        memory_max_entries: int = 512,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 5000,
+        access_flush_size: int = 64
+    ):
+        """
+        Inicializa o cache.
+
+        Args:
+            namespace: Nome lógico do cache (isola entradas no mesmo arquivo SQLite)
+            ttl_seconds: Tempo de vida das entradas em segundos
+            memory_max_entries: Máximo de entradas na camada em memória
+            disk_path: Caminho do arquivo SQLite (None desabilita a camada em disco)
+            disk_max_entries: Máximo de entradas na camada em disco
+            access_flush_size: Leituras em disco acumuladas antes de gravar os
+                instantes de acesso (LRU) numa única transação
+        """
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.memory_max_entries = memory_max_entries
+        self.disk_max_entries = disk_max_entries
+        self.access_flush_size = max(1, access_flush_size)
+        self.stats: Counter = Counter()
+        self._memory: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._pending_access: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+
+        if disk_path and disk_max_entries > 0:
+            try:
+                self._db = self._open_db(disk_path)
+            except sqlite3.Error as e:
+                logger.warning(
+                    "Camada de cache em disco indisponível",
+                    namespace=namespace,
+                    path=disk_path,
+                    error=str(e)
+                )
+
+    @staticmethod
+    def _open_db(disk_path: str) -> sqlite3.Connection:
+        """Abre (e cria se necessário) o banco SQLite do cache."""
+        Path(disk_path).parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(disk_path, timeout=5, check_same_thread=False)
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " metadata TEXT NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_lru"
+            " ON cache_entries (namespace, accessed_at)"
+        )
+        db.commit()
+        return db
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """Indica se a entrada ainda está dentro do TTL."""
+        return entry.age_seconds() <= self.ttl_seconds
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Busca uma entrada (memória primeiro, depois disco).
+
+        Args:
+            key: Chave da entrada
+
+        Returns:
+            CacheEntry (possivelmente expirada) ou None se ausente
+        """
+        entry, tier = self._lookup(key)
+        if entry is None:
+            self.stats["misses"] += 1
+        elif self.is_fresh(entry):
+            self.stats[f"hits_{tier}"] += 1
+        else:
+            self.stats["stale"] += 1
+
+        return entry
+
+    def peek(self, key: str) -> Optional[CacheEntry]:
+        """Busca uma entrada como `get`, sem contar nas métricas de hit/miss."""
+        return self._lookup(key)[0]
+
+    def _lookup(self, key: str):
+        """Entrada da memória ou do disco (promovida à memória) e a camada em que estava."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry, "memory"
+            entry = self._disk_get(key)
+            if entry is not None:
+                self._memory_put(key, entry)
+            return entry, "disk"
+
+    def set(self, key: str, value: Any, metadata: Optional[Dict[str, Any]] = None):
+        """Armazena uma entrada nas duas camadas."""
+        entry = CacheEntry(value=value, stored_at=time.time(), metadata=metadata or {})
+        with self._lock:
+            self._memory_put(key, entry)
+            self._disk_put(key, entry)
+        self.stats["writes"] += 1
+
+    def touch(self, key: str, metadata: Optional[Dict[str, Any]] = None) -> Optional[CacheEntry]:
+        """
+        Renova o TTL de uma entrada existente (ex.: após revalidação 304).
+
+        Args:
+            key: Chave da entrada
+            metadata: Metadados atualizados (mesclados aos existentes)
+
+        Returns:
+            Entrada renovada ou None se ausente
+        """
+        with self._lock:
+            entry = self._memory.get(key) or self._disk_get(key)
+            if entry is None:
+                return None
+
+            entry = CacheEntry(
+                value=entry.value,
+                stored_at=time.time(),
+                metadata={**entry.metadata, **(metadata or {})}
+            )
+            self._memory_put(key, entry)
+            self._disk_put(key, entry)
+        return entry
+
+    def delete(self, key: str):
+        """Remove uma entrada das duas camadas."""
+        with self._lock:
+            self._memory.pop(key, None)
+            self._pending_access.pop(key, None)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                        (self.namespace, key)
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning("Falha ao remover entrada do cache em disco", error=str(e))
+
+    async def aget(self, key: str) -> Optional[CacheEntry]:
+        """Versão assíncrona de `get`; só a leitura em disco sai do event loop."""
+        if key in self._memory:
+            return self.get(key)
+        return await self._offload(self.get, key)
+
+    async def apeek(self, key: str) -> Optional[CacheEntry]:
+        """Versão assíncrona de `peek`."""
+        if key in self._memory:
+            return self.peek(key)
+        return await self._offload(self.peek, key)
+
+    async def aset(self, key: str, value: Any, metadata: Optional[Dict[str, Any]] = None):
+        """Versão assíncrona de `set`."""
+        await self._offload(self.set, key, value, metadata)
+
+    async def atouch(self, key: str, metadata: Optional[Dict[str, Any]] = None) -> Optional[CacheEntry]:
+        """Versão assíncrona de `touch`."""
+        return await self._offload(self.touch, key, metadata)
+
+    async def adelete(self, key: str):
+        """Versão assíncrona de `delete`."""
+        await self._offload(self.delete, key)
+
+    async def _offload(self, func, *args):
+        """Executa a operação numa thread quando ela pode tocar o SQLite."""
+        if self._db is None:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    def count(self, event: str, amount: int = 1):
+        """Incrementa um contador de métrica específico do chamador."""
+        self.stats[event] += amount
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas de uso do cache."""
+        hits = self.stats["hits_memory"] + self.stats["hits_disk"]
+        lookups = hits + self.stats["misses"] + self.stats["stale"]
+        return {
+            "namespace": self.namespace,
+            **dict(self.stats),
+            "hits": hits,
+            "misses": self.stats["misses"],
+            "stale": self.stats["stale"],
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "disk_enabled": self._db is not None,
+        }
+
+    def close(self):
+        """Grava os acessos pendentes e fecha a conexão com o banco em disco."""
+        with self._lock:
+            if self._db is not None:
+                try:
+                    self._flush_access()
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning("Falha ao gravar acessos do cache em disco", error=str(e))
+                self._db.close()
+                self._db = None
+
+    def _memory_put(self, key: str, entry: CacheEntry):
+        """Insere na camada em memória respeitando o limite LRU."""
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[CacheEntry]:
+        """Lê da camada em disco e agenda a atualização do instante de acesso (LRU)."""
+        if self._db is None:
+            return None
+
+        try:
+            row = self._db.execute(
+                "SELECT value, metadata, stored_at FROM cache_entries"
+                " WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+            if row is None:
+                return None
+
+            self._pending_access[key] = time.time()
+            if len(self._pending_access) >= self.access_flush_size:
+                self._flush_access()
+                self._db.commit()
+            return CacheEntry(
+                value=json.loads(row[0]),
+                stored_at=row[2],
+                metadata=json.loads(row[1])
+            )
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning("Falha ao ler cache em disco", namespace=self.namespace, error=str(e))
+            return None
+
+    def _disk_put(self, key: str, entry: CacheEntry):
+        """Grava na camada em disco e descarta as entradas menos usadas."""
+        if self._db is None:
+            return
+
+        try:
+            self._flush_access()
+            self._db.execute(
+                "INSERT OR REPLACE INTO cache_entries"
+                " (namespace, key, value, metadata, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self.namespace,
+                    key,
+                    json.dumps(entry.value, ensure_ascii=False),
+                    json.dumps(entry.metadata, ensure_ascii=False),
+                    entry.stored_at,
+                    time.time(),
+                )
+            )
+            self._db.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+                " SELECT key FROM cache_entries WHERE namespace = ?"
+                " ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.namespace, self.namespace, self.disk_max_entries)
+            )
+            self._db.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning("Falha ao gravar cache em disco", namespace=self.namespace, error=str(e))
+
+    def _flush_access(self):
+        """Grava os instantes de acesso pendentes (o chamador faz o commit)."""
+        if not self._pending_access:
+            return
+        pending, self._pending_access = self._pending_access, {}
+        self._db.executemany(
+            "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+            [(accessed_at, self.namespace, key) for key, accessed_at in pending.items()]
+        )
+
+
+def create_cache(
+    namespace: str,
+    ttl_seconds: int,
+    memory_max_entries: int,
+    disk_max_entries: int
+) -> TieredCache:
+    """
+    Cria um TieredCache usando o diretório de cache configurado em Settings.
+
+    Args:
+        namespace: Nome lógico do cache
+        ttl_seconds: Tempo de vida das entradas em segundos
+        memory_max_entries: Máximo de entradas em memória
+        disk_max_entries: Máximo de entradas em disco (0 desabilita o disco)
+
+    Returns:
+        Instância de TieredCache
+    """
+    disk_path = (
+        str(Path(settings.cache_dir) / "cache.sqlite3")
+        if settings.cache_dir
+        else None
+    )
+    return TieredCache(
+        namespace=namespace,
+        ttl_seconds=ttl_seconds,
+        memory_max_entries=memory_max_entries,
+        disk_path=disk_path,
+        disk_max_entries=disk_max_entries
+    )
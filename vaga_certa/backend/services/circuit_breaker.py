@@ -0,0 +1,269 @@
+"""
+Circuit breakers por host e cache negativo de URLs com falha recente.
+Evitam repetir a cadeia completa de scraping (e a chamada de LLM) contra
+sites que estão bloqueando ou URLs que não respondem.
+"""
+from typing import Any, Dict, Optional
+from collections import OrderedDict
+from dataclasses import dataclass
+import threading
+import time
+import structlog
+
+logger = structlog.get_logger()
+
+
+class CircuitOpenError(ValueError):
+    """Requisição recusada porque o circuito do host está aberto."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker clássico (fechado -> aberto -> meio-aberto).
+
+    Após `failure_threshold` falhas consecutivas o circuito abre e recusa
+    chamadas por `recovery_seconds`. Em seguida passa a meio-aberto e libera
+    uma chamada de teste: sucesso fecha o circuito, falha reabre.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_seconds: float = 60.0):
+        """
+        Inicializa o circuito fechado.
+
+        Args:
+            failure_threshold: Falhas consecutivas para abrir o circuito
+            recovery_seconds: Tempo aberto antes da chamada de teste
+        """
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_seconds = recovery_seconds
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self._state = self.CLOSED
+        self._open_until = 0.0
+        self._probe_started: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """Estado atual (aberto vira meio-aberto quando o tempo de recuperação passa)."""
+        if self._state == self.OPEN and time.monotonic() >= self._open_until:
+            self._state = self.HALF_OPEN
+            self._probe_started = None
+        return self._state
+
+    def retry_in_seconds(self) -> float:
+        """Segundos até a próxima chamada de teste (0 se o circuito aceita chamadas)."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._open_until - time.monotonic())
+
+    def allow(self) -> bool:
+        """Indica se uma chamada pode seguir (reserva a chamada de teste no meio-aberto)."""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            now = time.monotonic()
+            # Chamada de teste sem resultado (ex.: cancelada) libera nova tentativa
+            if self._probe_started is None or now - self._probe_started >= self.recovery_seconds:
+                self._probe_started = now
+                return True
+        return False
+
+    def record_success(self):
+        """Registra sucesso: zera as falhas e fecha o circuito."""
+        self.consecutive_failures = 0
+        self._state = self.CLOSED
+        self._probe_started = None
+
+    def record_failure(self, retry_after_seconds: Optional[float] = None):
+        """
+        Registra falha, abrindo o circuito no limite ou se a chamada de teste falhar.
+
+        Args:
+            retry_after_seconds: Espera sugerida pelo servidor (Retry-After)
+        """
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            recovery = max(self.recovery_seconds, retry_after_seconds or 0.0)
+            self._state = self.OPEN
+            self._open_until = time.monotonic() + recovery
+            self._probe_started = None
+            self.times_opened += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna estado e contadores do circuito."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "retry_in_seconds": round(self.retry_in_seconds(), 1),
+        }
+
+
+class CircuitBreakerRegistry:
+    """
+    Circuit breakers independentes por chave (host do site ou do proxy).
+
+    No máximo `max_entries` circuitos ficam em memória; acima disso os
+    fechados sem falhas saem primeiro, depois os menos usados.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_seconds: float = 60.0,
+        max_entries: int = 1024
+    ):
+        """
+        Inicializa o registro.
+
+        Args:
+            failure_threshold: Falhas consecutivas para abrir cada circuito
+            recovery_seconds: Tempo aberto antes da chamada de teste
+            max_entries: Máximo de circuitos mantidos (LRU)
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.max_entries = max(1, max_entries)
+        self._breakers: "OrderedDict[str, CircuitBreaker]" = OrderedDict()
+
+    def get(self, key: str) -> CircuitBreaker:
+        """Retorna (criando se necessário) o circuito da chave."""
+        breaker = self._breakers.get(key)
+        if breaker is not None:
+            self._breakers.move_to_end(key)
+            return breaker
+        self._evict()
+        breaker = self._breakers[key] = CircuitBreaker(
+            self.failure_threshold, self.recovery_seconds
+        )
+        return breaker
+
+    def _evict(self):
+        """Abre espaço para um novo circuito: sem histórico primeiro, depois os menos usados."""
+        excess = len(self._breakers) - self.max_entries + 1
+        if excess <= 0:
+            return
+        healthy = [
+            key for key, breaker in self._breakers.items()
+            if breaker.state == CircuitBreaker.CLOSED and breaker.consecutive_failures == 0
+        ]
+        for key in list(dict.fromkeys(healthy + list(self._breakers)))[:excess]:
+            del self._breakers[key]
+
+    def check(self, key: str):
+        """
+        Garante que o circuito da chave aceita chamadas.
+
+        Raises:
+            CircuitOpenError: Se o circuito estiver aberto
+        """
+        breaker = self.get(key)
+        if not breaker.allow():
+            raise CircuitOpenError(
+                f"Circuito aberto para {key}: falhas consecutivas recentes. "
+                f"Nova tentativa em {breaker.retry_in_seconds():.0f}s"
+            )
+
+    def record(self, key: str, success: bool, retry_after_seconds: Optional[float] = None):
+        """Registra o resultado de uma chamada no circuito da chave."""
+        breaker = self.get(key)
+        previous = breaker.state
+        if success:
+            breaker.record_success()
+        else:
+            breaker.record_failure(retry_after_seconds)
+
+        if breaker.state != previous:
+            logger.info("Circuito mudou de estado", key=key, previous=previous, state=breaker.state)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Retorna o estado de todos os circuitos."""
+        return {key: breaker.get_stats() for key, breaker in sorted(self._breakers.items())}
+
+
+@dataclass
+class NegativeEntry:
+    """URL com falha recente e o instante em que pode ser tentada de novo."""
+    failures: int
+    retry_at: float
+    reason: str
+
+
+class NegativeCache:
+    """
+    Cache de URLs que falharam recentemente, com backoff exponencial.
+
+    Cada falha consecutiva dobra o bloqueio (`base_seconds * 2^(n-1)`, até
+    `max_seconds`); um sucesso remove a URL do cache.
+    """
+
+    def __init__(self, base_seconds: float = 30.0, max_seconds: float = 3600.0, max_entries: int = 1000):
+        """
+        Inicializa o cache negativo.
+
+        Args:
+            base_seconds: Bloqueio após a primeira falha
+            max_seconds: Bloqueio máximo
+            max_entries: Máximo de URLs mantidas (LRU)
+        """
+        self.base_seconds = base_seconds
+        self.max_seconds = max_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, NegativeEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.blocked_requests = 0
+
+    def get(self, key: str) -> Optional[NegativeEntry]:
+        """Retorna a entrada se a URL ainda estiver bloqueada."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry.retry_at:
+                return None
+            self.blocked_requests += 1
+            return entry
+
+    def record_failure(self, key: str, reason: str) -> NegativeEntry:
+        """
+        Registra falha da URL, dobrando o bloqueio a cada falha consecutiva.
+
+        Args:
+            key: Chave da URL
+            reason: Motivo resumido da falha
+
+        Returns:
+            Entrada atualizada
+        """
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            failures = (previous.failures if previous else 0) + 1
+            backoff = min(self.max_seconds, self.base_seconds * 2 ** (failures - 1))
+            entry = NegativeEntry(failures, time.monotonic() + backoff, reason)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self, key: str):
+        """Remove a URL do cache (após sucesso)."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def retry_in_seconds(self, entry: NegativeEntry) -> float:
+        """Segundos até a URL poder ser tentada de novo."""
+        return max(0.0, entry.retry_at - time.monotonic())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas do cache negativo."""
+        now = time.monotonic()
+        with self._lock:
+            blocked = sum(1 for entry in self._entries.values() if entry.retry_at > now)
+        return {
+            "entries": len(self._entries),
+            "currently_blocked": blocked,
+            "blocked_requests": self.blocked_requests,
+        }
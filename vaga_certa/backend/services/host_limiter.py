@@ -0,0 +1,124 @@
+"""
+Limite de concorrência por host para o cliente HTTP do scraper.
+Impede que uma rajada de URLs do mesmo site ocupe todas as conexões do pool
+compartilhado com os demais sites e proxies.
+"""
+from typing import Any, AsyncIterator, Dict
+from collections import Counter
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+import asyncio
+import time
+import weakref
+
+
+class HostConcurrencyLimiter:
+    """
+    Semáforo por host (netloc) com métricas de uso.
+
+    Requisições excedentes para o mesmo host aguardam de forma assíncrona;
+    hosts diferentes não competem entre si, exceto pelo limite global do pool.
+    Acima de `max_hosts`, os hosts sem requisições em andamento menos usados
+    são descartados (semáforo e métricas).
+    """
+
+    def __init__(self, max_per_host: int = 4, max_hosts: int = 1024):
+        """
+        Inicializa o limitador.
+
+        Args:
+            max_per_host: Requisições simultâneas permitidas por host (0 desabilita)
+            max_hosts: Máximo de hosts acompanhados em memória
+        """
+        self.max_per_host = max(0, max_per_host)
+        self.max_hosts = max(1, max_hosts)
+        self.evicted_hosts = 0
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._active: Counter = Counter()
+        self._waiting: Counter = Counter()
+        self._peak_active: Counter = Counter()
+        self._requests: Counter = Counter()
+        self._wait_seconds: Dict[str, float] = {}
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Host usado como chave do limite (netloc em minúsculas)."""
+        return urlparse(url).netloc.lower()
+
+    def _get_semaphore(self, host: str) -> asyncio.Semaphore:
+        """Semáforo do host no event loop atual."""
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.get(loop)
+        if semaphores is None:
+            semaphores = self._semaphores[loop] = {}
+        semaphore = semaphores.get(host)
+        if semaphore is None:
+            semaphore = semaphores[host] = asyncio.Semaphore(self.max_per_host)
+        return semaphore
+
+    @asynccontextmanager
+    async def limit(self, url: str) -> AsyncIterator[None]:
+        """
+        Reserva uma vaga de concorrência para o host da URL.
+
+        Args:
+            url: URL que será requisitada
+        """
+        host = self.host_key(url)
+        if host not in self._requests:
+            self._evict()
+        # Reinsere para manter _requests em ordem de uso (LRU)
+        self._requests[host] = self._requests.pop(host, 0) + 1
+        if self.max_per_host == 0:
+            yield
+            return
+
+        semaphore = self._get_semaphore(host)
+        started = time.monotonic()
+        self._waiting[host] += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting[host] -= 1
+        self._wait_seconds[host] = self._wait_seconds.get(host, 0.0) + time.monotonic() - started
+
+        self._active[host] += 1
+        self._peak_active[host] = max(self._peak_active[host], self._active[host])
+        try:
+            yield
+        finally:
+            self._active[host] -= 1
+            semaphore.release()
+
+    def _evict(self):
+        """Abre espaço para um novo host descartando os ociosos menos usados."""
+        excess = len(self._requests) - self.max_hosts + 1
+        if excess <= 0:
+            return
+        idle = [host for host in self._requests if not self._active[host] and not self._waiting[host]]
+        for host in idle[:excess]:
+            for counter in (self._requests, self._active, self._waiting, self._peak_active):
+                counter.pop(host, None)
+            self._wait_seconds.pop(host, None)
+            for semaphores in self._semaphores.values():
+                semaphores.pop(host, None)
+            self.evicted_hosts += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna uso por host (ativas, aguardando, pico e tempo de espera)."""
+        return {
+            "max_per_host": self.max_per_host,
+            "evicted_hosts": self.evicted_hosts,
+            "hosts": {
+                host: {
+                    "active": self._active[host],
+                    "waiting": self._waiting[host],
+                    "peak_active": self._peak_active[host],
+                    "requests": self._requests[host],
+                    "wait_seconds_total": round(self._wait_seconds.get(host, 0.0), 4),
+                }
+                for host in sorted(self._requests)
+            },
+        }
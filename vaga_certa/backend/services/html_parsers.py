@@ -0,0 +1,492 @@
+"""
+Backends de parsing HTML para o WebScraper.
+Todos os backends implementam a mesma semântica de extração (título, empresa,
+descrição e texto completo) e são selecionáveis via Settings.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Type, Union
+import codecs
+import json
+import re
+
+from bs4 import BeautifulSoup
+import lxml.html
+from lxml import etree
+
+from services.jsonld import extract_job_posting_fast, find_job_posting, job_posting_fields
+from services.main_content import extract_main_text, soup_tree
+from services.site_extractors import SiteExtractor, find_site_extractor
+
+
+# Remove sufixos comuns de sites de vagas do <title>
+_TITLE_SUFFIX_PATTERN = re.compile(r"\s*[-|]\s*(LinkedIn|Indeed|Glassdoor).*$", re.IGNORECASE)
+_COMPANY_CLASS_PATTERN = re.compile(r"company", re.I)
+_DESCRIPTION_CLASS_PATTERN = re.compile(r"description", re.I)
+_JOB_DESCRIPTION_CLASS_PATTERN = re.compile(r"job-description", re.I)
+_JOB_DETAILS_ID_PATTERN = re.compile(r"job-details", re.I)
+_BLANK_LINES_PATTERN = re.compile(r"\n\s*\n\s*\n+")
+_MULTIPLE_SPACES_PATTERN = re.compile(r" +")
+
+# Tags ignoradas no texto completo da página
+NOISE_TAGS = ["script", "style", "nav", "footer", "header"]
+
+# <meta charset=...> ou <meta http-equiv="Content-Type" content="...; charset=...">
+_META_CHARSET_PATTERN = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.IGNORECASE)
+# Como nos navegadores, o <meta charset> só é procurado no início do documento
+META_CHARSET_SCAN_BYTES = 4096
+
+
+def resolve_encoding(html: bytes, declared: Optional[str] = None) -> str:
+    """
+    Encoding para decodificar o HTML em bytes, sem detecção estatística.
+
+    Ordem: charset declarado no Content-Type, <meta charset> no início do
+    documento e, por fim, UTF-8. ISO-8859-1 vira windows-1252, como nos
+    navegadores.
+
+    Args:
+        html: HTML da página em bytes
+        declared: Charset do header Content-Type (se houver)
+
+    Returns:
+        Nome do codec Python
+    """
+    meta = _META_CHARSET_PATTERN.search(html, 0, META_CHARSET_SCAN_BYTES)
+    candidates = (declared, meta.group(1).decode("ascii", "ignore") if meta else None)
+    for candidate in candidates:
+        if not candidate:
+            continue
+        try:
+            name = codecs.lookup(candidate).name
+        except LookupError:
+            continue
+        return "cp1252" if name == "iso8859-1" else name
+    return "utf-8"
+
+
+def clean_full_text(text: str) -> str:
+    """Limpa espaços múltiplos e quebras de linha do texto completo."""
+    text = _BLANK_LINES_PATTERN.sub("\n\n", text)
+    text = _MULTIPLE_SPACES_PATTERN.sub(" ", text)
+    return text.strip()
+
+
+def build_result(
+    structured_data: Dict[str, str],
+    title: str,
+    company: str,
+    description: str,
+    full_text: str,
+    main_text: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Combina dados estruturados (prioritários) com as heurísticas.
+
+    Com `main_text` (conteúdo principal da página), o texto completo passa a
+    ser título, empresa e conteúdo principal, no mesmo formato do caminho
+    rápido JSON-LD.
+    """
+    title = (structured_data.get("title") or title or "").strip()
+    company = (structured_data.get("company") or company or "").strip()
+    if main_text:
+        full_text = clean_full_text(f"{title}\n{company}\n\n{main_text}")
+    return {
+        "title": title,
+        "company": company,
+        "description": (structured_data.get("description") or description or "").strip(),
+        "fullText": full_text.strip()
+    }
+
+
+class HTMLParserBackend(ABC):
+    """
+    Interface de backend de parsing HTML.
+    Implementações devem ser equivalentes na saída (ver testes de paridade).
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def parse(
+        self,
+        html: Union[str, bytes],
+        url: Optional[str] = None,
+        main_content: bool = False,
+        encoding: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Parseia HTML e extrai informações da vaga.
+
+        Args:
+            html: HTML da página (bytes são decodificados pelo próprio parser)
+            url: URL da vaga (seleciona o extrator específico do site, se houver)
+            main_content: Reduz o texto completo ao conteúdo principal da página
+            encoding: Encoding dos bytes (None = resolve_encoding)
+
+        Returns:
+            Dicionário com title, company, description e fullText
+        """
+
+
+class BeautifulSoupBackend(HTMLParserBackend):
+    """Backend original baseado em BeautifulSoup (com parser lxml)."""
+
+    name = "beautifulsoup"
+
+    def parse(
+        self,
+        html: Union[str, bytes],
+        url: Optional[str] = None,
+        main_content: bool = False,
+        encoding: Optional[str] = None
+    ) -> Dict[str, str]:
+        if isinstance(html, bytes):
+            encoding = resolve_encoding(html, encoding)
+            soup = BeautifulSoup(html, "lxml", from_encoding=encoding)
+        else:
+            soup = BeautifulSoup(html, "lxml")
+
+        # Structured data (JSON-LD), extrator do site e heurísticas antes de
+        # limpar a árvore; as heurísticas só rodam para campos não encontrados
+        structured_data = self._extract_structured_data(soup)
+        site_fields = self._extract_site_fields(soup, find_site_extractor(url))
+        title = site_fields.get("title") or self._extract_title(soup)
+        company = site_fields.get("company") or self._extract_company(soup)
+        description = site_fields.get("description") or self._extract_description(soup)
+        # Conteúdo principal sobre a própria soup (sem segundo parse), antes
+        # de a limpeza do texto completo remover nós da árvore
+        main_text = extract_main_text(soup_tree(soup.html or soup)) if main_content else None
+        full_text = self._extract_full_text(soup)
+
+        return build_result(structured_data, title, company, description, full_text, main_text)
+
+    def _extract_structured_data(self, soup: BeautifulSoup) -> Dict[str, str]:
+        """Extrai dados estruturados JSON-LD."""
+        for script in soup.find_all("script", type="application/ld+json"):
+            try:
+                # Pode ser array, objeto único ou @graph
+                item = find_job_posting(json.loads(script.string))
+                if item:
+                    return job_posting_fields(item)
+            except Exception:
+                continue
+
+        return {}
+
+    @staticmethod
+    def _extract_site_fields(soup: BeautifulSoup, extractor: Optional[SiteExtractor]) -> Dict[str, str]:
+        """Extrai campos com os seletores específicos do site."""
+        if extractor is None:
+            return {}
+        return extractor.extract(
+            lambda selector: selector.soup.select_one(soup),
+            lambda element, separator: element.get_text(separator=separator, strip=True)
+        )
+
+    def _extract_title(self, soup: BeautifulSoup) -> str:
+        """Extrai título usando heurísticas."""
+        # Meta tags
+        og_title = soup.find("meta", property="og:title")
+        if og_title:
+            return og_title.get("content", "")
+
+        twitter_title = soup.find("meta", attrs={"name": "twitter:title"})
+        if twitter_title:
+            return twitter_title.get("content", "")
+
+        # Tag title
+        title_tag = soup.find("title")
+        if title_tag:
+            title = title_tag.string or ""
+            return _TITLE_SUFFIX_PATTERN.sub("", title).strip()
+
+        # H1
+        h1 = soup.find("h1")
+        if h1:
+            return h1.get_text(strip=True)
+
+        return ""
+
+    def _extract_company(self, soup: BeautifulSoup) -> str:
+        """Extrai nome da empresa usando heurísticas."""
+        # Padrões comuns em sites de vagas
+        patterns = [
+            soup.find("a", class_=_COMPANY_CLASS_PATTERN),
+            soup.find(attrs={"data-company-name": True}),
+        ]
+
+        for element in patterns:
+            if element:
+                if element.name == "a":
+                    return element.get_text(strip=True)
+                else:
+                    return element.get("data-company-name", "")
+
+        return ""
+
+    def _extract_description(self, soup: BeautifulSoup) -> str:
+        """Extrai descrição da vaga."""
+        # Procura por seções de descrição
+        description_selectors = [
+            soup.find("div", class_=_DESCRIPTION_CLASS_PATTERN),
+            soup.find("section", class_=_JOB_DESCRIPTION_CLASS_PATTERN),
+            soup.find("div", id=_JOB_DETAILS_ID_PATTERN),
+        ]
+
+        for element in description_selectors:
+            if element:
+                text = element.get_text(separator="\n", strip=True)
+                if len(text) > 200:
+                    return text
+
+        return ""
+
+    def _extract_full_text(self, soup: BeautifulSoup) -> str:
+        """Extrai texto completo limpo da página."""
+        # Remove scripts, styles e navegação
+        for tag in soup(NOISE_TAGS):
+            tag.decompose()
+
+        return clean_full_text(soup.get_text(separator="\n", strip=True))
+
+
+def _lower_contains_xpath(attribute: str, needle: str) -> str:
+    """Predicado XPath 1.0 de 'contém' case-insensitive (ASCII)."""
+    return (
+        f"contains(translate({attribute}, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', "
+        f"'abcdefghijklmnopqrstuvwxyz'), '{needle}')"
+    )
+
+
+# Nós de texto "visíveis" com a mesma semântica do get_text do BeautifulSoup,
+# que ignora strings de script/style/template e comentários
+_NOT_HIDDEN = "not(ancestor::script or ancestor::style or ancestor::template)"
+_NOT_NOISE = "not(" + " or ".join(f"ancestor::{tag}" for tag in NOISE_TAGS + ["template"]) + ")"
+
+
+class LxmlBackend(HTMLParserBackend):
+    """
+    Backend baseado em lxml.html com XPath pré-compilado.
+    Mais rápido e econômico em memória que o BeautifulSoup em páginas grandes.
+    """
+
+    name = "lxml"
+
+    _json_ld = etree.XPath("//script[@type='application/ld+json']")
+    _og_title = etree.XPath("//meta[@property='og:title']")
+    _twitter_title = etree.XPath("//meta[@name='twitter:title']")
+    _title = etree.XPath("//title")
+    _h1 = etree.XPath("//h1")
+    _company_link = etree.XPath(f"//a[{_lower_contains_xpath('@class', 'company')}]")
+    _company_data = etree.XPath("//*[@data-company-name]")
+    _description_div = etree.XPath(f"//div[{_lower_contains_xpath('@class', 'description')}]")
+    _description_section = etree.XPath(
+        f"//section[{_lower_contains_xpath('@class', 'job-description')}]"
+    )
+    _details_div = etree.XPath(f"//div[{_lower_contains_xpath('@id', 'job-details')}]")
+    _visible_text = etree.XPath(f".//text()[{_NOT_HIDDEN}]")
+    _page_text = etree.XPath(f"//text()[{_NOT_NOISE}]")
+
+    def parse(
+        self,
+        html: Union[str, bytes],
+        url: Optional[str] = None,
+        main_content: bool = False,
+        encoding: Optional[str] = None
+    ) -> Dict[str, str]:
+        root = self._document(html, encoding)
+        if root is None:
+            return build_result({}, "", "", "", "")
+
+        site_fields = self._extract_site_fields(root, find_site_extractor(url))
+        return build_result(
+            self._extract_structured_data(root),
+            site_fields.get("title") or self._extract_title(root),
+            site_fields.get("company") or self._extract_company(root),
+            site_fields.get("description") or self._extract_description(root),
+            self._extract_full_text(root),
+            extract_main_text(root) if main_content else None
+        )
+
+    @staticmethod
+    def _document(html: Union[str, bytes], encoding: Optional[str] = None) -> Optional[etree._Element]:
+        """
+        Constrói a árvore lxml do documento (None se vazio).
+
+        Bytes vão direto ao libxml2 com o encoding resolvido, sem a cópia
+        intermediária em str.
+        """
+        if isinstance(html, bytes):
+            # Parser por chamada: parsers lxml não podem ser compartilhados entre threads
+            parser = lxml.html.HTMLParser(encoding=resolve_encoding(html, encoding))
+            try:
+                return lxml.html.document_fromstring(html, parser=parser)
+            except (ValueError, etree.ParserError):
+                return None
+
+        try:
+            return lxml.html.document_fromstring(html)
+        except ValueError:
+            # Strings com declaração de encoding XML precisam ir como bytes
+            try:
+                return lxml.html.document_fromstring(html.encode("utf-8"))
+            except (ValueError, etree.ParserError):
+                return None
+        except etree.ParserError:
+            return None
+
+    @staticmethod
+    def _first(nodes: List[etree._Element]) -> Optional[etree._Element]:
+        return nodes[0] if nodes else None
+
+    def _join_text(self, element: etree._Element, separator: str) -> str:
+        """Equivalente a get_text(separator=..., strip=True) do BeautifulSoup."""
+        return separator.join(
+            text.strip() for text in self._visible_text(element) if text.strip()
+        )
+
+    def _extract_site_fields(
+        self,
+        root: etree._Element,
+        extractor: Optional[SiteExtractor]
+    ) -> Dict[str, str]:
+        """Extrai campos com os seletores específicos do site."""
+        if extractor is None:
+            return {}
+        return extractor.extract(
+            lambda selector: self._first(selector.xpath(root)),
+            self._join_text
+        )
+
+    def _extract_structured_data(self, root: etree._Element) -> Dict[str, str]:
+        """Extrai dados estruturados JSON-LD."""
+        for script in self._json_ld(root):
+            try:
+                item = find_job_posting(json.loads(script.text))
+                if item:
+                    return job_posting_fields(item)
+            except Exception:
+                continue
+
+        return {}
+
+    def _extract_title(self, root: etree._Element) -> str:
+        """Extrai título usando heurísticas."""
+        og_title = self._first(self._og_title(root))
+        if og_title is not None:
+            return og_title.get("content", "")
+
+        twitter_title = self._first(self._twitter_title(root))
+        if twitter_title is not None:
+            return twitter_title.get("content", "")
+
+        title_tag = self._first(self._title(root))
+        if title_tag is not None:
+            title = title_tag.text if len(title_tag) == 0 and title_tag.text else ""
+            return _TITLE_SUFFIX_PATTERN.sub("", title).strip()
+
+        h1 = self._first(self._h1(root))
+        if h1 is not None:
+            return self._join_text(h1, "")
+
+        return ""
+
+    def _extract_company(self, root: etree._Element) -> str:
+        """Extrai nome da empresa usando heurísticas."""
+        company_link = self._first(self._company_link(root))
+        if company_link is not None:
+            return self._join_text(company_link, "")
+
+        company_data = self._first(self._company_data(root))
+        if company_data is not None:
+            return company_data.get("data-company-name", "")
+
+        return ""
+
+    def _extract_description(self, root: etree._Element) -> str:
+        """Extrai descrição da vaga."""
+        for selector in (self._description_div, self._description_section, self._details_div):
+            element = self._first(selector(root))
+            if element is not None:
+                text = self._join_text(element, "\n")
+                if len(text) > 200:
+                    return text
+
+        return ""
+
+    def _extract_full_text(self, root: etree._Element) -> str:
+        """Extrai texto completo limpo da página (sem modificar a árvore)."""
+        return clean_full_text("\n".join(
+            text.strip() for text in self._page_text(root) if text.strip()
+        ))
+
+
+PARSER_BACKENDS: Dict[str, Type[HTMLParserBackend]] = {
+    BeautifulSoupBackend.name: BeautifulSoupBackend,
+    LxmlBackend.name: LxmlBackend,
+}
+
+
+_backend_instances: Dict[str, HTMLParserBackend] = {}
+
+
+def get_parser_backend(name: str) -> HTMLParserBackend:
+    """
+    Instancia o backend de parsing pelo nome configurado.
+
+    Args:
+        name: Nome do backend ("beautifulsoup" ou "lxml")
+
+    Returns:
+        Instância do backend
+
+    Raises:
+        ValueError: Se o backend não existir
+    """
+    key = (name or "").strip().lower()
+    backend = _backend_instances.get(key)
+    if backend is None:
+        backend_class = PARSER_BACKENDS.get(key)
+        if backend_class is None:
+            raise ValueError(
+                f"Backend de parsing HTML desconhecido: {name}. "
+                f"Opções: {', '.join(sorted(PARSER_BACKENDS))}"
+            )
+        # Backends não guardam estado por página: uma instância por processo basta
+        backend = _backend_instances[key] = backend_class()
+    return backend
+
+
+def parse_job_page(
+    html: Union[str, bytes],
+    backend_name: str,
+    url: Optional[str] = None,
+    main_content: bool = False,
+    encoding: Optional[str] = None
+) -> Dict[str, str]:
+    """
+    Parseia uma página de vaga: caminho rápido JSON-LD, senão o backend.
+
+    Função de módulo (serializável) para poder rodar em ProcessPoolExecutor.
+
+    Aceita o corpo HTTP em bytes com o charset declarado: o parser decodifica
+    direto, sem a cópia em str e sem a detecção de charset do httpx.
+
+    Args:
+        html: HTML da página (str ou bytes)
+        backend_name: Nome do backend de parsing
+        url: URL da vaga (seleciona o extrator específico do site)
+        main_content: Reduz o texto completo ao conteúdo principal da página
+        encoding: Charset declarado no Content-Type (só para bytes)
+
+    Returns:
+        Dicionário com title, company, description e fullText
+    """
+    if isinstance(html, bytes):
+        encoding = resolve_encoding(html, encoding)
+
+    fast_result = extract_job_posting_fast(html, encoding)
+    if fast_result:
+        return fast_result
+
+    return get_parser_backend(backend_name).parse(html, url, main_content, encoding)
@@ -0,0 +1,229 @@
+"""
+Corpus HTTP gravado em disco (gzip) para reproduzir o scraping sem rede.
+RecordingTransport grava as respostas reais (status, headers e corpo) e
+ReplayTransport as serve localmente ao httpx.AsyncClient do WebScraper, para
+testes e benchmarks determinísticos (inclusive em CI, sem internet).
+"""
+from typing import Dict, Iterator, List, Optional, Tuple
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+
+import httpx
+import structlog
+
+from services.url_canonicalizer import canonicalize_url
+
+logger = structlog.get_logger()
+
+CORPUS_VERSION = 1
+
+# Headers que descrevem a codificação de transporte do corpo original; o corpo
+# é gravado já decodificado e o httpx recalcula o tamanho na reprodução
+_TRANSPORT_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+@dataclass
+class RecordedResponse:
+    """Resposta HTTP gravada no corpus."""
+    method: str
+    url: str
+    status_code: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    recorded_at: float = field(default_factory=time.time)
+
+    @property
+    def content_type(self) -> str:
+        for name, value in self.headers:
+            if name.lower() == "content-type":
+                return value
+        return ""
+
+    def to_json(self) -> Dict:
+        data = asdict(self)
+        data["headers"] = [list(header) for header in self.headers]
+        data["body"] = base64.b64encode(self.body).decode("ascii")
+        return data
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "RecordedResponse":
+        return cls(
+            method=data["method"],
+            url=data["url"],
+            status_code=data["status_code"],
+            headers=[tuple(header) for header in data["headers"]],
+            body=base64.b64decode(data["body"]),
+            recorded_at=data.get("recorded_at", 0.0),
+        )
+
+
+class HttpCorpus:
+    """
+    Conjunto de respostas gravadas, indexado por método e URL.
+
+    A busca aceita também a URL canônica, já que o WebScraper canonicaliza a
+    URL antes do fetch (ex.: br.linkedin.com -> www.linkedin.com).
+
+    Persistido como um único JSON comprimido com gzip (`.json.gz`), com o
+    corpo de cada resposta em base64.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Inicializa o corpus, carregando o arquivo se existir.
+
+        Args:
+            path: Arquivo .json.gz do corpus (None mantém só em memória)
+        """
+        self.path = path
+        self._responses: Dict[Tuple[str, str], RecordedResponse] = {}
+        self._canonical: Dict[Tuple[str, str], Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load()
+
+    @staticmethod
+    def _key(method: str, url: str) -> Tuple[str, str]:
+        return method.upper(), str(url)
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def __iter__(self) -> Iterator[RecordedResponse]:
+        with self._lock:
+            return iter(list(self._responses.values()))
+
+    def get(self, method: str, url: str) -> Optional[RecordedResponse]:
+        """Resposta gravada para o método e URL, exata ou canônica (None se ausente)."""
+        key = self._key(method, url)
+        response = self._responses.get(key)
+        if response is None:
+            exact = self._canonical.get(self._key(method, canonicalize_url(key[1])))
+            response = self._responses.get(exact) if exact else None
+        return response
+
+    def add(self, response: RecordedResponse):
+        """Grava (ou substitui) a resposta do método e URL."""
+        with self._lock:
+            self._index(response)
+
+    def _index(self, response: RecordedResponse):
+        key = self._key(response.method, response.url)
+        self._responses[key] = response
+        self._canonical.setdefault(self._key(response.method, canonicalize_url(response.url)), key)
+
+    def add_page(self, url: str, html: str, status_code: int = 200):
+        """Atalho para gravar uma página HTML (ex.: páginas salvas em fixtures)."""
+        self.add(RecordedResponse(
+            method="GET",
+            url=url,
+            status_code=status_code,
+            headers=[("content-type", "text/html; charset=utf-8")],
+            body=html.encode("utf-8"),
+        ))
+
+    def load(self):
+        """Carrega o corpus do arquivo (substitui o conteúdo em memória)."""
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CORPUS_VERSION:
+            raise ValueError(
+                f"Versão de corpus não suportada: {data.get('version')} (esperada {CORPUS_VERSION})"
+            )
+        with self._lock:
+            self._responses = {}
+            self._canonical = {}
+            for item in data["responses"]:
+                self._index(RecordedResponse.from_json(item))
+
+    def save(self, path: Optional[str] = None):
+        """Grava o corpus em disco (escrita atômica via arquivo temporário)."""
+        path = path or self.path
+        if not path:
+            raise ValueError("Corpus sem caminho de arquivo para gravar")
+
+        with self._lock:
+            responses = sorted(self._responses.values(), key=lambda r: (r.url, r.method))
+            data = {"version": CORPUS_VERSION, "responses": [r.to_json() for r in responses]}
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        # Sem data no cabeçalho gzip: diferenças no arquivo refletem só o conteúdo
+        with open(tmp_path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+            f.write(json.dumps(data, ensure_ascii=False, indent=1).encode("utf-8"))
+        os.replace(tmp_path, path)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Transporte que repassa as requisições ao transporte real e grava cada
+    resposta completa no corpus.
+    """
+
+    def __init__(self, corpus: HttpCorpus, transport: Optional[httpx.AsyncBaseTransport] = None):
+        """
+        Args:
+            corpus: Corpus que recebe as respostas
+            transport: Transporte real (padrão: httpx.AsyncHTTPTransport)
+        """
+        self.corpus = corpus
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        try:
+            # Lê o corpo inteiro (mesmo que o cliente pare cedo) já decodificado
+            body = await response.aread()
+        finally:
+            await response.aclose()
+
+        headers = [
+            (name, value) for name, value in response.headers.multi_items()
+            if name.lower() not in _TRANSPORT_HEADERS
+        ]
+        self.corpus.add(RecordedResponse(
+            method=request.method,
+            url=str(request.url),
+            status_code=response.status_code,
+            headers=headers,
+            body=body,
+        ))
+        logger.debug("Resposta gravada no corpus", url=str(request.url), status=response.status_code)
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Transporte que serve as respostas do corpus, sem acesso à rede.
+
+    URLs ausentes do corpus falham como falta de conexão (httpx.ConnectError),
+    o mesmo caminho de erro de um site fora do ar.
+    """
+
+    def __init__(self, corpus: HttpCorpus):
+        self.corpus = corpus
+        self.hits = 0
+        self.misses = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        recorded = self.corpus.get(request.method, str(request.url))
+        if recorded is None:
+            self.misses += 1
+            raise httpx.ConnectError(f"URL fora do corpus: {request.url}", request=request)
+
+        self.hits += 1
+        return httpx.Response(
+            recorded.status_code,
+            headers=recorded.headers,
+            content=recorded.body,
+            request=request,
+        )
@@ -0,0 +1,629 @@
+"""
+Monitor de vagas salvas: re-verifica periodicamente as vagas acompanhadas.
+Usa GET condicional (ETag/Last-Modified), compara hashes do corpo e do texto
+normalizado (só re-parseia quando o corpo muda) e marca as vagas como
+alteradas ou encerradas. Os resultados derivados (cache de scraping e
+ouvintes registrados) só são invalidados quando o texto da vaga muda.
+Vagas encerradas continuam sendo verificadas num intervalo maior e voltam a
+ativas se a página voltar.
+"""
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+import asyncio
+import hashlib
+import ipaddress
+import os
+import re
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+import httpx
+import structlog
+
+from config import settings
+from services.near_duplicates import hamming_distance, simhash
+from services.url_canonicalizer import canonicalize_url
+from services.web_scraper import GONE_STATUS_CODES
+from services.worker_pool import get_worker_pool
+
+logger = structlog.get_logger()
+
+# Estados de uma vaga acompanhada
+STATUS_ACTIVE = "active"
+STATUS_CHANGED = "changed"
+STATUS_CLOSED = "closed"
+
+# Respostas que indicam vaga removida
+CLOSED_STATUS_CODES = GONE_STATUS_CODES
+
+# Avisos de vaga encerrada exibidos no lugar da descrição
+_CLOSED_PATTERN = re.compile(
+    r"vaga (?:foi )?encerrada|vaga não está mais disponível|"
+    r"(?:inscrições|candidaturas) encerradas|processo seletivo encerrado|"
+    r"no longer accepting applications|job (?:is )?no longer available|"
+    r"this (?:job|position) (?:has been|is) closed|job (?:has )?expired",
+    re.IGNORECASE
+)
+
+
+def normalize_text(text: str) -> str:
+    """Texto comparável entre verificações (espaços colapsados, sem caixa)."""
+    return " ".join(text.split()).casefold()
+
+
+def text_hash(text: str) -> str:
+    """Hash do texto normalizado da vaga."""
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def looks_closed(text: str) -> bool:
+    """Indica se o texto da página anuncia a vaga como encerrada."""
+    return bool(_CLOSED_PATTERN.search(text))
+
+
+def validate_monitor_url(url: str):
+    """
+    Recusa URLs que o monitor não deve buscar periodicamente.
+
+    Aceita só http(s) com host público: sem credenciais na URL, sem
+    localhost/nomes internos e sem IPs privados, de loopback ou reservados.
+
+    Raises:
+        ValueError: Se a URL não puder ser acompanhada
+    """
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").rstrip(".").lower()
+    if parsed.scheme not in ("http", "https") or not host:
+        raise ValueError(f"URL inválida para acompanhamento (use http/https): {url}")
+    if parsed.username or parsed.password:
+        raise ValueError(f"URL com credenciais não pode ser acompanhada: {url}")
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        address = None
+    if address is not None:
+        if not address.is_global:
+            raise ValueError(f"Endereço não público não pode ser acompanhado: {host}")
+    elif host == "localhost" or host.endswith((".localhost", ".local", ".internal")) or "." not in host:
+        raise ValueError(f"Host interno não pode ser acompanhado: {host}")
+
+
+@dataclass
+class MonitoredJob:
+    """Vaga acompanhada e o resultado da última verificação."""
+    url: str
+    status: str = STATUS_ACTIVE
+    closed_signals: int = 0  # Sinais seguidos de vaga encerrada (404/410 ou aviso na página)
+    body_hash: str = ""  # Corpo HTTP da última resposta (evita re-parse)
+    text_hash: str = ""  # Texto normalizado da vaga (base da comparação)
+    text_simhash: str = ""  # SimHash (hex) do texto, para medir o tamanho da mudança
+    etag: str = ""
+    last_modified: str = ""
+    added_at: float = 0.0
+    last_checked_at: float = 0.0
+    last_changed_at: float = 0.0
+    checks: int = 0
+    changes: int = 0
+    last_change_distance: int = 0  # Bits diferentes no SimHash (0-64) na última mudança
+    last_error: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class JobChange:
+    """Mudança detectada em uma vaga (entregue aos ouvintes)."""
+    url: str
+    status: str
+    result: Optional[Dict[str, str]]  # Novo resultado parseado (None se encerrada)
+    distance: int
+
+
+class JobMonitorStore:
+    """Vagas acompanhadas em SQLite (":memory:" quando não há diretório de cache)."""
+
+    _FIELDS = [name for name in MonitoredJob.__dataclass_fields__]
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Abre (e cria se necessário) o banco do monitor.
+
+        Args:
+            path: Arquivo SQLite ou ":memory:"
+        """
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS monitored_jobs ("
+            " url TEXT PRIMARY KEY,"
+            " status TEXT NOT NULL,"
+            " body_hash TEXT NOT NULL,"
+            " text_hash TEXT NOT NULL,"
+            " text_simhash TEXT NOT NULL,"
+            " etag TEXT NOT NULL,"
+            " last_modified TEXT NOT NULL,"
+            " added_at REAL NOT NULL,"
+            " last_checked_at REAL NOT NULL,"
+            " last_changed_at REAL NOT NULL,"
+            " checks INTEGER NOT NULL,"
+            " changes INTEGER NOT NULL,"
+            " last_change_distance INTEGER NOT NULL,"
+            " last_error TEXT NOT NULL,"
+            " closed_signals INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(monitored_jobs)")}
+        if "closed_signals" not in columns:
+            # Bancos criados antes da confirmação de vagas encerradas
+            self._db.execute(
+                "ALTER TABLE monitored_jobs ADD COLUMN closed_signals INTEGER NOT NULL DEFAULT 0"
+            )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_monitored_jobs_due"
+            " ON monitored_jobs (status, last_checked_at)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS monitor_lease ("
+            " name TEXT PRIMARY KEY,"
+            " owner TEXT NOT NULL,"
+            " expires_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def _row_to_job(self, row) -> MonitoredJob:
+        return MonitoredJob(**dict(zip(self._FIELDS, row)))
+
+    def get(self, url: str) -> Optional[MonitoredJob]:
+        """Vaga acompanhada pela URL canônica (None se ausente)."""
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT {', '.join(self._FIELDS)} FROM monitored_jobs WHERE url = ?", (url,)
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def save(self, job: MonitoredJob):
+        """Grava (ou substitui) a vaga."""
+        values = [getattr(job, name) for name in self._FIELDS]
+        with self._lock:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO monitored_jobs ({', '.join(self._FIELDS)})"
+                f" VALUES ({', '.join('?' * len(self._FIELDS))})",
+                values
+            )
+            self._db.commit()
+
+    def delete(self, url: str) -> bool:
+        """Remove a vaga; retorna se ela existia."""
+        with self._lock:
+            cursor = self._db.execute("DELETE FROM monitored_jobs WHERE url = ?", (url,))
+            self._db.commit()
+        return cursor.rowcount > 0
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM monitored_jobs").fetchone()[0]
+
+    def count_by_status(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT status, COUNT(*) FROM monitored_jobs GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+    def list(self, status: Optional[str] = None) -> List[MonitoredJob]:
+        """Vagas acompanhadas (opcionalmente filtradas por estado), mais recentes primeiro."""
+        query = f"SELECT {', '.join(self._FIELDS)} FROM monitored_jobs"
+        params: tuple = ()
+        if status:
+            query += " WHERE status = ?"
+            params = (status,)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY added_at DESC", params).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def due(
+        self,
+        checked_before: float,
+        limit: int,
+        closed_checked_before: Optional[float] = None
+    ) -> List[MonitoredJob]:
+        """
+        Vagas com verificação vencida, as mais antigas primeiro.
+
+        Args:
+            checked_before: Vagas abertas verificadas até este instante
+            limit: Máximo de vagas
+            closed_checked_before: Vagas encerradas verificadas até este
+                instante (None deixa as encerradas de fora)
+        """
+        query = (
+            f"SELECT {', '.join(self._FIELDS)} FROM monitored_jobs"
+            " WHERE (status != ? AND last_checked_at <= ?)"
+        )
+        params: list = [STATUS_CLOSED, checked_before]
+        if closed_checked_before is not None:
+            query += " OR (status = ? AND last_checked_at <= ?)"
+            params += [STATUS_CLOSED, closed_checked_before]
+        with self._lock:
+            rows = self._db.execute(
+                query + " ORDER BY last_checked_at LIMIT ?", (*params, limit)
+            ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def acquire_lease(self, owner: str, ttl_seconds: float, name: str = "scheduler") -> bool:
+        """
+        Obtém (ou renova) a posse exclusiva do agendador entre processos.
+
+        Vários workers (gunicorn --workers) abrem o mesmo banco; só o dono do
+        lease verifica vagas. A posse expira se o dono deixar de renová-la.
+
+        Args:
+            owner: Identificador único do processo
+            ttl_seconds: Validade da posse a partir de agora
+            name: Nome do lease
+
+        Returns:
+            True se `owner` detém o lease
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO monitor_lease (name, owner, expires_at) VALUES (?, ?, ?)"
+                " ON CONFLICT(name) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at"
+                " WHERE monitor_lease.owner = excluded.owner OR monitor_lease.expires_at < ?",
+                (name, owner, now + ttl_seconds, now)
+            )
+            self._db.commit()
+        return cursor.rowcount > 0
+
+    def release_lease(self, owner: str, name: str = "scheduler"):
+        """Libera o lease se `owner` for o dono (outro processo assume na próxima rodada)."""
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM monitor_lease WHERE name = ? AND owner = ?", (name, owner)
+            )
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class JobMonitor:
+    """
+    Re-verificação periódica das vagas acompanhadas, em segundo plano.
+
+    Cada verificação custa, no melhor caso, um 304; com corpo novo, só um
+    hash. O parse acontece apenas quando o corpo muda, e a vaga só é marcada
+    como alterada quando o hash do texto normalizado muda (tokens, datas de
+    acesso e scripts que variam a cada resposta não contam).
+
+    Uma vaga só é encerrada após `closed_confirmations` sinais seguidos
+    (404/410, inclusive vindos de proxy, ou aviso de encerramento na página):
+    um sinal isolado pode ser falha transitória ou falso positivo. Encerradas
+    são re-verificadas a cada `closed_interval_seconds` e reabertas se a
+    página voltar.
+
+    Com vários processos sobre o mesmo banco, só o dono do lease no SQLite
+    executa as rodadas; os demais apenas atendem as rotas do monitor.
+
+    O acesso ao SQLite roda em threads (asyncio.to_thread) e o SimHash no
+    worker pool, para não bloquear o event loop.
+    """
+
+    def __init__(
+        self,
+        scraper,
+        store: Optional[JobMonitorStore] = None,
+        interval_seconds: Optional[float] = None,
+        poll_seconds: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        lease_seconds: Optional[float] = None,
+        closed_confirmations: Optional[int] = None,
+        closed_interval_seconds: Optional[float] = None
+    ):
+        """
+        Inicializa o monitor.
+
+        Args:
+            scraper: WebScraper usado nos fetches (estratégias, proxies, limites por host)
+            store: Armazenamento das vagas (padrão: SQLite no diretório de cache)
+            interval_seconds: Intervalo entre verificações da mesma vaga
+            poll_seconds: Frequência com que o monitor procura vagas vencidas
+            batch_size: Máximo de vagas verificadas por rodada
+            concurrency: Verificações simultâneas
+            lease_seconds: Validade da posse do agendador entre processos
+            closed_confirmations: Sinais seguidos de vaga encerrada para encerrá-la
+            closed_interval_seconds: Intervalo entre verificações das vagas encerradas
+        """
+        if store is None:
+            path = (
+                str(Path(settings.cache_dir) / "job_monitor.sqlite3")
+                if settings.cache_dir
+                else ":memory:"
+            )
+            store = JobMonitorStore(path)
+        self.scraper = scraper
+        self.store = store
+        self.interval_seconds = interval_seconds or settings.job_monitor_interval_seconds
+        self.poll_seconds = poll_seconds or settings.job_monitor_poll_seconds
+        self.batch_size = batch_size or settings.job_monitor_batch_size
+        self.concurrency = max(1, concurrency or settings.job_monitor_concurrency)
+        self.max_jobs = settings.job_monitor_max_jobs
+        self.closed_confirmations = max(1, closed_confirmations or settings.job_monitor_closed_confirmations)
+        self.closed_interval_seconds = closed_interval_seconds or settings.job_monitor_closed_interval_seconds
+        self.lease_seconds = max(
+            lease_seconds or settings.job_monitor_lease_seconds, self.poll_seconds * 2
+        )
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+        self._listeners: List[Callable[[JobChange], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {
+            "checks": 0, "not_modified": 0, "body_unchanged": 0, "parses": 0,
+            "changed": 0, "closed": 0, "closed_signals": 0, "reopened": 0, "errors": 0,
+        }
+
+    def add_listener(self, listener: Callable[[JobChange], None]):
+        """Registra um callback chamado quando uma vaga muda ou é encerrada."""
+        self._listeners.append(listener)
+
+    async def watch(self, url: str) -> MonitoredJob:
+        """
+        Passa a acompanhar a vaga (ou reinicia a base de comparação).
+
+        Se o scraping da vaga estiver em cache, ele vira a base e a primeira
+        verificação fica para o próximo intervalo; senão, a vaga é verificada
+        na próxima rodada.
+
+        Raises:
+            ValueError: Se a URL não puder ser acompanhada ou o limite de
+                vagas acompanhadas for atingido
+        """
+        validate_monitor_url(url)
+        key = canonicalize_url(url)
+        job = await asyncio.to_thread(self.store.get, key)
+        if job is None and await asyncio.to_thread(self.store.count) >= self.max_jobs:
+            raise ValueError(f"Limite de {self.max_jobs} vagas acompanhadas atingido")
+
+        now = time.time()
+        job = MonitoredJob(url=key, added_at=job.added_at if job else now)
+        cached = await self.scraper.cache.aget(key) if self.scraper.cache else None
+        if cached is not None and cached.value.get("fullText"):
+            full_text = cached.value["fullText"]
+            job.text_hash = text_hash(full_text)
+            job.text_simhash = format(await self._simhash(full_text), "016x")
+            job.etag = cached.metadata.get("etag", "")
+            job.last_modified = cached.metadata.get("last_modified", "")
+            job.last_checked_at = now
+        await self._save(job)
+        logger.info("Vaga adicionada ao monitor", url=key, baseline=bool(job.text_hash))
+        return job
+
+    async def unwatch(self, url: str) -> bool:
+        """Deixa de acompanhar a vaga; retorna se ela era acompanhada."""
+        return await asyncio.to_thread(self.store.delete, canonicalize_url(url))
+
+    async def get(self, url: str) -> Optional[MonitoredJob]:
+        return await asyncio.to_thread(self.store.get, canonicalize_url(url))
+
+    async def list_jobs(self, status: Optional[str] = None) -> List[MonitoredJob]:
+        """Vagas acompanhadas (opcionalmente filtradas por estado)."""
+        return await asyncio.to_thread(self.store.list, status)
+
+    async def _save(self, job: MonitoredJob):
+        await asyncio.to_thread(self.store.save, job)
+
+    @staticmethod
+    async def _simhash(text: str) -> int:
+        return await get_worker_pool().run(simhash, text, size_hint=len(text))
+
+    async def check(self, url: str) -> MonitoredJob:
+        """
+        Verifica uma vaga acompanhada agora.
+
+        Raises:
+            ValueError: Se a vaga não for acompanhada
+        """
+        job = await self.get(url)
+        if job is None:
+            raise ValueError(f"Vaga não acompanhada: {url}")
+
+        self.stats["checks"] += 1
+        job.checks += 1
+        job.last_checked_at = time.time()
+        headers = {}
+        if job.text_hash and job.etag:
+            headers["If-None-Match"] = job.etag
+        if job.text_hash and job.last_modified:
+            headers["If-Modified-Since"] = job.last_modified
+
+        try:
+            page = await self.scraper.fetch_job_page(job.url, headers=headers)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in CLOSED_STATUS_CODES:
+                return await self._closed_signal(job, f"HTTP {e.response.status_code}")
+            return await self._mark_error(job, f"HTTP {e.response.status_code}")
+        except Exception as e:
+            return await self._mark_error(job, str(e).splitlines()[0] if str(e) else type(e).__name__)
+
+        job.last_error = ""
+        if page.status_code == 304:
+            self.stats["not_modified"] += 1
+            return await self._still_open(job)
+
+        job.etag = page.headers.get("etag", "")
+        job.last_modified = page.headers.get("last-modified", "")
+        body_hash = hashlib.sha1(page.body).hexdigest()
+        if body_hash == job.body_hash:
+            self.stats["body_unchanged"] += 1
+            return await self._still_open(job)
+        job.body_hash = body_hash
+
+        self.stats["parses"] += 1
+        result = await self.scraper.parse_fetched_page(page, job.url)
+        full_text = result.get("fullText", "")
+        if looks_closed(full_text):
+            # A mesma página de aviso precisa ser parseada de novo para confirmar
+            job.body_hash, job.etag, job.last_modified = "", "", ""
+            return await self._closed_signal(job, "Aviso de vaga encerrada na página")
+
+        reopened = self._reopen(job)
+        new_hash = text_hash(full_text)
+        new_simhash = await self._simhash(full_text)
+        if not job.text_hash:
+            # Primeira verificação: estabelece a base de comparação
+            job.text_hash, job.text_simhash = new_hash, format(new_simhash, "016x")
+            await self.scraper.invalidate(job.url, result, {"etag": job.etag, "last_modified": job.last_modified})
+        elif new_hash != job.text_hash:
+            distance = hamming_distance(int(job.text_simhash or "0", 16), new_simhash)
+            job.text_hash, job.text_simhash = new_hash, format(new_simhash, "016x")
+            job.status = STATUS_CHANGED
+            job.changes += 1
+            job.last_changed_at = job.last_checked_at
+            job.last_change_distance = distance
+            self.stats["changed"] += 1
+            logger.info("Vaga alterada", url=job.url, distance=distance)
+            await self.scraper.invalidate(job.url, result, {"etag": job.etag, "last_modified": job.last_modified})
+            self._notify(JobChange(job.url, STATUS_CHANGED, result, distance))
+            reopened = False
+
+        await self._save(job)
+        if reopened:
+            self._notify(JobChange(job.url, job.status, result, 0))
+        return job
+
+    async def _still_open(self, job: MonitoredJob) -> MonitoredJob:
+        """Página inalterada desde a última verificação: a vaga segue no ar."""
+        reopened = self._reopen(job)
+        await self._save(job)
+        if reopened:
+            self._notify(JobChange(job.url, job.status, None, 0))
+        return job
+
+    def _reopen(self, job: MonitoredJob) -> bool:
+        """Zera os sinais de encerramento; retorna se a vaga estava encerrada."""
+        job.closed_signals = 0
+        if job.status != STATUS_CLOSED:
+            return False
+        job.status = STATUS_ACTIVE
+        job.last_changed_at = job.last_checked_at
+        self.stats["reopened"] += 1
+        logger.info("Vaga encerrada voltou ao ar", url=job.url)
+        return True
+
+    async def _closed_signal(self, job: MonitoredJob, reason: str) -> MonitoredJob:
+        """Sinal de vaga encerrada: encerra só após `closed_confirmations` seguidos."""
+        job.closed_signals += 1
+        self.stats["closed_signals"] += 1
+        if job.status != STATUS_CLOSED and job.closed_signals >= self.closed_confirmations:
+            return await self._mark_closed(job, reason)
+
+        job.last_error = reason
+        if job.status != STATUS_CLOSED:
+            job.last_error += f" (sinal {job.closed_signals} de {self.closed_confirmations})"
+        await self._save(job)
+        return job
+
+    async def _mark_closed(self, job: MonitoredJob, reason: str) -> MonitoredJob:
+        job.status = STATUS_CLOSED
+        job.last_changed_at = job.last_checked_at
+        job.last_error = reason
+        self.stats["closed"] += 1
+        await self._save(job)
+        logger.info("Vaga encerrada", url=job.url, reason=reason)
+        await self.scraper.invalidate(job.url)
+        self._notify(JobChange(job.url, STATUS_CLOSED, None, 64))
+        return job
+
+    async def _mark_error(self, job: MonitoredJob, reason: str) -> MonitoredJob:
+        """Falha transitória: mantém o estado e tenta de novo no próximo intervalo."""
+        job.last_error = reason
+        self.stats["errors"] += 1
+        await self._save(job)
+        logger.debug("Verificação de vaga falhou", url=job.url, error=reason)
+        return job
+
+    def _notify(self, change: JobChange):
+        for listener in self._listeners:
+            try:
+                listener(change)
+            except Exception as e:
+                logger.warning("Ouvinte do monitor de vagas falhou", url=change.url, error=str(e))
+
+    async def run_once(self) -> List[MonitoredJob]:
+        """Verifica as vagas vencidas (até `batch_size`), com concorrência limitada."""
+        now = time.time()
+        due = await asyncio.to_thread(
+            self.store.due,
+            now - self.interval_seconds,
+            self.batch_size,
+            now - self.closed_interval_seconds
+        )
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def check(job: MonitoredJob) -> MonitoredJob:
+            async with semaphore:
+                return await self.check(job.url)
+
+        return list(await asyncio.gather(*(check(job) for job in due)))
+
+    async def _hold_lease(self) -> bool:
+        """Obtém ou renova o lease do agendador; registra mudanças de posse."""
+        try:
+            leader = await asyncio.to_thread(self.store.acquire_lease, self.owner, self.lease_seconds)
+        except sqlite3.Error as e:
+            logger.warning("Falha ao obter lease do monitor de vagas", error=str(e))
+            leader = False
+        if leader != self.is_leader:
+            logger.info("Posse do monitor de vagas alterada", owner=self.owner, leader=leader)
+            self.is_leader = leader
+        return leader
+
+    async def _run(self):
+        while True:
+            try:
+                if await self._hold_lease():
+                    checked = await self.run_once()
+                    if checked:
+                        logger.info("Rodada do monitor de vagas concluída", checked=len(checked))
+                        # Rodadas longas não podem deixar o lease expirar no meio
+                        await self._hold_lease()
+            except Exception as e:
+                logger.warning("Rodada do monitor de vagas falhou", error=str(e))
+            await asyncio.sleep(self.poll_seconds)
+
+    def start(self):
+        """Inicia a verificação periódica em segundo plano."""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Interrompe a verificação periódica e fecha o armazenamento."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.is_leader:
+            await asyncio.to_thread(self.store.release_lease, self.owner)
+            self.is_leader = False
+        await asyncio.to_thread(self.store.close)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores das verificações e vagas por estado."""
+        return {
+            "interval_seconds": self.interval_seconds,
+            "leader": self.is_leader,
+            "jobs": self.store.count_by_status(),
+            **self.stats,
+        }
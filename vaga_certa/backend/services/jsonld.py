@@ -0,0 +1,233 @@
+"""
+Extração rápida de vagas a partir de blocos JSON-LD (schema.org JobPosting).
+Varre o HTML bruto com regex, sem construir a árvore DOM completa.
+"""
+from typing import Any, Dict, Iterator, Optional, Union
+import codecs
+import html as html_lib
+import json
+import re
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+    _JSON_ERRORS = (orjson.JSONDecodeError, ValueError)
+except ImportError:  # pragma: no cover - orjson é opcional
+    _json_loads = json.loads
+    _JSON_ERRORS = (ValueError,)
+
+
+_LD_JSON_PATTERN = re.compile(
+    r"<script[^>]*?type\s*=\s*[\"']?application/ld\+json[\"']?[^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL
+)
+_LD_JSON_PATTERN_BYTES = re.compile(_LD_JSON_PATTERN.pattern.encode(), re.IGNORECASE | re.DOTALL)
+_SCRIPT_OPEN_BYTES = re.compile(rb"<script", re.IGNORECASE)
+_SCRIPT_CLOSE_BYTES = re.compile(rb"</script", re.IGNORECASE)
+# Bytes revistos entre partes para não perder uma tag cortada na fronteira
+_CHUNK_OVERLAP = 16
+
+_BLOCK_TAG_PATTERN = re.compile(r"<\s*(br|/p|/div|/h[1-6]|/ul|/ol|/tr)\b[^>]*>", re.IGNORECASE)
+_LIST_ITEM_PATTERN = re.compile(r"<\s*li\b[^>]*>", re.IGNORECASE)
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+_SPACES_PATTERN = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES_PATTERN = re.compile(r"\n\s*\n\s*\n+")
+
+# Descrições curtas demais não substituem o parse completo da página
+MIN_DESCRIPTION_CHARS = 200
+
+
+def _is_utf8_compatible(encoding: Optional[str]) -> bool:
+    """Indica se bytes no encoding podem ir direto ao decoder JSON (UTF-8)."""
+    if not encoding:
+        return True
+    try:
+        return codecs.lookup(encoding).name in ("utf-8", "ascii")
+    except LookupError:
+        return True
+
+
+def iter_ld_json_blocks(html: Union[str, bytes], encoding: Optional[str] = None) -> Iterator[Any]:
+    """
+    Itera sobre os blocos JSON-LD decodificados do HTML bruto.
+
+    Args:
+        html: HTML da página (str ou bytes)
+        encoding: Encoding dos bytes (None = UTF-8); só os blocos JSON-LD
+            são decodificados quando o encoding não é compatível com UTF-8
+
+    Yields:
+        Objetos JSON decodificados (blocos inválidos são ignorados)
+    """
+    pattern = _LD_JSON_PATTERN_BYTES if isinstance(html, bytes) else _LD_JSON_PATTERN
+    decode_blocks = isinstance(html, bytes) and not _is_utf8_compatible(encoding)
+    for match in pattern.finditer(html):
+        raw = match.group(1).strip()
+        if not raw:
+            continue
+        if decode_blocks:
+            raw = raw.decode(encoding, errors="replace")
+        try:
+            yield _json_loads(raw)
+        except _JSON_ERRORS:
+            continue
+
+
+def find_job_posting(data: Any) -> Optional[Dict[str, Any]]:
+    """
+    Localiza o primeiro objeto JobPosting em um bloco JSON-LD.
+
+    Aceita objeto único, lista de objetos e `@graph`.
+
+    Args:
+        data: Bloco JSON-LD decodificado
+
+    Returns:
+        Objeto JobPosting ou None
+    """
+    items = data if isinstance(data, list) else [data]
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+
+        item_type = item.get("@type")
+        types = item_type if isinstance(item_type, list) else [item_type]
+        if "JobPosting" in types:
+            return item
+
+        if "@graph" in item:
+            found = find_job_posting(item["@graph"])
+            if found:
+                return found
+
+    return None
+
+
+def job_posting_fields(item: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Normaliza título, empresa e descrição (HTML bruto) de um JobPosting.
+
+    Args:
+        item: Objeto JobPosting
+
+    Returns:
+        Dicionário com title, company e description
+    """
+    org = item.get("hiringOrganization", {})
+    if isinstance(org, dict):
+        company = org.get("name", "")
+    else:
+        company = str(org)
+
+    return {
+        "title": str(item.get("title") or item.get("name", "")),
+        "company": str(company or ""),
+        "description": str(item.get("description", "")),
+    }
+
+
+def html_to_text(fragment: str) -> str:
+    """
+    Converte um fragmento HTML em texto simples sem construir DOM.
+
+    Preserva quebras de linha de blocos e marca itens de lista com "- ".
+
+    Args:
+        fragment: Fragmento HTML (pode vir com entidades escapadas)
+
+    Returns:
+        Texto limpo
+    """
+    # Descrições de alguns boards chegam com o HTML escapado (&lt;p&gt;)
+    text = html_lib.unescape(fragment) if "&lt;" in fragment else fragment
+    text = _LIST_ITEM_PATTERN.sub("\n- ", text)
+    text = _BLOCK_TAG_PATTERN.sub("\n", text)
+    text = _TAG_PATTERN.sub("", text)
+    text = html_lib.unescape(text)
+    text = _SPACES_PATTERN.sub(" ", text)
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    text = _BLANK_LINES_PATTERN.sub("\n\n", text)
+    return text.strip()
+
+
+def extract_job_posting_fast(
+    html: Union[str, bytes],
+    encoding: Optional[str] = None
+) -> Optional[Dict[str, str]]:
+    """
+    Caminho rápido: extrai a vaga apenas do JSON-LD, sem BeautifulSoup.
+
+    Só retorna quando o JobPosting está completo (título, empresa e
+    descrição com tamanho mínimo); caso contrário o chamador deve seguir
+    para o parse completo da página.
+
+    Args:
+        html: HTML da página (str ou bytes)
+        encoding: Encoding dos bytes (None = UTF-8)
+
+    Returns:
+        Dicionário com title, company, description e fullText, ou None
+    """
+    for block in iter_ld_json_blocks(html, encoding):
+        item = find_job_posting(block)
+        if not item:
+            continue
+
+        fields = job_posting_fields(item)
+        title = fields["title"].strip()
+        company = fields["company"].strip()
+        description = html_to_text(fields["description"])
+
+        if not title or not company or len(description) < MIN_DESCRIPTION_CHARS:
+            return None
+
+        return {
+            "title": title,
+            "company": company,
+            "description": description,
+            "fullText": f"{title}\n{company}\n\n{description}",
+        }
+
+    return None
+
+
+class JobPostingStreamDetector:
+    """
+    Detector incremental de JobPosting completo em HTML recebido por partes.
+
+    Cada chamada a `check` varre apenas o trecho ainda não analisado do
+    buffer, permitindo encerrar o download assim que o bloco JSON-LD da vaga
+    estiver disponível.
+    """
+
+    def __init__(self):
+        self._scan_from = 0
+
+    def check(self, buffer: Union[bytes, bytearray]) -> bool:
+        """
+        Verifica se o buffer já contém um JobPosting completo.
+
+        Args:
+            buffer: Bytes recebidos até o momento (acumulados)
+
+        Returns:
+            True se o caminho rápido já consegue extrair a vaga
+        """
+        for match in _LD_JSON_PATTERN_BYTES.finditer(buffer, self._scan_from):
+            self._scan_from = match.end()
+            if extract_job_posting_fast(bytes(match.group(0))):
+                return True
+
+        # Próxima varredura começa na última <script> ainda aberta; sem tag
+        # pendente, só a sobreposição do fim do buffer precisa ser revista
+        last_open = None
+        for open_tag in _SCRIPT_OPEN_BYTES.finditer(buffer, self._scan_from):
+            last_open = open_tag.start()
+
+        if last_open is not None and not _SCRIPT_CLOSE_BYTES.search(buffer, last_open):
+            self._scan_from = last_open
+        else:
+            self._scan_from = max(self._scan_from, len(buffer) - _CHUNK_OVERLAP)
+
+        return False
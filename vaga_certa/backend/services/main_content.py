@@ -0,0 +1,356 @@
+"""
+Extração do conteúdo principal da página de vaga (estilo readability).
+Pontua os blocos da árvore lxml por densidade de texto e de links e devolve só
+o corpo da vaga, sem banners de cookies, listas de "vagas semelhantes",
+barras laterais e menus, reduzindo o texto enviado ao LLM.
+Árvores BeautifulSoup já parseadas são lidas por `soup_tree`, sem novo parse.
+"""
+from typing import Dict, Iterator, List, Optional, Tuple
+import re
+
+from bs4 import Tag
+from bs4.element import PreformattedString
+from lxml import etree
+
+# Parágrafos mais curtos não pontuam (rótulos, botões, itens de menu)
+MIN_PARAGRAPH_CHARS = 25
+
+# Conteúdo principal menor que isso não substitui o texto completo da página
+MIN_MAIN_CONTENT_CHARS = 200
+
+# Subárvores nunca consideradas conteúdo
+EXCLUDED_TAGS = frozenset({
+    "script", "style", "nav", "footer", "header", "template", "aside", "form",
+    "button", "noscript", "iframe", "svg", "select", "dialog",
+})
+
+# Elementos cujo texto pontua os ancestrais
+PARAGRAPH_TAGS = frozenset({"p", "li", "pre", "dd", "blockquote", "td"})
+
+# Um div sem nenhum destes filhos é tratado como parágrafo
+BLOCK_TAGS = frozenset({
+    "div", "p", "ul", "ol", "dl", "table", "section", "article", "pre", "blockquote",
+    "h1", "h2", "h3", "h4", "h5", "h6",
+})
+
+# Blocos descartados dentro do conteúdo quando são majoritariamente links
+LINK_LIST_TAGS = frozenset({"div", "section", "ul", "ol", "table", "dl"})
+
+TAG_WEIGHTS = {
+    "article": 10, "main": 10, "div": 5, "section": 3, "pre": 3, "td": 3, "blockquote": 3,
+    "ul": -3, "ol": -3, "dl": -3, "dd": -3, "li": -3, "form": -3,
+    "h1": -5, "h2": -5, "h3": -5, "h4": -5, "h5": -5, "h6": -5, "th": -5,
+}
+
+_UNLIKELY_PATTERN = re.compile(
+    r"cookie|consent|banner|sidebar|similar|related|recommend|share|social|comment|"
+    r"newsletter|popup|modal|breadcrumb|footer|menu|nav|promo|sponsor|advert",
+    re.I
+)
+_MAYBE_PATTERN = re.compile(r"article|body|column|content|main|description", re.I)
+_POSITIVE_PATTERN = re.compile(
+    r"article|body|content|entry|main|post|text|description|job|vaga|posting|details",
+    re.I
+)
+_NEGATIVE_PATTERN = re.compile(
+    r"cookie|consent|banner|sidebar|similar|related|recommend|share|social|comment|"
+    r"footer|menu|nav|promo|sponsor|widget|masthead|meta|outbrain|taboola",
+    re.I
+)
+_HIDDEN_STYLE_PATTERN = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.I)
+
+# (caracteres de texto, caracteres dentro de links, vírgulas)
+TextStats = Tuple[int, int, int]
+
+
+class SoupNode:
+    """
+    Nó de uma árvore BeautifulSoup com a parte da interface de
+    lxml.etree._Element usada na pontuação (tag, text, tail, get, filhos e
+    ancestrais). Hash por identidade: o hash de um Tag serializa a subárvore.
+    """
+
+    __slots__ = ("tag", "text", "tail", "attrib", "children", "parent")
+
+    def __init__(self, tag: Optional[str], attrib: Dict[str, str], parent: Optional["SoupNode"]):
+        self.tag = tag  # None para comentários e afins (como as tags não-str do lxml)
+        self.text: Optional[str] = None
+        self.tail: Optional[str] = None
+        self.attrib = attrib
+        self.children: List["SoupNode"] = []
+        self.parent = parent
+
+    def get(self, name: str, default=None):
+        return self.attrib.get(name, default)
+
+    def __iter__(self) -> Iterator["SoupNode"]:
+        return iter(self.children)
+
+    def __reversed__(self) -> Iterator["SoupNode"]:
+        return reversed(self.children)
+
+    def __len__(self) -> int:
+        return len(self.children)
+
+    def iter(self) -> Iterator["SoupNode"]:
+        """Este nó e os descendentes, em ordem de documento."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def iterancestors(self) -> Iterator["SoupNode"]:
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def getparent(self) -> Optional["SoupNode"]:
+        return self.parent
+
+
+def soup_tree(root: Tag) -> SoupNode:
+    """
+    Espelha uma árvore BeautifulSoup já parseada em nós SoupNode.
+
+    Uma passada sobre os nós existentes, sem parse: textos antes do primeiro
+    filho viram `text` e os seguintes a cada filho viram `tail`, como no lxml.
+
+    Args:
+        root: Tag raiz (normalmente soup.html)
+
+    Returns:
+        Raiz espelhada, aceita por `extract_main_text`
+    """
+    def attributes(tag: Tag) -> Dict[str, str]:
+        return {
+            name: " ".join(value) if isinstance(value, list) else value
+            for name, value in tag.attrs.items()
+        }
+
+    top = SoupNode(root.name, attributes(root), None)
+    stack = [(root, top)]
+    while stack:
+        tag, node = stack.pop()
+        for child in tag.children:
+            if isinstance(child, Tag):
+                child_node = SoupNode(child.name, attributes(child), node)
+                node.children.append(child_node)
+                stack.append((child, child_node))
+            elif isinstance(child, PreformattedString):
+                node.children.append(SoupNode(None, {}, node))
+            elif node.children:
+                last = node.children[-1]
+                last.tail = (last.tail or "") + child
+            else:
+                node.text = (node.text or "") + child
+    return top
+
+
+def _class_and_id(element: etree._Element) -> str:
+    return f"{element.get('class', '')} {element.get('id', '')}"
+
+
+def _is_excluded(element: etree._Element) -> bool:
+    """Indica se a subárvore fica fora do conteúdo (ruído, oculta ou improvável)."""
+    if not isinstance(element.tag, str):
+        return True  # Comentários e instruções de processamento
+    tag = element.tag.lower()
+    if tag in EXCLUDED_TAGS:
+        return True
+    if element.get("hidden") is not None or element.get("aria-hidden") == "true":
+        return True
+    if _HIDDEN_STYLE_PATTERN.search(element.get("style", "")):
+        return True
+    if tag in ("html", "body", "article", "main"):
+        return False
+    names = _class_and_id(element)
+    return bool(_UNLIKELY_PATTERN.search(names)) and not _MAYBE_PATTERN.search(names)
+
+
+def _text_stats(root: etree._Element) -> Dict[etree._Element, TextStats]:
+    """
+    Conta texto, texto de links e vírgulas de cada elemento em uma única
+    passada (filhos antes dos pais, sem recursão); subárvores excluídas
+    ficam fora do dicionário.
+    """
+    stats: Dict[etree._Element, TextStats] = {}
+    for element in reversed(list(root.iter())):
+        if _is_excluded(element):
+            continue
+
+        own_text = (element.text or "").strip()
+        chars, commas = len(own_text), own_text.count(",")
+        link_chars = 0
+        for child in element:
+            child_chars, child_links, child_commas = stats.get(child, (0, 0, 0))
+            tail = (child.tail or "").strip()
+            chars += child_chars + len(tail)
+            link_chars += child_links
+            commas += child_commas + tail.count(",")
+
+        if element.tag.lower() == "a":
+            link_chars = chars
+        stats[element] = (chars, link_chars, commas)
+    return stats
+
+
+def _is_paragraph(element: etree._Element) -> bool:
+    """Parágrafos de texto, incluindo divs usados como parágrafo."""
+    tag = element.tag.lower()
+    if tag in PARAGRAPH_TAGS:
+        return True
+    return tag == "div" and not any(
+        isinstance(child.tag, str) and child.tag.lower() in BLOCK_TAGS for child in element
+    )
+
+
+def _link_density(stats: TextStats) -> float:
+    chars, link_chars, _ = stats
+    return link_chars / chars if chars else 0.0
+
+
+def _initial_score(element: etree._Element) -> float:
+    """Pontuação inicial do candidato pela tag e pelos nomes de classe/id."""
+    score = TAG_WEIGHTS.get(element.tag.lower(), 0)
+    names = _class_and_id(element)
+    if _POSITIVE_PATTERN.search(names):
+        score += 25
+    if _NEGATIVE_PATTERN.search(names):
+        score -= 25
+    return score
+
+
+def _score_candidates(stats: Dict[etree._Element, TextStats]) -> Dict[etree._Element, float]:
+    """Distribui a pontuação dos parágrafos entre até três ancestrais."""
+    scores: Dict[etree._Element, float] = {}
+    for element, (chars, _, commas) in stats.items():
+        if chars < MIN_PARAGRAPH_CHARS or not _is_paragraph(element):
+            continue
+
+        paragraph_score = 1 + commas + min(chars // 100, 3)
+        for level, ancestor in enumerate(element.iterancestors()):
+            if level == 3 or ancestor not in stats:
+                break
+            if ancestor not in scores:
+                scores[ancestor] = _initial_score(ancestor)
+            scores[ancestor] += paragraph_score / (1, 2, 6)[level]
+
+    return {
+        element: score * (1 - _link_density(stats[element]))
+        for element, score in scores.items()
+    }
+
+
+def _pick_top_candidate(scores: Dict[etree._Element, float]) -> etree._Element:
+    """
+    Escolhe o melhor candidato; se outros candidatos com pontuação próxima
+    estiverem sob um ancestral comum (ex.: várias listas de requisitos em
+    sequência), sobe até esse ancestral para não cortar seções da vaga.
+    """
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    top, top_score = ranked[0]
+    alternatives = [
+        element for element, score in ranked[1:6] if score >= top_score * 0.75
+    ]
+    if len(alternatives) < 2:
+        return top
+
+    for ancestor in top.iterancestors():
+        contained = sum(1 for element in alternatives if ancestor in set(element.iterancestors()))
+        if contained >= 2:
+            return ancestor
+    return top
+
+
+def _content_nodes(
+    top: etree._Element,
+    scores: Dict[etree._Element, float],
+    stats: Dict[etree._Element, TextStats]
+) -> List[etree._Element]:
+    """Candidato vencedor mais os irmãos com pontuação ou texto relevantes."""
+    parent = top.getparent()
+    if parent is None:
+        return [top]
+
+    threshold = max(10.0, scores.get(top, 0.0) * 0.2)
+    nodes = []
+    for sibling in parent:
+        if sibling is top:
+            nodes.append(sibling)
+        elif sibling in stats and scores.get(sibling, 0.0) >= threshold:
+            nodes.append(sibling)
+        elif (
+            sibling in stats
+            and sibling.tag.lower() == "p"
+            and stats[sibling][0] > 80
+            and _link_density(stats[sibling]) < 0.25
+        ):
+            nodes.append(sibling)
+    return nodes
+
+
+def _visible_text(
+    element: etree._Element,
+    stats: Dict[etree._Element, TextStats],
+    pieces: List[str]
+):
+    """Acumula o texto do elemento, pulando subárvores excluídas e listas de links."""
+    stack = [(element, False)]
+    while stack:
+        node, closing = stack.pop()
+        if closing:
+            tail = (node.tail or "").strip()
+            if tail and node is not element:
+                pieces.append(tail)
+            continue
+
+        stack.append((node, True))
+        node_stats = stats.get(node)
+        if node_stats is None:
+            continue
+        if (
+            node is not element
+            and node.tag.lower() in LINK_LIST_TAGS
+            and _link_density(node_stats) > 0.5
+        ):
+            continue
+
+        text = (node.text or "").strip()
+        if text:
+            pieces.append(text)
+        stack.extend((child, False) for child in reversed(node))
+
+
+def extract_main_text(root: Optional[etree._Element]) -> Optional[str]:
+    """
+    Extrai o texto do conteúdo principal da página.
+
+    Não modifica a árvore. O texto sai com um bloco de texto por linha, sem
+    normalizar espaços (a limpeza final fica com quem chama).
+
+    Args:
+        root: Raiz da árvore lxml.html do documento (ou de `soup_tree`)
+
+    Returns:
+        Texto do conteúdo principal, ou None se não houver candidato com
+        texto suficiente (quem chama mantém o texto completo da página)
+    """
+    if root is None:
+        return None
+
+    stats = _text_stats(root)
+    scores = _score_candidates(stats)
+    if not scores:
+        return None
+
+    top = _pick_top_candidate(scores)
+    pieces: List[str] = []
+    for node in _content_nodes(top, scores, stats):
+        _visible_text(node, stats, pieces)
+
+    text = "\n".join(pieces)
+    if len(text) < MIN_MAIN_CONTENT_CHARS:
+        return None
+    return text
@@ -0,0 +1,159 @@
+"""
+Detecção de vagas quase idênticas via SimHash com bandas LSH.
+A mesma vaga aparece em vários sites ou URLs com pequenas diferenças de texto;
+o índice reconhece essas cópias para reaproveitar a extração já feita.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+from collections import Counter, OrderedDict
+import hashlib
+import re
+
+FINGERPRINT_BITS = 64
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _hash64(value: str) -> int:
+    """Hash estável de 64 bits (independente de PYTHONHASHSEED)."""
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    Calcula o SimHash de 64 bits do texto.
+
+    Usa shingles de palavras (sequências de `shingle_size` palavras em
+    minúsculas) ponderados pela frequência; textos parecidos geram
+    fingerprints com poucos bits diferentes.
+
+    Args:
+        text: Texto limpo da vaga
+        shingle_size: Palavras por shingle
+
+    Returns:
+        Fingerprint de 64 bits (0 para texto vazio)
+    """
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    if len(tokens) < shingle_size:
+        shingles = Counter([" ".join(tokens)] if tokens else [])
+    else:
+        shingles = Counter(
+            " ".join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1)
+        )
+
+    weights = [0] * FINGERPRINT_BITS
+    for shingle, weight in shingles.items():
+        hashed = _hash64(shingle)
+        for bit in range(FINGERPRINT_BITS):
+            if hashed >> bit & 1:
+                weights[bit] += weight
+            else:
+                weights[bit] -= weight
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Número de bits diferentes entre dois fingerprints."""
+    return bin(a ^ b).count("1")
+
+
+class SimHashIndex:
+    """
+    Índice incremental de fingerprints SimHash com busca por bandas (LSH).
+
+    O fingerprint é dividido em `max_distance + 1` bandas: pelo princípio da
+    casa dos pombos, dois fingerprints a até `max_distance` bits de distância
+    compartilham ao menos uma banda idêntica, então só os candidatos dessas
+    bandas são comparados. Guarda apenas chave e inteiro por vaga (LRU).
+    """
+
+    def __init__(self, max_distance: int = 2, max_entries: int = 10000):
+        """
+        Inicializa o índice vazio.
+
+        Args:
+            max_distance: Distância de Hamming máxima para considerar duplicata
+            max_entries: Máximo de fingerprints mantidos (os mais antigos saem)
+        """
+        self.max_distance = max(0, max_distance)
+        self.max_entries = max_entries
+        self.bands = min(self.max_distance + 1, FINGERPRINT_BITS)
+        self._band_bits = FINGERPRINT_BITS // self.bands
+        self._fingerprints: "OrderedDict[str, int]" = OrderedDict()
+        self._buckets: List[Dict[int, Set[str]]] = [{} for _ in range(self.bands)]
+        self.stats: Counter = Counter()
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def _band_values(self, fingerprint: int) -> List[int]:
+        """Valores de cada banda (a última absorve os bits restantes)."""
+        mask = (1 << self._band_bits) - 1
+        values = [(fingerprint >> (i * self._band_bits)) & mask for i in range(self.bands - 1)]
+        values.append(fingerprint >> ((self.bands - 1) * self._band_bits))
+        return values
+
+    def add(self, key: str, fingerprint: int):
+        """Insere (ou atualiza) o fingerprint de uma chave."""
+        self.remove(key)
+        self._fingerprints[key] = fingerprint
+        for band, value in enumerate(self._band_values(fingerprint)):
+            self._buckets[band].setdefault(value, set()).add(key)
+
+        while len(self._fingerprints) > self.max_entries:
+            oldest = next(iter(self._fingerprints))
+            self.remove(oldest)
+
+    def remove(self, key: str):
+        """Remove a chave do índice (se existir)."""
+        fingerprint = self._fingerprints.pop(key, None)
+        if fingerprint is None:
+            return
+        for band, value in enumerate(self._band_values(fingerprint)):
+            bucket = self._buckets[band].get(value)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][value]
+
+    def find(self, fingerprint: int, exclude: Optional[str] = None) -> Optional[Tuple[str, int]]:
+        """
+        Busca a chave mais próxima dentro de `max_distance`.
+
+        Args:
+            fingerprint: Fingerprint consultado
+            exclude: Chave ignorada na busca (ex.: a própria URL)
+
+        Returns:
+            Tupla (chave, distância) ou None se não houver duplicata
+        """
+        candidates: Set[str] = set()
+        for band, value in enumerate(self._band_values(fingerprint)):
+            candidates.update(self._buckets[band].get(value, ()))
+        candidates.discard(exclude)
+
+        best: Optional[Tuple[str, int]] = None
+        for key in candidates:
+            distance = hamming_distance(fingerprint, self._fingerprints[key])
+            if distance <= self.max_distance and (best is None or distance < best[1]):
+                best = (key, distance)
+
+        self.stats["lookups"] += 1
+        self.stats["candidates"] += len(candidates)
+        if best:
+            self.stats["matches"] += 1
+        return best
+
+    def get_stats(self) -> Dict[str, int]:
+        """Retorna tamanho do índice e contadores de busca."""
+        return {
+            "entries": len(self._fingerprints),
+            "bands": self.bands,
+            "max_distance": self.max_distance,
+            **dict(self.stats),
+        }
@@ -0,0 +1,178 @@
+"""
+Pool de proxies CORS usados como fallback do scraping direto.
+Mantém taxa de sucesso e latência (médias móveis exponenciais) por proxy,
+ordena as tentativas pelo tempo esperado até uma resposta útil e afasta
+temporariamente os proxies que falham em sequência.
+"""
+from typing import Any, Dict, List, Optional
+from dataclasses import asdict, dataclass
+from urllib.parse import urlparse
+import time
+import structlog
+
+logger = structlog.get_logger()
+
+# Piso da taxa de sucesso no score (evita divisão por zero e score infinito)
+MIN_SUCCESS_RATE = 0.05
+
+
+@dataclass
+class ProxyHealth:
+    """Saúde de um proxy do pool."""
+    template: str
+    attempts: int = 0
+    successes: int = 0
+    success_rate: float = 1.0  # Média móvel exponencial (otimista antes da 1ª tentativa)
+    latency_ms: float = 0.0  # Média móvel exponencial das tentativas
+    consecutive_failures: int = 0
+    ejections: int = 0  # Afastamentos seguidos (zerado no sucesso)
+    ejected_until: float = 0.0  # time.monotonic() até quando o proxy fica fora
+    last_error: str = ""
+
+
+def parse_proxy_templates(value: str) -> List[str]:
+    """
+    Lê os templates de proxy separados por vírgula.
+
+    Raises:
+        ValueError: Se algum template não tiver o marcador {url}
+    """
+    templates = [item.strip() for item in value.split(",") if item.strip()]
+    for template in templates:
+        if "{url}" not in template:
+            raise ValueError(f"Template de proxy sem {{url}}: {template}")
+    return templates
+
+
+class ProxyPool:
+    """
+    Proxies CORS com score de saúde, identificados pelo host do template.
+
+    O score é o tempo esperado até uma resposta útil (latência média dividida
+    pela taxa de sucesso); proxies ainda não tentados vêm primeiro, na ordem
+    configurada. Após `eject_after_failures` falhas seguidas o proxy sai do
+    pool por `eject_seconds`, tempo que dobra a cada novo afastamento (até
+    `eject_max_seconds`); ao voltar, uma nova falha o afasta de imediato e
+    um sucesso o reabilita.
+    """
+
+    def __init__(
+        self,
+        templates: List[str],
+        alpha: float = 0.3,
+        eject_after_failures: int = 3,
+        eject_seconds: float = 60.0,
+        eject_max_seconds: float = 900.0
+    ):
+        """
+        Inicializa o pool.
+
+        Args:
+            templates: URLs dos proxies com o marcador {url} (ordem padrão)
+            alpha: Peso da tentativa mais recente nas médias móveis
+            eject_after_failures: Falhas seguidas para afastar o proxy
+            eject_seconds: Duração do primeiro afastamento
+            eject_max_seconds: Duração máxima do afastamento
+        """
+        self.alpha = alpha
+        self.eject_after_failures = max(1, eject_after_failures)
+        self.eject_seconds = eject_seconds
+        self.eject_max_seconds = eject_max_seconds
+        self._proxies: Dict[str, ProxyHealth] = {}
+        for template in templates:
+            self._proxies.setdefault(self.name_of(template), ProxyHealth(template=template))
+
+    @staticmethod
+    def name_of(url: str) -> str:
+        """Nome do proxy: host do template ou da URL montada."""
+        return urlparse(url).netloc.lower()
+
+    def __len__(self) -> int:
+        return len(self._proxies)
+
+    def score(self, health: ProxyHealth) -> float:
+        """Tempo esperado (ms) até uma resposta útil; menor é melhor."""
+        if health.attempts == 0:
+            return 0.0
+        return health.latency_ms / max(health.success_rate, MIN_SUCCESS_RATE)
+
+    def is_ejected(self, health: ProxyHealth) -> bool:
+        """Indica se o proxy está afastado do pool."""
+        return time.monotonic() < health.ejected_until
+
+    def urls_for(self, url: str) -> List[str]:
+        """
+        URLs de proxy para a vaga, do melhor para o pior score.
+
+        Proxies afastados ficam de fora (a lista pode ficar vazia).
+
+        Args:
+            url: URL da vaga
+        """
+        available = [health for health in self._proxies.values() if not self.is_ejected(health)]
+        ranked = sorted(available, key=self.score)  # Estável: empate mantém a ordem configurada
+        return [health.template.replace("{url}", url) for health in ranked]
+
+    def record(self, proxy_url: str, success: bool, latency_seconds: float, error: str = ""):
+        """
+        Registra o resultado de uma tentativa via proxy.
+
+        Args:
+            proxy_url: URL montada do proxy (ou o template)
+            success: Se a tentativa produziu conteúdo aceitável
+            latency_seconds: Duração da tentativa
+            error: Motivo da falha, exibido na saúde do proxy
+        """
+        health = self._proxies.get(self.name_of(proxy_url))
+        if health is None:
+            return
+
+        latency_ms = latency_seconds * 1000
+        if health.attempts == 0:
+            health.success_rate = 1.0 if success else 0.0
+            health.latency_ms = latency_ms
+        else:
+            health.success_rate += self.alpha * ((1.0 if success else 0.0) - health.success_rate)
+            health.latency_ms += self.alpha * (latency_ms - health.latency_ms)
+        health.attempts += 1
+
+        if success:
+            health.successes += 1
+            health.consecutive_failures = 0
+            health.ejections = 0
+            health.ejected_until = 0.0
+            return
+
+        health.consecutive_failures += 1
+        health.last_error = error
+        if health.consecutive_failures >= self.eject_after_failures:
+            health.ejections += 1
+            seconds = min(self.eject_seconds * 2 ** (health.ejections - 1), self.eject_max_seconds)
+            health.ejected_until = time.monotonic() + seconds
+            logger.info(
+                "Proxy afastado do pool",
+                proxy=self.name_of(health.template),
+                consecutive_failures=health.consecutive_failures,
+                seconds=seconds
+            )
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Saúde de cada proxy, na ordem em que seriam tentados."""
+        now = time.monotonic()
+        rows = []
+        for name, health in sorted(
+            self._proxies.items(),
+            key=lambda item: (self.is_ejected(item[1]), self.score(item[1]))
+        ):
+            data = asdict(health)
+            data.pop("ejected_until")
+            data.update({
+                "name": name,
+                "success_rate": round(health.success_rate, 3),
+                "latency_ms": round(health.latency_ms, 1),
+                "score_ms": round(self.score(health), 1),
+                "ejected": self.is_ejected(health),
+                "ejected_for_seconds": round(max(0.0, health.ejected_until - now), 1),
+            })
+            rows.append(data)
+        return rows
@@ -0,0 +1,294 @@
+"""
+Limite de taxa por host (token bucket) para as requisições do scraper.
+Espaça as requisições para o mesmo site de vagas ou proxy CORS, respeita o
+Retry-After de respostas 429/503 e descarta a requisição quando a fila do
+host não libera vaga antes do prazo de quem chamou.
+"""
+from typing import Any, Dict, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+import asyncio
+import time
+import structlog
+
+logger = structlog.get_logger()
+
+
+class RateLimitExceeded(ValueError):
+    """Requisição descartada: o host não libera vaga antes do prazo do chamador."""
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Converte o header Retry-After em segundos.
+
+    Args:
+        value: Valor do header (segundos ou data HTTP)
+        now: Horário atual em epoch (padrão: time.time())
+
+    Returns:
+        Segundos de espera (>= 0), ou None se ausente ou inválido
+    """
+    value = (value or "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None or retry_at.tzinfo is None:
+        return None
+    return max(0.0, retry_at.timestamp() - (time.time() if now is None else now))
+
+
+def parse_host_rates(value: str) -> Dict[str, float]:
+    """
+    Lê taxas por host no formato "host=req/s,host=req/s".
+
+    Raises:
+        ValueError: Se algum item estiver fora do formato
+    """
+    rates = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        host, separator, rate = item.partition("=")
+        try:
+            if not separator or not host.strip():
+                raise ValueError
+            rates[host.strip().lower()] = float(rate)
+        except ValueError:
+            raise ValueError(f"Taxa por host inválida: {item!r} (esperado host=req/s)") from None
+    return rates
+
+
+@dataclass
+class _Bucket:
+    """Estado do token bucket de um host (GCRA) e métricas de uso."""
+    rate: float
+    next_free: float = 0.0  # Instante teórico de chegada da próxima requisição
+    blocked_until: float = 0.0  # Retry-After recebido do host
+    penalty_shift: float = 0.0  # Adiamento acumulado da fila pelos Retry-After
+    requests: int = 0
+    delayed: int = 0
+    shed: int = 0
+    penalties: int = 0
+    wait_seconds: float = 0.0
+
+
+class HostRateLimiter:
+    """
+    Token bucket por host (netloc), implementado como GCRA.
+
+    Cada host libera até `burst` requisições imediatas e depois uma a cada
+    1/rate segundos; as excedentes aguardam em ordem de chegada. Quando a vaga
+    na fila fica depois do prazo do chamador (ou de `max_wait_seconds`), a
+    requisição é descartada com RateLimitExceeded sem consumir vaga, e o
+    chamador pode seguir para outra estratégia.
+
+    No máximo `max_hosts` buckets ficam em memória; acima disso os hosts
+    ociosos menos usados são descartados primeiro.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = 2.0,
+        burst: int = 4,
+        host_rates: Optional[Dict[str, float]] = None,
+        max_wait_seconds: float = 10.0,
+        max_retry_after_seconds: float = 300.0,
+        max_hosts: int = 1024
+    ):
+        """
+        Inicializa o limitador.
+
+        Args:
+            rate_per_second: Requisições por segundo por host (0 desabilita)
+            burst: Requisições liberadas de imediato com o bucket cheio
+            host_rates: Taxas específicas por host (valem também para subdomínios)
+            max_wait_seconds: Espera máxima na fila quando o chamador não tem prazo
+            max_retry_after_seconds: Teto para a espera pedida via Retry-After
+            max_hosts: Máximo de hosts acompanhados em memória
+        """
+        self.rate_per_second = max(0.0, rate_per_second)
+        self.burst = max(1, burst)
+        self.host_rates = {host.lower(): rate for host, rate in (host_rates or {}).items()}
+        self.max_wait_seconds = max_wait_seconds
+        self.max_retry_after_seconds = max_retry_after_seconds
+        self.max_hosts = max(1, max_hosts)
+        self.evicted_hosts = 0
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        """Host usado como chave do bucket (netloc em minúsculas)."""
+        return urlparse(url).netloc.lower()
+
+    def rate_for(self, host: str) -> float:
+        """Taxa do host: a configurada para ele ou para um domínio pai, senão a padrão."""
+        name = host.split(":")[0]
+        while name:
+            if name in self.host_rates:
+                return max(0.0, self.host_rates[name])
+            _, _, name = name.partition(".")
+        return self.rate_per_second
+
+    def _bucket(self, host: str) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is not None:
+            self._buckets.move_to_end(host)
+            return bucket
+        self._evict()
+        bucket = self._buckets[host] = _Bucket(rate=self.rate_for(host))
+        return bucket
+
+    def _evict(self):
+        """Abre espaço para um novo host: descarta ociosos primeiro, depois os menos usados."""
+        excess = len(self._buckets) - self.max_hosts + 1
+        if excess <= 0:
+            return
+        now = time.monotonic()
+        idle = [
+            host for host, bucket in self._buckets.items()
+            if bucket.next_free <= now and bucket.blocked_until <= now
+        ]
+        for host in list(dict.fromkeys(idle + list(self._buckets)))[:excess]:
+            del self._buckets[host]
+            self.evicted_hosts += 1
+
+    def _reserve(self, host: str, deadline: Optional[float]) -> Tuple[float, float]:
+        """
+        Reserva a próxima vaga do host.
+
+        Returns:
+            Tupla (instante liberado, instante teórico reservado)
+
+        Raises:
+            RateLimitExceeded: Se a vaga ficar depois do prazo
+        """
+        bucket = self._bucket(host)
+        now = time.monotonic()
+        interval = 1.0 / bucket.rate
+        tolerance = (self.burst - 1) * interval
+
+        next_free = max(bucket.next_free, now)
+        start_at = max(now, next_free - tolerance, bucket.blocked_until)
+        if start_at > self._wait_limit(now, deadline):
+            bucket.shed += 1
+            raise RateLimitExceeded(
+                f"Limite de requisições para {host}: próxima vaga em "
+                f"{start_at - now:.1f}s, além do prazo da requisição"
+            )
+
+        bucket.next_free = next_free + interval
+        return start_at, bucket.next_free
+
+    def _wait_limit(self, now: float, deadline: Optional[float]) -> float:
+        """Último instante aceitável para a vaga (prazo do chamador ou max_wait_seconds)."""
+        limit = now + self.max_wait_seconds
+        return limit if deadline is None else min(limit, deadline)
+
+    @staticmethod
+    def _release(bucket: _Bucket, reserved: float):
+        """Devolve a vaga se ninguém reservou depois dela."""
+        if bucket.next_free == reserved:
+            bucket.next_free -= 1.0 / bucket.rate
+
+    async def acquire(self, url: str, deadline: Optional[float] = None):
+        """
+        Aguarda a vez da requisição no bucket do host da URL.
+
+        Args:
+            url: URL que será requisitada
+            deadline: Prazo do chamador (time.monotonic()); None usa max_wait_seconds
+
+        Raises:
+            RateLimitExceeded: Se o host não liberar vaga antes do prazo
+        """
+        host = self.host_key(url)
+        bucket = self._bucket(host)
+        bucket.requests += 1
+        if bucket.rate == 0:
+            return
+
+        started = time.monotonic()
+        start_at, reserved = self._reserve(host, deadline)
+        limit = self._wait_limit(started, deadline)
+        shift = bucket.penalty_shift
+        while True:
+            delay = start_at - time.monotonic()
+            if delay <= 0:
+                break
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self._release(bucket, reserved)
+                raise
+            # Retry-After recebido durante a espera: a vaga já reservada é
+            # adiada junto com a fila, sem reservar outra
+            if bucket.penalty_shift != shift:
+                start_at += bucket.penalty_shift - shift
+                reserved += bucket.penalty_shift - shift
+                shift = bucket.penalty_shift
+                if start_at > limit:
+                    self._release(bucket, reserved)
+                    bucket.shed += 1
+                    raise RateLimitExceeded(
+                        f"Limite de requisições para {host}: Retry-After adiou a vaga "
+                        f"além do prazo da requisição"
+                    )
+
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            bucket.delayed += 1
+            bucket.wait_seconds += waited
+
+    def penalize(self, url: str, retry_after_seconds: float):
+        """
+        Suspende o host pelo tempo pedido em Retry-After (limitado ao teto).
+
+        Requisições já na fila são adiadas pelo mesmo intervalo, mantendo o
+        espaçamento; depois da suspensão o host volta uma requisição por vez,
+        sem rajada.
+        """
+        host = self.host_key(url)
+        bucket = self._bucket(host)
+        seconds = min(max(0.0, retry_after_seconds), self.max_retry_after_seconds)
+        if bucket.rate == 0 or seconds == 0:
+            return
+
+        now = time.monotonic()
+        until = now + seconds
+        shift = max(0.0, until - max(now, bucket.blocked_until))
+        bucket.penalty_shift += shift
+        bucket.blocked_until = max(bucket.blocked_until, until)
+        bucket.next_free = max(bucket.next_free + shift, until + (self.burst - 1) / bucket.rate)
+        bucket.penalties += 1
+        logger.info("Host pediu para reduzir o ritmo (Retry-After)", host=host, seconds=round(seconds, 1))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna taxa e uso por host (atrasadas, descartadas, suspensão)."""
+        now = time.monotonic()
+        return {
+            "rate_per_second": self.rate_per_second,
+            "burst": self.burst,
+            "max_wait_seconds": self.max_wait_seconds,
+            "evicted_hosts": self.evicted_hosts,
+            "hosts": {
+                host: {
+                    "rate_per_second": bucket.rate,
+                    "requests": bucket.requests,
+                    "delayed": bucket.delayed,
+                    "shed": bucket.shed,
+                    "penalties": bucket.penalties,
+                    "blocked_for_seconds": round(max(0.0, bucket.blocked_until - now), 1),
+                    "wait_seconds_total": round(bucket.wait_seconds, 4),
+                }
+                for host, bucket in sorted(self._buckets.items())
+            },
+        }
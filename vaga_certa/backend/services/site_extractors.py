@@ -0,0 +1,245 @@
+"""
+Extratores específicos por site de vagas, escolhidos pelo hostname da URL.
+Cada extrator declara seletores CSS pré-compilados para os dois backends de
+parsing (soupsieve no BeautifulSoup, XPath no lxml), consultando poucos nós
+em vez de varrer a árvore inteira; sites desconhecidos seguem para as
+heurísticas genéricas.
+"""
+from typing import Any, Callable, Dict, Optional, Sequence
+from urllib.parse import urlparse
+import re
+
+from lxml import etree
+import soupsieve
+
+# Descrições curtas demais não substituem as heurísticas genéricas
+MIN_DESCRIPTION_CHARS = 200
+
+FIELDS = ("title", "company", "description")
+
+_ATTRIBUTE_SUFFIX = re.compile(r"::attr\(([\w-]+)\)$")
+_COMPOUND_PATTERN = re.compile(
+    r"^(?P<tag>[a-zA-Z][\w-]*|\*)?"
+    r"(?P<rest>(?:#[\w-]+|\.[\w-]+|\[[\w-]+(?:=[\"']?[^\]\"']*[\"']?)?\])*)$"
+)
+_COMPOUND_PART = re.compile(r"#([\w-]+)|\.([\w-]+)|\[([\w-]+)(?:=[\"']?([^\]\"']*)[\"']?)?\]")
+
+
+def css_to_xpath(css: str) -> str:
+    """
+    Converte um seletor CSS simples em XPath 1.0.
+
+    Suporta tag, `#id`, `.classe`, `[atributo]`, `[atributo=valor]` e o
+    combinador de descendente (espaço), suficientes para os extratores.
+
+    Args:
+        css: Seletor CSS
+
+    Returns:
+        Expressão XPath equivalente
+
+    Raises:
+        ValueError: Se o seletor usar sintaxe não suportada
+    """
+    steps = []
+    for compound in css.split():
+        match = _COMPOUND_PATTERN.match(compound)
+        if not match:
+            raise ValueError(f"Seletor CSS não suportado: {css}")
+
+        predicates = []
+        for element_id, class_name, attribute, value in _COMPOUND_PART.findall(match.group("rest")):
+            if element_id:
+                predicates.append(f"@id='{element_id}'")
+            elif class_name:
+                predicates.append(
+                    f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+                )
+            elif value:
+                predicates.append(f"@{attribute}='{value}'")
+            else:
+                predicates.append(f"@{attribute}")
+
+        steps.append((match.group("tag") or "*") + "".join(f"[{p}]" for p in predicates))
+
+    if not steps:
+        raise ValueError(f"Seletor CSS vazio: {css!r}")
+    return "//" + "//".join(steps)
+
+
+class CompiledSelector:
+    """
+    Seletor CSS compilado uma única vez para os dois backends.
+
+    O sufixo `::attr(nome)` lê o atributo do elemento em vez do texto.
+    """
+
+    def __init__(self, css: str):
+        self.css = css
+        attribute = _ATTRIBUTE_SUFFIX.search(css)
+        self.attribute = attribute.group(1) if attribute else None
+        element_css = _ATTRIBUTE_SUFFIX.sub("", css).strip()
+        self.soup = soupsieve.compile(element_css)
+        self.xpath = etree.XPath(css_to_xpath(element_css))
+
+
+class SiteExtractor:
+    """Extrator de título, empresa e descrição para um site de vagas."""
+
+    def __init__(
+        self,
+        name: str,
+        hosts: Sequence[str],
+        title: Sequence[str] = (),
+        company: Sequence[str] = (),
+        description: Sequence[str] = (),
+        cleaners: Optional[Dict[str, Callable[[str], str]]] = None
+    ):
+        """
+        Inicializa o extrator compilando os seletores.
+
+        Args:
+            name: Nome do site
+            hosts: Domínios atendidos (subdomínios também são aceitos)
+            title: Seletores do título, em ordem de prioridade
+            company: Seletores da empresa, em ordem de prioridade
+            description: Seletores da descrição, em ordem de prioridade
+            cleaners: Pós-processamento por campo (ex.: remover prefixos)
+        """
+        self.name = name
+        self.hosts = tuple(host.lower() for host in hosts)
+        self.selectors: Dict[str, tuple] = {
+            "title": tuple(CompiledSelector(css) for css in title),
+            "company": tuple(CompiledSelector(css) for css in company),
+            "description": tuple(CompiledSelector(css) for css in description),
+        }
+        self.cleaners = cleaners or {}
+
+    def extract(
+        self,
+        find: Callable[[CompiledSelector], Any],
+        text_of: Callable[[Any, str], str]
+    ) -> Dict[str, str]:
+        """
+        Extrai os campos usando as funções de busca do backend.
+
+        Args:
+            find: Retorna o primeiro elemento do seletor (ou None)
+            text_of: Texto visível do elemento com o separador dado
+
+        Returns:
+            Campos encontrados (campos ausentes ficam de fora)
+        """
+        fields: Dict[str, str] = {}
+        for field in FIELDS:
+            separator = "\n" if field == "description" else ""
+            cleaner = self.cleaners.get(field)
+            for selector in self.selectors[field]:
+                element = find(selector)
+                if element is None:
+                    continue
+
+                if selector.attribute:
+                    value = (element.get(selector.attribute) or "").strip()
+                else:
+                    value = text_of(element, separator)
+                if cleaner:
+                    value = cleaner(value).strip()
+
+                if field == "description" and len(value) <= MIN_DESCRIPTION_CHARS:
+                    continue
+                if value:
+                    fields[field] = value
+                    break
+
+        return fields
+
+
+def _strip_prefix(prefix: str) -> Callable[[str], str]:
+    """Cleaner que remove um prefixo fixo (sem diferenciar maiúsculas)."""
+    def clean(value: str) -> str:
+        value = value.strip()
+        return value[len(prefix):] if value.lower().startswith(prefix.lower()) else value
+    return clean
+
+
+def _strip_suffix(suffix: str) -> Callable[[str], str]:
+    """Cleaner que remove um sufixo fixo (sem diferenciar maiúsculas)."""
+    def clean(value: str) -> str:
+        value = value.strip()
+        return value[:-len(suffix)] if value.lower().endswith(suffix.lower()) else value
+    return clean
+
+
+SITE_EXTRACTORS = [
+    SiteExtractor(
+        name="linkedin",
+        hosts=["linkedin.com"],
+        title=["h1.top-card-layout__title", "h1.topcard__title"],
+        company=["a.topcard__org-name-link", "span.topcard__flavor a"],
+        description=["div.show-more-less-html__markup", "div.description__text"],
+    ),
+    SiteExtractor(
+        name="gupy",
+        hosts=["gupy.io"],
+        title=["[data-testid=job-title]"],
+        company=["[data-testid=company-name]"],
+        description=["[data-testid=text-section]"],
+    ),
+    SiteExtractor(
+        name="indeed",
+        hosts=["indeed.com", "indeed.com.br"],
+        title=["h1.jobsearch-JobInfoHeader-title"],
+        company=["div[data-company-name] a", "[data-company-name]"],
+        description=["#jobDescriptionText"],
+    ),
+    SiteExtractor(
+        name="greenhouse",
+        hosts=["greenhouse.io"],
+        title=["h1.app-title"],
+        company=["span.company-name"],
+        description=["#content"],
+        cleaners={"company": _strip_prefix("at ")},
+    ),
+    SiteExtractor(
+        name="lever",
+        hosts=["lever.co"],
+        title=["div.posting-headline h2"],
+        company=["a.main-header-logo img::attr(alt)"],
+        description=["div.posting-page div.section-wrapper"],
+        cleaners={"company": _strip_suffix(" logo")},
+    ),
+]
+
+_extractors_by_host: Dict[str, SiteExtractor] = {}
+
+
+def register_site_extractor(extractor: SiteExtractor):
+    """Registra (ou substitui) o extrator para os domínios que ele atende."""
+    for host in extractor.hosts:
+        _extractors_by_host[host] = extractor
+
+
+for _extractor in SITE_EXTRACTORS:
+    register_site_extractor(_extractor)
+
+
+def find_site_extractor(url: Optional[str]) -> Optional[SiteExtractor]:
+    """
+    Localiza o extrator do site pela URL (inclui subdomínios).
+
+    Args:
+        url: URL da vaga (None retorna None)
+
+    Returns:
+        Extrator do site ou None se o site não tiver extrator dedicado
+    """
+    if not url:
+        return None
+
+    labels = (urlparse(url).hostname or "").lower().split(".")
+    for i in range(len(labels) - 1):
+        extractor = _extractors_by_host.get(".".join(labels[i:]))
+        if extractor:
+            return extractor
+    return None
@@ -0,0 +1,311 @@
+"""
+Aprendizado de estratégias de extração por domínio.
+Registra taxa de sucesso e latência (médias móveis exponenciais) de cada
+estratégia por domínio e usa esse histórico para ordenar ou pular estratégias.
+"""
+from typing import Any, Dict, List, Optional
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import structlog
+
+from config import settings
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class StrategyStats:
+    """Histórico de uma estratégia em um domínio."""
+    attempts: int = 0
+    successes: int = 0
+    success_rate: float = 0.0  # Média móvel exponencial (1 = sempre funciona)
+    latency_ms: float = 0.0  # Média móvel exponencial das tentativas
+    last_attempt_at: float = 0.0
+
+
+class StrategyLearner:
+    """
+    Tabela aprendida de estratégias por domínio, persistida em JSON.
+
+    Estratégias com poucas amostras mantêm a ordem padrão. Com histórico
+    suficiente, a ordem passa a ser por taxa de sucesso (e latência no
+    empate), e estratégias que quase nunca funcionam são puladas até que
+    `retry_after_seconds` se passem desde a última tentativa. Estratégias
+    rebaixadas só rodam quando a primeira falha, então também são exploradas:
+    sem tentativa há `retry_after_seconds`, vão uma vez para a frente da fila
+    e a média volta a acompanhar o domínio.
+
+    Vários processos (workers do gunicorn) compartilham o arquivo: cada
+    gravação mescla o que está em disco, mantendo por estratégia a entrada
+    com a tentativa mais recente, e usa um arquivo temporário próprio.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        alpha: float = 0.3,
+        min_samples: int = 5,
+        skip_below: float = 0.1,
+        retry_after_seconds: int = 3600,
+        save_interval_seconds: float = 30.0
+    ):
+        """
+        Inicializa a tabela, carregando o histórico salvo se existir.
+
+        Args:
+            path: Arquivo JSON de persistência (None mantém só em memória)
+            alpha: Peso da amostra mais recente nas médias móveis
+            min_samples: Tentativas mínimas antes de reordenar/pular
+            skip_below: Taxa de sucesso abaixo da qual a estratégia é pulada
+            retry_after_seconds: Intervalo para tentar de novo uma estratégia pulada
+            save_interval_seconds: Intervalo mínimo entre gravações em disco
+        """
+        self.path = path
+        self.alpha = alpha
+        self.min_samples = max(1, min_samples)
+        self.skip_below = skip_below
+        self.retry_after_seconds = retry_after_seconds
+        self.save_interval_seconds = save_interval_seconds
+        self._table: Dict[str, Dict[str, StrategyStats]] = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._probed_at: Dict[tuple, float] = {}  # Exploração reservada por (domínio, estratégia)
+        self._dirty = False
+        self._last_save = 0.0
+        self._load()
+
+    @staticmethod
+    def domain_of(url: str) -> str:
+        """Domínio usado na tabela (host sem "www." e sem porta)."""
+        host = (urlparse(url).hostname or "").lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def record(self, domain: str, strategy: str, success: bool, latency_seconds: float):
+        """
+        Registra o resultado de uma tentativa.
+
+        Args:
+            domain: Domínio da vaga
+            strategy: Nome da estratégia (ex.: "direct", "proxy")
+            success: Se a tentativa produziu resultado aceitável
+            latency_seconds: Duração da tentativa
+        """
+        latency_ms = latency_seconds * 1000
+        with self._lock:
+            stats = self._table.setdefault(domain, {}).setdefault(strategy, StrategyStats())
+            if stats.attempts == 0:
+                stats.success_rate = 1.0 if success else 0.0
+                stats.latency_ms = latency_ms
+            else:
+                stats.success_rate += self.alpha * ((1.0 if success else 0.0) - stats.success_rate)
+                stats.latency_ms += self.alpha * (latency_ms - stats.latency_ms)
+            stats.attempts += 1
+            stats.successes += int(success)
+            stats.last_attempt_at = time.time()
+            self._probed_at.pop((domain, strategy), None)
+            self._dirty = True
+
+        if time.monotonic() - self._last_save >= self.save_interval_seconds:
+            self._schedule_save()
+
+    def _schedule_save(self):
+        """Grava em disco numa thread quando chamado do event loop (inline fora dele)."""
+        self._last_save = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save()
+            return
+        loop.run_in_executor(None, self.save)
+
+    def should_skip(self, domain: str, strategy: str) -> bool:
+        """Indica se a estratégia falha de forma consistente no domínio."""
+        with self._lock:
+            stats = self._table.get(domain, {}).get(strategy)
+        if stats is None or stats.attempts < self.min_samples:
+            return False
+        if stats.success_rate >= self.skip_below:
+            return False
+        # Nova tentativa periódica para detectar quando o site volta a responder
+        return time.time() - stats.last_attempt_at < self.retry_after_seconds
+
+    def order(self, domain: str, strategies: List[str]) -> List[str]:
+        """
+        Ordena as estratégias para o domínio, removendo as que devem ser puladas.
+
+        Nunca retorna lista vazia: se todas forem puladas, a ordem padrão é mantida.
+
+        Args:
+            domain: Domínio da vaga
+            strategies: Estratégias na ordem padrão
+
+        Returns:
+            Estratégias na ordem em que devem ser tentadas
+        """
+        kept = [name for name in strategies if not self.should_skip(domain, name)]
+        if not kept:
+            return list(strategies)
+
+        with self._lock:
+            known = dict(self._table.get(domain, {}))
+
+        def score(name: str):
+            stats = known.get(name)
+            if stats is None or stats.attempts < self.min_samples:
+                # Sem histórico suficiente: taxa neutra, mantendo a ordem padrão no empate
+                return (-0.5, 0.0, strategies.index(name))
+            return (-stats.success_rate, stats.latency_ms, strategies.index(name))
+
+        ordered = sorted(kept, key=score)
+
+        # Exploração: rebaixada sem tentativa recente passa à frente uma vez
+        now = time.time()
+        with self._lock:
+            probes = [
+                name for name in ordered[1:]
+                if self._due_for_probe(domain, name, known.get(name), now)
+            ]
+            for name in probes:
+                self._probed_at[(domain, name)] = now
+        if probes:
+            return probes + [name for name in ordered if name not in probes]
+        return ordered
+
+    def _due_for_probe(self, domain: str, name: str, stats: Optional[StrategyStats], now: float) -> bool:
+        """Indica se a estratégia rebaixada está há `retry_after_seconds` sem tentativa."""
+        if stats is None or stats.attempts < self.min_samples:
+            return False
+        last = max(stats.last_attempt_at, self._probed_at.get((domain, name), 0.0))
+        return now - last >= self.retry_after_seconds
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Retorna a tabela aprendida (para o endpoint administrativo)."""
+        with self._lock:
+            return {
+                domain: {
+                    name: {
+                        **asdict(stats),
+                        "success_rate": round(stats.success_rate, 3),
+                        "latency_ms": round(stats.latency_ms, 1),
+                        "skipped": (
+                            stats.attempts >= self.min_samples
+                            and stats.success_rate < self.skip_below
+                        ),
+                    }
+                    for name, stats in strategies.items()
+                }
+                for domain, strategies in sorted(self._table.items())
+            }
+
+    def save(self):
+        """
+        Grava a tabela em disco, mesclada com a gravada por outros processos.
+
+        A escrita é atômica: arquivo temporário exclusivo do processo
+        (mkstemp) seguido de os.replace. Faz I/O bloqueante; no event loop,
+        use o agendamento de `record`.
+        """
+        self._last_save = time.monotonic()
+        if not self.path or not self._dirty:
+            return
+
+        with self._save_lock:
+            with self._lock:
+                self._dirty = False
+            # Entradas mais recentes de outros processos também passam a valer aqui
+            self._merge(self._read_file())
+            with self._lock:
+                data = {
+                    domain: {name: asdict(stats) for name, stats in strategies.items()}
+                    for domain, strategies in self._table.items()
+                }
+
+            tmp_path = None
+            try:
+                directory = Path(self.path).parent
+                directory.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(
+                    dir=directory, prefix=f"{Path(self.path).name}.", suffix=".tmp"
+                )
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+                tmp_path = None
+            except OSError as e:
+                logger.warning("Falha ao salvar estatísticas de estratégias", path=self.path, error=str(e))
+            finally:
+                if tmp_path is not None:
+                    try:
+                        os.unlink(tmp_path)
+                    except OSError:
+                        pass
+
+    def _read_file(self) -> Dict[str, Dict[str, StrategyStats]]:
+        """Tabela gravada em disco (vazia se ausente ou corrompida)."""
+        if not self.path or not os.path.exists(self.path):
+            return {}
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return {
+                domain: {name: StrategyStats(**stats) for name, stats in strategies.items()}
+                for domain, strategies in data.items()
+            }
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning("Falha ao carregar estatísticas de estratégias", path=self.path, error=str(e))
+            return {}
+
+    def _merge(self, table: Dict[str, Dict[str, StrategyStats]]):
+        """Adota as entradas de `table` com tentativa mais recente que a local."""
+        with self._lock:
+            for domain, strategies in table.items():
+                local = self._table.setdefault(domain, {})
+                for name, stats in strategies.items():
+                    current = local.get(name)
+                    if current is None or stats.last_attempt_at > current.last_attempt_at:
+                        local[name] = stats
+
+    def _load(self):
+        """Carrega a tabela salva (arquivo ausente ou corrompido é ignorado)."""
+        self._table = self._read_file()
+        if self._table:
+            logger.info("Estatísticas de estratégias carregadas", domains=len(self._table))
+
+
+_strategy_learner: Optional[StrategyLearner] = None
+
+
+def get_strategy_learner() -> StrategyLearner:
+    """Retorna a tabela global do processo, criada a partir de Settings."""
+    global _strategy_learner
+    if _strategy_learner is None:
+        path = (
+            str(Path(settings.cache_dir) / "scraping_strategies.json")
+            if settings.cache_dir
+            else None
+        )
+        _strategy_learner = StrategyLearner(
+            path=path,
+            alpha=settings.strategy_stats_alpha,
+            min_samples=settings.strategy_min_samples,
+            skip_below=settings.strategy_skip_success_rate,
+            retry_after_seconds=settings.strategy_retry_after_seconds,
+            save_interval_seconds=settings.strategy_save_interval_seconds
+        )
+    return _strategy_learner
+
+
+def shutdown_strategy_learner():
+    """Grava a tabela global pendente (chamado no shutdown da aplicação)."""
+    global _strategy_learner
+    if _strategy_learner is not None:
+        _strategy_learner.save()
+        _strategy_learner = None
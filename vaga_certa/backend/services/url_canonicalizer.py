@@ -0,0 +1,147 @@
+"""
+Canonicalização de URLs de vagas.
+A URL canônica é a identidade da vaga em todos os caches e índices (scraping,
+memória, cache negativo, estatísticas por domínio): parâmetros de rastreamento,
+fragmentos e variações de host/caminho de cada site são normalizados.
+"""
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+import re
+
+
+# Parâmetros de rastreamento removidos de qualquer URL
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "yclid",
+    "mc_cid", "mc_eid", "_hsenc", "_hsmi", "mkt_tok",
+    "refid", "trackingid", "trk", "trkinfo", "lipi", "originalsubdomain",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+_LINKEDIN_JOB_ID = re.compile(r"/jobs/view/(?:[^/]*?-)?(\d+)/?$")
+_LEVER_POSTING = re.compile(r"^(/[^/]+/[0-9a-fA-F-]{8,})(?:/apply)?/?$")
+
+# (host, caminho, parâmetros de query) -> mesma tupla normalizada
+BoardRule = Callable[[str, str, List[Tuple[str, str]]], Tuple[str, str, List[Tuple[str, str]]]]
+
+
+def _query_value(query: List[Tuple[str, str]], name: str) -> Optional[str]:
+    """Primeiro valor não vazio do parâmetro (nome sem diferenciar maiúsculas)."""
+    for key, value in query:
+        if key.lower() == name.lower() and value:
+            return value
+    return None
+
+
+def _linkedin(host: str, path: str, query: List[Tuple[str, str]]):
+    """LinkedIn: busca, coleções e slugs viram /jobs/view/<id> em www.linkedin.com."""
+    job_id = _query_value(query, "currentJobId")
+    match = _LINKEDIN_JOB_ID.search(path)
+    if match:
+        job_id = match.group(1)
+    if job_id and job_id.isdigit():
+        return "www.linkedin.com", f"/jobs/view/{job_id}", []
+    return "www.linkedin.com", path, query
+
+
+def _indeed(host: str, path: str, query: List[Tuple[str, str]]):
+    """Indeed: qualquer página com jk/vjk vira /viewjob?jk=<id> (host do país mantido)."""
+    if host.startswith("m."):
+        host = "www." + host[2:]
+    job_key = _query_value(query, "jk") or _query_value(query, "vjk")
+    if job_key:
+        return host, "/viewjob", [("jk", job_key)]
+    return host, path, query
+
+
+def _gupy(host: str, path: str, query: List[Tuple[str, str]]):
+    """Gupy: a vaga é identificada só pelo caminho (query é origem/rastreamento)."""
+    return host, path, []
+
+
+def _greenhouse(host: str, path: str, query: List[Tuple[str, str]]):
+    """Greenhouse: job-boards e boards são o mesmo quadro; gh_src é rastreamento."""
+    if host == "job-boards.greenhouse.io":
+        host = "boards.greenhouse.io"
+    return host, path, [(key, value) for key, value in query if key.lower() != "gh_src"]
+
+
+def _lever(host: str, path: str, query: List[Tuple[str, str]]):
+    """Lever: remove /apply e os parâmetros lever-source/lever-origin."""
+    match = _LEVER_POSTING.match(path)
+    if match:
+        path = match.group(1)
+    return host, path, [(key, value) for key, value in query if not key.lower().startswith("lever-")]
+
+
+BOARD_RULES: Dict[str, BoardRule] = {
+    "linkedin.com": _linkedin,
+    "indeed.com": _indeed,
+    "indeed.com.br": _indeed,
+    "gupy.io": _gupy,
+    "greenhouse.io": _greenhouse,
+    "lever.co": _lever,
+}
+
+
+def _board_rule(host: str) -> Optional[BoardRule]:
+    """Regra do site pelo host (inclui subdomínios)."""
+    labels = host.split(".")
+    for i in range(len(labels) - 1):
+        rule = BOARD_RULES.get(".".join(labels[i:]))
+        if rule:
+            return rule
+    return None
+
+
+def _is_tracking_param(name: str) -> bool:
+    """Indica se o parâmetro de query é apenas de rastreamento."""
+    lowered = name.lower()
+    return lowered in TRACKING_PARAMS or lowered.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normaliza a URL de uma vaga para uso como chave de cache e deduplicação.
+
+    Regras gerais: esquema e host em minúsculas, sem porta padrão, sem
+    fragmento, sem parâmetros de rastreamento, query ordenada e sem barra
+    final no caminho. Em seguida aplica a regra específica do site, se houver.
+
+    URLs sem esquema ou host são retornadas apenas sem espaços nas pontas.
+
+    Args:
+        url: URL recebida
+
+    Returns:
+        URL canônica
+    """
+    url = (url or "").strip()
+    parsed = urlparse(url)
+    if not parsed.scheme or not parsed.hostname:
+        return url
+
+    scheme = parsed.scheme.lower()
+    host = parsed.hostname.lower().rstrip(".")
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    if port and str(port) != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+
+    path = re.sub(r"/{2,}", "/", parsed.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not _is_tracking_param(key)
+    ]
+
+    rule = _board_rule(host)
+    if rule:
+        host, path, query = rule(host, path, query)
+
+    return urlunparse((scheme, host, path, "", urlencode(sorted(query)), ""))
@@ -2,45 +2,210 @@
 Serviço de web scraping para extração de conteúdo de vagas.
 Implementa estratégias múltiplas com fallback automático.
 """
-from typing import Dict, Optional
-import re
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Union
+from collections import OrderedDict
+from dataclasses import dataclass
+import asyncio
+import contextvars
+import importlib.util
+import time
 import structlog
 from urllib.parse import urlparse
 import httpx
-from bs4 import BeautifulSoup
 
 from config import settings
+from services.cache import CacheEntry, TieredCache, create_cache
+from services.circuit_breaker import CircuitBreakerRegistry, CircuitOpenError
+from services.host_limiter import HostConcurrencyLimiter
+from services.html_parsers import HTMLParserBackend, get_parser_backend, parse_job_page, resolve_encoding
+from services.jsonld import JobPostingStreamDetector
+from services.near_duplicates import SimHashIndex, simhash
+from services.proxy_pool import ProxyPool, parse_proxy_templates
+from services.rate_limiter import HostRateLimiter, RateLimitExceeded, parse_host_rates, parse_retry_after
+from services.strategy_stats import StrategyLearner, get_strategy_learner
+from services.url_canonicalizer import canonicalize_url
+from services.worker_pool import get_worker_pool
+from utils.validation import validate_and_score_job_content
 
 logger = structlog.get_logger()
 
+# Tipos de conteúdo aceitos antes de ler o corpo (ausência de header também é aceita)
+ALLOWED_CONTENT_TYPES = (
+    "text/html",
+    "application/xhtml+xml",
+    "text/plain",
+    "text/xml",
+    "application/xml",
+)
+
+# Respostas que indicam bloqueio ou indisponibilidade do host (contam para o circuit breaker)
+BREAKER_STATUS_CODES = (403, 429)
+
+# Respostas cujo Retry-After suspende o host no limite de taxa
+RETRY_AFTER_STATUS_CODES = (429, 503)
+
+# Respostas do próprio site indicando página removida (não adianta tentar proxy)
+GONE_STATUS_CODES = (404, 410)
+
+# Prazo (time.monotonic()) do scraping em andamento; herdado pelas tarefas de
+# fetch para que a fila do limite de taxa descarte o que não cabe no prazo
+_scrape_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "scrape_deadline", default=None
+)
+
+
+def _same_posting(original: Dict[str, str], result: Dict[str, str]) -> bool:
+    """Título e empresa idênticos (ignorando caixa e espaços) nas duas extrações."""
+    def normalize(value: Optional[str]) -> str:
+        return " ".join((value or "").split()).casefold()
+    
+    title = normalize(result.get("title"))
+    return bool(title) and all(
+        normalize(original.get(field)) == normalize(result.get(field))
+        for field in ("title", "company")
+    )
+
+
+@dataclass
+class FetchedPage:
+    """Resposta HTTP lida por streaming."""
+    status_code: int
+    headers: httpx.Headers
+    body: bytes
+    encoding: Optional[str]  # Charset do Content-Type (None = não declarado)
+    truncated: bool = False  # Download encerrado cedo (vaga já encontrada)
+    
+    @property
+    def text(self) -> str:
+        """Corpo decodificado (charset declarado, <meta charset> ou UTF-8)."""
+        return self.body.decode(resolve_encoding(self.body, self.encoding), errors="replace")
+
 
 class WebScraper:
     """
     Serviço de web scraping robusto com múltiplas estratégias de fallback.
     """
     
-    def __init__(self, timeout_seconds: int = None):
+    def __init__(
+        self,
+        timeout_seconds: int = None,
+        cache: Optional[TieredCache] = None,
+        parser_backend: Optional[HTMLParserBackend] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        strategy_learner: Optional[StrategyLearner] = None
+    ):
         """
         Inicializa o web scraper.
         
         Args:
             timeout_seconds: Timeout em segundos (usa config padrão se None)
+            cache: Cache de resultados (usa config padrão se None)
+            parser_backend: Backend de parsing HTML (usa config padrão se None)
+            transport: Transporte httpx alternativo (testes, replay)
+            strategy_learner: Tabela de estratégias por domínio (usa a global se None)
         """
         self.timeout = timeout_seconds or settings.scraping_timeout_seconds
+        self.memo_ttl_seconds = settings.scraping_memo_ttl_seconds
+        self.memo_max_entries = settings.scraping_memo_max_entries
+        # Single-flight: requisições concorrentes para a mesma URL compartilham
+        # o mesmo fetch, e o resultado parseado fica memorizado por alguns
+        # segundos para as etapas seguintes do pipeline (conteúdo -> título/empresa)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._memo: "OrderedDict[str, Tuple[float, Dict[str, str]]]" = OrderedDict()
+        if cache is None and settings.scrape_cache_enabled:
+            cache = create_cache(
+                namespace="scrape",
+                ttl_seconds=settings.scrape_cache_ttl_seconds,
+                memory_max_entries=settings.scrape_cache_memory_max_entries,
+                disk_max_entries=settings.scrape_cache_disk_max_entries
+            )
+        self.cache = cache
+        # Fingerprints do texto das vagas já extraídas (mesma vaga em outra URL/site)
+        self.near_duplicates = (
+            SimHashIndex(
+                max_distance=settings.near_duplicate_max_distance,
+                max_entries=settings.near_duplicate_max_entries
+            )
+            if settings.near_duplicate_enabled
+            else None
+        )
+        self.parser_backend = parser_backend or get_parser_backend(
+            settings.scraping_parser_backend
+        )
+        self.main_content = settings.scraping_main_content_enabled
+        if strategy_learner is None and settings.strategy_learning_enabled:
+            strategy_learner = get_strategy_learner()
+        self.strategy_learner = strategy_learner
+        self.max_body_bytes = settings.scraping_max_body_bytes
+        self.early_stop_enabled = settings.scraping_early_stop_enabled
+        self.limits = httpx.Limits(
+            max_connections=settings.scraping_max_connections,
+            max_keepalive_connections=settings.scraping_max_keepalive_connections,
+            keepalive_expiry=settings.scraping_keepalive_expiry_seconds
+        )
+        self.http2 = self._http2_available() if settings.scraping_http2_enabled else False
+        self.host_limiter = HostConcurrencyLimiter(
+            settings.scraping_max_concurrency_per_host,
+            max_hosts=settings.scraping_max_tracked_hosts
+        )
+        self.rate_limiter = (
+            HostRateLimiter(
+                rate_per_second=settings.scraping_rate_per_host,
+                burst=settings.scraping_rate_burst,
+                host_rates=parse_host_rates(settings.scraping_host_rates),
+                max_wait_seconds=settings.scraping_rate_max_wait_seconds,
+                max_retry_after_seconds=settings.scraping_retry_after_max_seconds,
+                max_hosts=settings.scraping_max_tracked_hosts
+            )
+            if settings.scraping_rate_limit_enabled
+            else None
+        )
+        # Proxies CORS ordenados por saúde (sucesso e latência)
+        self.proxy_pool = ProxyPool(
+            parse_proxy_templates(settings.proxy_pool_urls),
+            alpha=settings.proxy_pool_alpha,
+            eject_after_failures=settings.proxy_eject_after_failures,
+            eject_seconds=settings.proxy_eject_seconds,
+            eject_max_seconds=settings.proxy_eject_max_seconds
+        )
+        # Um circuito por host requisitado: sites de vagas e proxies CORS
+        self.breakers = (
+            CircuitBreakerRegistry(
+                failure_threshold=settings.circuit_failure_threshold,
+                recovery_seconds=settings.circuit_recovery_seconds,
+                max_entries=settings.scraping_max_tracked_hosts
+            )
+            if settings.circuit_breaker_enabled
+            else None
+        )
         self.client = httpx.AsyncClient(
             timeout=self.timeout,
             follow_redirects=True,
+            limits=self.limits,
+            http2=self.http2,
+            transport=transport,
             headers={
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
             }
         )
     
-    async def scrape_job_posting(self, url: str) -> Dict[str, str]:
+    @staticmethod
+    def _http2_available() -> bool:
+        """Verifica se o suporte a HTTP/2 (pacote h2) está instalado."""
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 habilitado mas pacote h2 ausente - usando HTTP/1.1")
+            return False
+        return True
+    
+    async def scrape_job_posting(self, url: str, deadline_seconds: Optional[float] = None) -> Dict[str, str]:
         """
         Extrai dados de uma vaga de emprego.
         
         Args:
             url: URL da vaga
+            deadline_seconds: Prazo do chamador; requisições que esperariam na
+                fila do limite de taxa além dele são descartadas (None usa
+                `scraping_rate_max_wait_seconds` por requisição)
             
         Returns:
             Dicionário com title, company, description e fullText
@@ -48,8 +213,6 @@ class WebScraper:
         Raises:
             ValueError: Se scraping falhar
         """
-        logger.info("Iniciando scraping", url=url)
-        
         # Validação da URL
         try:
             parsed = urlparse(url)
@@ -58,25 +221,95 @@ class WebScraper:
         except Exception as e:
             raise ValueError(f"URL inválida: {url}") from e
         
-        # Tentativa 1: Scraping direto
-        try:
-            result = await self._try_direct_scrape(url)
+        # A URL canônica identifica a vaga na memória, no single-flight e no cache
+        url = canonicalize_url(url)
+        
+        memoized = self._get_memoized(url)
+        if memoized is not None:
+            logger.info("Scraping reutilizado da memória", url=url)
+            return memoized
+        
+        task = self._inflight.get(url)
+        if task is None:
+            # A tarefa copia o contexto atual: o prazo vale para todos os fetches dela
+            token = _scrape_deadline.set(
+                time.monotonic() + deadline_seconds if deadline_seconds is not None else None
+            )
+            try:
+                task = asyncio.ensure_future(self._scrape_uncached(url))
+            finally:
+                _scrape_deadline.reset(token)
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        else:
+            logger.info("Aguardando scraping em andamento", url=url)
+        
+        # shield: o cancelamento de um chamador não derruba o fetch compartilhado
+        result = await asyncio.shield(task)
+        self._store_memoized(url, result)
+        return dict(result)
+    
+    async def _scrape_uncached(self, url: str) -> Dict[str, str]:
+        """Executa as estratégias de scraping sem consultar a memória."""
+        cached = await self.cache.aget(self._cache_key(url)) if self.cache else None
+        if cached is not None and self.cache.is_fresh(cached):
+            logger.info("Scraping servido pelo cache", url=url)
+            return dict(cached.value)
+        
+        logger.info("Iniciando scraping", url=url)
+        
+        if settings.scraping_hedge_enabled:
+            result, strategy = await self._race_strategies(url, cached)
             if result:
-                logger.info("Scraping direto bem-sucedido", url=url)
+                logger.info("Scraping concorrente bem-sucedido", url=url, strategy=strategy)
+                if strategy != "direct":
+                    await self._cache_result(url, result)
                 return result
-        except Exception as e:
-            logger.warning("Scraping direto falhou", error=str(e))
+            raise ValueError(self._failure_message(url))
         
-        # Tentativa 2: Via proxy CORS
-        try:
-            result = await self._try_cors_proxy_scrape(url)
+        # Scraping direto (condicional se houver entrada expirada) e proxy CORS,
+        # na ordem aprendida para o domínio
+        strategies = {
+            "direct": lambda: self._try_direct_scrape(url, cached),
+            "proxy": lambda: self._try_cors_proxy_scrape(url),
+        }
+        domain = StrategyLearner.domain_of(url)
+        for name in self._strategy_order(domain, list(strategies)):
+            started = time.monotonic()
+            try:
+                result = await strategies[name]()
+            except Exception as e:
+                logger.warning("Estratégia de scraping falhou", strategy=name, error=str(e))
+                result = None
+            self._record_strategy(domain, name, bool(result), time.monotonic() - started)
+            
             if result:
-                logger.info("Scraping via proxy bem-sucedido", url=url)
+                logger.info("Scraping bem-sucedido", url=url, strategy=name)
+                if name != "direct":
+                    await self._cache_result(url, result)
                 return result
-        except Exception as e:
-            logger.warning("Scraping via proxy falhou", error=str(e))
         
-        raise ValueError(
+        raise ValueError(self._failure_message(url))
+    
+    def _strategy_order(self, domain: str, strategies: List[str]) -> List[str]:
+        """Ordem das estratégias para o domínio (padrão sem aprendizado)."""
+        if not self.strategy_learner:
+            return strategies
+        
+        ordered = self.strategy_learner.order(domain, strategies)
+        if ordered != strategies:
+            logger.info("Ordem de estratégias ajustada pelo histórico", domain=domain, order=ordered)
+        return ordered
+    
+    def _record_strategy(self, domain: str, strategy: str, success: bool, latency_seconds: float):
+        """Registra o resultado de uma estratégia na tabela aprendida."""
+        if self.strategy_learner:
+            self.strategy_learner.record(domain, strategy, success, latency_seconds)
+    
+    @staticmethod
+    def _failure_message(url: str) -> str:
+        """Mensagem de erro quando todas as estratégias de scraping falham."""
+        return (
             f"Falha ao extrair conteúdo da URL: {url}\n"
             f"Possíveis causas:\n"
             f"- Site bloqueia scraping/bots\n"
@@ -85,193 +318,563 @@ class WebScraper:
             f"- Página usa JavaScript para renderizar conteúdo"
         )
     
-    async def _try_direct_scrape(self, url: str) -> Optional[Dict[str, str]]:
-        """Tenta scraping direto."""
+    @staticmethod
+    async def _is_acceptable(result: Optional[Dict[str, str]]) -> bool:
+        """Indica se o resultado tem conteúdo suficiente para encerrar a corrida."""
+        if not result:
+            return False
+        full_text = result.get("fullText", "")
+        if len(full_text) <= 200:
+            return False
+        validation = await get_worker_pool().run(
+            validate_and_score_job_content, full_text, size_hint=len(full_text)
+        )
+        return validation.is_valid
+    
+    async def _race_strategies(
+        self,
+        url: str,
+        cached: Optional[CacheEntry] = None
+    ) -> Tuple[Optional[Dict[str, str]], Optional[str]]:
+        """
+        Executa as estratégias em corrida (hedged requests).
+        
+        A estratégia melhor avaliada para o domínio (por padrão o fetch
+        direto) começa primeiro; cada tentativa seguinte é disparada após
+        `scraping_hedge_delay_seconds` sem resposta aceitável (ou imediatamente
+        quando uma tentativa termina sem sucesso), respeitando o limite de
+        `scraping_max_parallel_attempts`. O primeiro resultado aceitável vence
+        e as demais tentativas são canceladas.
+        
+        Args:
+            url: URL da vaga
+            cached: Entrada de cache expirada usada para revalidação condicional
+            
+        Returns:
+            Tupla (resultado, estratégia vencedora). Se nenhum resultado for
+            aceitável, retorna o primeiro resultado não vazio obtido.
+        """
+        Factory = Callable[[], Awaitable[Optional[Dict[str, str]]]]
+        groups: Dict[str, List[Factory]] = {
+            "direct": [lambda: self._try_direct_scrape(url, cached)],
+            "proxy": [
+                lambda p=proxy_url: self._try_single_proxy(p, url)
+                for proxy_url in self._proxy_urls(url)
+            ],
+        }
+        domain = StrategyLearner.domain_of(url)
+        attempts: List[Tuple[str, Factory]] = [
+            (name, factory)
+            for name in self._strategy_order(domain, list(groups))
+            for factory in groups[name]
+        ]
+        
+        hedge_delay = max(0.0, settings.scraping_hedge_delay_seconds)
+        max_parallel = max(1, settings.scraping_max_parallel_attempts)
+        running: Dict[asyncio.Task, Tuple[str, float]] = {}
+        fallback: Tuple[Optional[Dict[str, str]], Optional[str]] = (None, None)
+        
+        def launch_next():
+            name, factory = attempts.pop(0)
+            running[asyncio.ensure_future(factory())] = (name, time.monotonic())
+        
+        launch_next()
         try:
-            response = await self.client.get(url)
-            response.raise_for_status()
+            while running:
+                can_hedge = bool(attempts) and len(running) < max_parallel
+                done, _ = await asyncio.wait(
+                    set(running),
+                    timeout=hedge_delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                if not done:
+                    # Nenhuma resposta dentro do atraso: dispara a próxima estratégia
+                    launch_next()
+                    continue
+                
+                for task in done:
+                    name, started = running.pop(task)
+                    result = None if task.exception() else task.result()
+                    acceptable = await self._is_acceptable(result)
+                    self._record_strategy(domain, name, acceptable, time.monotonic() - started)
+                    if acceptable:
+                        return result, name
+                    if result and fallback[0] is None:
+                        fallback = (result, name)
+                
+                # Tentativas que falharam liberam vaga para a próxima imediatamente
+                while attempts and len(running) < max_parallel:
+                    launch_next()
             
-            html = response.text
-            return self._parse_html(html)
-        except Exception as e:
-            logger.debug("Scraping direto falhou", error=str(e))
+            return fallback
+        finally:
+            for task in running:
+                task.cancel()
+    
+    def _get_memoized(self, url: str) -> Optional[Dict[str, str]]:
+        """Retorna cópia do resultado memorizado se ainda estiver dentro do TTL."""
+        entry = self._memo.get(url)
+        if entry is None:
             return None
+        
+        stored_at, result = entry
+        if time.monotonic() - stored_at > self.memo_ttl_seconds:
+            self._memo.pop(url, None)
+            return None
+        
+        self._memo.move_to_end(url)
+        return dict(result)
     
-    async def _try_cors_proxy_scrape(self, url: str) -> Optional[Dict[str, str]]:
-        """Tenta scraping via proxy CORS."""
-        proxies = [
-            f"https://api.allorigins.win/raw?url={url}",
-            f"https://corsproxy.io/?{url}",
-        ]
+    def _store_memoized(self, url: str, result: Dict[str, str]):
+        """Memoriza o resultado parseado, descartando as entradas mais antigas."""
+        if self.memo_ttl_seconds <= 0:
+            return
         
-        for proxy_url in proxies:
-            try:
-                response = await self.client.get(proxy_url)
-                response.raise_for_status()
-                
-                html = response.text
-                result = self._parse_html(html)
-                if result and len(result.get("fullText", "")) > 200:
-                    return result
-            except Exception:
-                continue
+        self._memo[url] = (time.monotonic(), dict(result))
+        self._memo.move_to_end(url)
+        while len(self._memo) > self.memo_max_entries:
+            self._memo.popitem(last=False)
+    
+    @staticmethod
+    def _cache_key(url: str) -> str:
+        """Chave de cache: URL canônica da vaga."""
+        return canonicalize_url(url)
+    
+    async def _cache_result(
+        self,
+        url: str,
+        result: Dict[str, str],
+        validators: Optional[Dict[str, str]] = None
+    ):
+        """Armazena o resultado parseado e os validadores HTTP no cache."""
+        if self.cache:
+            await self.cache.aset(self._cache_key(url), result, validators)
+    
+    async def invalidate(
+        self,
+        url: str,
+        result: Optional[Dict[str, str]] = None,
+        validators: Optional[Dict[str, str]] = None
+    ):
+        """
+        Descarta o resultado memorizado da vaga e atualiza o cache.
         
-        return None
+        Args:
+            url: URL da vaga
+            result: Novo resultado parseado (None remove a entrada do cache)
+            validators: ETag/Last-Modified da resposta que gerou o resultado
+        """
+        key = self._cache_key(url)
+        self._memo.pop(key, None)
+        if result is not None:
+            await self._cache_result(key, result, validators)
+        elif self.cache:
+            await self.cache.adelete(key)
     
-    def _parse_html(self, html: str) -> Dict[str, str]:
+    async def fetch_job_page(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> FetchedPage:
         """
-        Parseia HTML e extrai informações da vaga.
+        Baixa a página da vaga pela cadeia de estratégias, sem parsear.
+        
+        Usa a mesma ordem aprendida para o domínio do scraping (fetch direto
+        e proxies CORS do mais saudável ao menos), uma tentativa por vez, e
+        registra o resultado nas estatísticas de estratégia e de proxies. Os
+        headers (ex.: condicionais) seguem em todas as tentativas.
         
         Args:
-            html: HTML da página
+            url: URL da vaga
+            headers: Headers adicionais (ex.: If-None-Match/If-Modified-Since)
             
         Returns:
-            Dicionário com dados extraídos
+            FetchedPage da primeira estratégia bem-sucedida (304 incluso)
+            
+        Raises:
+            httpx.HTTPStatusError: Se o site responder 404/410 no fetch direto
+            Exception: Erro da última tentativa, se todas falharem
         """
-        soup = BeautifulSoup(html, "lxml")
+        url = canonicalize_url(url)
+        targets = {"direct": [url], "proxy": self._proxy_urls(url)}
+        domain = StrategyLearner.domain_of(url)
+        last_error: Optional[Exception] = None
         
-        # Extrai structured data (JSON-LD)
-        structured_data = self._extract_structured_data(soup)
+        for name in self._strategy_order(domain, list(targets)):
+            if not targets[name]:
+                continue
+            started = time.monotonic()
+            success = False
+            try:
+                for target in targets[name]:
+                    attempt_started = time.monotonic()
+                    try:
+                        page = await self._fetch_page(target, headers=headers)
+                    except httpx.HTTPStatusError as e:
+                        if name == "direct" and e.response.status_code in GONE_STATUS_CODES:
+                            # Resposta definitiva do site: a vaga saiu do ar
+                            success = True
+                            raise
+                        last_error = e
+                    except (CircuitOpenError, RateLimitExceeded) as e:
+                        last_error = e
+                        continue
+                    except Exception as e:
+                        last_error = e
+                    else:
+                        if name == "proxy":
+                            self.proxy_pool.record(target, True, time.monotonic() - attempt_started)
+                        success = True
+                        return page
+                    
+                    if name == "proxy":
+                        reason = str(last_error).splitlines()[0] if str(last_error) else type(last_error).__name__
+                        self.proxy_pool.record(target, False, time.monotonic() - attempt_started, reason)
+            finally:
+                self._record_strategy(domain, name, success, time.monotonic() - started)
         
-        # Extrai título
-        title = (
-            structured_data.get("title")
-            or self._extract_title(soup)
-            or ""
-        )
+        raise last_error or ValueError(self._failure_message(url))
+    
+    async def parse_fetched_page(self, page: FetchedPage, url: str) -> Dict[str, str]:
+        """
+        Parseia uma página baixada por `fetch_job_page` (no worker pool).
         
-        # Extrai empresa
-        company = (
-            structured_data.get("company")
-            or self._extract_company(soup)
-            or ""
-        )
+        Args:
+            page: Página baixada
+            url: URL da vaga (seleciona o extrator específico do site)
+            
+        Returns:
+            Dicionário com title, company, description e fullText
+        """
+        return await self._parse_html_async(page.body, canonicalize_url(url), page.encoding)
+    
+    @staticmethod
+    def _conditional_headers(cached: Optional[CacheEntry]) -> Dict[str, str]:
+        """Monta headers If-None-Match/If-Modified-Since a partir da entrada em cache."""
+        if cached is None:
+            return {}
         
-        # Extrai descrição
-        description = (
-            structured_data.get("description")
-            or self._extract_description(soup)
-            or ""
-        )
+        headers = {}
+        if cached.metadata.get("etag"):
+            headers["If-None-Match"] = cached.metadata["etag"]
+        if cached.metadata.get("last_modified"):
+            headers["If-Modified-Since"] = cached.metadata["last_modified"]
+        return headers
+    
+    def get_cache_stats(self) -> Dict[str, object]:
+        """Retorna métricas do cache de scraping (hits, misses, revalidações)."""
+        if not self.cache:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            **self.cache.get_stats(),
+            "revalidations": self.cache.stats["revalidations"],
+        }
+    
+    def get_pool_stats(self) -> Dict[str, object]:
+        """Retorna uso do pool de conexões HTTP e da concorrência por host."""
+        stats: Dict[str, object] = {
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "keepalive_expiry_seconds": self.limits.keepalive_expiry,
+            "per_host": self.host_limiter.get_stats(),
+            "rate_limits": self.rate_limiter.get_stats() if self.rate_limiter else None,
+        }
         
-        # Texto completo limpo
-        full_text = self._extract_full_text(soup)
+        # Pool do httpcore só existe no transporte padrão (não em mocks/replay)
+        pool = getattr(getattr(self.client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is None:
+            stats["connections"] = None
+            return stats
         
-        return {
-            "title": title.strip(),
-            "company": company.strip(),
-            "description": description.strip(),
-            "fullText": full_text.strip()
+        idle = sum(1 for connection in connections if connection.is_idle())
+        stats["connections"] = {
+            "open": len(connections),
+            "idle": idle,
+            "active": len(connections) - idle,
+            "utilization": (
+                round((len(connections) - idle) / self.limits.max_connections, 3)
+                if self.limits.max_connections else None
+            ),
         }
+        return stats
     
-    def _extract_structured_data(self, soup: BeautifulSoup) -> Dict[str, str]:
-        """Extrai dados estruturados JSON-LD."""
-        result = {}
+    async def _try_direct_scrape(
+        self,
+        url: str,
+        cached: Optional[CacheEntry] = None
+    ) -> Optional[Dict[str, str]]:
+        """Tenta scraping direto, revalidando a entrada em cache quando possível."""
+        try:
+            page = await self._fetch_page(url, headers=self._conditional_headers(cached))
+            
+            if page.status_code == 304 and cached is not None:
+                logger.info("Conteúdo não modificado - cache revalidado", url=url)
+                self.cache.count("revalidations")
+                await self.cache.atouch(self._cache_key(url))
+                return dict(cached.value)
+            
+            result = await self._parse_page(page.body, url, page.encoding)
+            await self._cache_result(url, result, {
+                "etag": page.headers.get("etag", ""),
+                "last_modified": page.headers.get("last-modified", ""),
+            })
+            return result
+        except Exception as e:
+            logger.debug("Scraping direto falhou", error=str(e))
+            return None
+    
+    async def _fetch_page(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None
+    ) -> FetchedPage:
+        """
+        Baixa a página por streaming com limite de tamanho.
         
-        json_ld_scripts = soup.find_all(
-            "script",
-            type="application/ld+json"
-        )
+        Verifica status e content-type antes de ler o corpo, aborta se o
+        corpo passar de `scraping_max_body_bytes` e encerra o download assim
+        que um JobPosting JSON-LD completo for encontrado.
         
-        for script in json_ld_scripts:
-            try:
-                import json
-                data = json.loads(script.string)
-                
-                # Pode ser array ou objeto único
-                items = data if isinstance(data, list) else [data]
+        Args:
+            url: URL a buscar
+            headers: Headers adicionais (ex.: condicionais)
+            
+        Returns:
+            FetchedPage com o corpo lido (vazio em respostas 304)
+            
+        Raises:
+            httpx.HTTPStatusError: Se o status indicar erro
+            CircuitOpenError: Se o circuito do host estiver aberto
+            RateLimitExceeded: Se a fila do host não liberar vaga dentro do prazo
+            ValueError: Se o content-type não for HTML ou o corpo exceder o limite
+        """
+        host = self.host_limiter.host_key(url)
+        if self.breakers:
+            self.breakers.check(host)
+        if self.rate_limiter:
+            await self.rate_limiter.acquire(url, _scrape_deadline.get())
+        
+        try:
+            async with self.host_limiter.limit(url), \
+                    self.client.stream("GET", url, headers=headers) as response:
+                self._record_host_status(host, response)
+                self._apply_retry_after(url, response)
+                if response.status_code == 304:
+                    return FetchedPage(304, response.headers, b"", "utf-8")
                 
-                for item in items:
-                    if item.get("@type") == "JobPosting":
-                        result["title"] = item.get("title") or item.get("name", "")
-                        org = item.get("hiringOrganization", {})
-                        if isinstance(org, dict):
-                            result["company"] = org.get("name", "")
-                        else:
-                            result["company"] = str(org)
-                        result["description"] = item.get("description", "")
-                        break
-            except Exception:
-                continue
+                response.raise_for_status()
+                return await self._read_body(url, response)
+        except httpx.TransportError:
+            if self.breakers:
+                self.breakers.record(host, success=False)
+            raise
+    
+    def _record_host_status(self, host: str, response: httpx.Response):
+        """Atualiza o circuito do host conforme o status da resposta."""
+        if not self.breakers:
+            return
         
-        return result
-    
-    def _extract_title(self, soup: BeautifulSoup) -> str:
-        """Extrai título usando heurísticas."""
-        # Meta tags
-        og_title = soup.find("meta", property="og:title")
-        if og_title:
-            return og_title.get("content", "")
-        
-        twitter_title = soup.find("meta", attrs={"name": "twitter:title"})
-        if twitter_title:
-            return twitter_title.get("content", "")
-        
-        # Tag title
-        title_tag = soup.find("title")
-        if title_tag:
-            title = title_tag.string or ""
-            # Remove sufixos comuns
-            title = re.sub(r"\s*[-|]\s*(LinkedIn|Indeed|Glassdoor).*$", "", title, flags=re.IGNORECASE)
-            return title.strip()
-        
-        # H1
-        h1 = soup.find("h1")
-        if h1:
-            return h1.get_text(strip=True)
-        
-        return ""
-    
-    def _extract_company(self, soup: BeautifulSoup) -> str:
-        """Extrai nome da empresa usando heurísticas."""
-        # Padrões comuns em sites de vagas
-        patterns = [
-            soup.find("a", class_=re.compile(r"company", re.I)),
-            soup.find(attrs={"data-company-name": True}),
-        ]
+        blocked = response.status_code in BREAKER_STATUS_CODES or response.status_code >= 500
+        self.breakers.record(
+            host,
+            success=not blocked,
+            retry_after_seconds=parse_retry_after(response.headers.get("retry-after"))
+        )
+    
+    def _apply_retry_after(self, url: str, response: httpx.Response):
+        """Suspende o host no limite de taxa pelo Retry-After de respostas 429/503."""
+        if not self.rate_limiter or response.status_code not in RETRY_AFTER_STATUS_CODES:
+            return
         
-        for element in patterns:
-            if element:
-                if element.name == "a":
-                    return element.get_text(strip=True)
-                else:
-                    return element.get("data-company-name", "")
-        
-        return ""
-    
-    def _extract_description(self, soup: BeautifulSoup) -> str:
-        """Extrai descrição da vaga."""
-        # Procura por seções de descrição
-        description_selectors = [
-            soup.find("div", class_=re.compile(r"description", re.I)),
-            soup.find("section", class_=re.compile(r"job-description", re.I)),
-            soup.find("div", id=re.compile(r"job-details", re.I)),
-        ]
+        retry_after = parse_retry_after(response.headers.get("retry-after"))
+        if retry_after is not None:
+            self.rate_limiter.penalize(url, retry_after)
+    
+    async def _read_body(self, url: str, response: httpx.Response) -> FetchedPage:
+        """Lê o corpo por partes aplicando content-type, limite de tamanho e parada antecipada."""
+        content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type and content_type not in ALLOWED_CONTENT_TYPES:
+            raise ValueError(f"Content-type não suportado: {content_type}")
+        
+        declared_length = int(response.headers.get("content-length") or 0)
+        if declared_length > self.max_body_bytes:
+            raise ValueError(
+                f"Página muito grande ({declared_length} bytes, limite {self.max_body_bytes})"
+            )
+        
+        body = bytearray()
+        detector = JobPostingStreamDetector() if self.early_stop_enabled else None
+        truncated = False
+        async for chunk in response.aiter_bytes():
+            body.extend(chunk)
+            if len(body) > self.max_body_bytes:
+                raise ValueError(
+                    f"Página excedeu o limite de {self.max_body_bytes} bytes"
+                )
+            if detector and detector.check(body):
+                # Vaga completa já disponível: o restante da página é descartado
+                truncated = True
+                break
+        
+        if truncated:
+            logger.info("Download encerrado cedo: JSON-LD completo", url=url, bytes_read=len(body))
+        
+        return FetchedPage(
+            status_code=response.status_code,
+            headers=response.headers,
+            body=bytes(body),
+            # Só o charset declarado: o parser decodifica os bytes sem a
+            # detecção de charset do httpx nem a cópia intermediária em str
+            encoding=response.charset_encoding,
+            truncated=truncated
+        )
+    
+    def _proxy_urls(self, url: str) -> List[str]:
+        """URLs dos proxies CORS para a URL da vaga, do mais saudável ao menos."""
+        return self.proxy_pool.urls_for(url)
+    
+    async def _try_cors_proxy_scrape(self, url: str) -> Optional[Dict[str, str]]:
+        """Tenta scraping via proxy CORS."""
+        for proxy_url in self._proxy_urls(url):
+            result = await self._try_single_proxy(proxy_url, url)
+            if result:
+                return result
         
-        for element in description_selectors:
-            if element:
-                text = element.get_text(separator="\n", strip=True)
-                if len(text) > 200:
-                    return text
+        return None
+    
+    async def _try_single_proxy(
+        self,
+        proxy_url: str,
+        url: Optional[str] = None
+    ) -> Optional[Dict[str, str]]:
+        """Tenta scraping através de um único proxy CORS (url = URL original da vaga)."""
+        started = time.monotonic()
+        try:
+            page = await self._fetch_page(proxy_url)
+            result = await self._parse_page(page.body, url, page.encoding)
+            if result and len(result.get("fullText", "")) > 200:
+                self.proxy_pool.record(proxy_url, True, time.monotonic() - started)
+                return result
+            self.proxy_pool.record(proxy_url, False, time.monotonic() - started, "conteúdo insuficiente")
+        except (CircuitOpenError, RateLimitExceeded) as e:
+            # Requisição nem saiu: não conta para a saúde do proxy
+            logger.debug("Proxy indisponível no momento", proxy_url=proxy_url, error=str(e))
+        except Exception as e:
+            logger.debug("Scraping via proxy falhou", proxy_url=proxy_url, error=str(e))
+            reason = str(e).splitlines()[0] if str(e) else type(e).__name__
+            self.proxy_pool.record(proxy_url, False, time.monotonic() - started, reason)
         
-        return ""
+        return None
+    
+    async def _parse_page(
+        self,
+        html: Union[str, bytes],
+        url: Optional[str],
+        encoding: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Parseia a página e reaproveita a extração de uma vaga quase idêntica."""
+        result = await self._parse_html_async(html, url, encoding)
+        if url is None:
+            return result
+        return await self._resolve_near_duplicate(url, result)
     
-    def _extract_full_text(self, soup: BeautifulSoup) -> str:
-        """Extrai texto completo limpo da página."""
-        # Remove scripts e styles
-        for tag in soup(["script", "style", "nav", "footer", "header"]):
-            tag.decompose()
+    async def _resolve_near_duplicate(self, url: str, result: Dict[str, str]) -> Dict[str, str]:
+        """
+        Indexa o texto da vaga e, se já houver vaga quase idêntica em cache
+        (mesma vaga em outra URL ou site), retorna a extração existente para
+        que os caches seguintes (LLM, geração) sejam reaproveitados.
+        
+        Vagas diferentes da mesma empresa compartilham boilerplate e ficam a
+        poucos bits de distância, então o resultado recém-parseado só é
+        trocado quando título e empresa também são idênticos.
+        """
+        full_text = result.get("fullText", "")
+        if self.near_duplicates is None or len(full_text) <= 200:
+            return result
         
-        # Extrai texto
-        text = soup.get_text(separator="\n", strip=True)
+        key = self._cache_key(url)
+        fingerprint = await get_worker_pool().run(simhash, full_text, size_hint=len(full_text))
+        match = self.near_duplicates.find(fingerprint, exclude=key)
+        self.near_duplicates.add(key, fingerprint)
+        if match is None or not self.cache:
+            return result
         
-        # Limpa espaços múltiplos e quebras de linha
-        text = re.sub(r"\n\s*\n\s*\n+", "\n\n", text)
-        text = re.sub(r" +", " ", text)
+        original_key, distance = match
+        # Consulta interna: não conta como hit/miss do cache de scraping
+        original = await self.cache.apeek(original_key)
+        if original is None or not _same_posting(original.value, result):
+            self.cache.count("near_duplicates_rejected")
+            return result
         
-        return text.strip()
+        logger.info(
+            "Vaga quase idêntica já extraída - reaproveitando resultado",
+            url=url,
+            original_url=original_key,
+            distance=distance
+        )
+        self.cache.count("near_duplicates")
+        return dict(original.value)
+    
+    def _parse_html(
+        self,
+        html: Union[str, bytes],
+        url: Optional[str] = None,
+        encoding: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Parseia HTML e extrai informações da vaga.
+        
+        Tenta primeiro o caminho rápido via JSON-LD (sem construir DOM) e só
+        recorre ao parse completo quando o JobPosting está ausente ou incompleto.
+        
+        Args:
+            html: HTML da página (str ou bytes da resposta)
+            url: URL da vaga (seleciona o extrator específico do site)
+            encoding: Charset declarado na resposta (só para bytes)
+            
+        Returns:
+            Dicionário com dados extraídos
+        """
+        return parse_job_page(html, self.parser_backend.name, url, self.main_content, encoding)
+    
+    async def _parse_html_async(
+        self,
+        html: Union[str, bytes],
+        url: Optional[str] = None,
+        encoding: Optional[str] = None
+    ) -> Dict[str, str]:
+        """Parseia HTML no worker pool, sem bloquear o event loop em páginas grandes."""
+        return await get_worker_pool().run(
+            parse_job_page, html, self.parser_backend.name, url, self.main_content, encoding,
+            size_hint=len(html)
+        )
+    
+    def _parse_html_full(
+        self,
+        html: Union[str, bytes],
+        url: Optional[str] = None,
+        encoding: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Parseia o HTML completo com o backend configurado e heurísticas.
+        
+        Args:
+            html: HTML da página (str ou bytes da resposta)
+            url: URL da vaga (seleciona o extrator específico do site)
+            encoding: Charset declarado na resposta (só para bytes)
+            
+        Returns:
+            Dicionário com dados extraídos
+        """
+        return self.parser_backend.parse(html, url, self.main_content, encoding)
     
     async def close(self):
-        """Fecha o cliente HTTP."""
+        """Fecha o cliente HTTP e o cache."""
         await self.client.aclose()
+        if self.cache:
+            self.cache.close()
 
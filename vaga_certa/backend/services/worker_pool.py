@@ -0,0 +1,182 @@
+"""
+Pool de workers para tarefas CPU-bound (parsing HTML, validação, compatibilidade).
+Tira o trabalho pesado do event loop do uvicorn, com fila limitada e métricas
+de tempo em fila versus tempo em execução.
+"""
+from typing import Any, Callable, Dict, Optional, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from collections import Counter
+import asyncio
+import time
+import weakref
+import structlog
+
+from config import settings
+
+logger = structlog.get_logger()
+
+
+def _timed_call(func: Callable, args: Tuple) -> Tuple[Any, float, float]:
+    """Executa a função no worker registrando início e fim (relógio monotônico)."""
+    started = time.monotonic()
+    result = func(*args)
+    return result, started, time.monotonic()
+
+
+class CPUWorkerPool:
+    """
+    Executor de tarefas CPU-bound fora do event loop.
+
+    Entradas pequenas (abaixo de `min_offload_chars`) rodam inline, pois o
+    custo de despacho superaria o ganho. A admissão no executor é limitada a
+    `max_workers + max_queue_size` tarefas; chamadores excedentes aguardam de
+    forma assíncrona, sem bloquear o event loop.
+    """
+
+    MODES = ("thread", "process", "inline")
+
+    def __init__(
+        self,
+        mode: str = "thread",
+        max_workers: int = 4,
+        max_queue_size: int = 64,
+        min_offload_chars: int = 20000
+    ):
+        """
+        Inicializa o pool.
+
+        Args:
+            mode: "thread", "process" ou "inline" (sem offload)
+            max_workers: Número de workers do executor
+            max_queue_size: Tarefas aguardando worker além das em execução
+            min_offload_chars: Tamanho mínimo da entrada para sair do event loop
+
+        Raises:
+            ValueError: Se o modo for inválido
+        """
+        mode = (mode or "").strip().lower()
+        if mode not in self.MODES:
+            raise ValueError(
+                f"Modo de worker pool inválido: {mode}. Opções: {', '.join(self.MODES)}"
+            )
+
+        self.mode = mode
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max(0, max_queue_size)
+        self.min_offload_chars = min_offload_chars
+        self.stats: Counter = Counter()
+        self._queued_seconds = 0.0
+        self._executing_seconds = 0.0
+        self._max_queued_seconds = 0.0
+        self._in_flight = 0
+        self._executor: Optional[Executor] = None
+        # Um semáforo por event loop (testes e workers podem ter loops distintos)
+        self._admission: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _get_executor(self) -> Executor:
+        """Cria o executor sob demanda."""
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="cpu-worker"
+                )
+        return self._executor
+
+    def _get_admission(self) -> asyncio.Semaphore:
+        """Semáforo de admissão do event loop atual."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._admission.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_workers + self.max_queue_size)
+            self._admission[loop] = semaphore
+        return semaphore
+
+    async def run(self, func: Callable, *args: Any, size_hint: int = 0) -> Any:
+        """
+        Executa `func(*args)` no pool (ou inline para entradas pequenas).
+
+        No modo "process", `func` e os argumentos precisam ser serializáveis
+        (funções de módulo, não métodos de objetos com conexões abertas).
+
+        Args:
+            func: Função CPU-bound
+            *args: Argumentos posicionais
+            size_hint: Tamanho aproximado da entrada (ex.: caracteres do HTML)
+
+        Returns:
+            Resultado de `func`
+        """
+        if self.mode == "inline" or size_hint < self.min_offload_chars:
+            self.stats["inline"] += 1
+            return func(*args)
+
+        submitted = time.monotonic()
+        async with self._get_admission():
+            self._in_flight += 1
+            try:
+                loop = asyncio.get_running_loop()
+                result, started, finished = await loop.run_in_executor(
+                    self._get_executor(), _timed_call, func, args
+                )
+            finally:
+                self._in_flight -= 1
+
+        queued = max(0.0, started - submitted)
+        self.stats["offloaded"] += 1
+        self._queued_seconds += queued
+        self._executing_seconds += finished - started
+        self._max_queued_seconds = max(self._max_queued_seconds, queued)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna métricas de uso (tarefas, tempo em fila e em execução)."""
+        offloaded = self.stats["offloaded"]
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_queue_size": self.max_queue_size,
+            "in_flight": self._in_flight,
+            "inline": self.stats["inline"],
+            "offloaded": offloaded,
+            "queued_seconds_total": round(self._queued_seconds, 4),
+            "executing_seconds_total": round(self._executing_seconds, 4),
+            "queued_seconds_avg": round(self._queued_seconds / offloaded, 4) if offloaded else 0.0,
+            "executing_seconds_avg": round(self._executing_seconds / offloaded, 4) if offloaded else 0.0,
+            "queued_seconds_max": round(self._max_queued_seconds, 4),
+        }
+
+    def shutdown(self):
+        """Encerra o executor (tarefas em andamento são concluídas)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+_worker_pool: Optional[CPUWorkerPool] = None
+
+
+def get_worker_pool() -> CPUWorkerPool:
+    """Retorna o pool global do processo, criado a partir de Settings."""
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = CPUWorkerPool(
+            mode=settings.cpu_pool_mode,
+            max_workers=settings.cpu_pool_max_workers,
+            max_queue_size=settings.cpu_pool_max_queue_size,
+            min_offload_chars=settings.cpu_pool_min_offload_chars
+        )
+        logger.info("Worker pool inicializado", mode=_worker_pool.mode)
+    return _worker_pool
+
+
+def shutdown_worker_pool():
+    """Encerra o pool global (chamado no shutdown da aplicação)."""
+    global _worker_pool
+    if _worker_pool is not None:
+        _worker_pool.shutdown()
+        _worker_pool = None
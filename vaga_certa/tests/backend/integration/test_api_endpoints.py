@@ -311,3 +311,75 @@ class TestErrorHandling:
         
         assert response.status_code == 422
 
+
+
+@pytest.mark.integration
+class TestMetricsEndpoint:
+    """Testes do endpoint de métricas."""
+
+    def test_generation_cache_labelled_by_agent(self, client, monkeypatch):
+        """Caches dos agentes padrão e thinking aparecem separados."""
+        from api import main
+
+        default_agent = Mock()
+        default_agent.result_cache.get_stats.return_value = {"hits": 1}
+        thinking_agent = Mock()
+        thinking_agent.result_cache.get_stats.return_value = {"hits": 2}
+        monkeypatch.setattr(main, "generation_agent", default_agent)
+        monkeypatch.setattr(main, "thinking_generation_agent", thinking_agent)
+        monkeypatch.setattr(main.settings, "admin_api_key", "segredo")
+
+        response = client.get("/metrics", headers={"X-Admin-Key": "segredo"})
+
+        assert response.status_code == 200
+        assert response.json()["generation_cache"] == {
+            "default": {"hits": 1},
+            "thinking": {"hits": 2},
+        }
+
+
+@pytest.mark.integration
+class TestAdminGuard:
+    """Testes da chave exigida pelas rotas administrativas, do monitor e de métricas."""
+
+    ADMIN_ROUTES = [
+        ("get", "/metrics"),
+        ("get", "/admin/proxies"),
+        ("get", "/admin/scraping-strategies"),
+        ("get", "/monitor/jobs"),
+        ("post", "/monitor/jobs"),
+        ("post", "/monitor/jobs/check"),
+        ("delete", "/monitor/jobs?job_url=https://example.com/vaga"),
+    ]
+
+    @pytest.mark.parametrize("method,path", ADMIN_ROUTES)
+    def test_disabled_without_configured_key(self, client, monkeypatch, method, path):
+        """Sem ADMIN_API_KEY configurada, as rotas ficam desabilitadas."""
+        from config import settings
+
+        monkeypatch.setattr(settings, "admin_api_key", None)
+        response = client.request(method, path, json={"job_url": "https://example.com/vaga"})
+
+        assert response.status_code == 503
+
+    @pytest.mark.parametrize("method,path", ADMIN_ROUTES)
+    def test_rejects_missing_or_wrong_key(self, client, monkeypatch, method, path):
+        """Chave ausente ou errada recebe 401 antes de chegar ao monitor."""
+        from config import settings
+
+        monkeypatch.setattr(settings, "admin_api_key", "segredo")
+        body = {"job_url": "https://example.com/vaga"}
+
+        assert client.request(method, path, json=body).status_code == 401
+        assert client.request(
+            method, path, json=body, headers={"X-Admin-Key": "errada"}
+        ).status_code == 401
+
+    def test_accepts_valid_key(self, client, monkeypatch):
+        """Chave correta libera a rota."""
+        from config import settings
+
+        monkeypatch.setattr(settings, "admin_api_key", "segredo")
+        response = client.get("/admin/proxies", headers={"X-Admin-Key": "segredo"})
+
+        assert response.status_code == 200
@@ -0,0 +1,170 @@
+"""
+Testes unitários para o cache em duas camadas.
+"""
+import threading
+
+import pytest
+from services.cache import TieredCache
+
+
+@pytest.fixture
+def disk_path(tmp_path):
+    """Caminho temporário para o banco SQLite do cache."""
+    return str(tmp_path / "cache.sqlite3")
+
+
+@pytest.mark.unit
+class TestTieredCache:
+    """Testes do TieredCache."""
+
+    def test_get_and_set(self):
+        """Valor armazenado é retornado e conta como hit em memória."""
+        cache = TieredCache("test", ttl_seconds=60)
+        cache.set("a", {"title": "Vaga"}, {"etag": '"x"'})
+
+        entry = cache.get("a")
+
+        assert entry.value == {"title": "Vaga"}
+        assert entry.metadata == {"etag": '"x"'}
+        assert cache.get_stats()["hits_memory"] == 1
+
+    def test_miss_and_stale(self):
+        """Entradas ausentes contam como miss e expiradas como stale."""
+        cache = TieredCache("test", ttl_seconds=0)
+        cache.set("a", {"title": "Vaga"})
+
+        assert cache.get("b") is None
+        entry = cache.get("a")
+
+        assert entry is not None
+        assert not cache.is_fresh(entry)
+        stats = cache.get_stats()
+        assert stats["misses"] == 1
+        assert stats["stale"] == 1
+
+    def test_memory_lru_eviction(self):
+        """A camada em memória descarta a entrada menos usada recentemente."""
+        cache = TieredCache("test", ttl_seconds=60, memory_max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a").value == 1
+        assert cache.get("c").value == 3
+
+    def test_disk_tier_survives_restart(self, disk_path):
+        """Entradas em disco sobrevivem a uma nova instância do cache."""
+        cache = TieredCache("test", ttl_seconds=60, disk_path=disk_path)
+        cache.set("a", {"title": "Vaga"})
+        cache.close()
+
+        reopened = TieredCache("test", ttl_seconds=60, disk_path=disk_path)
+        entry = reopened.get("a")
+
+        assert entry.value == {"title": "Vaga"}
+        assert reopened.get_stats()["hits_disk"] == 1
+
+    def test_disk_lru_eviction(self, disk_path):
+        """A camada em disco respeita o limite de entradas."""
+        cache = TieredCache(
+            "test", ttl_seconds=60, memory_max_entries=1,
+            disk_path=disk_path, disk_max_entries=2
+        )
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+
+        assert cache.get("a") is None
+        assert cache.get("b").value == "b"
+
+    def test_namespaces_are_isolated(self, disk_path):
+        """Namespaces diferentes não compartilham entradas no mesmo arquivo."""
+        first = TieredCache("first", ttl_seconds=60, disk_path=disk_path)
+        second = TieredCache("second", ttl_seconds=60, disk_path=disk_path)
+        first.set("a", 1)
+
+        assert second.get("a") is None
+
+    def test_touch_renews_entry(self):
+        """touch renova o instante de armazenamento e mescla metadados."""
+        cache = TieredCache("test", ttl_seconds=60)
+        cache.set("a", 1, {"etag": '"v1"'})
+        before = cache.get("a").stored_at
+
+        entry = cache.touch("a", {"last_modified": "ontem"})
+
+        assert entry.stored_at >= before
+        assert entry.metadata == {"etag": '"v1"', "last_modified": "ontem"}
+
+    def test_peek_does_not_count_in_stats(self, disk_path):
+        """peek lê da memória e do disco sem alterar hits e misses."""
+        TieredCache("test", ttl_seconds=60, disk_path=disk_path).set("a", 1)
+        cache = TieredCache("test", ttl_seconds=60, disk_path=disk_path)
+
+        assert cache.peek("a").value == 1
+        assert cache.peek("b") is None
+        assert cache.peek("a").value == 1
+
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["stale"]) == (0, 0, 0)
+
+    def test_disk_reads_batch_access_updates(self, disk_path):
+        """Leituras em disco não gravam o acesso uma a uma; o lote mantém o LRU."""
+        cache = TieredCache(
+            "test", ttl_seconds=60, memory_max_entries=1,
+            disk_path=disk_path, disk_max_entries=2, access_flush_size=10
+        )
+        cache.set("a", "a")
+        cache.set("b", "b")
+        changes = cache._db.total_changes
+
+        assert cache.get("a").value == "a"
+        assert cache._db.total_changes == changes
+        cache.set("c", "c")
+
+        assert cache.get("b") is None
+        assert cache.get("a").value == "a"
+
+    def test_close_flushes_pending_access(self, disk_path):
+        """close grava os acessos pendentes antes de fechar o banco."""
+        cache = TieredCache("test", ttl_seconds=60, memory_max_entries=1, disk_path=disk_path)
+        cache.set("a", "a")
+        cache.set("b", "b")
+        cache.get("a")
+        cache.close()
+
+        reopened = TieredCache(
+            "test", ttl_seconds=60, memory_max_entries=1,
+            disk_path=disk_path, disk_max_entries=2
+        )
+        reopened.set("c", "c")
+
+        assert reopened.get("b") is None
+        assert reopened.get("a").value == "a"
+
+    @pytest.mark.asyncio
+    async def test_async_api_runs_disk_access_in_thread(self, disk_path, monkeypatch):
+        """aget/aset/atouch/adelete levam o SQLite para fora do event loop."""
+        cache = TieredCache("test", ttl_seconds=60, memory_max_entries=1, disk_path=disk_path)
+        loop_thread = threading.get_ident()
+        threads = []
+        disk_get = cache._disk_get
+
+        def tracking_disk_get(key):
+            threads.append(threading.get_ident())
+            return disk_get(key)
+
+        monkeypatch.setattr(cache, "_disk_get", tracking_disk_get)
+
+        await cache.aset("a", {"title": "Vaga"})
+        await cache.aset("b", 2)
+        entry = await cache.aget("a")
+        await cache.atouch("a", {"etag": '"v2"'})
+        await cache.adelete("b")
+
+        assert entry.value == {"title": "Vaga"}
+        assert (await cache.aget("a")).metadata == {"etag": '"v2"'}
+        assert await cache.aget("b") is None
+        assert threads and loop_thread not in threads
+        cache.close()
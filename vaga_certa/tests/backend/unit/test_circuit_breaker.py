@@ -0,0 +1,184 @@
+"""
+Testes unitários para circuit breakers e cache negativo de URLs.
+"""
+import time
+import httpx
+import pytest
+from services.cache import TieredCache
+from services.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+    NegativeCache,
+)
+from services.web_scraper import WebScraper
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """Testes das transições de estado do circuito."""
+
+    def test_opens_after_threshold(self):
+        """Circuito abre após falhas consecutivas e recusa chamadas."""
+        breaker = CircuitBreaker(failure_threshold=3, recovery_seconds=60)
+        for _ in range(2):
+            breaker.record_failure()
+        assert breaker.allow()
+
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+
+    def test_success_resets_failures(self):
+        """Sucesso zera a contagem de falhas consecutivas."""
+        breaker = CircuitBreaker(failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_allows_single_probe(self):
+        """Após a recuperação, só uma chamada de teste é liberada."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=0.01)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow()
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    def test_failed_probe_reopens(self):
+        """Falha na chamada de teste reabre o circuito."""
+        breaker = CircuitBreaker(failure_threshold=5, recovery_seconds=0.01)
+        for _ in range(5):
+            breaker.record_failure()
+        time.sleep(0.02)
+        assert breaker.allow()
+
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.times_opened == 2
+
+    def test_retry_after_extends_recovery(self):
+        """Retry-After maior que a recuperação padrão é respeitado."""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_seconds=1)
+        breaker.record_failure(retry_after_seconds=120)
+
+        assert breaker.retry_in_seconds() > 100
+
+    def test_registry_isolates_hosts(self):
+        """Circuito aberto de um host não afeta outros hosts."""
+        registry = CircuitBreakerRegistry(failure_threshold=1)
+        registry.record("www.linkedin.com", success=False)
+
+        with pytest.raises(CircuitOpenError):
+            registry.check("www.linkedin.com")
+        registry.check("corsproxy.io")
+
+    def test_registry_evicts_healthy_circuits_first(self):
+        """Acima de max_entries, circuitos sem falhas saem antes dos abertos."""
+        registry = CircuitBreakerRegistry(failure_threshold=1, max_entries=2)
+        registry.record("www.linkedin.com", success=False)
+        registry.record("corsproxy.io", success=True)
+
+        registry.check("boards.greenhouse.io")
+
+        assert set(registry.get_stats()) == {"www.linkedin.com", "boards.greenhouse.io"}
+        with pytest.raises(CircuitOpenError):
+            registry.check("www.linkedin.com")
+
+
+@pytest.mark.unit
+class TestNegativeCache:
+    """Testes do cache negativo com backoff exponencial."""
+
+    def test_backoff_doubles_until_max(self):
+        """Bloqueio dobra a cada falha consecutiva até o máximo."""
+        cache = NegativeCache(base_seconds=10, max_seconds=25)
+        waits = [
+            cache.retry_in_seconds(cache.record_failure("url", "HTTP 404"))
+            for _ in range(3)
+        ]
+
+        assert waits[0] == pytest.approx(10, abs=0.5)
+        assert waits[1] == pytest.approx(20, abs=0.5)
+        assert waits[2] == pytest.approx(25, abs=0.5)
+
+    def test_clear_unblocks_url(self):
+        """Sucesso remove a URL do cache negativo."""
+        cache = NegativeCache(base_seconds=60)
+        cache.record_failure("url", "erro")
+        assert cache.get("url") is not None
+
+        cache.clear("url")
+
+        assert cache.get("url") is None
+
+    def test_expired_entry_is_not_blocked(self):
+        """Entrada com bloqueio vencido libera nova tentativa."""
+        cache = NegativeCache(base_seconds=0.01)
+        cache.record_failure("url", "erro")
+        time.sleep(0.02)
+
+        assert cache.get("url") is None
+
+
+@pytest.mark.unit
+class TestScraperCircuit:
+    """Testes do circuit breaker integrado ao fetch do scraper."""
+
+    @pytest.mark.asyncio
+    async def test_blocking_host_fails_fast(self, monkeypatch):
+        """Host respondendo 429 abre o circuito e deixa de ser requisitado."""
+        from config import settings
+
+        monkeypatch.setattr(settings, "circuit_failure_threshold", 2)
+        # Sem o limite de taxa, que já seguraria a 2ª requisição pelo Retry-After
+        monkeypatch.setattr(settings, "scraping_rate_limit_enabled", False)
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(429, headers={"Retry-After": "30"})
+
+        scraper = WebScraper(
+            cache=TieredCache("scrape-test", ttl_seconds=60),
+            transport=httpx.MockTransport(handler)
+        )
+        url = "https://blocked.example.com/vaga/1"
+
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await scraper._fetch_page(url)
+        with pytest.raises(CircuitOpenError):
+            await scraper._fetch_page(url)
+
+        assert len(requests) == 2
+        stats = scraper.breakers.get_stats()["blocked.example.com"]
+        assert stats["state"] == "open"
+        assert stats["retry_in_seconds"] > 25
+        await scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_not_found_does_not_open_circuit(self, monkeypatch):
+        """404 indica URL morta, não host bloqueando."""
+        from config import settings
+
+        monkeypatch.setattr(settings, "circuit_failure_threshold", 1)
+        scraper = WebScraper(
+            cache=TieredCache("scrape-test", ttl_seconds=60),
+            transport=httpx.MockTransport(lambda request: httpx.Response(404))
+        )
+
+        for _ in range(3):
+            with pytest.raises(httpx.HTTPStatusError):
+                await scraper._fetch_page("https://example.com/vaga/encerrada")
+
+        assert scraper.breakers.get_stats()["example.com"]["state"] == "closed"
+        await scraper.close()
@@ -0,0 +1,364 @@
+"""
+Testes unitários para o agente de extração (sem chamadas reais ao LLM).
+"""
+import pytest
+from pydantic import ValidationError
+from agents.extraction_agent import ExtractionAgent, provided_scraped_data
+from agents.llm_registry import LLMRegistry
+from api.models import MAX_JOB_TEXT_CHARS, JobExtractionRequest, UserInputRequest
+from config import settings
+from services.job_monitor import STATUS_CHANGED, STATUS_CLOSED, JobChange
+
+
+class FailingLLM:
+    """LLM falso que sempre falha, contando as chamadas."""
+
+    calls = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def ainvoke(self, *args, **kwargs):
+        FailingLLM.calls += 1
+        raise RuntimeError("LLM indisponível")
+
+
+class InaccessibleLLM(FailingLLM):
+    """LLM falso que responde, mas sem conteúdo de vaga (página inacessível)."""
+
+    async def ainvoke(self, *args, **kwargs):
+        FailingLLM.calls += 1
+        return "Erro: página não encontrada (404)."
+
+
+@pytest.fixture
+def failing_agent(monkeypatch):
+    """Agente cujo scraping e fallback de IA sempre falham."""
+    FailingLLM.calls = 0
+    agent = ExtractionAgent()
+    agent.llm_registry = LLMRegistry(factory=FailingLLM)
+
+    async def failing_scrape(url):
+        failing_scrape.calls += 1
+        raise ValueError("Falha ao extrair conteúdo")
+
+    failing_scrape.calls = 0
+
+    monkeypatch.setattr(agent.web_scraper, "scrape_job_posting", failing_scrape)
+    return agent
+
+
+@pytest.mark.unit
+class TestNegativeCache:
+    """Testes do cache negativo de URLs com falha recente."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_failure_skips_whole_chain(self, failing_agent):
+        """Nova requisição para URL com falha recente falha sem scraping nem LLM."""
+        failing_agent.llm_registry = LLMRegistry(factory=InaccessibleLLM)
+        url = "https://example.com/vaga/morta"
+
+        with pytest.raises(ValueError, match="Falha completa"):
+            await failing_agent.extract_job_content_from_url(url)
+        assert FailingLLM.calls == 1
+
+        with pytest.raises(ValueError, match="falhou recentemente"):
+            await failing_agent.extract_job_content_from_url(url)
+
+        assert FailingLLM.calls == 1
+        assert failing_agent.negative_cache.get_stats()["blocked_requests"] == 1
+        await failing_agent.web_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_llm_error_does_not_block_url(self, failing_agent):
+        """Erro da API do LLM (quota, indisponível) não entra no cache negativo."""
+        url = "https://example.com/vaga/no-ar"
+
+        for _ in range(2):
+            with pytest.raises(ValueError, match="Falha completa"):
+                await failing_agent.extract_job_content_from_url(url)
+
+        assert FailingLLM.calls == 2
+        assert failing_agent.negative_cache.get(url) is None
+        await failing_agent.web_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_other_urls_are_not_blocked(self, failing_agent):
+        """Falha de uma URL não bloqueia outras."""
+        failing_agent.llm_registry = LLMRegistry(factory=InaccessibleLLM)
+        with pytest.raises(ValueError, match="Falha completa"):
+            await failing_agent.extract_job_content_from_url("https://example.com/vaga/1")
+        with pytest.raises(ValueError, match="Falha completa"):
+            await failing_agent.extract_job_content_from_url("https://example.com/vaga/2")
+
+        assert FailingLLM.calls == 2
+        await failing_agent.web_scraper.close()
+
+
+    @pytest.mark.asyncio
+    async def test_monitor_changes_update_negative_cache(self, failing_agent):
+        """Vaga encerrada pelo monitor é recusada; vaga alterada volta a ser aceita."""
+        url = "https://example.com/vaga/monitorada"
+
+        failing_agent.handle_job_change(JobChange(url, STATUS_CLOSED, None, 64))
+        with pytest.raises(ValueError, match="Vaga encerrada"):
+            await failing_agent.extract_job_content_from_url(url)
+        assert FailingLLM.calls == 0
+
+        failing_agent.handle_job_change(JobChange(url, STATUS_CHANGED, {"fullText": "..."}, 3))
+        assert failing_agent.negative_cache.get(url) is None
+        await failing_agent.web_scraper.close()
+
+
+class ContentLLM(FailingLLM):
+    """LLM falso que devolve o conteúdo da vaga."""
+
+    async def ainvoke(self, *args, **kwargs):
+        FailingLLM.calls += 1
+        return (
+            "Vaga: Desenvolvedor Python Sênior na Acme. Requisitos: experiência com Python, "
+            "FastAPI e Docker. Responsabilidades: desenvolver APIs. Benefícios: remoto."
+        ) * 5
+
+
+@pytest.mark.unit
+class TestLearnedContentOrder:
+    """Ordem aprendida entre scraping e IA na extração do conteúdo."""
+
+    @pytest.mark.asyncio
+    async def test_failing_scraping_domain_skips_fetch(self, failing_agent):
+        """Domínio em que o scraping sempre falha vai direto para a IA, sem fetch."""
+        failing_agent.llm_registry = LLMRegistry(factory=ContentLLM)
+        learner = failing_agent.strategy_learner
+        for _ in range(learner.min_samples):
+            learner.record("linkedin.com", "scraping", False, 1.0)
+        url = "https://www.linkedin.com/jobs/view/3812345678"
+
+        content = await failing_agent.extract_job_content_from_url(url)
+
+        assert content["source"] == "llm_fallback"
+        assert failing_agent.web_scraper.scrape_job_posting.calls == 0
+        assert FailingLLM.calls == 1
+        await failing_agent.web_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_outcomes_are_recorded_per_domain(self, failing_agent):
+        """Falha do scraping e sucesso da IA entram na tabela do domínio."""
+        failing_agent.llm_registry = LLMRegistry(factory=ContentLLM)
+
+        await failing_agent.extract_job_content_from_url("https://example.com/vaga/1")
+
+        table = failing_agent.strategy_learner.snapshot()["example.com"]
+        assert table["scraping"]["successes"] == 0
+        assert table["llm_content"]["successes"] == 1
+        await failing_agent.web_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_llm_api_error_is_not_recorded(self, failing_agent):
+        """Erro da API do LLM não conta contra a estratégia no domínio."""
+        with pytest.raises(ValueError, match="Falha completa"):
+            await failing_agent.extract_job_content_from_url("https://example.com/vaga/1")
+
+        assert "llm_content" not in failing_agent.strategy_learner.snapshot()["example.com"]
+        await failing_agent.web_scraper.close()
+
+@pytest.mark.unit
+class TestProvidedContent:
+    """Testes do conteúdo (HTML ou texto) enviado pelo cliente, sem fetch."""
+
+    @pytest.mark.asyncio
+    async def test_provided_html_skips_fetch(self, failing_agent, job_pages):
+        """HTML enviado é parseado e validado sem scraping nem LLM."""
+        url = "https://boards.greenhouse.io/acme/jobs/42"
+
+        result = await failing_agent.extract_job_content_from_url(
+            url, job_html=job_pages["greenhouse_job.html"]
+        )
+
+        assert result["source"] == "provided_html"
+        assert result["validation"]["is_valid"]
+        assert result["title"] and result["company"]
+        assert failing_agent.web_scraper.scrape_job_posting.calls == 0
+        assert FailingLLM.calls == 0
+        await failing_agent.web_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_provided_text_skips_fetch(self, failing_agent, job_pages):
+        """Texto colado vai direto para a validação."""
+        pasted = failing_agent.web_scraper._parse_html(job_pages["gupy_job.html"])["fullText"]
+
+        result = await failing_agent.extract_job_content_from_url(
+            "https://acme.gupy.io/jobs/1", job_text=f"  {pasted}  "
+        )
+
+        assert result["source"] == "provided_text"
+        assert result["content"] == pasted
+        assert failing_agent.web_scraper.scrape_job_posting.calls == 0
+        await failing_agent.web_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_invalid_provided_content_falls_back_to_url(self, failing_agent):
+        """Conteúdo reprovado na validação segue para a extração pela URL."""
+        with pytest.raises(ValueError, match="Falha completa"):
+            await failing_agent.extract_job_content_from_url(
+                "https://example.com/vaga/1",
+                job_html="<html><body><div id='app'></div></body></html>",
+                job_text="Vaga"
+            )
+
+        assert failing_agent.web_scraper.scrape_job_posting.calls == 1
+        await failing_agent.web_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_pasted_content_bypasses_negative_cache(self, failing_agent, job_pages):
+        """URL com falha recente ainda aceita o conteúdo colado pelo usuário."""
+        url = "https://boards.greenhouse.io/acme/jobs/42"
+        with pytest.raises(ValueError, match="Falha completa"):
+            await failing_agent.extract_job_content_from_url(url)
+
+        result = await failing_agent.extract_job_content_from_url(
+            url, job_html=job_pages["greenhouse_job.html"]
+        )
+
+        assert result["source"] == "provided_html"
+        await failing_agent.web_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_oversized_html_is_rejected(self, failing_agent, monkeypatch):
+        """HTML acima do limite de página é recusado."""
+        monkeypatch.setattr(settings, "scraping_max_body_bytes", 100)
+
+        with pytest.raises(ValueError, match="excede o limite"):
+            await failing_agent.extract_job_content_from_url(
+                "https://example.com/vaga/1", job_html="<p>" + "x" * 200 + "</p>"
+            )
+        await failing_agent.web_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_oversized_html_counts_bytes(self, failing_agent, monkeypatch):
+        """O limite vale para os bytes em UTF-8, não para os caracteres."""
+        monkeypatch.setattr(settings, "scraping_max_body_bytes", 300)
+
+        with pytest.raises(ValueError, match="excede o limite"):
+            await failing_agent.extract_job_content_from_url(
+                "https://example.com/vaga/1", job_html="<p>" + "ç" * 200 + "</p>"
+            )
+        await failing_agent.web_scraper.close()
+
+    def test_pasted_text_has_max_length(self):
+        """Texto colado acima do limite é recusado na validação da requisição."""
+        with pytest.raises(ValidationError):
+            JobExtractionRequest(job_url="https://example.com/vaga/1", job_text="x" * (MAX_JOB_TEXT_CHARS + 1))
+        with pytest.raises(ValidationError):
+            UserInputRequest(
+                cv="c" * 60, job_url="https://example.com/vaga/1", job_text="x" * (MAX_JOB_TEXT_CHARS + 1)
+            )
+
+    @pytest.mark.asyncio
+    async def test_details_from_provided_html(self, failing_agent, job_pages):
+        """Título e empresa vêm do HTML enviado, sem buscar a URL."""
+        url = "https://boards.greenhouse.io/acme/jobs/42"
+        content = await failing_agent.extract_job_content_from_url(
+            url, job_html=job_pages["greenhouse_job.html"]
+        )
+
+        details = await failing_agent.extract_job_title_and_company(
+            content["content"], url, scraped_data=provided_scraped_data(content)
+        )
+
+        assert details["job_title"] == content["title"]
+        assert details["company"] == content["company"]
+        assert details["source"] == "provided_html"
+        assert failing_agent.web_scraper.scrape_job_posting.calls == 0
+        assert FailingLLM.calls == 0
+        await failing_agent.web_scraper.close()
+
+    def test_provided_scraped_data_only_without_scraped_page(self):
+        """Scraping do servidor fica memorizado; cliente e IA dispensam novo fetch."""
+        assert provided_scraped_data({"source": "provided_text"}) == {"source": "provided_text"}
+        assert provided_scraped_data({"source": "llm_fallback"}) == {"source": "llm_fallback"}
+        assert provided_scraped_data({"source": "web_scraping"}) is None
+
+
+class DetailsLLM:
+    """LLM falso que devolve título e empresa em JSON, contando as chamadas."""
+
+    calls = 0
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __call__(self, prompt):
+        DetailsLLM.calls += 1
+        return '{"jobTitle": "Desenvolvedora Python Sênior", "company": "Acme Tecnologia"}'
+
+
+JOB_CONTENT = (
+    "Desenvolvedora Python Sênior na Acme Tecnologia. Buscamos pessoa com experiência "
+    "em FastAPI, filas assíncronas e observabilidade para o time de plataforma."
+)
+
+
+@pytest.fixture
+def details_agent():
+    """Agente sem scraping cujo LLM devolve título/empresa fixos."""
+    DetailsLLM.calls = 0
+    agent = ExtractionAgent(use_web_scraping=False)
+    agent.llm_registry = LLMRegistry(factory=DetailsLLM)
+    yield agent
+    agent.details_cache.close()
+
+
+@pytest.mark.unit
+class TestDetailsCache:
+    """Testes do cache de título/empresa extraídos pela IA."""
+
+    @pytest.mark.asyncio
+    async def test_same_content_skips_llm(self, details_agent):
+        """Mesmo conteúdo (ignorando espaços) reaproveita o resultado da IA."""
+        first = await details_agent.extract_job_title_and_company(JOB_CONTENT)
+        second = await details_agent.extract_job_title_and_company(f"  {JOB_CONTENT}\n")
+
+        assert DetailsLLM.calls == 1
+        assert second["job_title"] == first["job_title"] == "Desenvolvedora Python Sênior"
+        assert second["source"] == "llm" and second["cached"] is True
+        stats = details_agent.details_cache.get_stats()
+        assert stats["hits"] == 1 and stats["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_prompt_or_model_change_invalidates(self, details_agent):
+        """Outro prompt ou outro modelo geram chaves novas."""
+        await details_agent.extract_job_title_and_company(JOB_CONTENT)
+
+        details_agent.details_prompt_fingerprint = "prompt-alterado"
+        await details_agent.extract_job_title_and_company(JOB_CONTENT)
+        details_agent.model_name = "gemini-2.5-pro"
+        await details_agent.extract_job_title_and_company(JOB_CONTENT)
+
+        assert DetailsLLM.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_disk_tier_survives_new_agent(self, details_agent):
+        """Outro processo (novo agente) encontra o resultado na camada em disco."""
+        await details_agent.extract_job_title_and_company(JOB_CONTENT)
+        other = ExtractionAgent(use_web_scraping=False)
+        other.llm_registry = LLMRegistry(factory=DetailsLLM)
+
+        result = await other.extract_job_title_and_company(JOB_CONTENT)
+
+        assert result["cached"] is True
+        assert DetailsLLM.calls == 1
+        assert other.details_cache.get_stats()["hits_disk"] == 1
+        other.details_cache.close()
+
+    @pytest.mark.asyncio
+    async def test_invalid_result_is_not_cached(self, details_agent, monkeypatch):
+        """Resultado reprovado na validação não é guardado no cache."""
+        monkeypatch.setattr(DetailsLLM, "__call__", lambda self, prompt: '{"jobTitle": "", "company": ""}')
+
+        for _ in range(2):
+            with pytest.raises(ValueError, match="IA não conseguiu extrair dados válidos"):
+                await details_agent.extract_job_title_and_company(JOB_CONTENT)
+
+        stats = details_agent.details_cache.get_stats()
+        assert stats.get("writes", 0) == 0 and stats["misses"] == 2
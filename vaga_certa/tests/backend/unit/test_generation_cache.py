@@ -0,0 +1,136 @@
+"""
+Testes unitários para o cache de materiais gerados.
+"""
+import asyncio
+import pytest
+from agents.generation_agent import GenerationAgent
+
+
+CV = "João Silva, desenvolvedor Python com 8 anos de experiência em FastAPI, Docker e AWS."
+JOB_DESCRIPTION = (
+    "Procuramos pessoa desenvolvedora Python sênior com experiência em FastAPI, "
+    "Docker, AWS e microserviços para o time de plataforma da Acme."
+)
+RESPONSE = (
+    "### OPTIMIZED CV ###\nCV\n### COVER LETTER ###\nCarta\n"
+    "### NETWORKING MESSAGE ###\nMensagem\n### INTERVIEW TIPS ###\nDicas\n"
+)
+
+
+class CountingChain:
+    """Cadeia falsa que conta as chamadas ao LLM."""
+
+    def __init__(self, response=RESPONSE, delay=0.0):
+        self.response = response
+        self.delay = delay
+        self.calls = 0
+
+    async def ainvoke(self, prompt_vars):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.response
+
+    async def astream(self, prompt_vars):
+        self.calls += 1
+        for line in self.response.splitlines(keepends=True):
+            yield line
+
+
+@pytest.fixture
+def agent():
+    agent = GenerationAgent()
+    yield agent
+    agent.result_cache.close()
+
+
+def use_chain(monkeypatch, agent, chain):
+    monkeypatch.setattr(agent, "_create_chain", lambda: chain)
+    return chain
+
+
+@pytest.mark.unit
+class TestGenerationCache:
+    """Testes do cache de resultados da geração."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_request_is_served_from_cache(self, monkeypatch, agent):
+        """Mesma entrada (ignorando espaços) não chama o LLM de novo e é marcada como cached."""
+        chain = use_chain(monkeypatch, agent, CountingChain())
+
+        first = await agent.generate_career_materials(CV, "Dev Python", "Acme", JOB_DESCRIPTION)
+        second = await agent.generate_career_materials(f"{CV}\n\n", "Dev  Python", "Acme", JOB_DESCRIPTION)
+
+        assert chain.calls == 1
+        assert first["metadata"]["cached"] is False
+        assert second["metadata"]["cached"] is True
+        assert second["coverLetter"] == first["coverLetter"] == "Carta"
+        assert second["compatibility"] == first["compatibility"]
+
+    @pytest.mark.asyncio
+    async def test_force_regenerate_bypasses_cache(self, monkeypatch, agent):
+        """force_regenerate gera de novo e atualiza a entrada."""
+        chain = use_chain(monkeypatch, agent, CountingChain())
+        await agent.generate_career_materials(CV, "Dev Python", "Acme", JOB_DESCRIPTION)
+        chain.response = RESPONSE.replace("Carta", "Carta nova")
+
+        forced = await agent.generate_career_materials(
+            CV, "Dev Python", "Acme", JOB_DESCRIPTION, force_regenerate=True
+        )
+        cached = await agent.generate_career_materials(CV, "Dev Python", "Acme", JOB_DESCRIPTION)
+
+        assert chain.calls == 2
+        assert forced["metadata"]["cached"] is False
+        assert cached["coverLetter"] == "Carta nova"
+
+    @pytest.mark.asyncio
+    async def test_key_covers_inputs_model_and_prompt(self, monkeypatch, agent):
+        """Tom, modelo e versão do prompt fazem parte da chave."""
+        chain = use_chain(monkeypatch, agent, CountingChain())
+        await agent.generate_career_materials(CV, "Dev Python", "Acme", JOB_DESCRIPTION)
+
+        await agent.generate_career_materials(CV, "Dev Python", "Acme", JOB_DESCRIPTION, tone="Formal")
+        agent.prompt_version = "prompt-alterado"
+        await agent.generate_career_materials(CV, "Dev Python", "Acme", JOB_DESCRIPTION)
+        agent.model_name = "gemini-2.5-pro"
+        await agent.generate_career_materials(CV, "Dev Python", "Acme", JOB_DESCRIPTION)
+
+        assert chain.calls == 4
+
+    @pytest.mark.asyncio
+    async def test_incomplete_result_is_not_cached(self, monkeypatch, agent):
+        """Resposta sem alguma seção não é guardada."""
+        chain = use_chain(monkeypatch, agent, CountingChain(response="### OPTIMIZED CV ###\nSó o CV"))
+
+        for _ in range(2):
+            await agent.generate_career_materials(CV, "Dev Python", "Acme", JOB_DESCRIPTION)
+
+        assert chain.calls == 2
+        assert agent.result_cache.get_stats()["skipped_incomplete"] == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_generation(self, monkeypatch, agent):
+        """Duplo clique: requisições idênticas simultâneas aguardam a mesma geração."""
+        chain = use_chain(monkeypatch, agent, CountingChain(delay=0.05))
+
+        results = await asyncio.gather(*(
+            agent.generate_career_materials(CV, "Dev Python", "Acme", JOB_DESCRIPTION) for _ in range(3)
+        ))
+
+        assert chain.calls == 1
+        assert all(result["optimizedCv"] == "CV" for result in results)
+        results[0]["metadata"]["tone"] = "alterado"
+        assert results[1]["metadata"]["tone"] != "alterado"
+
+    @pytest.mark.asyncio
+    async def test_stream_uses_and_fills_cache(self, monkeypatch, agent):
+        """Streaming grava o resultado e um novo stream sai do cache sem chamar o LLM."""
+        chain = use_chain(monkeypatch, agent, CountingChain())
+
+        first = [event async for event in agent.stream_career_materials(CV, "Dev Python", "Acme", JOB_DESCRIPTION)]
+        second = [event async for event in agent.stream_career_materials(CV, "Dev Python", "Acme", JOB_DESCRIPTION)]
+        batch = await agent.generate_career_materials(CV, "Dev Python", "Acme", JOB_DESCRIPTION)
+
+        assert chain.calls == 1
+        assert second[-1]["metadata"]["cached"] is True
+        assert [e["text"] for e in second if e["event"] == "section_end"] == ["CV", "Carta", "Mensagem", "Dicas"]
+        assert first[-1]["interviewTips"] == batch["interviewTips"] == "Dicas"
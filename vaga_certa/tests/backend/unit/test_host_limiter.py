@@ -0,0 +1,85 @@
+"""
+Testes unitários para o limite de concorrência por host do scraper.
+"""
+import asyncio
+import pytest
+from services.host_limiter import HostConcurrencyLimiter
+
+
+@pytest.mark.unit
+class TestHostConcurrencyLimiter:
+    """Testes do semáforo por host."""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_capped_per_host(self):
+        """Rajada para o mesmo host respeita o limite configurado."""
+        limiter = HostConcurrencyLimiter(max_per_host=2)
+
+        async def fetch():
+            async with limiter.limit("https://www.linkedin.com/jobs/view/1"):
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(fetch() for _ in range(10)))
+
+        stats = limiter.get_stats()["hosts"]["www.linkedin.com"]
+        assert stats["peak_active"] == 2
+        assert stats["requests"] == 10
+        assert stats["active"] == 0
+        assert stats["waiting"] == 0
+
+    @pytest.mark.asyncio
+    async def test_saturated_host_does_not_block_others(self):
+        """Host saturado não impede requisições para outros hosts."""
+        limiter = HostConcurrencyLimiter(max_per_host=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.limit("https://www.linkedin.com/jobs/view/1"):
+                await release.wait()
+
+        holders = [asyncio.ensure_future(hold()) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        async with limiter.limit("https://boards.greenhouse.io/acme/jobs/1"):
+            stats = limiter.get_stats()["hosts"]
+            assert stats["www.linkedin.com"]["waiting"] == 2
+            assert stats["boards.greenhouse.io"]["active"] == 1
+
+        release.set()
+        await asyncio.gather(*holders)
+
+    @pytest.mark.asyncio
+    async def test_zero_disables_limit(self):
+        """Limite 0 não restringe a concorrência."""
+        limiter = HostConcurrencyLimiter(max_per_host=0)
+
+        async def fetch():
+            async with limiter.limit("https://example.com/vaga"):
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(fetch() for _ in range(5)))
+
+        assert limiter.get_stats()["hosts"]["example.com"]["requests"] == 5
+
+    @pytest.mark.asyncio
+    async def test_idle_hosts_evicted_above_limit(self):
+        """Acima de max_hosts, só hosts sem requisições em andamento são descartados."""
+        limiter = HostConcurrencyLimiter(max_per_host=1, max_hosts=2)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.limit("https://www.linkedin.com/jobs/view/1"):
+                await release.wait()
+
+        holder = asyncio.ensure_future(hold())
+        await asyncio.sleep(0)
+        async with limiter.limit("https://example.com/vaga"):
+            pass
+        async with limiter.limit("https://boards.greenhouse.io/acme/jobs/1"):
+            pass
+
+        stats = limiter.get_stats()
+        assert set(stats["hosts"]) == {"www.linkedin.com", "boards.greenhouse.io"}
+        assert stats["evicted_hosts"] == 1
+        release.set()
+        await holder
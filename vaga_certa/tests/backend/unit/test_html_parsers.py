@@ -0,0 +1,170 @@
+"""
+Testes de paridade entre os backends de parsing HTML.
+Todo backend deve produzir a mesma saída que o BeautifulSoup nas páginas gravadas.
+"""
+import pytest
+from services.html_parsers import (
+    PARSER_BACKENDS,
+    BeautifulSoupBackend,
+    get_parser_backend,
+    parse_job_page,
+    resolve_encoding
+)
+
+
+EDGE_CASES = {
+    "vazio": "",
+    "sem_head": "<p>Somente um parágrafo</p>",
+    "comentarios_e_template": (
+        "<html><body><h1>Vaga <!-- oculto --> Dev</h1>"
+        "<template><p>invisível</p></template><p>visível</p></body></html>"
+    ),
+    "nbsp_e_entidades": (
+        "<html><head><title>Dev &amp; Ops | LinkedIn</title></head>"
+        "<body><p>&nbsp;Texto&nbsp;</p></body></html>"
+    ),
+    "empresa_por_atributo": (
+        '<div data-company-name="Acme">Acme</div>'
+        '<a class="Top-Company-Link" href="#"> Empresa Link </a>'
+    ),
+    "descricao_com_script": (
+        '<div class="job-description"><script>var x = 1;</script>'
+        + "<p>Requisitos e responsabilidades da vaga.</p>" * 8
+        + "</div>"
+    ),
+    "declaracao_xml": '<?xml version="1.0" encoding="utf-8"?><html><body><p>ok</p></body></html>',
+    "header_com_tail": "<body><header>Menu</header>Texto após o header<footer>Rodapé</footer></body>",
+}
+
+ALTERNATIVE_BACKENDS = [name for name in PARSER_BACKENDS if name != BeautifulSoupBackend.name]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend_name", ALTERNATIVE_BACKENDS)
+class TestParserParity:
+    """Paridade de saída com o backend de referência (BeautifulSoup)."""
+
+    def test_recorded_pages(self, backend_name, job_pages):
+        """Páginas gravadas produzem exatamente a mesma extração."""
+        reference = BeautifulSoupBackend()
+        backend = get_parser_backend(backend_name)
+
+        for name, html in job_pages.items():
+            assert backend.parse(html) == reference.parse(html), name
+
+    def test_recorded_pages_main_content(self, backend_name, job_pages):
+        """Extração do conteúdo principal também é idêntica entre backends."""
+        reference = BeautifulSoupBackend()
+        backend = get_parser_backend(backend_name)
+
+        for name, html in job_pages.items():
+            assert backend.parse(html, main_content=True) == reference.parse(html, main_content=True), name
+
+    @pytest.mark.parametrize("case", sorted(EDGE_CASES))
+    def test_edge_cases(self, backend_name, case):
+        """Casos de borda produzem a mesma extração."""
+        html = EDGE_CASES[case]
+
+        assert get_parser_backend(backend_name).parse(html) == BeautifulSoupBackend().parse(html)
+
+
+    def test_main_content_with_comments_and_tails(self, backend_name):
+        """Comentários e textos soltos entre blocos pontuam igual nos dois backends."""
+        html = (
+            "<html><body><header>Menu</header>Texto solto<div class='job-description'>"
+            + "<p>Requisitos, responsabilidades e benefícios <!-- nota --> da vaga.</p>texto após" * 6
+            + "</div><aside>Vagas semelhantes</aside></body></html>"
+        )
+
+        assert get_parser_backend(backend_name).parse(html, main_content=True) == \
+            BeautifulSoupBackend().parse(html, main_content=True)
+
+
+@pytest.mark.unit
+def test_beautifulsoup_main_content_parses_once(monkeypatch, job_pages):
+    """Conteúdo principal do BeautifulSoup usa a própria soup, sem árvore lxml extra."""
+    import lxml.html
+
+    def no_second_parse(*args, **kwargs):
+        raise AssertionError("página parseada duas vezes")
+
+    monkeypatch.setattr(lxml.html, "document_fromstring", no_second_parse)
+    result = BeautifulSoupBackend().parse(job_pages["greenhouse_job.html"], main_content=True)
+
+    assert "Senior Backend Engineer" in result["fullText"]
+
+LATIN1_PAGE = (
+    '<html><head><meta http-equiv="Content-Type" content="text/html; charset=iso-8859-1">'
+    "<title>Analista de Produção</title></head>"
+    "<body><h1>Analista de Produção</h1><p>Gestão de ações em São Paulo – “híbrido”</p></body></html>"
+)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend_name", sorted(PARSER_BACKENDS))
+class TestBytesInput:
+    """Parse direto dos bytes da resposta, sem a cópia em str."""
+
+    def test_recorded_pages_bytes_match_str(self, backend_name, job_pages):
+        """Bytes UTF-8 produzem a mesma extração que o HTML decodificado."""
+        backend = get_parser_backend(backend_name)
+
+        for name, html in job_pages.items():
+            body = html.encode("utf-8")
+            assert backend.parse(body, encoding="utf-8") == backend.parse(html), name
+            assert backend.parse(body, main_content=True) == backend.parse(html, main_content=True), name
+            assert parse_job_page(body, backend_name) == parse_job_page(html, backend_name), name
+
+    def test_meta_charset_without_declared_encoding(self, backend_name):
+        """Sem charset no header, o <meta> da página define a decodificação."""
+        result = get_parser_backend(backend_name).parse(LATIN1_PAGE.encode("cp1252"))
+
+        assert result["title"] == "Analista de Produção"
+        assert "Gestão de ações em São Paulo – “híbrido”" in result["fullText"]
+
+    def test_declared_encoding_wins_over_meta(self, backend_name):
+        """Charset do Content-Type tem prioridade sobre o <meta> da página."""
+        html = LATIN1_PAGE.replace("iso-8859-1", "utf-8")
+
+        result = parse_job_page(html.encode("cp1252"), backend_name, encoding="windows-1252")
+
+        assert result["title"] == "Analista de Produção"
+
+
+@pytest.mark.unit
+class TestResolveEncoding:
+    """Testes da resolução de encoding dos bytes da página."""
+
+    def test_declared_charset(self):
+        """Charset declarado é normalizado para o nome do codec."""
+        assert resolve_encoding(b"<p>x</p>", "UTF8") == "utf-8"
+
+    def test_latin1_is_windows_1252(self):
+        """ISO-8859-1 é tratado como windows-1252, como nos navegadores."""
+        assert resolve_encoding(b"<p>x</p>", "ISO-8859-1") == "cp1252"
+        assert resolve_encoding(b'<meta charset="latin1">') == "cp1252"
+
+    def test_unknown_charset_falls_back(self):
+        """Charset desconhecido é ignorado em favor do <meta> ou de UTF-8."""
+        assert resolve_encoding(b'<meta charset="utf-16le">', "x-desconhecido") == "utf-16-le"
+        assert resolve_encoding(b"<p>x</p>", "x-desconhecido") == "utf-8"
+
+    def test_meta_outside_scan_window_is_ignored(self):
+        """<meta charset> após o início do documento não é considerado."""
+        html = b"<!--" + b" " * 8192 + b'--><meta charset="iso-8859-1">'
+
+        assert resolve_encoding(html) == "utf-8"
+
+
+@pytest.mark.unit
+class TestParserRegistry:
+    """Testes da seleção de backend."""
+
+    def test_get_known_backend(self):
+        """Nomes são aceitos sem diferenciar maiúsculas."""
+        assert get_parser_backend("LXML").name == "lxml"
+
+    def test_unknown_backend(self):
+        """Backend desconhecido levanta ValueError."""
+        with pytest.raises(ValueError):
+            get_parser_backend("html5lib")
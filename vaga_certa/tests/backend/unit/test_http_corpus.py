@@ -0,0 +1,151 @@
+"""
+Testes unitários do corpus HTTP gravado (record/replay) e do benchmark offline.
+"""
+import gzip
+
+import httpx
+import pytest
+from benchmarks.scraper_benchmark import DEFAULT_CORPUS, compare, html_pages, percentile, run_parse
+from services.http_corpus import HttpCorpus, RecordedResponse, RecordingTransport, ReplayTransport
+from services.strategy_stats import StrategyLearner
+from services.web_scraper import WebScraper
+
+
+def _replay_scraper(corpus: HttpCorpus) -> WebScraper:
+    """WebScraper servido só pelo corpus, sem caches."""
+    scraper = WebScraper(
+        transport=ReplayTransport(corpus),
+        strategy_learner=StrategyLearner(path=None)
+    )
+    scraper.cache = None
+    scraper.memo_ttl_seconds = 0
+    return scraper
+
+
+@pytest.mark.unit
+class TestHttpCorpus:
+    """Persistência e busca de respostas gravadas."""
+
+    def test_roundtrip_preserves_responses(self, tmp_path):
+        """Status, headers e corpo binário sobrevivem à gravação em disco."""
+        path = str(tmp_path / "corpus.json.gz")
+        corpus = HttpCorpus(path)
+        corpus.add(RecordedResponse(
+            method="GET",
+            url="https://example.com/logo.png",
+            status_code=200,
+            headers=[("content-type", "image/png"), ("set-cookie", "a=1"), ("set-cookie", "b=2")],
+            body=bytes(range(256)),
+        ))
+        corpus.add_page("https://example.com/vaga", "<p>Vaga é ótima</p>")
+        corpus.save()
+
+        loaded = HttpCorpus(path)
+
+        assert len(loaded) == 2
+        image = loaded.get("get", "https://example.com/logo.png")
+        assert image.body == bytes(range(256))
+        assert image.headers == [("content-type", "image/png"), ("set-cookie", "a=1"), ("set-cookie", "b=2")]
+        assert loaded.get("GET", "https://example.com/vaga").body.decode("utf-8") == "<p>Vaga é ótima</p>"
+        with gzip.open(path, "rb") as f:
+            assert f.read(1) == b"{"
+
+    def test_rejects_unknown_version(self, tmp_path):
+        """Corpus de versão desconhecida não é carregado em silêncio."""
+        path = tmp_path / "corpus.json.gz"
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            f.write('{"version": 99, "responses": []}')
+
+        with pytest.raises(ValueError, match="Versão de corpus"):
+            HttpCorpus(str(path))
+
+    def test_lookup_by_canonical_url(self):
+        """URL canonicalizada pelo scraper encontra a gravação original."""
+        corpus = HttpCorpus()
+        corpus.add_page("https://br.linkedin.com/jobs/view/123?trk=abc", "<p>ok</p>")
+
+        assert corpus.get("GET", "https://www.linkedin.com/jobs/view/123") is not None
+        assert corpus.get("GET", "https://www.linkedin.com/jobs/view/999") is None
+
+
+@pytest.mark.unit
+class TestRecordReplay:
+    """Gravação via transporte real e reprodução sem rede."""
+
+    @pytest.mark.asyncio
+    async def test_records_decoded_body(self):
+        """Corpo comprimido na origem é gravado decodificado e reproduzido igual."""
+        html = "<html><body><p>Vaga de Python</p></body></html>"
+        origin = httpx.MockTransport(lambda request: httpx.Response(
+            200,
+            headers={"content-type": "text/html; charset=utf-8", "content-encoding": "gzip"},
+            content=gzip.compress(html.encode("utf-8")),
+        ))
+        corpus = HttpCorpus()
+
+        async with httpx.AsyncClient(transport=RecordingTransport(corpus, origin)) as client:
+            recorded = await client.get("https://example.com/vaga")
+        async with httpx.AsyncClient(transport=ReplayTransport(corpus)) as client:
+            replayed = await client.get("https://example.com/vaga")
+
+        assert recorded.text == html
+        assert replayed.text == html
+        assert "content-encoding" not in {name for name, _ in corpus.get("GET", "https://example.com/vaga").headers}
+
+    @pytest.mark.asyncio
+    async def test_scraper_runs_from_corpus(self, job_pages):
+        """WebScraper extrai a vaga servida pelo corpus."""
+        corpus = HttpCorpus()
+        corpus.add_page("https://boards.greenhouse.io/acme/jobs/42", job_pages["greenhouse_job.html"])
+        scraper = _replay_scraper(corpus)
+
+        result = await scraper.scrape_job_posting("https://boards.greenhouse.io/acme/jobs/42")
+
+        assert result["title"] == "Senior Backend Engineer"
+        assert scraper.client._transport.hits == 1
+        await scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_missing_url_fails_without_network(self):
+        """URL fora do corpus falha como site inacessível."""
+        scraper = _replay_scraper(HttpCorpus())
+
+        with pytest.raises(ValueError, match="Falha ao extrair"):
+            await scraper.scrape_job_posting("https://example.com/vaga/inexistente")
+        assert scraper.client._transport.misses >= 1
+        await scraper.close()
+
+
+@pytest.mark.unit
+class TestScraperBenchmark:
+    """Benchmark offline sobre o corpus versionado em tests/fixtures."""
+
+    def test_fixture_corpus_benchmark(self):
+        """Corpus das fixtures roda sem rede e gera métricas e digests."""
+        pages = html_pages(HttpCorpus(str(DEFAULT_CORPUS)))
+        result = {"parse": run_parse(pages, repeat=2, parser_backend="lxml")}
+
+        assert result["parse"]["pages"] == 6
+        assert result["parse"]["parses"] == 12
+        assert result["parse"]["pages_per_sec"] > 0
+        assert 0 < result["parse"]["p50_ms"] <= result["parse"]["p95_ms"]
+        assert len(result["parse"]["digests"]) == 6
+        assert compare(result, result, max_slowdown=1.5) == []
+
+    def test_compare_flags_regressions(self):
+        """Extração alterada ou p95 acima do limite são regressões."""
+        baseline = {"parse": {"p95_ms": 1.0, "digests": {"https://a.com/1": "abc"}}}
+        current = {"parse": {"p95_ms": 2.0, "digests": {"https://a.com/1": "def"}}}
+
+        problems = compare(current, baseline, max_slowdown=1.5)
+
+        assert len(problems) == 2
+        assert "extração mudou: https://a.com/1" in problems
+
+    def test_percentile(self):
+        """Percentil por posição mais próxima."""
+        values = [float(v) for v in range(1, 101)]
+
+        assert percentile(values, 0.50) == 50.0
+        assert percentile(values, 0.95) == 95.0
+        assert percentile([], 0.95) == 0.0
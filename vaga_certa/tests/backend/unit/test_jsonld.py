@@ -0,0 +1,115 @@
+"""
+Testes unitários para a extração rápida via JSON-LD.
+"""
+import pytest
+from services.jsonld import (
+    JobPostingStreamDetector,
+    extract_job_posting_fast,
+    find_job_posting,
+    html_to_text,
+)
+
+
+@pytest.mark.unit
+class TestJobPostingFastPath:
+    """Testes do caminho rápido de extração."""
+
+    def test_escaped_description(self, job_pages):
+        """Descrição com HTML escapado (LinkedIn) é convertida em texto."""
+        result = extract_job_posting_fast(job_pages["linkedin_job.html"])
+
+        assert result["title"] == "Desenvolvedor Python Sênior"
+        assert result["company"] == "Tech Corp"
+        assert "<" not in result["description"]
+        assert "- Projetar e manter APIs REST com FastAPI" in result["description"]
+        assert result["fullText"].startswith("Desenvolvedor Python Sênior\nTech Corp")
+
+    def test_graph_and_type_list(self, job_pages):
+        """JobPosting dentro de @graph com @type em lista é encontrado."""
+        result = extract_job_posting_fast(job_pages["gupy_job.html"])
+
+        assert result["title"] == "Analista de Dados Pleno"
+        assert result["company"] == "Varejo Brasil"
+
+    def test_accepts_bytes(self, job_pages):
+        """O HTML bruto em bytes produz o mesmo resultado."""
+        html = job_pages["gupy_job.html"]
+
+        assert extract_job_posting_fast(html.encode("utf-8")) == extract_job_posting_fast(html)
+
+    def test_bytes_in_other_encoding(self, job_pages):
+        """Bytes em windows-1252 são decodificados com o encoding informado."""
+        html = job_pages["gupy_job.html"]
+
+        result = extract_job_posting_fast(html.encode("cp1252"), "cp1252")
+
+        assert result == extract_job_posting_fast(html)
+
+    def test_page_without_json_ld(self, job_pages):
+        """Sem JSON-LD o caminho rápido não se aplica."""
+        assert extract_job_posting_fast(job_pages["greenhouse_job.html"]) is None
+
+    def test_incomplete_job_posting(self):
+        """JobPosting sem empresa ou com descrição curta cai no parse completo."""
+        html = (
+            '<script type="application/ld+json">'
+            '{"@type": "JobPosting", "title": "Dev", "description": "curta"}'
+            "</script>"
+        )
+
+        assert extract_job_posting_fast(html) is None
+
+    def test_invalid_json_is_ignored(self):
+        """Blocos JSON-LD inválidos são ignorados sem erro."""
+        html = '<script type="application/ld+json">{invalido</script>'
+
+        assert extract_job_posting_fast(html) is None
+
+
+@pytest.mark.unit
+class TestJsonLdHelpers:
+    """Testes dos utilitários de JSON-LD."""
+
+    def test_find_job_posting_in_list(self):
+        """Localiza JobPosting em lista de objetos."""
+        data = [{"@type": "Organization"}, {"@type": "JobPosting", "title": "Dev"}]
+
+        assert find_job_posting(data)["title"] == "Dev"
+
+    def test_html_to_text(self):
+        """Tags de bloco viram quebras de linha e entidades são decodificadas."""
+        text = html_to_text("<p>Vaga &amp; time</p><ul><li>Python</li><li>SQL</li></ul>")
+
+        assert text == "Vaga & time\n\n- Python\n- SQL"
+
+
+@pytest.mark.unit
+class TestJobPostingStreamDetector:
+    """Testes do detector incremental usado no download por streaming."""
+
+    def test_detects_block_split_across_chunks(self, job_pages):
+        """Bloco JSON-LD cortado entre partes só é detectado quando completo."""
+        body = job_pages["linkedin_job.html"].encode("utf-8")
+        block_end = body.index(b"</script>") + len(b"</script>")
+        detector = JobPostingStreamDetector()
+        buffer = bytearray()
+
+        detected_at = None
+        for start in range(0, len(body), 97):
+            buffer.extend(body[start:start + 97])
+            if detector.check(buffer):
+                detected_at = len(buffer)
+                break
+
+        assert detected_at is not None
+        assert detected_at >= block_end
+        assert detected_at < block_end + 97
+
+    def test_page_without_job_posting(self, job_pages):
+        """Páginas sem JobPosting nunca disparam o encerramento."""
+        body = job_pages["greenhouse_job.html"].encode("utf-8")
+        detector = JobPostingStreamDetector()
+
+        assert not any(
+            detector.check(body[:end]) for end in range(64, len(body) + 64, 64)
+        )
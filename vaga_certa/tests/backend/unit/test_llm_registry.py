@@ -0,0 +1,113 @@
+"""
+Testes unitários para o registro de clientes LLM compartilhados.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from agents.generation_agent import GenerationAgent
+from agents.llm_registry import LLMConfig, LLMRegistry, generation_llm_config
+
+
+class FakeTransport:
+    """Transporte falso que registra o fechamento."""
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeLLM:
+    """Cliente falso que guarda os argumentos do construtor."""
+
+    created = 0
+
+    def __init__(self, **kwargs):
+        FakeLLM.created += 1
+        self.kwargs = kwargs
+        self.client = type("Client", (), {"transport": FakeTransport()})()
+
+    def __call__(self, prompt):
+        return "resposta"
+
+
+@pytest.fixture
+def registry():
+    FakeLLM.created = 0
+    return LLMRegistry(factory=FakeLLM, api_key="test-key")
+
+
+@pytest.mark.unit
+class TestLLMRegistry:
+    """Testes do compartilhamento de clientes e cadeias."""
+
+    def test_same_config_reuses_client(self, registry):
+        """Mesma configuração devolve o mesmo cliente; outra cria um novo."""
+        first = registry.get_llm(LLMConfig.build("gemini-2.5-flash", 0.1))
+        second = registry.get_llm(LLMConfig.build("gemini-2.5-flash", 0.1))
+        other = registry.get_llm(LLMConfig.build("gemini-2.5-flash", 0.7))
+
+        assert first is second
+        assert other is not first
+        assert FakeLLM.created == 2
+
+    def test_tools_and_thinking_are_part_of_key(self, registry):
+        """Ferramentas e orçamento de raciocínio chegam ao construtor e distinguem clientes."""
+        llm = registry.get_llm(generation_llm_config("gemini-2.5-pro", True))
+        plain = registry.get_llm(generation_llm_config("gemini-2.5-pro", False))
+
+        assert llm.kwargs["tools"] == [{"googleSearch": {}}]
+        assert llm.kwargs["thinking_config"] == {"thinking_budget": 32768}
+        assert llm.kwargs["google_api_key"] == "test-key"
+        assert "thinking_config" not in plain.kwargs
+        assert LLMConfig.build("m", 0.5, tools=[{"b": 1, "a": 2}]) == LLMConfig.build(
+            "m", 0.5, tools=[{"a": 2, "b": 1}]
+        )
+
+    def test_chain_is_built_once(self, registry):
+        """Cadeia é montada uma vez por nome e configuração."""
+        config = LLMConfig.build("gemini-2.5-flash", 0.1)
+        builds = []
+
+        def build(llm):
+            builds.append(llm)
+            return object()
+
+        assert registry.get_chain(config, "job_details", build) is registry.get_chain(
+            config, "job_details", build
+        )
+        assert len(builds) == 1
+        stats = registry.get_stats()["clients"][0]
+        assert stats["chains"] == ["job_details"]
+        assert stats["requests"] == 2
+
+    def test_concurrent_first_use_creates_one_client(self, registry):
+        """Threads pedindo a mesma configuração ao mesmo tempo compartilham um cliente."""
+        config = LLMConfig.build("gemini-2.5-flash", 0.1)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            clients = list(executor.map(lambda _: registry.get_llm(config), range(32)))
+
+        assert len({id(client) for client in clients}) == 1
+        assert FakeLLM.created == 1
+
+    @pytest.mark.asyncio
+    async def test_warm_up_and_close(self, registry):
+        """Pré-aquecimento cria os clientes e o fechamento encerra os transportes."""
+        configs = [LLMConfig.build("gemini-2.5-flash", 0.1), generation_llm_config("gemini-2.5-flash", False)]
+        registry.warm_up(configs)
+        transports = [registry.get_llm(config).client.transport for config in configs]
+
+        await registry.close()
+
+        assert FakeLLM.created == 2
+        assert all(transport.closed for transport in transports)
+        assert len(registry) == 0
+
+    def test_generation_agents_share_chain(self, registry):
+        """Agentes de geração com a mesma configuração usam a mesma cadeia."""
+        first, second = GenerationAgent(), GenerationAgent()
+        first.llm_registry = second.llm_registry = registry
+
+        assert first._create_chain() is second._create_chain()
+        assert GenerationAgent(use_thinking_mode=True).llm_config.model == "gemini-2.5-pro"
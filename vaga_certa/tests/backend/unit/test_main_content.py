@@ -0,0 +1,103 @@
+"""
+Testes unitários da extração de conteúdo principal (estilo readability).
+"""
+import lxml.html
+import pytest
+from services.html_parsers import PARSER_BACKENDS, get_parser_backend
+from services.main_content import extract_main_text
+from utils.validation import validate_and_score_job_content
+
+
+def _main_text(html: str):
+    return extract_main_text(lxml.html.document_fromstring(html))
+
+
+REQUIREMENTS = "".join(
+    f"<li>Requisito número {i}: experiência com Python, SQL e APIs REST</li>" for i in range(6)
+)
+
+
+@pytest.mark.unit
+class TestExtractMainText:
+    """Seleção do corpo da vaga por densidade de texto e de links."""
+
+    def test_removes_page_chrome(self, job_pages):
+        """Banner de cookies, vagas semelhantes e rodapé ficam de fora."""
+        text = _main_text(job_pages["linkedin_job.html"])
+
+        assert "Requisitos:" in text
+        assert "5+ anos de experiência com Python" in text
+        assert "Usamos cookies" not in text
+        assert "Vagas semelhantes" not in text
+        assert "Engenheiro de Dados - Banco XPTO" not in text
+        assert "Política de Privacidade" not in text
+
+    def test_keeps_every_section(self, job_pages):
+        """Seções em blocos irmãos (descrição, requisitos) são mantidas juntas."""
+        text = _main_text(job_pages["lever_job.html"])
+
+        assert "Treinar, avaliar e colocar modelos em produção" in text
+        assert "Vivência com SQL e grandes volumes de dados" in text
+        assert "Qualificações desejáveis" in text
+        assert "Jobs powered by Lever" not in text
+
+    def test_drops_link_lists_inside_content(self):
+        """Listas de links sem classe reconhecível são descartadas pela densidade."""
+        links = "".join(f'<li><a href="/vagas/{i}">Outra vaga {i}</a></li>' for i in range(8))
+        html = (
+            "<html><body><div class='job'><h1>Dev Python</h1>"
+            f"<p>Somos uma empresa de tecnologia, buscando pessoas curiosas.</p><ul>{REQUIREMENTS}</ul>"
+            f"<ul>{links}</ul></div></body></html>"
+        )
+
+        text = _main_text(html)
+
+        assert "Requisito número 5" in text
+        assert "Outra vaga" not in text
+
+    def test_skips_hidden_elements(self):
+        """Elementos ocultos não entram no conteúdo."""
+        html = (
+            f"<html><body><div><ul>{REQUIREMENTS}</ul>"
+            "<div style='display: none'>Texto oculto de rastreamento</div>"
+            "<p hidden>Outro texto oculto</p></div></body></html>"
+        )
+
+        text = _main_text(html)
+
+        assert "Requisito número 0" in text
+        assert "oculto" not in text
+
+    def test_short_page_returns_none(self):
+        """Sem conteúdo suficiente o texto completo da página é mantido."""
+        assert _main_text("<html><body><p>Somente um parágrafo curto de texto.</p></body></html>") is None
+        assert extract_main_text(None) is None
+
+    def test_does_not_modify_tree(self, job_pages):
+        """A árvore continua disponível para as demais extrações."""
+        root = lxml.html.document_fromstring(job_pages["linkedin_job.html"])
+        before = lxml.html.tostring(root)
+
+        extract_main_text(root)
+
+        assert lxml.html.tostring(root) == before
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend_name", sorted(PARSER_BACKENDS))
+class TestMainContentFullText:
+    """Texto completo reduzido ao conteúdo principal nos backends de parsing."""
+
+    def test_smaller_and_still_valid(self, backend_name, job_pages):
+        """Texto menor que o da página e ainda aprovado pela validação."""
+        backend = get_parser_backend(backend_name)
+        for name, html in job_pages.items():
+            page = backend.parse(html)
+            main = backend.parse(html, main_content=True)
+
+            assert len(main["fullText"]) < len(page["fullText"]), name
+            assert main["fullText"].startswith(f"{main['title']}\n{main['company']}"), name
+            assert validate_and_score_job_content(main["fullText"]).is_valid, name
+            assert {k: v for k, v in main.items() if k != "fullText"} == {
+                k: v for k, v in page.items() if k != "fullText"
+            }, name
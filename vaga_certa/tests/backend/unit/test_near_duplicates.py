@@ -0,0 +1,159 @@
+"""
+Testes unitários para a detecção de vagas quase idênticas (SimHash + LSH).
+"""
+import httpx
+import pytest
+from services.cache import TieredCache
+from services.html_parsers import parse_job_page
+from services.near_duplicates import SimHashIndex, hamming_distance, simhash
+from services.web_scraper import WebScraper
+
+
+@pytest.fixture
+def page_texts(job_pages):
+    """Texto completo limpo de cada página gravada."""
+    return {name: parse_job_page(html, "lxml")["fullText"] for name, html in job_pages.items()}
+
+
+@pytest.mark.unit
+class TestSimHash:
+    """Testes do fingerprint SimHash."""
+
+    def test_small_edits_keep_fingerprint_close(self, page_texts):
+        """Pequenas edições (rodapé, pontuação) mudam poucos bits."""
+        for name, text in page_texts.items():
+            variant = text.replace(".", ",", 1) + "\nCandidate-se hoje"
+
+            assert hamming_distance(simhash(text), simhash(variant)) <= 6, name
+
+    def test_different_postings_are_far_apart(self, page_texts):
+        """Vagas diferentes ficam bem acima do limite de duplicata."""
+        names = sorted(page_texts)
+        for i, first in enumerate(names):
+            for second in names[i + 1:]:
+                distance = hamming_distance(simhash(page_texts[first]), simhash(page_texts[second]))
+                assert distance > 12, (first, second)
+
+    def test_stable_and_case_insensitive(self):
+        """Fingerprint é determinístico e ignora maiúsculas."""
+        assert simhash("Vaga Python Sênior em SP") == simhash("vaga python sênior em sp")
+        assert simhash("") == 0
+
+
+@pytest.mark.unit
+class TestSimHashIndex:
+    """Testes do índice incremental com bandas LSH."""
+
+    def test_finds_near_duplicate(self):
+        """Fingerprint a poucos bits de distância é encontrado."""
+        index = SimHashIndex(max_distance=3)
+        index.add("https://a.com/vaga/1", 0b1011 << 40)
+
+        assert index.find((0b1011 << 40) ^ 0b101) == ("https://a.com/vaga/1", 2)
+        assert index.find((0b1011 << 40) ^ 0b1111) is None
+
+    def test_exclude_and_remove(self):
+        """A própria chave pode ser ignorada e chaves removidas somem do índice."""
+        index = SimHashIndex(max_distance=3)
+        index.add("a", 12345)
+
+        assert index.find(12345, exclude="a") is None
+        index.remove("a")
+        assert index.find(12345) is None
+        assert len(index) == 0
+
+    def test_evicts_oldest_entries(self):
+        """Índice respeita o limite de entradas descartando as mais antigas."""
+        index = SimHashIndex(max_distance=2, max_entries=2)
+        for i, fingerprint in enumerate([0, (1 << 32) - 1, (1 << 64) - 1]):
+            index.add(f"vaga-{i}", fingerprint)
+
+        assert len(index) == 2
+        assert index.find(0) is None
+        assert index.find((1 << 64) - 1) == ("vaga-2", 0)
+
+    def test_reinsert_updates_fingerprint(self):
+        """Reinserir a mesma chave substitui o fingerprint anterior."""
+        index = SimHashIndex(max_distance=1)
+        index.add("vaga", 0)
+        index.add("vaga", (1 << 64) - 1)
+
+        assert index.find(0) is None
+        assert index.find((1 << 64) - 1) == ("vaga", 0)
+
+
+@pytest.mark.unit
+class TestScraperNearDuplicates:
+    """Reaproveitamento da extração de vagas quase idênticas no scraper."""
+
+    @pytest.fixture(autouse=True)
+    def enable_near_duplicates(self, monkeypatch):
+        """Reaproveitamento fica desligado por padrão."""
+        from config import settings
+
+        monkeypatch.setattr(settings, "near_duplicate_enabled", True)
+
+    @pytest.mark.asyncio
+    async def test_reuses_existing_extraction(self, job_pages):
+        """Mesma vaga republicada em outra URL devolve a extração já existente."""
+        html = job_pages["greenhouse_job.html"]
+        mirrored = html.replace("Remote - Brazil", "Remote - Brazil (republicada)")
+        pages = {"/acme/jobs/42": html, "/acme-brasil/jobs/77": mirrored}
+
+        scraper = WebScraper(
+            cache=TieredCache("scrape-test", ttl_seconds=60),
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, text=pages[request.url.path])
+            )
+        )
+        scraper.memo_ttl_seconds = 0
+
+        original = await scraper._try_direct_scrape("https://boards.greenhouse.io/acme/jobs/42")
+        duplicate = await scraper._try_direct_scrape("https://boards.greenhouse.io/acme-brasil/jobs/77")
+
+        assert duplicate == original
+        assert scraper.get_cache_stats()["near_duplicates"] == 1
+        cached = scraper.cache.get("https://boards.greenhouse.io/acme-brasil/jobs/77")
+        assert cached.value == original
+        await scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_keeps_fresh_result_for_different_posting(self, monkeypatch):
+        """Outra vaga da mesma empresa (boilerplate igual) mantém a própria extração."""
+        from config import settings
+
+        # Distância folgada: o boilerplate sozinho já aproxima os fingerprints
+        monkeypatch.setattr(settings, "near_duplicate_max_distance", 16)
+        boilerplate = " ".join(
+            f"A Acme é uma empresa de tecnologia com benefício {i} e cultura de aprendizado contínuo."
+            for i in range(40)
+        )
+        pages = {
+            f"/jobs/{n}": (
+                f"<html><head><title>{level} - Acme</title></head><body><main>"
+                f"<h1>Desenvolvedor Python {level}</h1><p>{boilerplate}</p>"
+                f"</main></body></html>"
+            )
+            for n, level in ((1, "Sênior"), (2, "Pleno"))
+        }
+
+        scraper = WebScraper(
+            cache=TieredCache("scrape-test", ttl_seconds=60),
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(200, text=pages[request.url.path])
+            )
+        )
+        scraper.memo_ttl_seconds = 0
+
+        senior = await scraper._try_direct_scrape("https://acme.gupy.io/jobs/1")
+        pleno = await scraper._try_direct_scrape("https://acme.gupy.io/jobs/2")
+
+        assert "Sênior" in senior["title"]
+        assert "Pleno" in pleno["title"]
+        stats = scraper.get_cache_stats()
+        assert stats["near_duplicates_rejected"] == 1
+        # A consulta da vaga original não entra na taxa de hit do cache
+        assert (stats["hits"], stats["misses"]) == (0, 0)
+        assert "near_duplicates" not in stats
+        assert scraper.cache.get("https://acme.gupy.io/jobs/2").value == pleno
+        await scraper.close()
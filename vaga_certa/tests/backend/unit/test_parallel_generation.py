@@ -0,0 +1,168 @@
+"""
+Testes unitários para a geração de materiais por seção (em paralelo) e a regeneração de uma seção.
+"""
+import asyncio
+import time
+import pytest
+from fastapi.testclient import TestClient
+from agents.generation_agent import GenerationAgent
+from agents.prompts import PromptTemplates, build_generation_context, get_prompt_variables
+
+
+CV = "João Silva, desenvolvedor Python com 8 anos de experiência em FastAPI, Docker e AWS."
+JOB_DESCRIPTION = (
+    "Procuramos pessoa desenvolvedora Python sênior com experiência em FastAPI, "
+    "Docker, AWS e microserviços para o time de plataforma da Acme."
+)
+PAYLOAD = {"cv": CV, "job_title": "Dev Python", "company": "Acme", "job_description": JOB_DESCRIPTION}
+
+
+class FakeSectionChain:
+    """Cadeia falsa de uma seção: espera um pouco e devolve texto fixo."""
+
+    def __init__(self, section, calls, delay=0.1, fail=False):
+        self.section = section
+        self.calls = calls
+        self.delay = delay
+        self.fail = fail
+
+    async def ainvoke(self, prompt_vars):
+        self.calls.append((self.section, prompt_vars))
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("cota excedida")
+        return f"  texto de {self.section} para {prompt_vars['company']}  "
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+def fake_sections(monkeypatch, agent, calls, failing=()):
+    monkeypatch.setattr(
+        agent,
+        "_create_section_chain",
+        lambda section: FakeSectionChain(section, calls, fail=section in failing)
+    )
+
+
+@pytest.mark.unit
+class TestParallelGeneration:
+    """Testes da geração com uma chamada ao LLM por seção."""
+
+    @pytest.mark.asyncio
+    async def test_sections_run_concurrently(self, monkeypatch, calls):
+        """As quatro seções rodam juntas: o tempo total é o da mais lenta, não a soma."""
+        agent = GenerationAgent()
+        fake_sections(monkeypatch, agent, calls)
+
+        started = time.monotonic()
+        result = await agent.generate_career_materials(
+            CV, "Dev Python", "Acme", JOB_DESCRIPTION, parallel_sections=True
+        )
+
+        assert time.monotonic() - started < 0.3
+        assert result["coverLetter"] == "texto de coverLetter para Acme"
+        assert sorted(section for section, _ in calls) == [
+            "coverLetter", "interviewTips", "networkingMessage", "optimizedCv",
+        ]
+        assert result["metadata"]["parallel_sections"] is True
+        assert set(result["metadata"]["section_seconds"]) == {section for section, _ in calls}
+
+    @pytest.mark.asyncio
+    async def test_context_is_rendered_once_and_shared(self, monkeypatch, calls):
+        """Todas as seções recebem o mesmo bloco de contexto pré-renderizado."""
+        agent = GenerationAgent()
+        fake_sections(monkeypatch, agent, calls)
+
+        await agent.generate_career_materials(CV, "Dev Python", "Acme", JOB_DESCRIPTION, parallel_sections=True)
+
+        contexts = {prompt_vars["context"] for _, prompt_vars in calls}
+        assert len(contexts) == 1
+        assert CV in contexts.pop()
+
+    @pytest.mark.asyncio
+    async def test_failed_section_does_not_discard_others(self, monkeypatch, calls):
+        """Seção que falha recebe texto de erro e as demais são mantidas."""
+        agent = GenerationAgent()
+        fake_sections(monkeypatch, agent, calls, failing=("coverLetter",))
+
+        result = await agent.generate_career_materials(
+            CV, "Dev Python", "Acme", JOB_DESCRIPTION, parallel_sections=True
+        )
+
+        assert result["coverLetter"].startswith("Erro: falha ao gerar a seção")
+        assert result["optimizedCv"] == "texto de optimizedCv para Acme"
+        assert result["metadata"]["failed_sections"] == ["coverLetter"]
+
+    @pytest.mark.asyncio
+    async def test_all_sections_failing_raises(self, monkeypatch, calls):
+        """Se nenhuma seção for gerada, a geração falha."""
+        agent = GenerationAgent()
+        fake_sections(
+            monkeypatch, agent, calls,
+            failing=("optimizedCv", "coverLetter", "networkingMessage", "interviewTips")
+        )
+
+        with pytest.raises(ValueError, match="cota excedida"):
+            await agent.generate_career_materials(CV, "Dev Python", "Acme", JOB_DESCRIPTION, parallel_sections=True)
+
+    def test_section_prompt_reuses_shared_blocks(self):
+        """Prompt por seção traz as regras, só as instruções da seção e o contexto."""
+        prompt_vars = get_prompt_variables(CV, "Dev Python", "Acme", JOB_DESCRIPTION, "Formal", "Português")
+        messages = PromptTemplates.get_section_generation_prompt("coverLetter").format_messages(
+            **prompt_vars, context=build_generation_context(prompt_vars), feedback="Mais curta"
+        )
+
+        assert "REGRAS CRÍTICAS" in messages[0].content
+        assert "DETALHES DA CARTA DE APRESENTAÇÃO" in messages[0].content
+        assert "DETALHES DO CV OTIMIZADO" not in messages[0].content
+        assert CV in messages[1].content and "Mais curta" in messages[1].content
+        with pytest.raises(ValueError):
+            PromptTemplates.get_section_generation_prompt("resumo")
+
+
+@pytest.mark.unit
+class TestRegenerateSection:
+    """Testes da regeneração de uma única seção."""
+
+    @pytest.mark.asyncio
+    async def test_regenerates_only_requested_section(self, monkeypatch, calls):
+        """Só a seção pedida vai ao LLM, com o feedback do usuário."""
+        agent = GenerationAgent()
+        fake_sections(monkeypatch, agent, calls)
+
+        result = await agent.regenerate_section(
+            "coverLetter", CV, "Dev Python", "Acme", JOB_DESCRIPTION, feedback="Mais curta"
+        )
+
+        assert result["section"] == "coverLetter"
+        assert result["content"] == "texto de coverLetter para Acme"
+        assert [(section, prompt_vars["feedback"]) for section, prompt_vars in calls] == [
+            ("coverLetter", "Mais curta")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unknown_section_raises(self):
+        """Seção inexistente levanta ValueError."""
+        with pytest.raises(ValueError, match="Seção desconhecida"):
+            await GenerationAgent().regenerate_section("resumo", CV, "Dev Python", "Acme", JOB_DESCRIPTION)
+
+    def test_endpoint(self, monkeypatch, calls):
+        """Endpoint devolve a seção regenerada e valida o nome da seção."""
+        import api.main as main
+        from config import settings
+
+        agent = GenerationAgent()
+        fake_sections(monkeypatch, agent, calls)
+        monkeypatch.setattr(settings, "google_api_key", "AIzaTestKey1234567890")
+        monkeypatch.setattr(main, "generation_agent", agent)
+        client = TestClient(main.app)
+
+        response = client.post("/generate-materials/section", json={**PAYLOAD, "section": "interviewTips"})
+        invalid = client.post("/generate-materials/section", json={**PAYLOAD, "section": "resumo"})
+
+        assert response.status_code == 200
+        assert response.json()["content"] == "texto de interviewTips para Acme"
+        assert invalid.status_code == 422
@@ -0,0 +1,139 @@
+"""
+Testes unitários para o pool de proxies CORS do scraper.
+"""
+import time
+import httpx
+import pytest
+from services.cache import TieredCache
+from services.proxy_pool import ProxyPool, parse_proxy_templates
+from services.web_scraper import WebScraper
+
+
+SLOW = "https://slow.proxy.dev/raw?url={url}"
+FAST = "https://fast.proxy.dev/?{url}"
+JOB_URL = "https://example.com/vaga/1"
+
+
+@pytest.mark.unit
+class TestProxyPool:
+    """Testes do score e do afastamento de proxies."""
+
+    def test_untried_proxies_keep_configured_order(self):
+        """Sem histórico, a ordem configurada é mantida."""
+        pool = ProxyPool([SLOW, FAST])
+
+        assert pool.urls_for(JOB_URL) == [
+            f"https://slow.proxy.dev/raw?url={JOB_URL}",
+            f"https://fast.proxy.dev/?{JOB_URL}",
+        ]
+
+    def test_faster_proxy_is_tried_first(self):
+        """Proxy com menor latência passa para a frente."""
+        pool = ProxyPool([SLOW, FAST])
+        pool.record(SLOW, True, 3.0)
+        pool.record(FAST, True, 0.4)
+
+        assert [ProxyPool.name_of(url) for url in pool.urls_for(JOB_URL)] == [
+            "fast.proxy.dev", "slow.proxy.dev",
+        ]
+
+    def test_unreliable_proxy_loses_to_slower_reliable_one(self):
+        """Score pondera latência pela taxa de sucesso."""
+        pool = ProxyPool([FAST, SLOW], eject_after_failures=10)
+        pool.record(SLOW, True, 1.0)
+        for success in (True, False, False, True, False):
+            pool.record(FAST, success, 0.6)
+
+        assert ProxyPool.name_of(pool.urls_for(JOB_URL)[0]) == "slow.proxy.dev"
+
+    def test_consecutive_failures_eject_with_backoff(self):
+        """Falhas seguidas afastam o proxy por tempo que dobra a cada afastamento."""
+        pool = ProxyPool([SLOW, FAST], eject_after_failures=2, eject_seconds=60)
+        for _ in range(2):
+            pool.record(SLOW, False, 0.1, "HTTP 502")
+
+        assert [ProxyPool.name_of(url) for url in pool.urls_for(JOB_URL)] == ["fast.proxy.dev"]
+        health = pool._proxies["slow.proxy.dev"]
+        assert 59 < health.ejected_until - time.monotonic() <= 60
+
+        health.ejected_until = 0.0  # Afastamento expirou
+        pool.record(SLOW, False, 0.1, "HTTP 502")
+
+        assert 119 < health.ejected_until - time.monotonic() <= 120
+        assert health.ejections == 2
+
+    def test_success_reinstates_proxy(self):
+        """Sucesso zera falhas e afastamentos."""
+        pool = ProxyPool([SLOW], eject_after_failures=1)
+        pool.record(SLOW, False, 0.1)
+        pool._proxies["slow.proxy.dev"].ejected_until = 0.0
+
+        pool.record(SLOW, True, 0.1)
+
+        health = pool._proxies["slow.proxy.dev"]
+        assert health.consecutive_failures == 0
+        assert health.ejections == 0
+        assert pool.urls_for(JOB_URL)
+
+    def test_snapshot(self):
+        """Saúde lista proxies afastados por último, com motivo da falha."""
+        pool = ProxyPool([SLOW, FAST], eject_after_failures=1)
+        pool.record(SLOW, False, 0.2, "timeout")
+        pool.record(FAST, True, 0.5)
+
+        snapshot = pool.snapshot()
+
+        assert [row["name"] for row in snapshot] == ["fast.proxy.dev", "slow.proxy.dev"]
+        assert snapshot[0]["success_rate"] == 1.0
+        assert snapshot[0]["latency_ms"] == 500.0
+        assert snapshot[1]["ejected"] is True
+        assert snapshot[1]["last_error"] == "timeout"
+
+    def test_parse_templates(self):
+        """Templates separados por vírgula precisam do marcador {url}."""
+        assert parse_proxy_templates(f" {SLOW},{FAST} ,") == [SLOW, FAST]
+        with pytest.raises(ValueError):
+            parse_proxy_templates("https://proxy.dev/")
+
+
+@pytest.mark.unit
+class TestScraperProxyPool:
+    """Testes do pool de proxies integrado ao fallback do scraper."""
+
+    @pytest.mark.asyncio
+    async def test_dead_proxy_is_ranked_last_and_ejected(self, monkeypatch, job_pages):
+        """Proxy fora do ar vai para o fim da fila e, com falhas seguidas, sai do pool."""
+        from config import settings
+
+        monkeypatch.setattr(settings, "proxy_pool_urls", f"{SLOW},{FAST}")
+        monkeypatch.setattr(settings, "proxy_eject_after_failures", 2)
+        monkeypatch.setattr(settings, "circuit_breaker_enabled", False)
+        monkeypatch.setattr(settings, "scraping_hedge_enabled", False)
+        hosts = []
+
+        def handler(request):
+            hosts.append(request.url.host)
+            if request.url.host == "fast.proxy.dev":
+                return httpx.Response(200, text=job_pages["greenhouse_job.html"])
+            if request.url.host == "slow.proxy.dev":
+                return httpx.Response(502)
+            return httpx.Response(403)
+
+        scraper = WebScraper(
+            cache=TieredCache("scrape-test", ttl_seconds=60),
+            transport=httpx.MockTransport(handler)
+        )
+        scraper.memo_ttl_seconds = 0
+        scraper.near_duplicates = None
+
+        for i in range(3):
+            result = await scraper._try_cors_proxy_scrape(f"https://boards.greenhouse.io/acme/jobs/{i}")
+            assert result["title"]
+
+        assert hosts == ["slow.proxy.dev", "fast.proxy.dev", "fast.proxy.dev", "fast.proxy.dev"]
+
+        assert await scraper._try_single_proxy(SLOW.replace("{url}", JOB_URL), JOB_URL) is None
+        assert [ProxyPool.name_of(url) for url in scraper._proxy_urls(JOB_URL)] == ["fast.proxy.dev"]
+        names = [row["name"] for row in scraper.proxy_pool.snapshot() if row["ejected"]]
+        assert names == ["slow.proxy.dev"]
+        await scraper.close()
@@ -0,0 +1,263 @@
+"""
+Testes unitários para o limite de taxa por host (token bucket) do scraper.
+"""
+import asyncio
+import time
+import httpx
+import pytest
+from services.cache import TieredCache
+from services.rate_limiter import (
+    HostRateLimiter,
+    RateLimitExceeded,
+    parse_host_rates,
+    parse_retry_after,
+)
+from services.web_scraper import WebScraper
+
+
+URL = "https://www.linkedin.com/jobs/view/1"
+
+
+@pytest.mark.unit
+class TestHostRateLimiter:
+    """Testes do token bucket por host."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_spaced(self):
+        """Rajada inicial passa direto e as seguintes respeitam a taxa."""
+        limiter = HostRateLimiter(rate_per_second=20, burst=2)
+        started = time.monotonic()
+        times = []
+
+        async def fetch():
+            await limiter.acquire(URL)
+            times.append(time.monotonic() - started)
+
+        await asyncio.gather(*(fetch() for _ in range(5)))
+
+        assert times[1] < 0.02
+        assert times[-1] >= 0.14
+        stats = limiter.get_stats()["hosts"]["www.linkedin.com"]
+        assert stats["requests"] == 5
+        assert stats["delayed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_hosts_have_independent_buckets(self):
+        """Host sem vagas não atrasa requisições para outro host."""
+        limiter = HostRateLimiter(rate_per_second=1, burst=1)
+        await limiter.acquire(URL)
+
+        started = time.monotonic()
+        await limiter.acquire("https://boards.greenhouse.io/acme/jobs/1")
+
+        assert time.monotonic() - started < 0.05
+
+    @pytest.mark.asyncio
+    async def test_deadline_sheds_without_consuming_slot(self):
+        """Vaga além do prazo descarta a requisição sem ocupar a fila."""
+        limiter = HostRateLimiter(rate_per_second=1, burst=1)
+        await limiter.acquire(URL)
+
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire(URL, deadline=time.monotonic() + 0.2)
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire(URL, deadline=time.monotonic() + 0.2)
+
+        stats = limiter.get_stats()["hosts"]["www.linkedin.com"]
+        assert stats["shed"] == 2
+        assert limiter._buckets["www.linkedin.com"].next_free - time.monotonic() < 1.0
+
+    @pytest.mark.asyncio
+    async def test_max_wait_applies_without_deadline(self):
+        """Sem prazo do chamador, a espera máxima configurada limita a fila."""
+        limiter = HostRateLimiter(rate_per_second=1, burst=1, max_wait_seconds=0.5)
+        await limiter.acquire(URL)
+
+        with pytest.raises(RateLimitExceeded):
+            await limiter.acquire(URL)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_returns_slot(self):
+        """Requisição cancelada na fila devolve a vaga reservada."""
+        limiter = HostRateLimiter(rate_per_second=2, burst=1)
+        await limiter.acquire(URL)
+        next_free = limiter._buckets["www.linkedin.com"].next_free
+
+        waiter = asyncio.ensure_future(limiter.acquire(URL))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert limiter._buckets["www.linkedin.com"].next_free == next_free
+
+    def test_penalize_blocks_host_without_burst(self):
+        """Retry-After suspende o host e a volta é uma requisição por vez."""
+        limiter = HostRateLimiter(rate_per_second=10, burst=3, max_retry_after_seconds=5)
+        limiter.penalize(URL, 60)
+
+        first, _ = limiter._reserve("www.linkedin.com", None)
+        second, _ = limiter._reserve("www.linkedin.com", None)
+
+        assert 4.9 < first - time.monotonic() <= 5.0
+        assert second - first == pytest.approx(0.1)
+        assert limiter.get_stats()["hosts"]["www.linkedin.com"]["penalties"] == 1
+
+    def test_host_rates_apply_to_subdomains(self):
+        """Taxa configurada para um domínio vale para os subdomínios."""
+        limiter = HostRateLimiter(rate_per_second=2, host_rates={"gupy.io": 0.5, "corsproxy.io": 0})
+
+        assert limiter.rate_for("varejobrasil.gupy.io") == 0.5
+        assert limiter.rate_for("corsproxy.io:443") == 0
+        assert limiter.rate_for("www.linkedin.com") == 2
+
+    @pytest.mark.asyncio
+    async def test_zero_rate_disables_limit(self):
+        """Taxa 0 não restringe o host."""
+        limiter = HostRateLimiter(rate_per_second=0, burst=1)
+
+        await asyncio.gather(*(limiter.acquire(URL) for _ in range(20)))
+
+        assert limiter.get_stats()["hosts"]["www.linkedin.com"]["delayed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_penalty_during_wait_keeps_reservation(self):
+        """Retry-After durante a espera adia a vaga reservada sem reservar outra."""
+        limiter = HostRateLimiter(rate_per_second=10, burst=1)
+        buckets = limiter._buckets
+        await limiter.acquire(URL)
+        started = time.monotonic()
+
+        waiter = asyncio.ensure_future(limiter.acquire(URL))
+        await asyncio.sleep(0.01)
+        queued = buckets["www.linkedin.com"].next_free
+        limiter.penalize(URL, 0.2)
+        shifted = buckets["www.linkedin.com"].next_free
+        await waiter
+
+        assert time.monotonic() - started >= 0.2
+        assert buckets["www.linkedin.com"].next_free == shifted
+        assert shifted - queued == pytest.approx(0.2, abs=0.02)
+
+    @pytest.mark.asyncio
+    async def test_penalty_beyond_deadline_sheds_waiter(self):
+        """Retry-After que empurra a vaga além do prazo descarta a requisição na fila."""
+        limiter = HostRateLimiter(rate_per_second=10, burst=1)
+        await limiter.acquire(URL)
+
+        waiter = asyncio.ensure_future(limiter.acquire(URL, deadline=time.monotonic() + 0.5))
+        await asyncio.sleep(0.01)
+        limiter.penalize(URL, 5)
+
+        with pytest.raises(RateLimitExceeded):
+            await waiter
+        assert limiter.get_stats()["hosts"]["www.linkedin.com"]["shed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_idle_hosts_evicted_above_limit(self):
+        """Acima de max_hosts, hosts ociosos saem antes dos que têm fila."""
+        limiter = HostRateLimiter(rate_per_second=1, burst=1, max_hosts=2)
+        await limiter.acquire(URL)
+        await limiter.acquire("https://a.example.com/vaga")
+        limiter._buckets["a.example.com"].next_free = 0.0
+
+        await limiter.acquire("https://b.example.com/vaga")
+
+        assert set(limiter._buckets) == {"www.linkedin.com", "b.example.com"}
+        assert limiter.get_stats()["evicted_hosts"] == 1
+
+
+@pytest.mark.unit
+class TestRateLimitParsing:
+    """Testes de leitura do Retry-After e das taxas por host."""
+
+    def test_retry_after_seconds(self):
+        """Retry-After em segundos."""
+        assert parse_retry_after("120") == 120.0
+
+    def test_retry_after_http_date(self):
+        """Retry-After como data HTTP vira segundos a partir de agora."""
+        now = 1445412480.0  # Wed, 21 Oct 2015 07:28:00 GMT
+
+        assert parse_retry_after("Wed, 21 Oct 2015 07:30:00 GMT", now=now) == 120.0
+        assert parse_retry_after("Wed, 21 Oct 2015 07:00:00 GMT", now=now) == 0.0
+
+    def test_retry_after_invalid(self):
+        """Valores ausentes ou inválidos são ignorados."""
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("amanhã") is None
+
+    def test_host_rates(self):
+        """Lista host=req/s vira dicionário; item malformado levanta ValueError."""
+        assert parse_host_rates(" API.allorigins.win=1, corsproxy.io=0.5,") == {
+            "api.allorigins.win": 1.0,
+            "corsproxy.io": 0.5,
+        }
+        with pytest.raises(ValueError):
+            parse_host_rates("corsproxy.io")
+
+
+@pytest.mark.unit
+class TestScraperRateLimit:
+    """Testes do limite de taxa integrado ao fetch do scraper."""
+
+    @pytest.mark.asyncio
+    async def test_retry_after_holds_next_request(self, monkeypatch):
+        """429 com Retry-After suspende o host sem nova requisição."""
+        from config import settings
+
+        monkeypatch.setattr(settings, "circuit_breaker_enabled", False)
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(429, headers={"Retry-After": "30"})
+
+        scraper = WebScraper(
+            cache=TieredCache("scrape-test", ttl_seconds=60),
+            transport=httpx.MockTransport(handler)
+        )
+        url = "https://blocked.example.com/vaga/1"
+
+        with pytest.raises(httpx.HTTPStatusError):
+            await scraper._fetch_page(url)
+        with pytest.raises(RateLimitExceeded):
+            await scraper._fetch_page(url)
+
+        assert len(requests) == 1
+        host = scraper.get_pool_stats()["rate_limits"]["hosts"]["blocked.example.com"]
+        assert host["penalties"] == 1
+        assert host["shed"] == 1
+        assert host["blocked_for_seconds"] > 25
+        await scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_deadline_sheds_queued_scrape(self, monkeypatch):
+        """Scraping com prazo curto é descartado em vez de esperar a fila do host."""
+        from config import settings
+
+        monkeypatch.setattr(settings, "scraping_rate_per_host", 1.0)
+        monkeypatch.setattr(settings, "scraping_rate_burst", 1)
+        monkeypatch.setattr(settings, "scraping_hedge_enabled", False)
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(404)
+
+        scraper = WebScraper(
+            cache=TieredCache("scrape-test", ttl_seconds=60),
+            transport=httpx.MockTransport(handler)
+        )
+        monkeypatch.setattr(scraper, "_proxy_urls", lambda url: [])
+
+        with pytest.raises(ValueError):
+            await scraper.scrape_job_posting("https://example.com/vaga/1")
+        started = time.monotonic()
+        with pytest.raises(ValueError):
+            await scraper.scrape_job_posting("https://example.com/vaga/2", deadline_seconds=0.2)
+
+        assert time.monotonic() - started < 0.2
+        assert len(requests) == 1
+        assert scraper.rate_limiter.get_stats()["hosts"]["example.com"]["shed"] == 1
+        await scraper.close()
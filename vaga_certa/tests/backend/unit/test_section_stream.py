@@ -0,0 +1,195 @@
+"""
+Testes unitários para o parser de seções em streaming e o endpoint SSE de geração.
+"""
+import json
+import pytest
+from fastapi.testclient import TestClient
+from agents.generation_agent import GenerationAgent
+from agents.section_stream import SectionStreamParser, parse_sections
+
+
+RESPONSE = (
+    "Claro! Seguem os materiais.\n"
+    "### OPTIMIZED CV ###\n\nJoão Silva\nDesenvolvedor Python sênior\n\n"
+    "### COVER LETTER ###\nPrezada equipe da Acme,\nescrevo para...\n"
+    "### NETWORKING MESSAGE ###\nOlá! Vi a vaga na Acme.\n"
+    "### INTERVIEW TIPS ###\n1. Estude a arquitetura da Acme.\n"
+)
+
+CV = "João Silva, desenvolvedor Python com 8 anos de experiência em FastAPI, Docker e AWS."
+JOB_DESCRIPTION = (
+    "Procuramos pessoa desenvolvedora Python sênior com experiência em FastAPI, "
+    "Docker, AWS e microserviços para o time de plataforma da Acme."
+)
+
+
+def stream(chunks):
+    """Alimenta o parser pedaço a pedaço e devolve (parser, eventos)."""
+    parser = SectionStreamParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    events.extend(parser.close())
+    return parser, events
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class FakeChain:
+    """Cadeia falsa que devolve a resposta em pedaços."""
+
+    def __init__(self, chunks, fail_after=None):
+        self.chunks = chunks
+        self.fail_after = fail_after
+
+    async def astream(self, prompt_vars):
+        for i, chunk in enumerate(self.chunks):
+            if self.fail_after is not None and i == self.fail_after:
+                raise RuntimeError("conexão encerrada")
+            yield chunk
+
+    async def ainvoke(self, prompt_vars):
+        return "".join(self.chunks)
+
+
+def sse_events(body):
+    """Lê (evento, dados) de um corpo text/event-stream."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.mark.unit
+class TestSectionStreamParser:
+    """Testes do parser incremental de seções."""
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 64, len(RESPONSE)])
+    def test_any_chunking_matches_full_parse(self, size):
+        """Qualquer divisão em pedaços produz as mesmas seções do parse completo."""
+        parser, events = stream(chunked(RESPONSE, size))
+
+        expected = parse_sections(RESPONSE)
+        assert parser.sections == expected
+        assert parser.result() == expected
+        for key in expected:
+            deltas = "".join(e["text"] for e in events if e["event"] == "section_delta" and e["section"] == key)
+            assert deltas.strip() == expected[key]
+
+    def test_split_marker_never_leaks(self):
+        """Marcador partido entre pedaços não aparece no texto da seção anterior."""
+        _, events = stream(["### OPTIMIZED CV ###\nCV\n### COV", "ER LETTER ###\nCarta"])
+
+        texts = [e["text"] for e in events if e["event"] == "section_delta"]
+        assert all("#" not in text for text in texts)
+        assert [e["event"] for e in events] == [
+            "section_start", "section_delta", "section_end",
+            "section_start", "section_delta", "section_end",
+        ]
+
+    def test_sections_complete_as_next_one_starts(self):
+        """Seção termina assim que o marcador seguinte chega, antes do fim da resposta."""
+        parser = SectionStreamParser()
+        parser.feed("### OPTIMIZED CV ###\nCV pronto\n")
+
+        events = parser.feed("### COVER LETTER ###\nPrez")
+
+        assert {"event": "section_end", "section": "optimizedCv", "text": "CV pronto"} in events
+        assert events[-1] == {"event": "section_delta", "section": "coverLetter", "text": "Prez"}
+
+    def test_preamble_and_missing_sections(self):
+        """Texto antes do primeiro marcador é ignorado e seção ausente usa o texto de erro."""
+        parser, events = stream(["Introdução ### COVER LETTER ### Carta"])
+
+        assert [e["section"] for e in events if e["event"] == "section_start"] == ["coverLetter"]
+        assert parser.result()["optimizedCv"].startswith("Erro: Seção")
+
+
+@pytest.mark.unit
+class TestGenerationStreaming:
+    """Testes da geração em streaming no agente e no endpoint SSE."""
+
+    @pytest.mark.asyncio
+    async def test_agent_stream_ends_with_full_result(self, monkeypatch):
+        """Compatibilidade vem primeiro e `done` traz o mesmo resultado da geração completa."""
+        agent = GenerationAgent()
+        monkeypatch.setattr(agent, "_create_chain", lambda: FakeChain(chunked(RESPONSE, 5)))
+
+        events = [
+            event async for event in agent.stream_career_materials(CV, "Dev Python", "Acme", JOB_DESCRIPTION)
+        ]
+
+        assert events[0]["event"] == "compatibility"
+        done = events[-1]
+        assert done["event"] == "done"
+        assert done["coverLetter"] == parse_sections(RESPONSE)["coverLetter"]
+        assert done["metadata"]["model"] == "gemini-2.5-flash"
+
+    @pytest.mark.asyncio
+    async def test_agent_stream_validates_before_llm(self):
+        """Entrada inválida falha antes de qualquer evento."""
+        agent = GenerationAgent()
+
+        with pytest.raises(ValueError, match="CV muito curto"):
+            await agent.stream_career_materials("curto", "Dev", "Acme", JOB_DESCRIPTION).__anext__()
+
+    def test_endpoint_emits_sse(self, monkeypatch):
+        """Endpoint responde text/event-stream com eventos por seção e `done`."""
+        import api.main as main
+        from config import settings
+
+        agent = GenerationAgent()
+        monkeypatch.setattr(agent, "_create_chain", lambda: FakeChain(chunked(RESPONSE, 11)))
+        monkeypatch.setattr(settings, "google_api_key", "AIzaTestKey1234567890")
+        monkeypatch.setattr(main, "generation_agent", agent)
+        payload = {"cv": CV, "job_title": "Dev Python", "company": "Acme", "job_description": JOB_DESCRIPTION}
+
+        response = TestClient(main.app).post("/generate-materials/stream", json=payload)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = sse_events(response.text)
+        names = [name for name, _ in events]
+        assert names[0] == "compatibility" and names[-1] == "done"
+        assert names.count("section_end") == 4
+        assert events[-1][1]["interview_tips"] == "1. Estude a arquitetura da Acme."
+
+    def test_done_event_matches_generate_materials_body(self, monkeypatch):
+        """`done` do stream tem o mesmo corpo da resposta de /generate-materials."""
+        import api.main as main
+        from config import settings
+
+        agent = GenerationAgent()
+        monkeypatch.setattr(agent, "_create_chain", lambda: FakeChain(chunked(RESPONSE, 11)))
+        monkeypatch.setattr(settings, "google_api_key", "AIzaTestKey1234567890")
+        monkeypatch.setattr(main, "generation_agent", agent)
+        payload = {
+            "cv": CV, "job_title": "Dev Python", "company": "Acme", "job_description": JOB_DESCRIPTION,
+            "parallel_sections": False, "force_regenerate": True,
+        }
+        client = TestClient(main.app)
+
+        body = client.post("/generate-materials", json=payload).json()
+        events = sse_events(client.post("/generate-materials/stream", json=payload).text)
+
+        assert events[-1] == ("done", body)
+        assert set(body) == set(main.GeneratedContentResponse.model_fields)
+
+    def test_endpoint_reports_midstream_failure(self, monkeypatch):
+        """Falha do LLM depois do início do stream vira evento `error`."""
+        import api.main as main
+        from config import settings
+
+        agent = GenerationAgent()
+        monkeypatch.setattr(agent, "_create_chain", lambda: FakeChain(chunked(RESPONSE, 20), fail_after=3))
+        monkeypatch.setattr(settings, "google_api_key", "AIzaTestKey1234567890")
+        monkeypatch.setattr(main, "generation_agent", agent)
+        payload = {"cv": CV, "job_title": "Dev Python", "company": "Acme", "job_description": JOB_DESCRIPTION}
+
+        events = sse_events(TestClient(main.app).post("/generate-materials/stream", json=payload).text)
+
+        assert events[-1][0] == "error"
+        assert "conexão encerrada" in events[-1][1]["detail"]
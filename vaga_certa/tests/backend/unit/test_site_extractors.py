@@ -0,0 +1,111 @@
+"""
+Testes unitários para os extratores específicos por site de vagas.
+"""
+import pytest
+from services.html_parsers import PARSER_BACKENDS, get_parser_backend
+from services.site_extractors import (
+    SiteExtractor,
+    css_to_xpath,
+    find_site_extractor,
+    register_site_extractor,
+)
+
+
+PAGES = [
+    # (página gravada, URL, título, empresa)
+    ("linkedin_job.html", "https://br.linkedin.com/jobs/view/123",
+     "Desenvolvedor Python Sênior", "Tech Corp"),
+    ("gupy_job.html", "https://varejobrasil.gupy.io/jobs/55",
+     "Analista de Dados Pleno", "Varejo Brasil"),
+    ("indeed_job.html", "https://br.indeed.com/viewjob?jk=abc123",
+     "Desenvolvedor Front-end React", "Agência Digital Sol"),
+    ("greenhouse_job.html", "https://boards.greenhouse.io/acme/jobs/42",
+     "Senior Backend Engineer", "Acme Robotics"),
+    ("lever_job.html", "https://jobs.lever.co/nuvempagamentos/8f1c",
+     "Engenheira(o) de Machine Learning", "Nuvem Pagamentos"),
+]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend_name", sorted(PARSER_BACKENDS))
+class TestSiteExtraction:
+    """Extração dedicada nas páginas gravadas, em todos os backends."""
+
+    @pytest.mark.parametrize("page,url,title,company", PAGES)
+    def test_known_boards(self, backend_name, job_pages, page, url, title, company):
+        """Título, empresa e descrição saem dos seletores do site."""
+        result = get_parser_backend(backend_name).parse(job_pages[page], url)
+
+        assert result["title"] == title
+        assert result["company"] == company
+        assert len(result["description"]) > 200
+
+    def test_unknown_host_uses_generic_heuristics(self, backend_name, job_pages):
+        """Sites sem extrator dedicado mantêm o resultado das heurísticas."""
+        backend = get_parser_backend(backend_name)
+        html = job_pages["generic_careers.html"]
+
+        assert backend.parse(html, "https://carreiras.exemplo.com/vagas/7") == backend.parse(html)
+
+    def test_missing_nodes_fall_back_to_generic(self, backend_name):
+        """Página de site conhecido sem os nós esperados usa as heurísticas."""
+        html = "<html><head><title>Vaga Dev | LinkedIn</title></head><body><p>x</p></body></html>"
+
+        result = get_parser_backend(backend_name).parse(html, "https://www.linkedin.com/jobs/view/1")
+
+        assert result["title"] == "Vaga Dev"
+
+
+@pytest.mark.unit
+class TestSiteRegistry:
+    """Testes do despacho por hostname e do registro de extratores."""
+
+    @pytest.mark.parametrize("url,expected", [
+        ("https://www.linkedin.com/jobs/view/1", "linkedin"),
+        ("https://br.linkedin.com/jobs/view/1", "linkedin"),
+        ("https://empresa.gupy.io/jobs/1", "gupy"),
+        ("https://job-boards.greenhouse.io/acme/jobs/1", "greenhouse"),
+        ("https://example.com/vaga", None),
+        ("https://notlinkedin.com/jobs", None),
+        (None, None),
+    ])
+    def test_dispatch_by_hostname(self, url, expected):
+        """Subdomínios usam o extrator do domínio; hosts parecidos não."""
+        extractor = find_site_extractor(url)
+
+        assert (extractor.name if extractor else None) == expected
+
+    def test_register_custom_extractor(self, monkeypatch):
+        """Novos sites podem registrar extratores próprios."""
+        import services.site_extractors as site_extractors
+
+        monkeypatch.setattr(site_extractors, "_extractors_by_host", {})
+        register_site_extractor(SiteExtractor(
+            name="acme", hosts=["vagas.acme.com"], title=["h2.vaga"]
+        ))
+        html = '<html><body><h1>Acme</h1><h2 class="vaga">Engenheira de Dados</h2></body></html>'
+
+        result = get_parser_backend("lxml").parse(html, "https://vagas.acme.com/1")
+
+        assert result["title"] == "Engenheira de Dados"
+
+
+@pytest.mark.unit
+class TestCssToXpath:
+    """Testes da conversão de seletores CSS simples para XPath."""
+
+    def test_compound_and_descendant(self):
+        """Tag, classe, id, atributo e descendente são convertidos."""
+        xpath = css_to_xpath("div.posting-headline h2")
+
+        assert xpath == (
+            "//div[contains(concat(' ', normalize-space(@class), ' '), ' posting-headline ')]//h2"
+        )
+        assert css_to_xpath("#content") == "//*[@id='content']"
+        assert css_to_xpath("[data-testid=job-title]") == "//*[@data-testid='job-title']"
+        assert css_to_xpath("div[data-company-name] a") == "//div[@data-company-name]//a"
+
+    def test_unsupported_syntax(self):
+        """Combinadores não suportados levantam ValueError."""
+        with pytest.raises(ValueError):
+            css_to_xpath("ul > li")
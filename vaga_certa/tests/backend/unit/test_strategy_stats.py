@@ -0,0 +1,136 @@
+"""
+Testes unitários para o aprendizado de estratégias por domínio.
+"""
+import asyncio
+import threading
+import time
+import pytest
+from services.strategy_stats import StrategyLearner
+
+
+@pytest.mark.unit
+class TestStrategyLearner:
+    """Testes da tabela aprendida de estratégias."""
+
+    def test_default_order_without_history(self):
+        """Sem histórico suficiente, a ordem padrão é mantida."""
+        learner = StrategyLearner(min_samples=3)
+        learner.record("example.com", "direct", False, 0.5)
+
+        assert learner.order("example.com", ["direct", "proxy"]) == ["direct", "proxy"]
+
+    def test_consistently_failing_strategy_is_skipped(self):
+        """Estratégia que sempre falha no domínio é pulada."""
+        learner = StrategyLearner(min_samples=3)
+        for _ in range(3):
+            learner.record("linkedin.com", "direct", False, 1.0)
+            learner.record("linkedin.com", "proxy", True, 0.4)
+
+        assert learner.should_skip("linkedin.com", "direct")
+        assert learner.order("linkedin.com", ["direct", "proxy"]) == ["proxy"]
+        assert learner.order("gupy.io", ["direct", "proxy"]) == ["direct", "proxy"]
+
+    def test_skipped_strategy_is_retried_after_interval(self):
+        """Estratégia pulada volta a ser tentada após o intervalo configurado."""
+        learner = StrategyLearner(min_samples=2, retry_after_seconds=60)
+        for _ in range(2):
+            learner.record("linkedin.com", "direct", False, 1.0)
+
+        learner._table["linkedin.com"]["direct"].last_attempt_at = time.time() - 120
+
+        assert not learner.should_skip("linkedin.com", "direct")
+
+    def test_order_prefers_success_then_latency(self):
+        """Estratégias são ordenadas por taxa de sucesso e depois latência."""
+        learner = StrategyLearner(min_samples=2)
+        for _ in range(2):
+            learner.record("indeed.com", "direct", True, 2.0)
+            learner.record("indeed.com", "proxy", True, 0.3)
+
+        assert learner.order("indeed.com", ["direct", "proxy"]) == ["proxy", "direct"]
+
+    def test_demoted_strategy_is_explored_after_interval(self):
+        """Estratégia rebaixada sem tentativa recente vai uma vez para a frente."""
+        learner = StrategyLearner(min_samples=2, retry_after_seconds=60)
+        for _ in range(2):
+            learner.record("indeed.com", "direct", True, 2.0)
+            learner.record("indeed.com", "proxy", True, 0.3)
+        learner._table["indeed.com"]["direct"].last_attempt_at = time.time() - 120
+
+        assert learner.order("indeed.com", ["direct", "proxy"]) == ["direct", "proxy"]
+        assert learner.order("indeed.com", ["direct", "proxy"]) == ["proxy", "direct"]
+
+        # O resultado da exploração atualiza a média e a ordem volta a ser a aprendida
+        learner.record("indeed.com", "direct", True, 0.1)
+        assert learner.snapshot()["indeed.com"]["direct"]["latency_ms"] < 2000
+        assert learner.order("indeed.com", ["direct", "proxy"]) == ["proxy", "direct"]
+
+    def test_never_returns_empty_order(self):
+        """Se todas as estratégias forem puladas, a ordem padrão é mantida."""
+        learner = StrategyLearner(min_samples=1)
+        learner.record("example.com", "direct", False, 1.0)
+        learner.record("example.com", "proxy", False, 1.0)
+
+        assert learner.order("example.com", ["direct", "proxy"]) == ["direct", "proxy"]
+
+    def test_table_persists_across_instances(self, tmp_path):
+        """Tabela salva em disco é recarregada por uma nova instância."""
+        path = str(tmp_path / "strategies.json")
+        learner = StrategyLearner(path=path, min_samples=1, save_interval_seconds=3600)
+        learner.record("linkedin.com", "direct", False, 1.2)
+        learner.save()
+
+        reloaded = StrategyLearner(path=path, min_samples=1)
+        snapshot = reloaded.snapshot()
+
+        assert snapshot["linkedin.com"]["direct"]["attempts"] == 1
+        assert snapshot["linkedin.com"]["direct"]["latency_ms"] == 1200.0
+        assert reloaded.should_skip("linkedin.com", "direct")
+
+    def test_workers_sharing_file_keep_each_others_stats(self, tmp_path):
+        """Gravações de processos diferentes mesclam a tabela em vez de sobrescrevê-la."""
+        path = str(tmp_path / "strategies.json")
+        first = StrategyLearner(path=path, min_samples=1, save_interval_seconds=3600)
+        second = StrategyLearner(path=path, min_samples=1, save_interval_seconds=3600)
+        first.record("linkedin.com", "direct", False, 1.0)
+        second.record("gupy.io", "proxy", True, 0.5)
+        first.save()
+        second.save()
+
+        snapshot = StrategyLearner(path=path).snapshot()
+
+        assert set(snapshot) == {"linkedin.com", "gupy.io"}
+        assert "linkedin.com" in second.snapshot()
+        assert [p.name for p in tmp_path.iterdir()] == ["strategies.json"]
+
+    @pytest.mark.asyncio
+    async def test_record_on_event_loop_saves_in_thread(self, tmp_path, monkeypatch):
+        """No event loop, a gravação periódica roda fora da thread do loop."""
+        learner = StrategyLearner(path=str(tmp_path / "strategies.json"), save_interval_seconds=0)
+        saved = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        threads = []
+        save = learner.save
+
+        def tracking_save():
+            threads.append(threading.get_ident())
+            save()
+            loop.call_soon_threadsafe(saved.set)
+
+        monkeypatch.setattr(learner, "save", tracking_save)
+        learner.record("linkedin.com", "direct", True, 0.1)
+        await asyncio.wait_for(saved.wait(), timeout=2)
+
+        assert threads and threading.get_ident() not in threads
+        assert (tmp_path / "strategies.json").exists()
+
+    def test_corrupted_file_is_ignored(self, tmp_path):
+        """Arquivo corrompido não impede a inicialização."""
+        path = tmp_path / "strategies.json"
+        path.write_text("{corrompido", encoding="utf-8")
+
+        assert StrategyLearner(path=str(path)).snapshot() == {}
+
+    def test_domain_of_strips_www_and_port(self):
+        """Domínio ignora www, porta e caixa."""
+        assert StrategyLearner.domain_of("https://WWW.LinkedIn.com:443/jobs/view/1") == "linkedin.com"
@@ -0,0 +1,143 @@
+"""
+Testes do fetch por streaming do WebScraper contra um servidor HTTP local.
+Verificam limite de tamanho, checagem de content-type, encerramento antecipado
+e o teto de memória com páginas de vários megabytes.
+"""
+import asyncio
+import tracemalloc
+import pytest
+from services.cache import TieredCache
+from services.web_scraper import WebScraper
+
+
+MB = 1024 * 1024
+
+
+class StandInServer:
+    """Servidor HTTP mínimo que gera uma página grande sob demanda."""
+
+    def __init__(self, prefix: bytes, total_size: int, content_type: str = "text/html; charset=utf-8"):
+        self.prefix = prefix
+        self.total_size = total_size
+        self.content_type = content_type
+        self.bytes_sent = 0
+        self._handlers = set()
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/vaga"
+        return self
+
+    async def __aexit__(self, *exc_info):
+        for handler in self._handlers:
+            handler.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self._handlers.add(asyncio.current_task())
+        await reader.readuntil(b"\r\n\r\n")
+        # Sem Content-Length: o limite precisa ser aplicado durante a leitura
+        writer.write(
+            f"HTTP/1.1 200 OK\r\nContent-Type: {self.content_type}\r\n"
+            "Connection: close\r\n\r\n".encode()
+        )
+        filler = b"<p>" + b"conteudo irrelevante " * 3000 + b"</p>\n"
+        try:
+            writer.write(self.prefix)
+            self.bytes_sent = len(self.prefix)
+            while self.bytes_sent < self.total_size:
+                writer.write(filler)
+                self.bytes_sent += len(filler)
+                await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.fixture
+def streaming_scraper(monkeypatch):
+    """WebScraper sem cache, sem corrida e sem proxies."""
+    from config import settings
+
+    monkeypatch.setattr(settings, "scraping_hedge_enabled", False)
+    scraper = WebScraper(cache=TieredCache("scrape-test", ttl_seconds=60))
+    monkeypatch.setattr(scraper, "_proxy_urls", lambda url: [])
+    return scraper
+
+
+@pytest.mark.unit
+class TestStreamingFetch:
+    """Testes do download por streaming."""
+
+    @pytest.mark.asyncio
+    async def test_oversized_page_is_aborted_within_memory_ceiling(self, streaming_scraper):
+        """Página de 20 MB é abortada no limite sem estourar a memória."""
+        streaming_scraper.max_body_bytes = 1 * MB
+
+        async with StandInServer(b"<html><body>", 20 * MB) as server:
+            tracemalloc.start()
+            with pytest.raises(ValueError, match="limite"):
+                await streaming_scraper._fetch_page(server.url)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        assert peak < 4 * MB
+        assert server.bytes_sent < 10 * MB
+        await streaming_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_download_stops_after_json_ld(self, streaming_scraper, job_pages):
+        """Com o JSON-LD completo no início, o restante da página não é baixado."""
+        html = job_pages["linkedin_job.html"]
+        head = html[:html.index("</head>")].encode("utf-8")
+
+        async with StandInServer(head, 8 * MB) as server:
+            page = await streaming_scraper._fetch_page(server.url)
+            result = await streaming_scraper.scrape_job_posting(server.url)
+
+        assert page.truncated
+        assert len(page.body) < 1 * MB
+        assert result["title"] == "Desenvolvedor Python Sênior"
+        assert result["company"] == "Tech Corp"
+        await streaming_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_non_html_content_type_is_rejected(self, streaming_scraper):
+        """Conteúdo binário é recusado antes da leitura do corpo."""
+        async with StandInServer(b"%PDF-1.7", 4 * MB, content_type="application/pdf") as server:
+            with pytest.raises(ValueError, match="Content-type"):
+                await streaming_scraper._fetch_page(server.url)
+
+        await streaming_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_small_page_is_read_completely(self, streaming_scraper, job_pages):
+        """Páginas sem JSON-LD dentro do limite são lidas por inteiro."""
+        html = job_pages["greenhouse_job.html"].encode("utf-8")
+
+        async with StandInServer(html, len(html)) as server:
+            page = await streaming_scraper._fetch_page(server.url)
+
+        assert not page.truncated
+        assert page.body == html
+        assert "Senior Backend Engineer" in page.text
+        await streaming_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_declared_charset_is_used_to_parse_bytes(self, streaming_scraper, job_pages):
+        """Página em ISO-8859-1 é parseada dos bytes com o charset do header."""
+        html = job_pages["generic_careers.html"].replace('<meta charset="utf-8">', "")
+        body = html.encode("cp1252")
+
+        async with StandInServer(body, len(body), content_type="text/html; charset=ISO-8859-1") as server:
+            page = await streaming_scraper._fetch_page(server.url)
+            result = await streaming_scraper.scrape_job_posting(server.url)
+
+        assert page.encoding == "iso-8859-1"
+        assert page.text == html
+        assert result == streaming_scraper._parse_html(html, server.url)
+        await streaming_scraper.close()
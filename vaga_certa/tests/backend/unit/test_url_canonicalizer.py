@@ -0,0 +1,92 @@
+"""
+Testes unitários (orientados a tabela) para a canonicalização de URLs de vagas.
+"""
+import pytest
+from services.url_canonicalizer import canonicalize_url
+
+
+CANONICAL_CASES = [
+    # (descrição, URL recebida, URL canônica)
+    ("espacos_e_fragmento",
+     "  https://Example.com/vagas/123#candidatar  ",
+     "https://example.com/vagas/123"),
+    ("porta_padrao_e_barra_final",
+     "https://example.com:443/vagas/123/",
+     "https://example.com/vagas/123"),
+    ("porta_nao_padrao_mantida",
+     "http://127.0.0.1:8080/vaga",
+     "http://127.0.0.1:8080/vaga"),
+    ("barras_duplicadas",
+     "https://example.com//vagas///123",
+     "https://example.com/vagas/123"),
+    ("utm_e_click_ids",
+     "https://example.com/vaga?utm_source=x&UTM_MEDIUM=y&gclid=1&fbclid=2&id=9",
+     "https://example.com/vaga?id=9"),
+    ("query_ordenada",
+     "https://example.com/vaga?b=2&a=1",
+     "https://example.com/vaga?a=1&b=2"),
+    ("linkedin_slug",
+     "https://br.linkedin.com/jobs/view/desenvolvedor-python-senior-at-tech-corp-3812345678?refId=abc&trackingId=xyz",
+     "https://www.linkedin.com/jobs/view/3812345678"),
+    ("linkedin_busca_current_job_id",
+     "https://www.linkedin.com/jobs/search/?currentJobId=3812345678&keywords=python&geoId=106057199",
+     "https://www.linkedin.com/jobs/view/3812345678"),
+    ("linkedin_colecao",
+     "https://www.linkedin.com/jobs/collections/recommended/?currentJobId=3812345678",
+     "https://www.linkedin.com/jobs/view/3812345678"),
+    ("linkedin_mobile",
+     "https://m.linkedin.com/jobs/view/3812345678/",
+     "https://www.linkedin.com/jobs/view/3812345678"),
+    ("linkedin_comm",
+     "https://www.linkedin.com/comm/jobs/view/3812345678?trk=eml",
+     "https://www.linkedin.com/jobs/view/3812345678"),
+    ("linkedin_sem_vaga",
+     "https://www.linkedin.com/company/tech-corp/?trk=nav",
+     "https://www.linkedin.com/company/tech-corp"),
+    ("indeed_viewjob",
+     "https://br.indeed.com/viewjob?jk=abc123def&from=serp&tk=1h2",
+     "https://br.indeed.com/viewjob?jk=abc123def"),
+    ("indeed_busca_vjk",
+     "https://br.indeed.com/jobs?q=python&l=Campinas&vjk=abc123def",
+     "https://br.indeed.com/viewjob?jk=abc123def"),
+    ("indeed_mobile",
+     "https://m.indeed.com/viewjob?jk=abc123def",
+     "https://www.indeed.com/viewjob?jk=abc123def"),
+    ("gupy_origem",
+     "https://varejobrasil.gupy.io/jobs/5512345?jobBoardSource=gupy_public_page",
+     "https://varejobrasil.gupy.io/jobs/5512345"),
+    ("greenhouse_job_boards",
+     "https://job-boards.greenhouse.io/acme/jobs/4012345?gh_src=linkedin",
+     "https://boards.greenhouse.io/acme/jobs/4012345"),
+    ("lever_apply",
+     "https://jobs.lever.co/nuvempagamentos/8f1c2d3e-aaaa-bbbb-cccc-1234567890ab/apply?lever-source=LinkedIn",
+     "https://jobs.lever.co/nuvempagamentos/8f1c2d3e-aaaa-bbbb-cccc-1234567890ab"),
+    ("sem_esquema",
+     " vaga sem url ",
+     "vaga sem url"),
+]
+
+
+@pytest.mark.unit
+class TestCanonicalizeUrl:
+    """Testes da URL canônica por site."""
+
+    @pytest.mark.parametrize(
+        "url,expected",
+        [case[1:] for case in CANONICAL_CASES],
+        ids=[case[0] for case in CANONICAL_CASES]
+    )
+    def test_canonical_form(self, url, expected):
+        """Cada variação da URL chega à mesma forma canônica."""
+        assert canonicalize_url(url) == expected
+
+    @pytest.mark.parametrize(
+        "url",
+        [case[1] for case in CANONICAL_CASES],
+        ids=[case[0] for case in CANONICAL_CASES]
+    )
+    def test_idempotent(self, url):
+        """Canonicalizar uma URL canônica não a altera."""
+        canonical = canonicalize_url(url)
+
+        assert canonicalize_url(canonical) == canonical
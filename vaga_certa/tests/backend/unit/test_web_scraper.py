@@ -0,0 +1,413 @@
+"""
+Testes unitários para o serviço de web scraping.
+"""
+import asyncio
+import httpx
+import pytest
+from services.cache import TieredCache
+from services.strategy_stats import StrategyLearner
+from services.web_scraper import WebScraper
+
+
+SCRAPED = {
+    "title": "Desenvolvedor Python",
+    "company": "Tech Corp",
+    "description": "Descrição da vaga",
+    "fullText": "Desenvolvedor Python na Tech Corp " * 20,
+}
+
+
+@pytest.fixture
+def scraper(monkeypatch):
+    """WebScraper com fetch direto simulado e contador de chamadas."""
+    scraper = WebScraper(cache=TieredCache("scrape-test", ttl_seconds=60))
+    calls = []
+
+    async def fake_direct_scrape(url, cached=None):
+        calls.append(url)
+        await asyncio.sleep(0.01)
+        return dict(SCRAPED)
+
+    async def fake_single_proxy(proxy_url, url=None):
+        return None
+
+    monkeypatch.setattr(scraper, "_try_direct_scrape", fake_direct_scrape)
+    monkeypatch.setattr(scraper, "_try_single_proxy", fake_single_proxy)
+    scraper.calls = calls
+    return scraper
+
+
+@pytest.mark.unit
+class TestScrapeSingleFlight:
+    """Testes de reuso do scraping entre etapas do pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_fetch_once(self, scraper):
+        """Chamadas sequenciais para a mesma URL reutilizam o resultado."""
+        url = "https://example.com/vaga/1"
+
+        first = await scraper.scrape_job_posting(url)
+        second = await scraper.scrape_job_posting(url)
+
+        assert first == second == SCRAPED
+        assert scraper.calls == [url]
+        await scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_fetch(self, scraper):
+        """Chamadas concorrentes aguardam o mesmo fetch em andamento."""
+        url = "https://example.com/vaga/2"
+
+        results = await asyncio.gather(
+            *[scraper.scrape_job_posting(url) for _ in range(5)]
+        )
+
+        assert all(result == SCRAPED for result in results)
+        assert scraper.calls == [url]
+        await scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_returned_dict_is_a_copy(self, scraper):
+        """Mutação do resultado por um chamador não afeta os demais."""
+        url = "https://example.com/vaga/3"
+
+        first = await scraper.scrape_job_posting(url)
+        first["title"] = "Alterado"
+        second = await scraper.scrape_job_posting(url)
+
+        assert second["title"] == SCRAPED["title"]
+        await scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_expired_memo_fetches_again(self, scraper):
+        """Após o TTL, a URL é buscada novamente."""
+        url = "https://example.com/vaga/4"
+        scraper.memo_ttl_seconds = 0
+
+        await scraper.scrape_job_posting(url)
+        await scraper.scrape_job_posting(url)
+
+        assert scraper.calls == [url, url]
+        await scraper.close()
+
+
+JOB_HTML = """
+<html><head><title>Desenvolvedor Python - Tech Corp</title></head>
+<body><main>
+<h1>Desenvolvedor Python</h1>
+<div class="job-description">
+<p>A Tech Corp procura uma pessoa desenvolvedora Python para integrar a equipe
+de plataforma. Você vai projetar APIs, revisar código e apoiar o time.</p>
+<h2>Responsabilidades</h2>
+<ul><li>Desenvolver serviços com FastAPI e PostgreSQL</li>
+<li>Participar de decisões de arquitetura com a equipe</li></ul>
+<h2>Requisitos</h2>
+<ul><li>Experiência sólida com Python e testes automatizados</li>
+<li>Vivência com Docker, filas e observabilidade</li></ul>
+<h2>Qualificações desejáveis</h2>
+<ul><li>Conhecimento de Kubernetes e nuvem pública</li></ul>
+<p>Para se candidatar a esta vaga, envie seu currículo e aplique pelo site.</p>
+</div>
+</main></body></html>
+"""
+
+
+@pytest.mark.unit
+class TestScrapeCache:
+    """Testes do cache persistente com revalidação condicional."""
+
+    def _scraper(self, handler, ttl_seconds=60):
+        scraper = WebScraper(cache=TieredCache("scrape-test", ttl_seconds=ttl_seconds))
+        scraper.memo_ttl_seconds = 0
+        scraper.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return scraper
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_served_from_cache(self):
+        """Entrada dentro do TTL é servida sem novo fetch."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, text=JOB_HTML)
+
+        scraper = self._scraper(handler)
+        url = "https://example.com/vaga/10"
+
+        first = await scraper.scrape_job_posting(url)
+        second = await scraper.scrape_job_posting(url + "#detalhes")
+
+        assert first == second
+        assert len(requests) == 1
+        assert scraper.get_cache_stats()["hits"] == 1
+        await scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_revalidated(self):
+        """Entrada expirada é revalidada com If-None-Match e reutilizada no 304."""
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            if request.headers.get("if-none-match") == '"v1"':
+                return httpx.Response(304)
+            return httpx.Response(200, text=JOB_HTML, headers={"ETag": '"v1"'})
+
+        scraper = self._scraper(handler, ttl_seconds=0)
+        url = "https://example.com/vaga/11"
+
+        first = await scraper.scrape_job_posting(url)
+        second = await scraper.scrape_job_posting(url)
+
+        assert first == second
+        assert len(requests) == 2
+        assert requests[1].headers["if-none-match"] == '"v1"'
+        stats = scraper.get_cache_stats()
+        assert stats["revalidations"] == 1
+        assert stats["misses"] == 1
+        await scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_url_variants_share_canonical_entry(self):
+        """Variações da mesma vaga (rastreamento, busca) usam uma única entrada."""
+        requests = []
+
+        def handler(request):
+            requests.append(str(request.url))
+            return httpx.Response(200, text=JOB_HTML)
+
+        scraper = self._scraper(handler)
+
+        first = await scraper.scrape_job_posting(
+            "https://www.linkedin.com/jobs/search/?currentJobId=3812345678&keywords=python"
+        )
+        second = await scraper.scrape_job_posting(
+            "https://br.linkedin.com/jobs/view/dev-python-3812345678?refId=abc&utm_source=email"
+        )
+
+        assert first == second
+        assert requests == ["https://www.linkedin.com/jobs/view/3812345678"]
+        await scraper.close()
+
+
+@pytest.mark.unit
+class TestConnectionPool:
+    """Testes de limites do pool HTTP e concorrência por host."""
+
+    def test_http2_falls_back_without_h2(self, monkeypatch):
+        """HTTP/2 habilitado sem o pacote h2 volta para HTTP/1.1."""
+        from config import settings
+        import importlib.util
+
+        monkeypatch.setattr(settings, "scraping_http2_enabled", True)
+        monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+
+        scraper = WebScraper(cache=TieredCache("scrape-test", ttl_seconds=60))
+
+        assert scraper.http2 is False
+        assert scraper.get_pool_stats()["http2"] is False
+
+    @pytest.mark.asyncio
+    async def test_pool_stats_track_hosts(self, monkeypatch):
+        """Métricas do pool registram requisições e pico por host."""
+        from config import settings
+
+        monkeypatch.setattr(settings, "scraping_max_concurrency_per_host", 1)
+        scraper = WebScraper(
+            cache=TieredCache("scrape-test", ttl_seconds=60),
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, text=JOB_HTML))
+        )
+
+        await asyncio.gather(*(
+            scraper._fetch_page(f"https://example.com/vaga/{i}") for i in range(4)
+        ))
+
+        stats = scraper.get_pool_stats()
+        assert stats["max_connections"] == settings.scraping_max_connections
+        assert stats["connections"] is None
+        host = stats["per_host"]["hosts"]["example.com"]
+        assert host["requests"] == 4
+        assert host["peak_active"] == 1
+        await scraper.close()
+
+
+JOB_RESULT = {
+    "title": "Desenvolvedor Python",
+    "company": "Tech Corp",
+    "description": "",
+    "fullText": (
+        "A Tech Corp procura uma pessoa desenvolvedora Python para a equipe.\n"
+        "Responsabilidades:\n- Desenvolver APIs com FastAPI\n"
+        "Requisitos:\n- Experiência com Python, Docker e testes\n"
+        "Qualificações: vivência com nuvem pública e observabilidade.\n"
+        "Candidate-se para esta vaga e venha fazer parte do time de plataforma."
+    ),
+}
+
+
+@pytest.mark.unit
+class TestHedgedScrape:
+    """Testes da corrida entre fetch direto e proxies CORS."""
+
+    @pytest.fixture
+    def racing_scraper(self, monkeypatch):
+        """WebScraper em modo de corrida com atraso de hedge curto."""
+        from config import settings
+
+        monkeypatch.setattr(settings, "scraping_hedge_enabled", True)
+        monkeypatch.setattr(settings, "scraping_hedge_delay_seconds", 0.05)
+        monkeypatch.setattr(settings, "scraping_max_parallel_attempts", 3)
+        scraper = WebScraper(cache=TieredCache("scrape-test", ttl_seconds=60))
+        scraper.started = []
+        return scraper
+
+    @pytest.mark.asyncio
+    async def test_proxy_wins_when_direct_is_slow(self, racing_scraper, monkeypatch):
+        """Proxy rápido vence o fetch direto lento, que é cancelado."""
+        cancelled = []
+
+        async def slow_direct(url, cached=None):
+            racing_scraper.started.append("direct")
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append("direct")
+                raise
+            return dict(JOB_RESULT)
+
+        async def fast_proxy(proxy_url, url=None):
+            racing_scraper.started.append(proxy_url)
+            return dict(JOB_RESULT)
+
+        monkeypatch.setattr(racing_scraper, "_try_direct_scrape", slow_direct)
+        monkeypatch.setattr(racing_scraper, "_try_single_proxy", fast_proxy)
+
+        result = await asyncio.wait_for(
+            racing_scraper.scrape_job_posting("https://example.com/vaga/20"),
+            timeout=1
+        )
+        await asyncio.sleep(0)
+
+        assert result == JOB_RESULT
+        assert cancelled == ["direct"]
+        await racing_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_fast_direct_skips_proxies(self, racing_scraper, monkeypatch):
+        """Fetch direto aceitável dentro do atraso não dispara proxies."""
+        async def fast_direct(url, cached=None):
+            racing_scraper.started.append("direct")
+            return dict(JOB_RESULT)
+
+        async def proxy(proxy_url, url=None):
+            racing_scraper.started.append(proxy_url)
+            return None
+
+        monkeypatch.setattr(racing_scraper, "_try_direct_scrape", fast_direct)
+        monkeypatch.setattr(racing_scraper, "_try_single_proxy", proxy)
+
+        result = await racing_scraper.scrape_job_posting("https://example.com/vaga/21")
+
+        assert result == JOB_RESULT
+        assert racing_scraper.started == ["direct"]
+        await racing_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_direct_launches_proxy_immediately(self, racing_scraper, monkeypatch):
+        """Falha no fetch direto dispara o próximo proxy sem esperar o atraso."""
+        from config import settings
+
+        monkeypatch.setattr(settings, "scraping_hedge_delay_seconds", 10)
+
+        async def failing_direct(url, cached=None):
+            return None
+
+        async def proxy(proxy_url, url=None):
+            return dict(JOB_RESULT)
+
+        monkeypatch.setattr(racing_scraper, "_try_direct_scrape", failing_direct)
+        monkeypatch.setattr(racing_scraper, "_try_single_proxy", proxy)
+
+        result = await asyncio.wait_for(
+            racing_scraper.scrape_job_posting("https://example.com/vaga/22"),
+            timeout=1
+        )
+
+        assert result == JOB_RESULT
+        await racing_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_all_strategies_fail(self, racing_scraper, monkeypatch):
+        """Sem resultado de nenhuma estratégia, o scraping levanta ValueError."""
+        async def failing(*args, **kwargs):
+            return None
+
+        monkeypatch.setattr(racing_scraper, "_try_direct_scrape", failing)
+        monkeypatch.setattr(racing_scraper, "_try_single_proxy", failing)
+
+        with pytest.raises(ValueError):
+            await racing_scraper.scrape_job_posting("https://example.com/vaga/23")
+        await racing_scraper.close()
+
+
+@pytest.mark.unit
+class TestStrategyLearning:
+    """Testes da ordem de estratégias aprendida por domínio."""
+
+    @pytest.fixture
+    def learning_scraper(self, monkeypatch):
+        """WebScraper sequencial com tabela de estratégias própria."""
+        from config import settings
+
+        monkeypatch.setattr(settings, "scraping_hedge_enabled", False)
+        learner = StrategyLearner(min_samples=2)
+        scraper = WebScraper(
+            cache=TieredCache("scrape-test", ttl_seconds=60),
+            strategy_learner=learner
+        )
+        scraper.memo_ttl_seconds = 0
+        scraper.started = []
+
+        async def blocked_direct(url, cached=None):
+            scraper.started.append("direct")
+            return None
+
+        async def proxy(proxy_url, url=None):
+            scraper.started.append("proxy")
+            return dict(JOB_RESULT)
+
+        monkeypatch.setattr(scraper, "_try_direct_scrape", blocked_direct)
+        monkeypatch.setattr(scraper, "_try_single_proxy", proxy)
+        return scraper
+
+    @pytest.mark.asyncio
+    async def test_blocking_host_goes_straight_to_proxy(self, learning_scraper):
+        """Após falhas repetidas do fetch direto, o domínio vai direto ao proxy."""
+        for i in range(2):
+            await learning_scraper.scrape_job_posting(f"https://www.blocked.com/vaga/{i}")
+        assert learning_scraper.started == ["direct", "proxy", "direct", "proxy"]
+
+        learning_scraper.started.clear()
+        await learning_scraper.scrape_job_posting("https://www.blocked.com/vaga/99")
+
+        assert learning_scraper.started == ["proxy"]
+        table = learning_scraper.strategy_learner.snapshot()["blocked.com"]
+        assert table["direct"]["attempts"] == 2
+        assert table["proxy"]["successes"] == 3
+        await learning_scraper.close()
+
+    @pytest.mark.asyncio
+    async def test_race_records_outcomes(self, learning_scraper, monkeypatch):
+        """Modo de corrida registra o resultado de cada tentativa concluída."""
+        from config import settings
+
+        monkeypatch.setattr(settings, "scraping_hedge_enabled", True)
+        monkeypatch.setattr(settings, "scraping_hedge_delay_seconds", 0.05)
+        monkeypatch.setattr(learning_scraper, "_proxy_urls", lambda url: ["https://proxy.test/"])
+
+        await learning_scraper.scrape_job_posting("https://race.example.com/vaga/1")
+
+        table = learning_scraper.strategy_learner.snapshot()["race.example.com"]
+        assert table["direct"]["successes"] == 0
+        assert table["proxy"]["successes"] == 1
+        await learning_scraper.close()
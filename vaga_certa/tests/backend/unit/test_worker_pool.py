@@ -0,0 +1,85 @@
+"""
+Testes unitários para o pool de workers CPU-bound.
+"""
+import asyncio
+import time
+import pytest
+from services.html_parsers import parse_job_page
+from services.worker_pool import CPUWorkerPool
+
+
+def slow_square(value):
+    """Função CPU-bound simulada (de módulo, serializável)."""
+    time.sleep(0.05)
+    return value * value
+
+
+@pytest.mark.unit
+class TestCPUWorkerPool:
+    """Testes do CPUWorkerPool."""
+
+    @pytest.mark.asyncio
+    async def test_small_inputs_run_inline(self):
+        """Entradas abaixo do limite não saem do event loop."""
+        pool = CPUWorkerPool(min_offload_chars=100)
+
+        assert await pool.run(slow_square, 3, size_hint=10) == 9
+        stats = pool.get_stats()
+        assert stats["inline"] == 1
+        assert stats["offloaded"] == 0
+
+    @pytest.mark.asyncio
+    async def test_large_inputs_are_offloaded(self):
+        """Entradas grandes rodam no executor com métricas de execução."""
+        pool = CPUWorkerPool(min_offload_chars=0)
+
+        assert await pool.run(slow_square, 4) == 16
+        stats = pool.get_stats()
+        assert stats["offloaded"] == 1
+        assert stats["executing_seconds_total"] >= 0.04
+        pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_offload_keeps_event_loop_responsive(self):
+        """O event loop continua processando enquanto o worker executa."""
+        pool = CPUWorkerPool(min_offload_chars=0)
+        ticks = []
+
+        async def ticker():
+            for _ in range(3):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(pool.run(slow_square, 2), ticker())
+
+        assert len(ticks) == 3
+        pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_bounded_admission_records_queue_time(self):
+        """Tarefas além da capacidade aguardam e o tempo em fila é medido."""
+        pool = CPUWorkerPool(max_workers=1, max_queue_size=0, min_offload_chars=0)
+
+        results = await asyncio.gather(*[pool.run(slow_square, n) for n in range(3)])
+
+        assert results == [0, 1, 4]
+        stats = pool.get_stats()
+        assert stats["offloaded"] == 3
+        assert stats["queued_seconds_max"] >= 0.05
+        pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_process_mode_parses_html(self, job_pages):
+        """No modo processo, o parse de páginas roda em outro processo."""
+        pool = CPUWorkerPool(mode="process", max_workers=1, min_offload_chars=0)
+        html = job_pages["greenhouse_job.html"]
+
+        result = await pool.run(parse_job_page, html, "lxml")
+
+        assert result == parse_job_page(html, "lxml")
+        pool.shutdown()
+
+    def test_invalid_mode(self):
+        """Modo desconhecido levanta ValueError."""
+        with pytest.raises(ValueError):
+            CPUWorkerPool(mode="gpu")
@@ -66,3 +66,26 @@ def sample_job_details():
         "type": "CLT"
     }
 
+
+
+FIXTURE_PAGES_DIR = Path(__file__).parent / "fixtures" / "pages"
+
+
+@pytest.fixture
+def job_pages():
+    """Páginas de vagas salvas (nome do arquivo -> HTML) para testes de parsing."""
+    return {
+        page.name: page.read_text(encoding="utf-8")
+        for page in sorted(FIXTURE_PAGES_DIR.glob("*.html"))
+    }
+
+
+@pytest.fixture(autouse=True)
+def isolated_state_dir(tmp_path, monkeypatch):
+    """Isola o estado persistido (cache em disco, tabelas aprendidas) por teste."""
+    from config import settings
+    import services.strategy_stats as strategy_stats
+
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path / "cache"))
+    monkeypatch.setattr(strategy_stats, "_strategy_learner", None)
+    return tmp_path